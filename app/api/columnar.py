@@ -0,0 +1,204 @@
+"""다행(多行) 결과의 열 지향 바이너리 응답 (msgpack + 형식 있는 배열).
+
+Accept: application/vnd.msgpack 요청에는 행마다 객체를 만들지 않고 NumPy 버퍼를 그대로 실어 보낸다.
+본문은 표준 msgpack 맵이라 어떤 msgpack 클라이언트로도 읽을 수 있다.
+
+    {"format": "gbi.columnar.v1", "meta": {...스칼라...},
+     "columns": {이름: {"dtype": "<f8", "shape": [n], "data": <bin>} | [문자열, ...]}}
+
+- 숫자 열: data는 리틀 엔디언 원시 버퍼다 (np.frombuffer(data, dtype).reshape(shape), JS는 Float64Array).
+- 값이 없는 칸(JSON의 null)은 NaN이다.
+- 문자열 열은 msgpack 문자열 배열이다.
+인코더·디코더는 이 형식이 쓰는 msgpack 부분집합만 구현해 의존성을 늘리지 않는다.
+"""
+import struct
+from typing import Any
+
+import numpy as np
+from starlette.responses import Response
+
+MSGPACK = "application/vnd.msgpack"
+_MSGPACK_ALIASES = (MSGPACK, "application/msgpack", "application/x-msgpack")
+FORMAT = "gbi.columnar.v1"
+
+# OpenAPI 문서용: responses=COLUMNAR_RESPONSES
+COLUMNAR_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {"content": {MSGPACK: {"schema": {"type": "string", "format": "binary"}}}},
+}
+
+
+def _quality(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def wants_columnar(accept: str | None) -> bool:
+    """Accept 헤더가 msgpack을 JSON 이상으로 선호하면 True (없거나 */*면 JSON)."""
+    if not accept:
+        return False
+    binary = json = 0.0
+    for item in accept.split(","):
+        media, _, params = item.strip().partition(";")
+        media = media.strip().lower()
+        if media in _MSGPACK_ALIASES:
+            binary = max(binary, _quality(params))
+        elif media in ("application/json", "application/*", "*/*"):
+            json = max(json, _quality(params))
+    return binary > 0 and binary >= json
+
+
+def columnar(columns: dict[str, np.ndarray | list[str]], **meta: Any) -> dict[str, Any]:
+    return {"format": FORMAT, "meta": meta, "columns": columns}
+
+
+class ColumnarResponse(Response):
+    media_type = MSGPACK
+
+    def render(self, content: Any) -> bytes:
+        return packb(content)
+
+
+# ------------------------------------------------------------
+# msgpack 부분집합
+# ------------------------------------------------------------
+
+def packb(obj: Any) -> bytes:
+    out: list[bytes | memoryview] = []
+    _pack(obj, out)
+    return b"".join(out)
+
+
+def _header(out: list, n: int, fix: int | None, fix_max: int, codes: tuple[int, int, int]) -> None:
+    if fix is not None and n <= fix_max:
+        out.append(bytes((fix | n,)))
+    elif codes[0] and n < 1 << 8:
+        out.append(struct.pack(">BB", codes[0], n))
+    elif n < 1 << 16:
+        out.append(struct.pack(">BH", codes[1], n))
+    else:
+        out.append(struct.pack(">BI", codes[2], n))
+
+
+def _pack(obj: Any, out: list) -> None:
+    if obj is None:
+        out.append(b"\xc0")
+    elif obj is True or obj is False or isinstance(obj, np.bool_):
+        out.append(b"\xc3" if obj else b"\xc2")
+    elif isinstance(obj, (int, np.integer)):
+        obj = int(obj)
+        if -32 <= obj < 128:
+            out.append(struct.pack(">b", obj))
+        elif obj < 1 << 63:
+            out.append(struct.pack(">Bq", 0xD3, obj))
+        else:
+            out.append(struct.pack(">BQ", 0xCF, obj))
+    elif isinstance(obj, (float, np.floating)):
+        out.append(struct.pack(">Bd", 0xCB, float(obj)))
+    elif isinstance(obj, str):
+        data = obj.encode()
+        _header(out, len(data), 0xA0, 31, (0xD9, 0xDA, 0xDB))
+        out.append(data)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        _header(out, len(obj), None, 0, (0xC4, 0xC5, 0xC6))
+        out.append(obj)
+    elif isinstance(obj, np.ndarray):
+        array = np.ascontiguousarray(obj, dtype=obj.dtype.newbyteorder("<"))
+        data = memoryview(array.reshape(-1).view(np.uint8))  # 복사 없이 원시 버퍼를 싣는다
+        _pack({"dtype": array.dtype.str, "shape": list(array.shape), "data": data}, out)
+    elif isinstance(obj, dict):
+        _header(out, len(obj), 0x80, 15, (0, 0xDE, 0xDF))
+        for key, value in obj.items():
+            _pack(key, out)
+            _pack(value, out)
+    elif isinstance(obj, (list, tuple)):
+        _header(out, len(obj), 0x90, 15, (0, 0xDC, 0xDD))
+        for value in obj:
+            _pack(value, out)
+    else:
+        raise TypeError(f"msgpack으로 직렬화할 수 없는 값: {type(obj).__name__}")
+
+
+_FIXED = {
+    0xC0: None, 0xC2: False, 0xC3: True,
+}
+_SIZED = {  # 코드 → (길이 구조체, 종류)
+    0xC4: (">B", "bin"), 0xC5: (">H", "bin"), 0xC6: (">I", "bin"),
+    0xD9: (">B", "str"), 0xDA: (">H", "str"), 0xDB: (">I", "str"),
+    0xDC: (">H", "array"), 0xDD: (">I", "array"),
+    0xDE: (">H", "map"), 0xDF: (">I", "map"),
+}
+_NUMBERS = {
+    0xCA: ">f", 0xCB: ">d", 0xCC: ">B", 0xCD: ">H", 0xCE: ">I", 0xCF: ">Q",
+    0xD0: ">b", 0xD1: ">h", 0xD2: ">i", 0xD3: ">q",
+}
+
+
+def unpackb(data: bytes) -> Any:
+    """packb의 역. 숫자 열은 {"dtype", "shape", "data"} 맵 그대로 둔다 (decode_columns 참고)."""
+    value, end = _unpack(memoryview(data), 0)
+    if end != len(data):
+        raise ValueError("msgpack 본문 뒤에 남는 바이트가 있습니다.")
+    return value
+
+
+def _unpack(buf: memoryview, at: int) -> tuple[Any, int]:
+    code = buf[at]
+    at += 1
+    if code <= 0x7F:
+        return code, at
+    if code >= 0xE0:
+        return code - 0x100, at
+    if 0xA0 <= code <= 0xBF:
+        n = code & 0x1F
+        return bytes(buf[at:at + n]).decode(), at + n
+    if 0x90 <= code <= 0x9F:
+        return _unpack_array(buf, at, code & 0x0F)
+    if 0x80 <= code <= 0x8F:
+        return _unpack_map(buf, at, code & 0x0F)
+    if code in _FIXED:
+        return _FIXED[code], at
+    if code in _NUMBERS:
+        fmt = _NUMBERS[code]
+        return struct.unpack_from(fmt, buf, at)[0], at + struct.calcsize(fmt)
+    if code in _SIZED:
+        fmt, kind = _SIZED[code]
+        n = struct.unpack_from(fmt, buf, at)[0]
+        at += struct.calcsize(fmt)
+        if kind == "bin":
+            return bytes(buf[at:at + n]), at + n
+        if kind == "str":
+            return bytes(buf[at:at + n]).decode(), at + n
+        return (_unpack_array if kind == "array" else _unpack_map)(buf, at, n)
+    raise ValueError(f"지원하지 않는 msgpack 형식 코드: 0x{code:02x}")
+
+
+def _unpack_array(buf: memoryview, at: int, n: int) -> tuple[list, int]:
+    items = []
+    for _ in range(n):
+        value, at = _unpack(buf, at)
+        items.append(value)
+    return items, at
+
+
+def _unpack_map(buf: memoryview, at: int, n: int) -> tuple[dict, int]:
+    items = {}
+    for _ in range(n):
+        key, at = _unpack(buf, at)
+        items[key], at = _unpack(buf, at)
+    return items, at
+
+
+def decode_columns(payload: dict[str, Any]) -> dict[str, np.ndarray | list[str]]:
+    """unpackb 결과의 숫자 열을 NumPy 배열로 되돌린다."""
+    columns = {}
+    for name, col in payload["columns"].items():
+        if isinstance(col, dict):
+            col = np.frombuffer(col["data"], dtype=col["dtype"]).reshape(col["shape"])
+        columns[name] = col
+    return columns
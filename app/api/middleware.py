@@ -0,0 +1,68 @@
+"""요청 단위 미들웨어."""
+import threading
+import time
+
+from app.services.rate_store import pinned
+from app.services.tracing import Span, tracer
+
+
+class RateSnapshotMiddleware:
+    """요청마다 시작 시점의 금리 스냅샷을 고정하고 응답 헤더에 버전을 싣는다.
+
+    컨텍스트 변수로 고정하므로 스레드풀에서 실행되는 동기 엔드포인트에도 그대로 전달된다.
+    """
+
+    header = b"x-rate-snapshot-version"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        with pinned() as snapshot:
+            version = str(snapshot.version).encode()
+
+            async def send_with_version(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = [*message.get("headers", []), (self.header, version)]
+                await send(message)
+
+            await self.app(scope, receive, send_with_version)
+
+
+class TracingMiddleware:
+    """HTTP 요청마다 추적을 시작하고, 응답 시작 시각으로 직렬화 구간을 기록한다.
+
+    직렬화 구간은 TracedRoute가 표시한 엔드포인트 반환 시각부터 응답 헤더 전송까지다
+    (응답 모델 검증과 JSON 인코딩).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        trace, token = tracer.start(f"{scope['method']} {scope['path']}")
+        status = 500
+
+        async def send_traced(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if trace.endpoint_end_ns is not None:
+                    now = time.perf_counter_ns()
+                    trace.spans.append(
+                        Span("serialize", trace.endpoint_end_ns, now - trace.endpoint_end_ns, threading.get_ident(), None)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_traced)
+        finally:
+            tracer.finish(trace, token, status)
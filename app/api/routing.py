@@ -0,0 +1,45 @@
+"""추적용 라우트 클래스."""
+import functools
+import inspect
+import time
+
+from fastapi.routing import APIRoute
+
+from app.services.tracing import current_trace, span
+
+
+def _traced_endpoint(endpoint):
+    """엔드포인트 실행을 "endpoint" 스팬으로 기록하고 반환 시각을 추적에 남긴다 (직렬화 구간의 시작)."""
+    name = endpoint.__name__
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            trace = current_trace()
+            try:
+                with span("endpoint", function=name):
+                    return await endpoint(*args, **kwargs)
+            finally:
+                if trace is not None:
+                    trace.endpoint_end_ns = time.perf_counter_ns()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            trace = current_trace()
+            try:
+                with span("endpoint", function=name):
+                    return endpoint(*args, **kwargs)
+            finally:
+                if trace is not None:
+                    trace.endpoint_end_ns = time.perf_counter_ns()
+    return wrapper
+
+
+class TracedRoute(APIRoute):
+    """APIRouter(route_class=TracedRoute)로 쓰면 엔드포인트 실행과 직렬화를 구분해 추적한다.
+
+    functools.wraps가 원래 시그니처를 노출하므로 의존성·검증·OpenAPI 스키마는 그대로다.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _traced_endpoint(endpoint), **kwargs)
@@ -0,0 +1,117 @@
+"""사전 압축·내용 해시 정적 자산.
+
+시작 시 정적 디렉터리를 한 번 읽어 파일마다
+- 내용 해시를 붙인 이름(css/app.3f2a9c1b7e04.css)을 만들고
+- gzip과 (brotli 모듈이 있으면) br 압축본을 미리 만들어 메모리에 둔다.
+요청은 Accept-Encoding에 맞는 압축본을 그대로 보내므로 요청마다 파일 I/O나 압축이 없다.
+해시 이름은 내용이 바뀌면 이름도 바뀌므로 immutable로 1년 캐시하고,
+해시 없는 원래 이름과 인덱스 페이지는 ETag로 재검증(no-cache)하게 한다.
+"""
+import gzip
+import hashlib
+import mimetypes
+from collections.abc import Mapping
+from pathlib import Path
+from typing import NamedTuple
+
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip 압축본만 만든다
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+_PREFERENCE = ("br", "gzip")  # 둘 다 허용되면 더 작은 br 우선
+
+
+class Asset(NamedTuple):
+    media_type: str
+    digest: str
+    cache_control: str
+    variants: Mapping[str, bytes]  # 인코딩 → 본문 ("identity"는 항상 있다)
+
+
+def _compress(body: bytes) -> dict[str, bytes]:
+    variants = {"identity": body}
+    encoded = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=11)
+    for encoding, data in encoded.items():
+        if len(data) < len(body):  # 이미 압축된 형식(이미지 등)은 원본만 둔다
+            variants[encoding] = data
+    return variants
+
+
+def make_asset(body: bytes, media_type: str, cache_control: str = REVALIDATE) -> Asset:
+    digest = hashlib.sha256(body).hexdigest()[:12]
+    return Asset(media_type, digest, cache_control, _compress(body))
+
+
+def _accepted(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        try:
+            if params and float(q) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def asset_response(asset: Asset, headers: Headers) -> Response:
+    """Accept-Encoding에 맞는 변형을 고르고 If-None-Match가 맞으면 304를 돌려준다."""
+    accepted = _accepted(headers.get("accept-encoding", ""))
+    encoding = next(
+        (e for e in _PREFERENCE if e in asset.variants and (e in accepted or "*" in accepted)), "identity"
+    )
+    etag = f'"{asset.digest}"' if encoding == "identity" else f'"{asset.digest}-{encoding}"'
+    response_headers = {"cache-control": asset.cache_control, "etag": etag, "vary": "accept-encoding"}
+    if etag in headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=response_headers)
+    if encoding != "identity":
+        response_headers["content-encoding"] = encoding
+    return Response(asset.variants[encoding], media_type=asset.media_type, headers=response_headers)
+
+
+class StaticAssets:
+    """정적 디렉터리의 사전 빌드 결과를 서빙하는 ASGI 앱. prefix는 앱에 마운트한 경로다."""
+
+    def __init__(self, directory: Path, prefix: str):
+        self.prefix = prefix.rstrip("/")
+        self.files: dict[str, Asset] = {}
+        self.urls: dict[str, str] = {}  # 원래 경로 → 해시 경로
+        for path in sorted(p for p in directory.rglob("*") if p.is_file()):
+            name = path.relative_to(directory).as_posix()
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            asset = make_asset(path.read_bytes(), media_type)
+            stem, dot, suffix = name.rpartition(".")
+            hashed = f"{stem}.{asset.digest}.{suffix}" if dot else f"{name}.{asset.digest}"
+            self.files[name] = asset
+            self.files[hashed] = asset._replace(cache_control=IMMUTABLE)
+            self.urls[name] = hashed
+
+    def url(self, name: str, root_path: str = "") -> str:
+        """템플릿용: 원래 경로를 해시 경로 URL로 바꾼다 (모르는 경로는 그대로).
+
+        root_path는 요청의 ASGI root_path (경로 접두사 프록시 뒤에서 서빙할 때의 접두사)다.
+        """
+        return f"{root_path.rstrip('/')}{self.prefix}/{self.urls.get(name, name)}"
+
+    async def __call__(self, scope, receive, send):
+        path, root = scope["path"], scope.get("root_path", "")
+        name = path[len(root):].lstrip("/") if path.startswith(root) else path.lstrip("/")
+        asset = self.files.get(name)
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405, headers={"allow": "GET, HEAD"})
+        elif asset is None:
+            response = PlainTextResponse("Not Found", status_code=404)
+        else:
+            response = asset_response(asset, Headers(scope=scope))
+        await response(scope, receive, send)
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Query
 
+from app.api.routing import TracedRoute
 from app.models.asset import Asset
 from app.services.asset_universe import get_default_universe
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 
 
 @router.get("/assets", response_model=list[Asset])
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+
+from app.api.routing import TracedRoute
+from app.api.v1.endpoints.rates import require_admin
+from app.services.tracing import tracer
+
+router = APIRouter(route_class=TracedRoute)
+
+
+@router.get("/debug/traces", dependencies=[Depends(require_admin)])
+def get_traces() -> dict:
+    """보관 중인 요청 추적을 Chrome Trace Event 형식으로 반환한다 (Perfetto, chrome://tracing에서 열람)."""
+    return tracer.chrome_trace()
+
+
+@router.delete("/debug/traces", status_code=204, dependencies=[Depends(require_admin)])
+def clear_traces() -> None:
+    """보관 중인 요청 추적을 비운다."""
+    tracer.clear()
@@ -1,10 +1,11 @@
 from fastapi import APIRouter
 
+from app.api.routing import TracedRoute
 from app.models.gap import GapAnalysisResult
 from app.models.goal import GoalInput
 from app.services.gap_analyzer import analyze_gap
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 
 
 @router.post("/gap-analysis", response_model=GapAnalysisResult)
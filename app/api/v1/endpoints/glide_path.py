@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+
+from app.api.routing import TracedRoute
+from app.models.glide_path import GlidePathRequest, GlidePathResult
+from app.services.glide_path import optimize_glide_path
+
+router = APIRouter(route_class=TracedRoute)
+
+
+@router.post("/glide-path", response_model=GlidePathResult)
+def glide_path(req: GlidePathRequest) -> GlidePathResult:
+    """잔여 기간에 맞춰 구간별(월/연) 배분이 바뀌는 글라이드 패스를 반환한다."""
+    return optimize_glide_path(req)
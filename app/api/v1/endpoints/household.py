@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+
+from app.api.routing import TracedRoute
+from app.models.household import HouseholdInput, HouseholdResult
+from app.services.household import optimize_household
+
+router = APIRouter(route_class=TracedRoute)
+
+
+@router.post("/household/optimize", response_model=HouseholdResult)
+def household_optimize(household: HouseholdInput) -> HouseholdResult:
+    """가구의 여러 목표에 하나의 월 예산과 상품 한도를 배분한다."""
+    return optimize_household(household)
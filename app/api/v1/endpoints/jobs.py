@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Body, HTTPException
+
+from app.api.routing import TracedRoute
+from app.api.v1.endpoints.optimize import optimize
+from app.api.v1.endpoints.simulate import simulate
+from app.models.jobs import JobInfo, JobRequest, OptimizationJob, SimulationJob
+from app.models.portfolio import OptimizationResult
+from app.models.simulation import SimulationResponse
+from app.services.jobs import JobContext, QueueFullError, job_manager
+
+router = APIRouter(route_class=TracedRoute)
+
+SCENARIO_CHUNK = 256  # 진행률 보고·취소 확인 단위
+
+
+def _run_simulation(job: SimulationJob, ctx: JobContext) -> SimulationResponse:
+    """시나리오를 묶음별로 /simulate와 같은 파이프라인에 넣는다."""
+    req = job.request
+    if not req.scenarios:
+        return simulate(req)
+    chunks = [req.scenarios[i:i + SCENARIO_CHUNK] for i in range(0, len(req.scenarios), SCENARIO_CHUNK)]
+    results = []
+    for k, chunk in enumerate(chunks):
+        ctx.progress(k, len(chunks))
+        response = simulate(req.model_copy(update={"scenarios": chunk}))
+        results.extend(response.results)
+    ctx.progress(len(chunks), len(chunks))
+    return SimulationResponse(base_rate=response.base_rate, results=results)
+
+
+def _run_optimization(job: OptimizationJob, ctx: JobContext) -> list[OptimizationResult]:
+    """목표마다 /optimize 파이프라인을 실행한다."""
+    results = []
+    for i, goal in enumerate(job.goals):
+        ctx.progress(i, len(job.goals))
+        results.append(optimize(goal))
+    return results
+
+
+@router.post("/jobs", response_model=JobInfo, status_code=202)
+def submit_job(job: JobRequest = Body(...)) -> JobInfo:
+    """시뮬레이션/최적화 작업을 큐에 넣고 작업 ID를 바로 반환한다."""
+    runner = _run_simulation if isinstance(job, SimulationJob) else _run_optimization
+    try:
+        return job_manager.submit(job.kind, lambda ctx: runner(job, ctx))
+    except QueueFullError as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"}) from exc
+
+
+@router.get("/jobs/{job_id}", response_model=JobInfo)
+def get_job(job_id: str) -> JobInfo:
+    """작업 상태, 진행률, 결과를 조회한다. 만료되었거나 없는 ID는 404."""
+    info = job_manager.get(job_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다 (만료되었거나 없는 ID).")
+    return info
+
+
+@router.delete("/jobs/{job_id}", response_model=JobInfo)
+def cancel_job(job_id: str) -> JobInfo:
+    """작업 취소를 요청한다. 실행 중이면 다음 단위 작업 전에 멈춘다."""
+    info = job_manager.cancel(job_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다 (만료되었거나 없는 ID).")
+    return info
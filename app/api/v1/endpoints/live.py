@@ -0,0 +1,133 @@
+"""실시간 재계산 채널 (WebSocket /api/v1/live).
+
+클라이언트는 입력이 바뀔 때마다 {"seq": n, "goal": {...}}를 보내고,
+서버는 갭 분석 → 최적화 → 시뮬레이션 결과를 단계가 끝날 때마다 {"seq", "phase", "data"}로 밀어 준다.
+- 디바운스: 마지막 갱신 후 settings.live_debounce_ms 동안 새 갱신이 없을 때만 계산을 시작한다
+- 취소: 계산 중 새 갱신이 오면 진행 중인 단계가 끝나는 즉시 나머지 단계를 버리고 "cancelled"를 보낸다
+  (단계 하나는 작업 스레드에서 끝까지 실행되지만, 뒤 단계의 CPU는 쓰지 않는다)
+갱신마다 그 시점의 최신 금리 스냅샷에 고정해 계산한다.
+"""
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, ValidationError
+
+from app.api.v1.endpoints.optimize import optimize_goal
+from app.api.v1.endpoints.simulate import simulate_goal
+from app.config import settings
+from app.models.live import LiveMessage, LiveUpdate
+from app.models.simulation import SimulationResponse
+from app.services.gap_analyzer import analyze_gap
+from app.services.rate_store import pinned
+
+router = APIRouter()
+
+
+class _Latest:
+    """가장 최근 갱신 하나만 보관한다 (계산 전의 갱신은 덮어쓴다)."""
+
+    def __init__(self):
+        self.raw: Any = None
+        self.changed = asyncio.Event()
+        self.closed = False
+
+    def put(self, raw: Any) -> None:
+        self.raw = raw
+        self.changed.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self.changed.set()
+
+    async def debounced(self, delay: float) -> Any:
+        """새 갱신을 기다린 뒤 delay초 동안 조용해지면 마지막 갱신을 반환한다 (연결이 끊기면 None)."""
+        await self.changed.wait()
+        while not self.closed:
+            self.changed.clear()
+            try:
+                await asyncio.wait_for(self.changed.wait(), delay)
+            except TimeoutError:
+                return self.raw
+        return None
+
+
+async def _receive(websocket: WebSocket, latest: _Latest) -> None:
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                latest.put(json.loads(text))
+            except ValueError:
+                latest.put(text)  # 검증 단계에서 오류로 알린다
+    except WebSocketDisconnect:
+        pass
+    finally:
+        latest.close()
+
+
+async def _send(
+    websocket: WebSocket, seq: int | None, phase: str, version: int | None = None, data: Any = None
+) -> None:
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json")
+    message = LiveMessage(seq=seq, phase=phase, rate_snapshot_version=version, data=data)
+    await websocket.send_json(message.model_dump(mode="json"))
+
+
+async def _recompute(websocket: WebSocket, latest: _Latest, raw: Any) -> None:
+    seq = raw.get("seq") if isinstance(raw, dict) else None
+    try:
+        goal = LiveUpdate.model_validate(raw).goal
+    except ValidationError as exc:
+        await _send(websocket, seq, "error", data=exc.errors(include_url=False, include_context=False))
+        return
+
+    results: dict[str, Any] = {}
+
+    def simulate() -> SimulationResponse:
+        # 최적화 단계의 포트폴리오를 재사용한다 (배분이 없으면 /simulate와 같이 다시 구한다)
+        portfolio = results["optimize"]
+        return simulate_goal(goal, results["gap"], portfolio=portfolio if portfolio.allocations else None)
+
+    phases: list[tuple[str, Callable[[], Any]]] = [
+        ("gap", lambda: analyze_gap(goal)),
+        ("optimize", lambda: optimize_goal(goal, results["gap"])),
+        ("simulate", simulate),
+    ]
+    with pinned() as snapshot:
+        for phase, compute in phases:
+            if latest.changed.is_set():
+                await _send(websocket, seq, "cancelled", snapshot.version)
+                return
+            try:
+                results[phase] = await asyncio.to_thread(compute)
+            except Exception as exc:  # 계산 오류는 채널을 닫지 않고 알린다
+                await _send(websocket, seq, "error", snapshot.version, f"{type(exc).__name__}: {exc}")
+                return
+            if not latest.changed.is_set():
+                await _send(websocket, seq, phase, snapshot.version, results[phase])
+        if latest.changed.is_set():
+            await _send(websocket, seq, "cancelled", snapshot.version)
+            return
+        await _send(websocket, seq, "done", snapshot.version)
+
+
+@router.websocket("/live")
+async def live(websocket: WebSocket) -> None:
+    """목표 갱신 스트림을 디바운스해 단계별 결과를 밀어 준다."""
+    await websocket.accept()
+    latest = _Latest()
+    receiver = asyncio.create_task(_receive(websocket, latest))
+    try:
+        while True:
+            raw = await latest.debounced(settings.live_debounce_ms / 1000)
+            if latest.closed:
+                break
+            await _recompute(websocket, latest, raw)
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # 전송 중 연결이 끊김
+    finally:
+        receiver.cancel()
@@ -1,19 +1,32 @@
 from fastapi import APIRouter
 
+from app.api.routing import TracedRoute
+from app.models.cvar import CVaROptimizationResult, CVaRRequest
+from app.models.gap import GapAnalysisResult
 from app.models.goal import GoalInput
-from app.models.portfolio import OptimizationResult
+from app.models.goal_solver import GoalSolution
+from app.models.portfolio import BasisCacheStats, OptimizationResult
+from app.models.robust import RobustOptimizationResult, RobustRequest
 from app.services.asset_universe import get_default_universe
+from app.services.basis_cache import basis_cache
+from app.services.cvar import optimize_cvar
 from app.services.gap_analyzer import analyze_gap
-from app.services.optimizer import optimize_portfolio
+from app.services.goal_solver import solve_goal, suggestion_message
+from app.services.lp_index import quote_portfolio
+from app.services.probability import allocation_weights, plan_success_probability
+from app.services.robust import optimize_robust
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 
 
 @router.post("/optimize", response_model=OptimizationResult)
 def optimize(goal: GoalInput) -> OptimizationResult:
     """Phase 1~4 전체 파이프라인: 목표를 입력하면 최적 포트폴리오를 반환한다."""
-    gap_result = analyze_gap(goal)
+    return optimize_goal(goal, analyze_gap(goal))
 
+
+def optimize_goal(goal: GoalInput, gap_result: GapAnalysisResult) -> OptimizationResult:
+    """갭 분석 이후 단계 (Phase 2~4). 실시간 채널이 갭 분석 결과를 재사용한다."""
     if not gap_result.optimization_needed:
         return OptimizationResult(
             success=True,
@@ -24,6 +37,8 @@ def optimize(goal: GoalInput) -> OptimizationResult:
             message="안전자산만으로 목표 달성 가능합니다.",
         )
 
+    assets = get_default_universe(goal.eligible_youth_savings)
+
     # 목표 달성이 수학적으로 불가능한 경우
     if not gap_result.goal_achievable:
         return OptimizationResult(
@@ -32,17 +47,45 @@ def optimize(goal: GoalInput) -> OptimizationResult:
             portfolio_duration=0.0,
             portfolio_return=0.0,
             expected_future_value=0.0,
-            message=(
-                "목표 달성이 불가능합니다. "
-                "월 저축액을 늘리거나, 목표 기간을 연장하거나, "
-                "목표 금액을 낮춰주세요."
-            ),
+            message="목표 달성이 불가능합니다. " + suggestion_message(solve_goal(goal, assets)),
         )
 
-    assets = get_default_universe(goal.eligible_youth_savings)
-
-    return optimize_portfolio(
+    result = quote_portfolio(
         assets=assets,
         goal=goal,
         required_return=gap_result.required_annual_return,
     )
+    if result.allocations:
+        weights = allocation_weights(assets, result.allocations)
+        result.success_probability = round(plan_success_probability(assets, weights, goal), 4)
+    if not result.success:
+        result.message = f"{result.message} {suggestion_message(solve_goal(goal, assets))}"
+    return result
+
+
+@router.get("/optimize/basis-cache", response_model=BasisCacheStats)
+def basis_cache_stats() -> BasisCacheStats:
+    """최적 기저 캐시의 크기와 적중률을 반환한다."""
+    return BasisCacheStats(**basis_cache.stats())
+
+
+@router.post("/goal-solver", response_model=GoalSolution)
+def goal_solver(goal: GoalInput) -> GoalSolution:
+    """목표 역산: 최소 월 저축액, 최소 목표 기간, 최대 달성 가능 목표 금액을 반환한다."""
+    return solve_goal(goal)
+
+
+@router.post("/optimize/cvar", response_model=CVaROptimizationResult)
+def optimize_with_cvar(req: CVaRRequest) -> CVaROptimizationResult:
+    """금리 시나리오별 목표 부족액의 CVaR를 제한하는 최적 포트폴리오를 반환한다."""
+    assets = get_default_universe(req.eligible_youth_savings)
+    return optimize_cvar(assets, req)
+
+
+@router.post("/optimize/robust", response_model=RobustOptimizationResult)
+def optimize_with_robust(req: RobustRequest) -> RobustOptimizationResult:
+    """수익률 불확실성 집합(box/budget)의 최악 수익률로 필요 수익률을 맞추는 강건 포트폴리오를 반환한다."""
+    gap_result = analyze_gap(req)
+    assets = get_default_universe(req.eligible_youth_savings)
+    required = gap_result.required_annual_return if gap_result.optimization_needed else None
+    return optimize_robust(assets, req, required_return=required)
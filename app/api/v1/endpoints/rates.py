@@ -0,0 +1,57 @@
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.api.routing import TracedRoute
+from app.config import settings
+from app.models.rates import RateSnapshotInfo, RateSnapshotInput
+from app.services.rate_store import RateSnapshot, current_snapshot, rate_store
+
+router = APIRouter(route_class=TracedRoute)
+
+
+def _info(snapshot: RateSnapshot) -> RateSnapshotInfo:
+    return RateSnapshotInfo(
+        version=snapshot.version,
+        created_at=snapshot.created_at,
+        source=snapshot.source,
+        base_interest_rate=snapshot.base_interest_rate,
+        gross_returns=dict(snapshot.gross_returns),
+    )
+
+
+def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    """X-Admin-Token 헤더를 settings.admin_token과 비교한다 (설정되지 않으면 관리자 API 비활성)."""
+    if settings.admin_token is None:
+        raise HTTPException(status_code=403, detail="관리자 API가 비활성화되어 있습니다.")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다.")
+
+
+@router.get("/rates", response_model=RateSnapshotInfo)
+def get_rates() -> RateSnapshotInfo:
+    """이 요청에 고정된 금리 스냅샷을 조회한다."""
+    return _info(current_snapshot())
+
+
+@router.get("/rates/history", response_model=list[RateSnapshotInfo])
+def get_rate_history() -> list[RateSnapshotInfo]:
+    """보관 중인 최근 금리 스냅샷 (오래된 순)."""
+    return [_info(s) for s in rate_store.history()]
+
+
+@router.put("/admin/rates", response_model=RateSnapshotInfo, dependencies=[Depends(require_admin)])
+def publish_rates(req: RateSnapshotInput) -> RateSnapshotInfo:
+    """새 금리 스냅샷을 발행한다. 진행 중인 요청은 이전 스냅샷으로 끝난다."""
+    return _info(rate_store.publish(req.base_interest_rate, req.gross_returns, req.source))
+
+
+@router.post("/admin/rates/reload", response_model=RateSnapshotInfo, dependencies=[Depends(require_admin)])
+def reload_rates() -> RateSnapshotInfo:
+    """settings.rate_snapshot_path 파일을 다시 읽어 발행한다."""
+    if not settings.rate_snapshot_path:
+        raise HTTPException(status_code=404, detail="금리 스냅샷 파일이 설정되지 않았습니다.")
+    try:
+        return _info(rate_store.load_file(settings.rate_snapshot_path))
+    except (OSError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail=f"금리 스냅샷 파일을 읽을 수 없습니다: {exc}") from exc
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+
+from app.api.routing import TracedRoute
+from app.models.rebalance import RebalanceRequest, RebalanceResponse
+from app.services.rebalancer import rebalance_accounts
+
+router = APIRouter(route_class=TracedRoute)
+
+
+@router.post("/rebalance", response_model=RebalanceResponse)
+def rebalance(req: RebalanceRequest) -> RebalanceResponse:
+    """보유 자산이 있는 계좌들의 증분 거래(매수/매도)를 한 번에 계산한다."""
+    return RebalanceResponse(results=rebalance_accounts(req.accounts))
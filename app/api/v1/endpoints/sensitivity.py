@@ -0,0 +1,23 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Header, Response
+
+from app.api.columnar import COLUMNAR_RESPONSES, ColumnarResponse, columnar, wants_columnar
+from app.api.routing import TracedRoute
+from app.models.sensitivity import SensitivityGridRequest, SensitivityGridResult
+from app.services.sensitivity import compute_sensitivity_grid, sensitivity_grid_arrays
+
+router = APIRouter(route_class=TracedRoute)
+
+
+@router.post("/sensitivity-grid", response_model=SensitivityGridResult, responses=COLUMNAR_RESPONSES)
+def sensitivity_grid(
+    req: SensitivityGridRequest, accept: Annotated[str | None, Header()] = None
+) -> SensitivityGridResult | Response:
+    """What-if 격자: 월 저축액 × 목표 기간 전체의 필요 수익률과 최적 수익률을 반환한다.
+
+    Accept: application/vnd.msgpack이면 격자를 (월 저축액, 목표 기간) 모양의 배열로 담은 msgpack으로 응답한다.
+    """
+    if wants_columnar(accept):
+        return ColumnarResponse(columnar(sensitivity_grid_arrays(req)._asdict()))
+    return compute_sensitivity_grid(req)
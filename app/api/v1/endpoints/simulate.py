@@ -1,19 +1,37 @@
-from fastapi import APIRouter
+from typing import Annotated
 
+from fastapi import APIRouter, Header, Response
+
+from app.api.columnar import COLUMNAR_RESPONSES, ColumnarResponse, columnar, wants_columnar
+from app.api.routing import TracedRoute
+from app.models.asset import Asset
+from app.models.gap import GapAnalysisResult
 from app.models.goal import GoalInput
 from app.models.portfolio import OptimizationResult
-from app.models.simulation import SimulationRequest, SimulationResponse
+from app.models.simulation import (
+    RateScenario,
+    RollingSimulationRequest,
+    RollingSimulationResponse,
+    SimulationRequest,
+    SimulationResponse,
+)
 from app.services.asset_universe import get_default_universe
 from app.services.gap_analyzer import analyze_gap
 from app.services.optimizer import optimize_portfolio
-from app.services.simulator import simulate_scenarios
+from app.services.rolling import simulate_rolling
+from app.services.simulator import ScenarioColumns, scenario_columns, scenario_response
+
+router = APIRouter(route_class=TracedRoute)
 
-router = APIRouter()
 
+@router.post("/simulate", response_model=SimulationResponse, responses=COLUMNAR_RESPONSES)
+def simulate(
+    req: SimulationRequest, accept: Annotated[str | None, Header()] = None
+) -> SimulationResponse | Response:
+    """Section 5: 금리 변동 시뮬레이션을 수행한다.
 
-@router.post("/simulate", response_model=SimulationResponse)
-def simulate(req: SimulationRequest) -> SimulationResponse:
-    """Section 5: 금리 변동 시뮬레이션을 수행한다."""
+    Accept: application/vnd.msgpack이면 시나리오별 열을 형식 있는 배열로 담은 msgpack으로 응답한다.
+    """
     goal = GoalInput(
         goal_amount=req.goal_amount,
         time_horizon_months=req.time_horizon_months,
@@ -23,11 +41,56 @@ def simulate(req: SimulationRequest) -> SimulationResponse:
     )
 
     gap_result = analyze_gap(goal)
+    if wants_columnar(accept):
+        columns = simulation_columns(goal, gap_result, req.scenarios)
+        return ColumnarResponse(columnar(
+            {
+                "label": columns.labels,
+                "rate_shift": columns.rate_shift,
+                "new_rate": columns.new_rate.round(4),
+                "simple_savings_fv": columns.simple_savings_fv.round(0),
+                "portfolio_fv": columns.portfolio_fv.round(0),
+                "difference": (columns.portfolio_fv - columns.simple_savings_fv).round(0),
+            },
+            base_rate=columns.base_rate,
+        ))
+    return simulate_goal(goal, gap_result, req.scenarios)
+
+
+def simulate_goal(
+    goal: GoalInput,
+    gap_result: GapAnalysisResult,
+    scenarios: list[RateScenario] | None = None,
+    portfolio: OptimizationResult | None = None,
+) -> SimulationResponse:
+    """갭 분석 이후의 시뮬레이션. portfolio가 주어지면 다시 최적화하지 않는다."""
+    return scenario_response(simulation_columns(goal, gap_result, scenarios, portfolio))
+
+
+def simulation_columns(
+    goal: GoalInput,
+    gap_result: GapAnalysisResult,
+    scenarios: list[RateScenario] | None = None,
+    portfolio: OptimizationResult | None = None,
+) -> ScenarioColumns:
     assets = get_default_universe(goal.eligible_youth_savings)
 
+    if portfolio is None:
+        portfolio = _simulation_portfolio(goal, gap_result, assets)
+    return scenario_columns(
+        goal=goal,
+        portfolio=portfolio,
+        assets=assets,
+        scenarios=scenarios,
+    )
+
+
+def _simulation_portfolio(
+    goal: GoalInput, gap_result: GapAnalysisResult, assets: list[Asset]
+) -> OptimizationResult:
     # 최적화 불가능해도 시뮬레이션은 수행 (빈 포트폴리오로 비교)
     if not gap_result.goal_achievable:
-        portfolio = OptimizationResult(
+        return OptimizationResult(
             success=False,
             allocations=[],
             portfolio_duration=0.0,
@@ -35,16 +98,14 @@ def simulate(req: SimulationRequest) -> SimulationResponse:
             expected_future_value=0.0,
             message="목표 달성 불가",
         )
-    else:
-        portfolio = optimize_portfolio(
-            assets=assets,
-            goal=goal,
-            required_return=gap_result.required_annual_return,
-        )
-
-    return simulate_scenarios(
-        goal=goal,
-        portfolio=portfolio,
+    return optimize_portfolio(
         assets=assets,
-        scenarios=req.scenarios,
+        goal=goal,
+        required_return=gap_result.required_annual_return,
     )
+
+
+@router.post("/simulate/rolling", response_model=RollingSimulationResponse)
+def simulate_rolling_horizon(req: RollingSimulationRequest) -> RollingSimulationResponse:
+    """금리 경로별로 매 주기 재최적화하는 롤링 시뮬레이션의 목표 달성 확률을 반환한다."""
+    return simulate_rolling(req)
@@ -1,9 +1,30 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import assets, gap, optimize, simulate
+from app.api.v1.endpoints import (
+    assets,
+    debug,
+    gap,
+    glide_path,
+    household,
+    jobs,
+    live,
+    optimize,
+    rates,
+    rebalance,
+    sensitivity,
+    simulate,
+)
 
 router = APIRouter(prefix="/api/v1")
 router.include_router(gap.router, tags=["gap-analysis"])
 router.include_router(assets.router, tags=["assets"])
 router.include_router(optimize.router, tags=["optimize"])
 router.include_router(simulate.router, tags=["simulate"])
+router.include_router(sensitivity.router, tags=["sensitivity"])
+router.include_router(household.router, tags=["household"])
+router.include_router(glide_path.router, tags=["glide-path"])
+router.include_router(rebalance.router, tags=["rebalance"])
+router.include_router(rates.router, tags=["rates"])
+router.include_router(jobs.router, tags=["jobs"])
+router.include_router(live.router, tags=["live"])
+router.include_router(debug.router, tags=["debug"])
@@ -0,0 +1,79 @@
+"""고객 목표 파일 일괄 계획 (python -m app.batch).
+
+고객 장부 전체를 HTTP를 거치지 않고 다시 계획한다. 행마다 /optimize·/simulate와 같은 파이프라인
+(갭 분석 → 최적화 → 금리 시나리오 시뮬레이션)을 실행해 JSON Lines로 쓴다.
+입력 열은 GoalInput 필드 이름을 쓰고, 그 밖의 열(고객 번호 등)은 결과의 "extra"에 그대로 담는다.
+
+    python -m app.batch customers.csv -o plans.jsonl --workers 8
+    python -m app.batch customers.csv -o plans.jsonl --resume    # 중단된 실행을 이어서
+"""
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import click
+
+from app.api.v1.endpoints.optimize import optimize_goal
+from app.api.v1.endpoints.simulate import simulate_goal
+from app.models.goal import GoalInput
+from app.services.batch import BatchError, BatchProgress, run_batch
+from app.services.gap_analyzer import analyze_gap
+
+_GOAL_FIELDS = frozenset(GoalInput.model_fields)
+
+
+def plan_row(fields: dict[str, Any]) -> dict[str, Any]:
+    """입력 한 행의 갭 분석, 최적 포트폴리오, 기본 금리 시나리오 시뮬레이션."""
+    goal = GoalInput.model_validate({k: v for k, v in fields.items() if k in _GOAL_FIELDS})
+    gap = analyze_gap(goal)
+    portfolio = optimize_goal(goal, gap)
+    simulation = simulate_goal(goal, gap, portfolio=portfolio if portfolio.allocations else None)
+    return {
+        "extra": {k: v for k, v in fields.items() if k not in _GOAL_FIELDS},
+        "gap": gap,
+        "optimization": portfolio,
+        "simulation": simulation,
+    }
+
+
+def format_progress(p: BatchProgress) -> str:
+    done = f"{p.rows:,}/{p.total:,}행 ({p.rows / p.total:.1%})" if p.total else f"{p.rows:,}행"
+    speed = (p.rows - p.resumed_from) / p.elapsed if p.elapsed > 0 else 0.0
+    return f"{done}, {speed:,.0f}행/초, 실패 {p.failed:,}"
+
+
+@click.command()
+@click.argument("input_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path), required=True,
+              help="결과 JSON Lines 파일 (체크포인트는 <출력>.ckpt)")
+@click.option("-j", "--workers", default=os.cpu_count() or 1, show_default="CPU 수",
+              help="작업 프로세스 수 (1이면 현재 프로세스에서 실행)")
+@click.option("--chunk-size", default=500, show_default=True, help="한 번에 읽어 작업 프로세스에 넘기는 행 수")
+@click.option("--resume", is_flag=True, help="체크포인트부터 이어서 실행")
+@click.option("--overwrite", is_flag=True, help="기존 출력 파일을 지우고 처음부터 실행")
+@click.option("-q", "--quiet", is_flag=True, help="진행 상황을 출력하지 않는다")
+def main(
+    input_path: Path, output: Path, workers: int, chunk_size: int, resume: bool, overwrite: bool, quiet: bool
+) -> None:
+    """CSV/Parquet 고객 목표 파일을 일괄 계획해 JSON Lines로 쓴다."""
+    last = 0.0
+
+    def report(p: BatchProgress) -> None:
+        nonlocal last
+        if not quiet and time.monotonic() - last >= 1.0:  # 초당 한 줄까지만
+            last = time.monotonic()
+            click.echo(format_progress(p), err=True)
+
+    try:
+        summary = run_batch(
+            input_path, output, plan_row, chunk_size=chunk_size, workers=workers,
+            resume=resume, overwrite=overwrite, progress=report,
+        )
+    except BatchError as exc:
+        raise click.ClickException(str(exc)) from exc
+    click.echo(f"완료: {format_progress(summary)} → {output}")
+
+
+if __name__ == "__main__":
+    main()
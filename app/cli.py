@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import click
+
+from app.config import settings
+
+
+@click.group()
+def cli() -> None:
+    """GBI 로보 어드바이저 관리 도구."""
+
+
+@cli.command("build-index")
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="인덱스 파일 경로 (기본값: GBI_LP_INDEX_PATH)")
+@click.option("--max-months", default=600, show_default=True, help="최대 목표 기간 (개월)")
+@click.option("--contribution-points", default=256, show_default=True,
+              help="월 저축액 격자 점 개수 (10만~1억 로그 간격)")
+def build_index_command(output: Path | None, max_months: int, contribution_points: int) -> None:
+    """목표 기간 × 월 저축액 격자의 최적 기저를 계산해 메모리 맵 인덱스로 저장한다."""
+    from app.services.lp_index import build_index, default_contribution_grid
+
+    if output is None:
+        if not settings.lp_index_path:
+            raise click.UsageError("--output 또는 GBI_LP_INDEX_PATH를 지정하세요.")
+        output = Path(settings.lp_index_path)
+
+    info = build_index(output, max_months, default_contribution_grid(contribution_points))
+    click.echo(
+        f"{info['cells']:,}개 셀 저장: {info['path']} ({info['bytes']:,} bytes, "
+        f"실행 가능 셀: 일반 {info['feasible_false']:,}, 청년도약저축 자격 {info['feasible_true']:,})"
+    )
+
+
+if __name__ == "__main__":
+    cli()
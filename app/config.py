@@ -11,6 +11,7 @@ class Settings(BaseSettings):
     # 세율
     interest_income_tax_rate: float = 0.154  # 이자소득세 15.4%
     isa_separate_tax_rate: float = 0.099  # ISA 분리과세 9.9%
+    isa_tax_free_allowance: float = 200_0000  # ISA 순이익 비과세 한도 200만원 (초과분 분리과세)
 
     # 청년도약저축
     youth_savings_monthly_limit: float = 70_0000  # 월 70만원
@@ -20,6 +21,53 @@ class Settings(BaseSettings):
     # ISA
     isa_annual_limit: float = 2000_0000  # 연 2,000만원
 
+    # 리밸런싱
+    rebalance_max_turnover: float = 0.2  # 월 매도 한도 (보유 자산 대비)
+    deposit_early_termination_penalty: float = 0.01  # 예금/ISA 중도해지 비용 (해지 금액 대비)
+    youth_savings_early_termination_penalty: float = 0.04  # 청년도약저축 중도해지 (정부 기여금 상실)
+
+    # 강건 최적화: 세전 수익률 편차 기본값 (듀레이션 1년당)
+    robust_uncertainty_per_duration: float = 0.002
+
+    # 사전 계산 LP 인덱스 파일 (python -m app.cli build-index로 생성, 없으면 항상 솔버 사용)
+    lp_index_path: str | None = None
+
+    # 실행 불가능 시 탄력 LP의 제약 위반 가중치
+    elastic_duration_weight: float = 1.0  # 듀레이션 밴드 위반 1년당
+    elastic_return_weight: float = 100.0  # 필요 수익률 미달 1%p당 1
+
+    # 목표 달성 확률 근사: 금리 수준 변동 표준편차
+    success_rate_volatility: float = 0.01
+
+    # 금리 스냅샷: 시작 시 읽을 JSON 파일과 보관할 이전 버전 수
+    rate_snapshot_path: str | None = None
+    rate_snapshot_history: int = 16
+
+    # 관리자 API 토큰 (X-Admin-Token 헤더, 없으면 관리자 API 비활성)
+    admin_token: str | None = None
+
+    # 비동기 작업: 작업 스레드 수, 대기 + 실행 중 작업 상한, 완료 결과 보관 시간 (초)
+    job_workers: int = 2
+    job_queue_size: int = 32
+    job_result_ttl: float = 600.0
+
+    # 실시간 재계산 채널: 마지막 입력 후 계산을 시작하기까지 기다리는 시간 (밀리초)
+    live_debounce_ms: int = 150
+
+    # 요청 추적: 보관할 최근 요청 수 (0이면 비활성), 항상 남길 지연 기준 (밀리초), 나머지 요청의 표본 비율
+    trace_buffer_size: int = 256
+    trace_slow_ms: float = 250.0
+    trace_sample_rate: float = 0.01
+
+    # 워커 간 공유 결과 캐시 (analyze_gap / optimize_portfolio): 메모리 맵 파일 경로 (없으면 비활성),
+    # 슬롯 수와 슬롯 크기 (바이트, 직렬화 결과가 이보다 크면 캐시하지 않는다)
+    shared_cache_path: str | None = None
+    shared_cache_slots: int = 4096
+    shared_cache_slot_size: int = 4096
+
+    # 최적 기저 캐시 크기 (자산 유니버스당 기저 개수, 0이면 비활성)
+    basis_cache_size: int = 256
+
     model_config = {"env_prefix": "GBI_"}
 
 
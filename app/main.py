@@ -1,28 +1,55 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
 from pathlib import Path
 
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import Response
+from jinja2 import Environment, FileSystemLoader
 
+from app.api.middleware import RateSnapshotMiddleware, TracingMiddleware
+from app.api.static_assets import Asset, StaticAssets, asset_response, make_asset
 from app.api.v1.router import router as v1_router
+from app.services.jobs import job_manager
 
 BASE_DIR = Path(__file__).resolve().parent
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    job_manager.shutdown()  # 대기 작업은 버리고 실행 중인 작업은 다음 진행 보고에서 멈춘다
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title="GBI 로보 어드바이저",
         description="듀레이션 매칭 기반 사회초년생 맞춤 로보 어드바이저 엔진",
         version="0.1.0",
+        lifespan=lifespan,
     )
+    app.add_middleware(RateSnapshotMiddleware)
+    app.add_middleware(TracingMiddleware)  # 바깥쪽: 스냅샷 고정까지 포함해 잰다
     app.include_router(v1_router)
-    app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
 
-    templates = Jinja2Templates(directory=BASE_DIR / "templates")
+    # 정적 자산과 인덱스 페이지는 시작 시 한 번 해시·압축해 두고 요청마다 그대로 보낸다
+    assets = StaticAssets(BASE_DIR / "static", prefix="/static")
+    app.mount(assets.prefix, assets, name="static")
+
+    templates = Environment(loader=FileSystemLoader(BASE_DIR / "templates"), autoescape=True)
+    template = templates.get_template("index.html")
+
+    @lru_cache(maxsize=16)
+    def index_page(root_path: str) -> Asset:
+        # 자산 URL에 프록시 경로 접두사(root_path)가 들어가므로 접두사마다 한 번 렌더링한다
+        page = template.render(static_url=partial(assets.url, root_path=root_path))
+        return make_asset(page.encode(), "text/html")
+
+    index_page(app.root_path)
 
     @app.get("/", include_in_schema=False)
-    def index(request: Request):
-        return templates.TemplateResponse("index.html", {"request": request})
+    def index(request: Request) -> Response:
+        return asset_response(index_page(request.scope.get("root_path", "")), request.headers)
 
     return app
 
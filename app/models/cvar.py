@@ -0,0 +1,29 @@
+from pydantic import Field
+
+from app.models.goal import GoalInput
+from app.models.portfolio import OptimizationResult
+from app.models.simulation import RateScenario
+
+
+class CVaRRequest(GoalInput):
+    scenarios: list[RateScenario] | None = Field(
+        default=None, max_length=20_000, description="금리 시나리오 (None이면 정규분포로 생성)"
+    )
+    n_scenarios: int = Field(default=2000, ge=10, le=20_000, description="생성할 시나리오 수")
+    rate_volatility: float = Field(default=0.01, ge=0, le=0.05, description="생성 시나리오의 금리 변동 표준편차")
+    seed: int | None = Field(default=None, description="난수 시드 (재현용)")
+    confidence: float = Field(default=0.95, gt=0.5, lt=1, description="CVaR 신뢰수준 α")
+    max_shortfall: float = Field(
+        default=0, ge=0, description="허용 기대 부족액 한도 (원): 하위 (1-α) 시나리오의 평균 목표 부족액"
+    )
+
+
+class CVaROptimizationResult(OptimizationResult):
+    cvar_shortfall: float = Field(default=0.0, description="최적 포트폴리오의 CVaR 기대 부족액 (원)")
+    value_at_risk: float = Field(default=0.0, description="α 분위수 부족액 (원), 음수면 목표 초과")
+    shortfall_probability: float = Field(default=0.0, description="목표 미달 시나리오 비율")
+    n_scenarios: int = Field(default=0, description="시나리오 수")
+    n_variables: int = Field(default=0, description="LP 변수 수")
+    n_constraints: int = Field(default=0, description="LP 제약 수")
+    n_nonzeros: int = Field(default=0, description="제약 행렬 비영 원소 수")
+    solve_time_ms: float = Field(default=0.0, description="HiGHS 풀이 시간 (ms)")
@@ -1,6 +1,23 @@
 from pydantic import BaseModel, Field
 
 
+class GapSensitivities(BaseModel):
+    """갭 분석 결과의 입력별 해석적 도함수 (그릭스)."""
+
+    future_value_per_contribution: float = Field(..., description="∂안전자산 미래가치/∂월 저축액 (원/원)")
+    future_value_per_month: float = Field(..., description="∂안전자산 미래가치/∂목표 기간 (원/개월)")
+    future_value_per_rate: float = Field(..., description="∂안전자산 미래가치/∂안전 이율 (원, 연 수익률 1.0당)")
+    future_value_per_principal: float = Field(..., description="∂안전자산 미래가치/∂초기 자본 (원/원)")
+    required_return_per_contribution: float | None = Field(
+        default=None, description="∂필요 수익률/∂월 저축액 (원당)"
+    )
+    required_return_per_month: float | None = Field(default=None, description="∂필요 수익률/∂목표 기간 (개월당)")
+    required_return_per_goal: float | None = Field(default=None, description="∂필요 수익률/∂목표 금액 (원당)")
+    required_return_per_principal: float | None = Field(
+        default=None, description="∂필요 수익률/∂초기 자본 (원당)"
+    )
+
+
 class GapAnalysisResult(BaseModel):
     future_value_safe: float = Field(..., description="안전자산 적금 미래가치 (원)")
     goal_amount: float = Field(..., description="목표 금액 (원)")
@@ -13,3 +30,6 @@ class GapAnalysisResult(BaseModel):
         default=True,
         description="목표 달성 가능 여부 (100% 수익률로도 불가능하면 False)",
     )
+    sensitivities: GapSensitivities | None = Field(
+        default=None, description="입력별 해석적 도함수 (음함수 정리 기반 필요 수익률 민감도 포함)"
+    )
@@ -0,0 +1,33 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.models.goal import GoalInput
+from app.models.household import PrincipalAllocation
+from app.models.portfolio import AllocationItem
+
+
+class GlidePathRequest(GoalInput):
+    step_months: Literal[1, 12] = Field(
+        default=12, description="배분 변경 주기 (1: 월별, 12: 연별)"
+    )
+
+
+class GlidePathStep(BaseModel):
+    start_month: int = Field(..., description="구간 시작 월 (0부터)")
+    months: int = Field(..., description="구간 길이 (개월)")
+    remaining_years: float = Field(..., description="구간 시작 시점의 잔여 기간 (년)")
+    allocations: list[AllocationItem] = Field(..., description="구간 월 저축액의 자산별 배분")
+    portfolio_duration: float = Field(..., description="구간 포트폴리오 듀레이션 (년)")
+    portfolio_return: float = Field(..., description="구간 포트폴리오 가중 세후 수익률")
+
+
+class GlidePathResult(BaseModel):
+    success: bool
+    steps: list[GlidePathStep]
+    principal_allocations: list[PrincipalAllocation] = Field(
+        default_factory=list, description="초기 자본의 자산별 배분"
+    )
+    expected_future_value: float = Field(..., description="만기 예상 미래가치 (원)")
+    goal_achievable: bool = Field(default=False, description="예상 미래가치가 목표 금액 이상인지 여부")
+    message: str = Field(default="", description="결과 메시지")
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+
+class GoalSolution(BaseModel):
+    goal_achievable: bool = Field(..., description="현재 입력으로 목표 달성 가능 여부")
+    min_monthly_contribution: float = Field(
+        ..., description="현재 기간에서 목표를 달성하는 최소 월 저축액 (원)"
+    )
+    min_time_horizon_months: int | None = Field(
+        default=None, description="현재 월 저축액으로 목표를 달성하는 최소 기간 (개월), 불가능하면 null"
+    )
+    max_goal_amount: float = Field(
+        ..., description="현재 월 저축액과 기간으로 달성 가능한 최대 목표 금액 (원)"
+    )
@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+
+from app.models.asset import AssetClass
+from app.models.portfolio import AllocationItem
+
+
+class HouseholdGoal(BaseModel):
+    label: str = Field(..., description="목표 이름 (예: 비상금, 결혼자금)")
+    goal_amount: float = Field(..., gt=0, description="목표 금액 (원)")
+    time_horizon_months: int = Field(..., gt=0, description="목표 기간 (개월)")
+    initial_principal: float = Field(default=0, ge=0, description="이 목표에 배정된 초기 자본 (원)")
+
+
+class HouseholdInput(BaseModel):
+    goals: list[HouseholdGoal] = Field(..., min_length=1, description="가구의 재무 목표 목록")
+    monthly_budget: float = Field(..., gt=0, description="가구 전체 월 저축 가능액 (원)")
+    eligible_youth_savings: bool = Field(default=False, description="청년도약저축 가입 자격 여부")
+
+
+class PrincipalAllocation(BaseModel):
+    asset_class: AssetClass
+    name: str
+    amount: float = Field(..., ge=0, description="초기 자본 배분액 (원)")
+
+
+class GoalAllocation(BaseModel):
+    label: str
+    goal_amount: float
+    time_horizon_months: int
+    monthly_amount: float = Field(..., ge=0, description="이 목표에 배정된 월 저축액 (원)")
+    allocations: list[AllocationItem] = Field(..., description="월 저축액의 자산별 배분")
+    principal_allocations: list[PrincipalAllocation] = Field(
+        default_factory=list, description="초기 자본의 자산별 배분"
+    )
+    portfolio_duration: float = Field(..., description="월 저축 포트폴리오 듀레이션 (년)")
+    portfolio_return: float = Field(..., description="월 저축 포트폴리오 가중 세후 수익률")
+    expected_future_value: float = Field(..., description="예상 미래가치 (원)")
+
+
+class HouseholdResult(BaseModel):
+    success: bool
+    goals: list[GoalAllocation]
+    monthly_budget: float = Field(..., description="가구 월 저축 가능액 (원)")
+    budget_used: float = Field(..., description="배정된 월 저축액 합계 (원)")
+    message: str = Field(default="", description="결과 메시지")
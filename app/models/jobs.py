@@ -0,0 +1,45 @@
+from datetime import datetime
+from enum import Enum
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field
+
+from app.models.goal import GoalInput
+from app.models.portfolio import OptimizationResult
+from app.models.simulation import SimulationRequest, SimulationResponse
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class SimulationJob(BaseModel):
+    kind: Literal["simulate"] = "simulate"
+    request: SimulationRequest = Field(..., description="/simulate와 같은 입력 (시나리오 수 제한 없음)")
+
+
+class OptimizationJob(BaseModel):
+    kind: Literal["optimize"] = "optimize"
+    goals: list[GoalInput] = Field(..., min_length=1, max_length=10_000, description="/optimize를 실행할 목표 목록")
+
+
+JobRequest = Annotated[SimulationJob | OptimizationJob, Field(discriminator="kind")]
+
+
+class JobInfo(BaseModel):
+    id: str = Field(..., description="작업 ID")
+    kind: Literal["simulate", "optimize"]
+    status: JobStatus
+    progress: float = Field(..., ge=0, le=1, description="진행률 (완료한 단위 작업 비율)")
+    cancel_requested: bool = Field(default=False, description="취소 요청 여부 (실행 중이면 다음 단위 작업 전에 멈춘다)")
+    rate_snapshot_version: int = Field(..., description="작업에 고정된 금리 스냅샷 버전")
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    expires_at: datetime | None = Field(default=None, description="결과 보관 만료 시각 (완료 후 설정)")
+    error: str | None = None
+    result: SimulationResponse | list[OptimizationResult] | None = None
@@ -0,0 +1,19 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+from app.models.goal import GoalInput
+
+
+class LiveUpdate(BaseModel):
+    """실시간 채널로 보내는 목표 갱신. seq가 더 큰 갱신이 오면 이전 계산은 버린다."""
+
+    seq: int = Field(..., ge=0, description="클라이언트 갱신 번호 (증가)")
+    goal: GoalInput
+
+
+class LiveMessage(BaseModel):
+    seq: int | None = Field(..., description="응답 대상 갱신 번호")
+    phase: Literal["gap", "optimize", "simulate", "done", "cancelled", "error"]
+    rate_snapshot_version: int | None = Field(default=None, description="계산에 쓴 금리 스냅샷 버전")
+    data: Any = Field(default=None, description="단계 결과 (gap/optimize/simulate) 또는 오류 내용")
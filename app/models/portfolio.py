@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 from app.models.asset import AssetClass
@@ -12,6 +14,28 @@ class AllocationItem(BaseModel):
     after_tax_return: float = Field(..., description="세후 수익률")
 
 
+class ConstraintRelaxation(BaseModel):
+    constraint: Literal["duration_lower", "duration_upper", "required_return"]
+    limit: float = Field(..., description="원래 제약 값 (듀레이션은 년, 수익률은 연율)")
+    achieved: float = Field(..., description="완화된 계획에서의 값")
+    violation: float = Field(..., ge=0, description="완화량")
+
+
+class PlanSensitivities(BaseModel):
+    """최적 포트폴리오의 입력별 도함수 (최적 기저 고정, 실효 세후 수익률과 원장 미래가치 기준)."""
+
+    return_per_month: float = Field(..., description="∂세후 수익률/∂목표 기간 (개월당)")
+    return_per_epsilon: float = Field(..., description="∂세후 수익률/∂듀레이션 허용 오차 (년당)")
+    return_per_contribution: float = Field(..., description="∂세후 수익률/∂월 저축액 (원당, 상품 한도와 ISA 실효 수익률 경유)")
+    return_per_rate: float = Field(..., description="∂세후 수익률/∂금리 수준 (모든 자산 동일 폭 변동)")
+    future_value_per_month: float = Field(..., description="∂예상 미래가치/∂목표 기간 (원/개월)")
+    future_value_per_epsilon: float = Field(..., description="∂예상 미래가치/∂듀레이션 허용 오차 (원/년)")
+    future_value_per_contribution: float = Field(..., description="∂예상 미래가치/∂월 저축액 (원/원)")
+    future_value_per_rate: float = Field(..., description="∂예상 미래가치/∂금리 수준 (원, 연 수익률 1.0당)")
+    future_value_per_principal: float = Field(..., description="∂예상 미래가치/∂초기 자본 (원/원)")
+    duration_shadow_price: float = Field(..., description="활성 듀레이션 경계의 쌍대 가격 (년당 수익률)")
+
+
 class OptimizationResult(BaseModel):
     success: bool
     allocations: list[AllocationItem]
@@ -19,3 +43,19 @@ class OptimizationResult(BaseModel):
     portfolio_return: float = Field(..., description="포트폴리오 가중 세후 수익률")
     expected_future_value: float = Field(..., description="예상 미래가치 (원)")
     message: str = Field(default="", description="결과 메시지")
+    success_probability: float | None = Field(
+        default=None, description="금리 수준 변동을 반영한 목표 달성 확률 (해석적 근사)"
+    )
+    relaxations: list[ConstraintRelaxation] = Field(
+        default_factory=list, description="실행 불가능할 때 가장 가까운 계획을 위해 완화한 제약"
+    )
+    sensitivities: PlanSensitivities | None = Field(
+        default=None, description="입력별 도함수 (최적화 성공 시)"
+    )
+
+
+class BasisCacheStats(BaseModel):
+    entries: int = Field(..., description="캐시된 최적 기저 개수")
+    hits: int = Field(..., description="솔버 없이 역대입으로 응답한 횟수")
+    misses: int = Field(..., description="LP 솔버를 호출한 횟수")
+    hit_rate: float = Field(..., description="적중률")
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+from app.models.asset import AssetClass
+
+
+class RateSnapshotInput(BaseModel):
+    """새 금리 스냅샷. 지정하지 않은 값은 현재 스냅샷에서 이어받는다."""
+
+    base_interest_rate: float | None = Field(default=None, ge=0, le=1, description="기준 금리 (안전자산 이율)")
+    gross_returns: dict[AssetClass, Annotated[float, Field(gt=-1, le=1)]] = Field(
+        default_factory=dict,
+        description="상품별 세전 수익률 (청년도약저축은 정부 기여분 제외 상품 금리)",
+    )
+    source: str = Field(default="admin", max_length=200, description="출처 메모")
+
+
+class RateSnapshotInfo(BaseModel):
+    version: int = Field(..., description="스냅샷 버전 (발행 순서대로 1씩 증가)")
+    created_at: datetime = Field(..., description="발행 시각 (UTC)")
+    source: str = Field(..., description="출처 메모")
+    base_interest_rate: float = Field(..., description="기준 금리")
+    gross_returns: dict[AssetClass, float] = Field(..., description="상품별 세전 수익률")
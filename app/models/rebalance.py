@@ -0,0 +1,55 @@
+from pydantic import BaseModel, Field
+
+from app.models.asset import AssetClass
+
+
+class Holding(BaseModel):
+    asset_class: AssetClass
+    amount: float = Field(..., ge=0, description="현재 평가금액 (원)")
+    cost_basis: float | None = Field(
+        default=None, ge=0, description="취득원가 (원), 없으면 평가금액과 같다고 본다 (미실현 이익 0)"
+    )
+
+
+class RebalanceAccount(BaseModel):
+    account_id: str = Field(..., description="계좌 식별자")
+    time_horizon_months: int = Field(..., gt=0, description="목표까지 잔여 기간 (개월)")
+    monthly_contribution: float = Field(default=0, ge=0, description="이번 달 신규 납입액 (원)")
+    eligible_youth_savings: bool = Field(default=False, description="청년도약저축 가입 자격 여부")
+    holdings: list[Holding] = Field(default_factory=list, description="현재 보유 자산")
+    isa_contributed_this_year: float = Field(default=0, ge=0, description="올해 ISA 납입액 (원)")
+    max_turnover: float | None = Field(
+        default=None, ge=0, le=1, description="매도 한도 (보유 자산 대비 비율), 없으면 기본값"
+    )
+
+
+class RebalanceRequest(BaseModel):
+    accounts: list[RebalanceAccount] = Field(..., min_length=1, max_length=1000)
+
+
+class Trade(BaseModel):
+    asset_class: AssetClass
+    name: str
+    buy: float = Field(..., ge=0, description="매수(납입) 금액 (원)")
+    sell: float = Field(..., ge=0, description="매도(해지) 금액 (원)")
+    cost: float = Field(..., ge=0, description="매도에 따른 세금 + 중도해지 비용 (원)")
+
+
+class RebalanceResult(BaseModel):
+    account_id: str
+    success: bool
+    trades: list[Trade]
+    holdings_after: list[Holding] = Field(default_factory=list, description="거래 후 보유 자산")
+    duration_before: float = Field(..., description="거래 전 포트폴리오 듀레이션 (년)")
+    duration_after: float = Field(..., description="거래 후 포트폴리오 듀레이션 (년)")
+    duration_gap: float = Field(
+        default=0.0, description="매도 한도 때문에 남은 듀레이션 밴드 이탈폭 (년), 0이면 밴드 안"
+    )
+    portfolio_return_after: float = Field(..., description="거래 후 가중 세후 수익률")
+    turnover: float = Field(..., description="매도 금액 / 거래 전 보유 자산")
+    transaction_cost: float = Field(..., description="세금 + 중도해지 비용 합계 (원)")
+    message: str = Field(default="", description="결과 메시지")
+
+
+class RebalanceResponse(BaseModel):
+    results: list[RebalanceResult]
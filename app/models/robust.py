@@ -0,0 +1,24 @@
+from typing import Literal
+
+from pydantic import Field
+
+from app.models.asset import AssetClass
+from app.models.goal import GoalInput
+from app.models.portfolio import OptimizationResult
+
+
+class RobustRequest(GoalInput):
+    uncertainty_set: Literal["box", "budget"] = Field(
+        default="budget", description="수익률 불확실성 집합 (box: 모든 자산 동시 최악, budget: 최대 Γ개 자산만 최악)"
+    )
+    budget: float = Field(default=1.0, ge=0, description="budget 집합의 Γ (동시에 최악이 되는 자산 수)")
+    deviations: dict[AssetClass, float] | None = Field(
+        default=None, description="자산군별 세전 수익률 최대 편차 (None이면 듀레이션 비례 기본값)"
+    )
+
+
+class RobustOptimizationResult(OptimizationResult):
+    uncertainty_set: Literal["box", "budget"]
+    budget: float = Field(default=0.0, description="적용된 Γ")
+    worst_case_return: float = Field(default=0.0, description="불확실성 집합 내 최악의 세후 수익률")
+    worst_case_future_value: float = Field(default=0.0, description="최악 수익률 기준 미래가치 (원)")
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field, model_validator
+
+
+class SensitivityGridRequest(BaseModel):
+    goal_amount: float = Field(..., gt=0, description="목표 금액 (원)")
+    initial_principal: float = Field(default=0, ge=0, description="초기 자본 (원)")
+    eligible_youth_savings: bool = Field(default=False, description="청년도약저축 가입 자격 여부")
+    monthly_contribution_min: float = Field(..., gt=0, description="월 저축액 하한 (원)")
+    monthly_contribution_max: float = Field(..., gt=0, description="월 저축액 상한 (원)")
+    monthly_contribution_steps: int = Field(default=50, ge=1, le=200, description="월 저축액 격자 수")
+    time_horizon_min_months: int = Field(..., gt=0, description="목표 기간 하한 (개월)")
+    time_horizon_max_months: int = Field(..., gt=0, description="목표 기간 상한 (개월)")
+    time_horizon_steps: int = Field(default=60, ge=1, le=600, description="목표 기간 격자 수")
+
+    @model_validator(mode="after")
+    def _check_ranges(self) -> "SensitivityGridRequest":
+        if self.monthly_contribution_min > self.monthly_contribution_max:
+            raise ValueError("monthly_contribution_min이 monthly_contribution_max보다 큽니다.")
+        if self.time_horizon_min_months > self.time_horizon_max_months:
+            raise ValueError("time_horizon_min_months가 time_horizon_max_months보다 큽니다.")
+        return self
+
+
+class SensitivityGridResult(BaseModel):
+    """What-if 격자. 2차원 배열은 [월 저축액 인덱스][목표 기간 인덱스] 순서다."""
+
+    monthly_contributions: list[float] = Field(..., description="월 저축액 축 (원)")
+    time_horizons_months: list[int] = Field(..., description="목표 기간 축 (개월)")
+    optimization_needed: list[list[bool]] = Field(..., description="최적화 필요 여부")
+    required_annual_return: list[list[float | None]] = Field(
+        ..., description="목표 달성 최소 연 수익률 (불필요하거나 달성 불가능하면 null)"
+    )
+    portfolio_return: list[list[float | None]] = Field(
+        ..., description="듀레이션 매칭 최적 포트폴리오 세후 수익률 (제약 충족 불가면 null)"
+    )
+    feasible: list[list[bool]] = Field(..., description="목표 달성 가능 여부")
+    success_probability: list[list[float | None]] = Field(
+        ..., description="최적 포트폴리오의 금리 변동 하 목표 달성 확률 (최적화 불필요하거나 제약 충족 불가면 null)"
+    )
@@ -29,3 +29,38 @@ class ScenarioResult(BaseModel):
 class SimulationResponse(BaseModel):
     base_rate: float
     results: list[ScenarioResult]
+
+
+class RollingSimulationRequest(BaseModel):
+    goal_amount: float = Field(..., gt=0)
+    time_horizon_months: int = Field(..., gt=0, le=600)
+    monthly_contribution: float = Field(..., gt=0)
+    initial_principal: float = Field(default=0, ge=0)
+    eligible_youth_savings: bool = Field(default=False)
+    n_paths: int = Field(default=10_000, ge=1, le=100_000, description="금리 경로 수")
+    rebalance_months: int = Field(default=12, ge=1, le=120, description="재최적화 주기 (개월)")
+    rate_volatility: float = Field(
+        default=0.0075, ge=0, le=0.05, description="연간 금리 변동 표준편차 (랜덤워크)"
+    )
+    seed: int | None = Field(default=None, description="난수 시드 (재현용)")
+
+
+class TerminalValueDistribution(BaseModel):
+    mean: float
+    p5: float
+    p25: float
+    p50: float
+    p75: float
+    p95: float
+
+
+class RollingSimulationResponse(BaseModel):
+    n_paths: int
+    n_rebalances: int = Field(..., description="경로당 재최적화 횟수")
+    success_probability: float = Field(..., description="만기 자산이 목표 금액 이상인 경로 비율")
+    terminal_value: TerminalValueDistribution = Field(..., description="만기 자산 분포 (원)")
+    simple_savings_success_probability: float = Field(
+        ..., description="단순 적금(안전 금리 추종)의 목표 달성 비율"
+    )
+    mean_duration_path: list[float] = Field(..., description="재최적화 시점별 평균 포트폴리오 듀레이션 (년)")
+    mean_return_path: list[float] = Field(..., description="재최적화 시점별 평균 포트폴리오 세후 수익률")
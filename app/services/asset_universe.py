@@ -1,21 +1,30 @@
 from app.config import settings
 from app.models.asset import Asset, AssetClass, TaxBenefit
+from app.services.rate_store import RateSnapshot, current_snapshot
+from app.services.tracing import traced
 
 
-def get_default_universe(eligible_youth_savings: bool = False) -> list[Asset]:
-    """Phase 3: 사회초년생이 접근 가능한 자산 유니버스를 반환한다."""
+@traced("universe")
+def get_default_universe(
+    eligible_youth_savings: bool = False, snapshot: RateSnapshot | None = None
+) -> list[Asset]:
+    """Phase 3: 사회초년생이 접근 가능한 자산 유니버스를 반환한다.
+
+    세전 수익률은 금리 스냅샷(기본: 현재 요청에 고정된 스냅샷)에서 읽는다.
+    """
+    rates = (snapshot or current_snapshot()).gross_returns
     assets: list[Asset] = [
         Asset(
             name="파킹통장/CMA",
             asset_class=AssetClass.PARKING,
-            gross_return=0.030,
+            gross_return=rates[AssetClass.PARKING],
             duration=0.0,
             tax_benefit=TaxBenefit.NONE,
         ),
         Asset(
             name="ISA 내 예금",
             asset_class=AssetClass.ISA_DEPOSIT,
-            gross_return=0.035,
+            gross_return=rates[AssetClass.ISA_DEPOSIT],
             duration=1.0,
             tax_benefit=TaxBenefit.SEPARATE_TAX,
             annual_limit=settings.isa_annual_limit,
@@ -23,21 +32,21 @@ def get_default_universe(eligible_youth_savings: bool = False) -> list[Asset]:
         Asset(
             name="정기예금 (1년)",
             asset_class=AssetClass.TIME_DEPOSIT,
-            gross_return=0.033,
+            gross_return=rates[AssetClass.TIME_DEPOSIT],
             duration=1.0,
             tax_benefit=TaxBenefit.NONE,
         ),
         Asset(
             name="KODEX 국고채 3년 ETF",
             asset_class=AssetClass.BOND_ETF_3Y,
-            gross_return=0.038,
+            gross_return=rates[AssetClass.BOND_ETF_3Y],
             duration=2.7,
             tax_benefit=TaxBenefit.NONE,
         ),
         Asset(
             name="KODEX 국고채 10년 ETF",
             asset_class=AssetClass.BOND_ETF_10Y,
-            gross_return=0.042,
+            gross_return=rates[AssetClass.BOND_ETF_10Y],
             duration=7.8,
             tax_benefit=TaxBenefit.NONE,
         ),
@@ -49,7 +58,7 @@ def get_default_universe(eligible_youth_savings: bool = False) -> list[Asset]:
             Asset(
                 name="청년도약저축",
                 asset_class=AssetClass.YOUTH_SAVINGS,
-                gross_return=0.06 + settings.youth_savings_gov_contribution_rate,
+                gross_return=rates[AssetClass.YOUTH_SAVINGS] + settings.youth_savings_gov_contribution_rate,
                 duration=2.5,
                 tax_benefit=TaxBenefit.TAX_FREE,
                 monthly_limit=settings.youth_savings_monthly_limit,
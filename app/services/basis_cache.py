@@ -0,0 +1,235 @@
+"""최적 기저 캐시와 우변 범위 분석.
+
+optimize_portfolio의 LP에서 쌍대해(축소 비용)는 목적함수의 수익률과 듀레이션에 의존하고,
+목표 기간(T), 월 저축액(C), 필요 수익률은 우변을 바꾼다. 다만 목적함수 수익률(lp_returns)도
+ISA 누적 과세 때문에 C, T, 초기 자본에 따라 달라진다 (한도 비중에서 비과세 한도가 차지하는 비율).
+따라서 캐시된 기저가 새 목표에서도 최적이라는 보장은 우변 범위만으로는 없다.
+
+솔버가 찾은 해에서 기저를 복원해 다음 범위와 함께 저장한다.
+- 목표 기간: 저축액을 고정했을 때 기저가 실행 가능한 연속 구간 (1개월 간격 탐색)
+- 월 저축액: 기간을 고정했을 때 기저가 실행 가능한 연속 구간 (1% 간격 탐색)
+필요 수익률은 LP에서 빼고 풀이 후 비교하므로 (optimizer._optimize_portfolio) 범위에 넣지 않는다.
+범위는 HiGHS의 우변 범위 분석(ranging)이 아니라 기저 역대입을 격자로 훑어 구한다.
+scipy.optimize.linprog는 HiGHS의 ranging 결과를 돌려주지 않기 때문이다.
+
+범위는 후보를 고르는 데만 쓴다. 범위 안의 새 목표는 기저에 역대입해 풀고, 그 목표의 수익률로
+원문제 실행 가능성과 쌍대 실행 가능성(KKT)을 다시 확인한 뒤에만 사용한다 (verify_basis).
+조회가 정확한 것은 이 재확인 덕분이며, 수익률이 바뀌어 최적이 아니게 된 기저는 캐시 미스가 된다.
+"""
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+from app.config import settings
+from app.models.asset import Asset
+from app.models.goal import GoalInput
+from app.services.batch_lp import (
+    LPBasis,
+    asset_upper_bounds,
+    basis_is_dual_feasible,
+    basis_primal,
+    duration_band,
+    verify_basis,
+)
+
+_MAX_UNIVERSES = 8
+_MAX_MONTHS = 1200
+_CONTRIBUTION_STEPS = np.power(1.01, np.arange(-300, 301))  # 약 1/20배 ~ 20배
+_TOL = 1e-7
+
+
+class CachedBasis(NamedTuple):
+    basis: LPBasis
+    months_range: tuple[int, int]
+    contribution_range: tuple[float, float]
+
+
+def _universe_key(assets: list[Asset], epsilon: float) -> tuple:
+    return (
+        epsilon,
+        settings.youth_savings_monthly_limit,
+        settings.isa_annual_limit,
+        tuple((a.asset_class, a.gross_return, a.duration, a.tax_benefit) for a in assets),
+    )
+
+
+def recover_basis(
+    weights: np.ndarray, durations: np.ndarray, lo: float, hi: float, upper: np.ndarray
+) -> LPBasis | None:
+    """솔버 해에서 기저(상한 자산, 기저 변수, 활성 듀레이션 제약)를 복원한다."""
+    capped = upper < 1.0
+    at_upper = capped & (weights >= upper - _TOL)
+    basic = tuple(int(i) for i in np.flatnonzero(~at_upper & (weights > _TOL)))
+    duration = float(weights @ durations)
+
+    if len(basic) == 1:
+        side = 0
+    elif len(basic) == 2 and abs(duration - hi) <= _TOL:
+        side = 1
+    elif len(basic) == 2 and abs(duration - lo) <= _TOL:
+        side = -1
+    else:
+        return None
+    return LPBasis(tuple(int(i) for i in np.flatnonzero(at_upper)), basic, side)
+
+
+def _contiguous(grid: np.ndarray, feasible: np.ndarray, at: int) -> tuple:
+    """at을 포함하는 실행 가능 연속 구간의 양 끝 격자값."""
+    if not feasible[at]:
+        return grid[at], grid[at]
+    breaks = np.flatnonzero(~feasible)
+    left = breaks[breaks < at]
+    right = breaks[breaks > at]
+    start = left[-1] + 1 if len(left) else 0
+    stop = right[0] - 1 if len(right) else len(grid) - 1
+    return grid[start], grid[stop]
+
+
+def basis_ranges(
+    basis: LPBasis,
+    assets: list[Asset],
+    durations: np.ndarray,
+    months: int,
+    contribution: float,
+    epsilon: float,
+) -> tuple[tuple[int, int], tuple[float, float]]:
+    """기저가 실행 가능하게 유지되는 목표 기간 구간과 월 저축액 구간 (한 번에 하나씩 변화)."""
+    month_grid = np.arange(1, _MAX_MONTHS + 1)
+    lo, hi = duration_band(month_grid / 12, epsilon)
+    upper = np.broadcast_to(asset_upper_bounds(assets, contribution), (len(month_grid), len(assets)))
+    _, feasible = basis_primal(basis, durations, lo, hi, upper)
+    m_lo, m_hi = _contiguous(month_grid, feasible, min(months, _MAX_MONTHS) - 1)
+
+    c_grid = contribution * _CONTRIBUTION_STEPS
+    lo, hi = duration_band(months / 12, epsilon)
+    _, feasible = basis_primal(basis, durations, lo, hi, asset_upper_bounds(assets, c_grid))
+    c_lo, c_hi = _contiguous(c_grid, feasible, len(c_grid) // 2)
+    return (int(m_lo), int(m_hi)), (float(c_lo), float(c_hi))
+
+
+class BasisCache:
+    """자산 유니버스별 최적 기저 LRU 캐시."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._universes: OrderedDict[tuple, OrderedDict[LPBasis, CachedBasis]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._universes.values())
+
+    def lookup(
+        self,
+        assets: list[Asset],
+        returns: np.ndarray,
+        durations: np.ndarray,
+        goal: GoalInput,
+        epsilon: float,
+    ) -> np.ndarray | None:
+        """범위 안의 캐시된 기저로 최적 비중을 역대입한다. 없으면 None."""
+        if self.maxsize <= 0:
+            return None
+        key = _universe_key(assets, epsilon)
+        months, C = goal.time_horizon_months, goal.monthly_contribution
+
+        with self._lock:
+            entries = self._universes.get(key)
+            candidates = [] if entries is None else [
+                e for e in reversed(entries.values())
+                if e.months_range[0] <= months <= e.months_range[1]
+                and e.contribution_range[0] <= C <= e.contribution_range[1]
+            ]
+
+        if candidates:
+            T_years = months / 12
+            upper = asset_upper_bounds(assets, C)[0]
+            for entry in candidates:
+                weights = verify_basis(
+                    entry.basis, returns, durations, T_years - epsilon, T_years + epsilon, upper
+                )
+                if weights is not None:
+                    with self._lock:
+                        self.hits += 1
+                        self._universes.move_to_end(key)
+                        if entry.basis in entries:
+                            entries.move_to_end(entry.basis)
+                    return weights
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def store(
+        self,
+        assets: list[Asset],
+        weights: np.ndarray,
+        returns: np.ndarray,
+        durations: np.ndarray,
+        goal: GoalInput,
+        epsilon: float,
+    ) -> CachedBasis | None:
+        """솔버 해의 기저를 복원·검증하고 우변 범위와 함께 저장한다."""
+        if self.maxsize <= 0:
+            return None
+        T_years = goal.time_horizon_months / 12
+        lo, hi = T_years - epsilon, T_years + epsilon
+        upper = asset_upper_bounds(assets, goal.monthly_contribution)[0]
+
+        basis = recover_basis(weights, durations, lo, hi, upper)
+        if basis is None or not basis_is_dual_feasible(basis, returns, durations):
+            return None
+        _, feasible = basis_primal(basis, durations, lo, hi, upper)
+        if not feasible[0]:
+            return None
+
+        months_range, contribution_range = basis_ranges(
+            basis, assets, durations, goal.time_horizon_months, goal.monthly_contribution, epsilon
+        )
+        entry = CachedBasis(basis, months_range, contribution_range)
+
+        key = _universe_key(assets, epsilon)
+        with self._lock:
+            entries = self._universes.setdefault(key, OrderedDict())
+            self._universes.move_to_end(key)
+            previous = entries.get(basis)
+            if previous is not None:
+                # 한 번에 하나씩 구한 범위라 실제 실행 가능 영역(2차원)의 일부만 덮는다.
+                # 이전 범위와 합친 외곽 범위로 넓히고, 정확성은 조회 시 KKT 검사로 보장한다.
+                entry = entry._replace(
+                    months_range=(
+                        min(previous.months_range[0], months_range[0]),
+                        max(previous.months_range[1], months_range[1]),
+                    ),
+                    contribution_range=(
+                        min(previous.contribution_range[0], contribution_range[0]),
+                        max(previous.contribution_range[1], contribution_range[1]),
+                    ),
+                )
+            entries[basis] = entry
+            entries.move_to_end(basis)
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+            while len(self._universes) > _MAX_UNIVERSES:
+                self._universes.popitem(last=False)
+        return entry
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._universes.clear()
+            self.hits = self.misses = 0
+
+
+basis_cache = BasisCache(settings.basis_cache_size)
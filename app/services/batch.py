@@ -0,0 +1,235 @@
+"""파일 단위 대량 실행기 (청크 스트리밍, 프로세스 풀, 체크포인트/재개).
+
+입력 파일(CSV, Parquet)을 chunk_size행씩 읽어 프로세스 풀에 넘기고, 결과를 입력 순서대로
+JSON Lines 파일에 이어 쓴다. 한 행은 {"row": 입력 행 번호(0부터), ...fn 결과} 한 줄이다.
+- 메모리: 읽는 중·계산 중·쓰는 중인 청크가 최대 workers × 2 + 1개라 입력 크기와 무관하다
+- 체크포인트: 청크를 쓰고 fsync한 뒤 <출력>.ckpt에 (처리한 행 수, 출력 바이트 수)를 원자적으로 기록한다
+- 재개: 출력을 체크포인트의 바이트 수로 잘라 쓰다 만 청크를 버리고 그 다음 행부터 다시 시작한다
+- 금리: 실행 전체를 시작 시점의 스냅샷 하나에 고정하고, 체크포인트에 담아 재개할 때도 같은 금리를 쓴다
+- 행 단위 실패(검증 오류 등)는 {"row", "error"} 줄로 남기고 계속한다
+"""
+import csv
+import itertools
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+from pydantic_core import to_json
+
+from app.models.asset import AssetClass
+from app.services.rate_store import RateSnapshot, current_snapshot, pinned
+
+CHECKPOINT_SUFFIX = ".ckpt"
+
+# 행 하나의 입력 필드 → 출력 레코드. 작업 프로세스로 보내므로 모듈 수준 함수여야 한다.
+RowFn = Callable[[dict[str, Any]], dict[str, Any]]
+
+
+class BatchError(RuntimeError):
+    """입력·출력·체크포인트 상태 때문에 실행을 시작하거나 재개할 수 없다."""
+
+
+class BatchProgress(NamedTuple):
+    rows: int  # 출력에 기록한 행 수 (재개 이전 실행분 포함)
+    failed: int  # 실패한 행 수 (재개 이전 실행분 포함)
+    total: int | None  # 입력 전체 행 수 (Parquet만 미리 안다)
+    resumed_from: int  # 이번 실행이 시작한 행
+    elapsed: float  # 이번 실행 경과 초
+
+
+def checkpoint_path(output: Path) -> Path:
+    return output.with_name(output.name + CHECKPOINT_SUFFIX)
+
+
+# ------------------------------------------------------------
+# 입력
+# ------------------------------------------------------------
+
+def read_rows(path: Path, batch_size: int = 1024) -> tuple[Iterator[dict[str, Any]], int | None]:
+    """입력 파일의 행을 하나씩 읽는다. (행 반복자, 전체 행 수 또는 None)을 반환한다.
+
+    빈 칸은 빼서 모델 기본값이 적용되게 한다. 확장자로 형식을 고른다 (.csv, .parquet).
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return _csv_rows(path), None
+    if suffix in (".parquet", ".pq"):
+        return _parquet_rows(path, batch_size)
+    raise BatchError(f"지원하지 않는 입력 형식입니다: {path.name} (.csv 또는 .parquet)")
+
+
+def _csv_rows(path: Path) -> Iterator[dict[str, Any]]:
+    with path.open(newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            yield {k: v for k, v in row.items() if k is not None and v not in (None, "")}
+
+
+def _parquet_rows(path: Path, batch_size: int) -> tuple[Iterator[dict[str, Any]], int]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise BatchError("Parquet 입력에는 pyarrow가 필요합니다 (pip install .[parquet]).") from exc
+
+    file = pq.ParquetFile(path)
+
+    def rows() -> Iterator[dict[str, Any]]:
+        for batch in file.iter_batches(batch_size=batch_size):
+            for row in batch.to_pylist():
+                yield {k: v for k, v in row.items() if v is not None}
+
+    return rows(), file.metadata.num_rows
+
+
+# ------------------------------------------------------------
+# 체크포인트
+# ------------------------------------------------------------
+
+def _rates_to_json(snapshot: RateSnapshot) -> dict[str, Any]:
+    return {
+        "version": snapshot.version,
+        "created_at": snapshot.created_at.isoformat(),
+        "source": snapshot.source,
+        "base_interest_rate": snapshot.base_interest_rate,
+        "gross_returns": {k.value: v for k, v in snapshot.gross_returns.items()},
+    }
+
+
+def _rates_from_json(data: dict[str, Any]) -> RateSnapshot:
+    return RateSnapshot(
+        version=data["version"],
+        created_at=datetime.fromisoformat(data["created_at"]),
+        source=data["source"],
+        base_interest_rate=data["base_interest_rate"],
+        gross_returns=MappingProxyType({AssetClass(k): v for k, v in data["gross_returns"].items()}),
+    )
+
+
+def _write_checkpoint(path: Path, state: dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)  # 읽는 쪽은 이전 체크포인트나 새 체크포인트 중 하나만 본다
+
+
+def _load_checkpoint(path: Path, input_path: Path) -> dict[str, Any]:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise BatchError(f"재개할 체크포인트가 없습니다: {path}") from None
+    stat = input_path.stat()
+    if (state["input_size"], state["input_mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+        raise BatchError("체크포인트 이후 입력 파일이 바뀌었습니다. 처음부터 다시 실행하세요 (--overwrite).")
+    return state
+
+
+# ------------------------------------------------------------
+# 실행
+# ------------------------------------------------------------
+
+def _run_chunk(
+    fn: RowFn, chunk: list[tuple[int, dict[str, Any]]], rates: dict[str, Any]
+) -> tuple[bytes, int, int]:
+    """청크의 행마다 fn을 실행해 (JSON Lines 바이트, 행 수, 실패 수)를 반환한다. 작업 프로세스에서 돈다."""
+    lines = []
+    failed = 0
+    with pinned(_rates_from_json(rates)):
+        for index, fields in chunk:
+            try:
+                record = {"row": index, **fn(fields)}
+            except Exception as exc:  # 행 실패는 출력에 남기고 계속한다
+                record = {"row": index, "error": f"{type(exc).__name__}: {exc}"}
+                failed += 1
+            lines.append(to_json(record))
+            lines.append(b"\n")
+    return b"".join(lines), len(chunk), failed
+
+
+def run_batch(
+    input_path: Path,
+    output_path: Path,
+    fn: RowFn,
+    chunk_size: int = 500,
+    workers: int = 1,
+    resume: bool = False,
+    overwrite: bool = False,
+    progress: Callable[[BatchProgress], None] | None = None,
+) -> BatchProgress:
+    """입력의 각 행에 fn을 적용해 결과를 출력 파일에 이어 쓴다. workers가 1 이하면 현재 프로세스에서 실행한다.
+
+    resume이면 체크포인트부터 이어서 실행하고, 아니면 출력 파일이 이미 있을 때 overwrite가 필요하다.
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    ckpt = checkpoint_path(output_path)
+    if resume:
+        state = _load_checkpoint(ckpt, input_path)
+        if not output_path.is_file():
+            raise BatchError(f"체크포인트는 있지만 출력 파일이 없습니다: {output_path} (--overwrite로 처음부터 실행)")
+        if output_path.stat().st_size < state["output_bytes"]:
+            raise BatchError(f"출력 파일이 체크포인트보다 짧습니다: {output_path} (--overwrite로 처음부터 실행)")
+        out = output_path.open("r+b")
+        out.truncate(state["output_bytes"])  # 체크포인트 뒤에 쓰다 만 청크를 버린다
+        out.seek(0, os.SEEK_END)
+    else:
+        if output_path.exists() and not overwrite:
+            raise BatchError(f"출력 파일이 이미 있습니다: {output_path} (--resume 또는 --overwrite)")
+        stat = input_path.stat()
+        state = {
+            "input": str(input_path),
+            "input_size": stat.st_size,
+            "input_mtime_ns": stat.st_mtime_ns,
+            "rows": 0,
+            "failed": 0,
+            "output_bytes": 0,
+            "rates": _rates_to_json(current_snapshot()),
+        }
+        out = output_path.open("wb")
+        _write_checkpoint(ckpt, state)
+
+    rows, total = read_rows(input_path, chunk_size)
+    resumed_from = state["rows"]
+    numbered = enumerate(itertools.islice(rows, resumed_from, None), resumed_from)
+    chunks = iter(lambda: list(itertools.islice(numbered, chunk_size)), [])
+    started = time.perf_counter()
+
+    def report() -> BatchProgress:
+        return BatchProgress(
+            state["rows"], state["failed"], total, resumed_from, time.perf_counter() - started
+        )
+
+    def commit(result: tuple[bytes, int, int]) -> None:
+        data, n_rows, n_failed = result
+        out.write(data)
+        out.flush()
+        os.fsync(out.fileno())  # 체크포인트가 디스크에 없는 행을 가리키지 않도록 먼저 내린다
+        state["rows"] += n_rows
+        state["failed"] += n_failed
+        state["output_bytes"] = out.tell()
+        _write_checkpoint(ckpt, state)
+        if progress is not None:
+            progress(report())
+
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        if executor is None:
+            for chunk in chunks:
+                commit(_run_chunk(fn, chunk, state["rates"]))
+        else:
+            # 입력 순서대로 쓰기 위해 제출 순서의 큐에서 앞부터 꺼낸다. 큐 길이가 메모리 상한이다.
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_run_chunk, fn, chunk, state["rates"]))
+                if len(pending) >= 2 * workers:
+                    commit(pending.popleft().result())
+            while pending:
+                commit(pending.popleft().result())
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        out.close()
+    return report()
@@ -0,0 +1,276 @@
+"""듀레이션 매칭 LP의 배치 해법.
+
+optimize_portfolio의 LP는 변수가 자산 수(n)만큼이고 일반 제약이 Σw=1과 듀레이션 밴드뿐이며,
+청년도약저축/ISA 한도는 변수 상한(w_i ≤ 한도/C)과 같다.
+따라서 최적 기저해는 한도에 걸린 자산(상한), 0인 자산, 그리고 1~2개의 기저 변수로 구성된다.
+
+    max  Σ R_i w_i
+    s.t. Σ w_i = 1
+         lo ≤ Σ D_i w_i ≤ hi
+         0 ≤ w_i ≤ u_i
+
+가능한 기저 후보를 모두 열거해 수천 개의 LP를 NumPy 연산으로 한 번에 푼다.
+n이 작은(한도 자산이 몇 개뿐인) 이 저장소의 유니버스에서는 linprog 반복 호출보다 수백 배 빠르다.
+"""
+from functools import lru_cache
+from itertools import combinations
+from typing import NamedTuple
+
+import numpy as np
+
+from app.config import settings
+from app.models.asset import Asset, AssetClass
+
+_TOL = 1e-9
+
+
+class LPBasis(NamedTuple):
+    at_upper: tuple[int, ...]  # 상한(한도)에 걸린 자산 인덱스
+    basic: tuple[int, ...]  # 기저 변수 (1개 또는 2개)
+    side: int  # 활성 듀레이션 제약: 0 없음, -1 하한, +1 상한
+
+
+class BatchSolution(NamedTuple):
+    weights: np.ndarray  # (B, n)
+    objective: np.ndarray  # (B,) 포트폴리오 세후 수익률, 실행 불가능하면 NaN
+    feasible: np.ndarray  # (B,) bool
+    basis_index: np.ndarray  # (B,) bases의 인덱스, 실행 불가능하면 -1
+    bases: tuple[LPBasis, ...]
+
+
+def asset_upper_bounds(
+    assets: list[Asset], monthly_contribution: np.ndarray | float
+) -> np.ndarray:
+    """월 저축액별 자산 비중 상한 (B, n). 청년도약저축/ISA 한도를 비중으로 환산한다."""
+    C = np.atleast_1d(np.asarray(monthly_contribution, dtype=float))
+    # 월 저축액 0(원금만 있는 목표)은 한도에 묶이지 않으므로 0으로 나누지 않고 상한 1로 둔다
+    safe_C = np.where(C > 0, C, np.inf)
+    upper = np.ones((C.shape[0], len(assets)))
+    for i, asset in enumerate(assets):
+        if asset.asset_class == AssetClass.YOUTH_SAVINGS:
+            upper[:, i] = np.minimum(1.0, settings.youth_savings_monthly_limit / safe_C)
+        elif asset.asset_class == AssetClass.ISA_DEPOSIT:
+            upper[:, i] = np.minimum(1.0, settings.isa_annual_limit / (12 * safe_C))
+    return upper
+
+
+def duration_band(
+    T_years: np.ndarray | float, epsilon: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """듀레이션 매칭 밴드 [T - ε, T + ε]."""
+    T = np.atleast_1d(np.asarray(T_years, dtype=float))
+    return T - epsilon, T + epsilon
+
+
+@lru_cache(maxsize=64)
+def enumerate_bases(n: int, capped: tuple[int, ...]) -> tuple[LPBasis, ...]:
+    """상한이 1보다 작을 수 있는 자산(capped) 기준으로 기저 후보를 열거한다."""
+    bases: list[LPBasis] = []
+    for k in range(len(capped) + 1):
+        for at_upper in combinations(capped, k):
+            free = [i for i in range(n) if i not in at_upper]
+            for b in free:
+                bases.append(LPBasis(at_upper, (b,), 0))
+            for a, b in combinations(free, 2):
+                bases.append(LPBasis(at_upper, (a, b), -1))
+                bases.append(LPBasis(at_upper, (a, b), 1))
+    return tuple(bases)
+
+
+@lru_cache(maxsize=64)
+def _basis_arrays(n: int, capped: tuple[int, ...]):
+    bases = enumerate_bases(n, capped)
+    upper_mask = np.zeros((len(bases), n))
+    first = np.empty(len(bases), dtype=np.intp)
+    second = np.empty(len(bases), dtype=np.intp)
+    side = np.empty(len(bases), dtype=np.intp)
+    for k, basis in enumerate(bases):
+        upper_mask[k, list(basis.at_upper)] = 1.0
+        first[k] = basis.basic[0]
+        second[k] = basis.basic[1] if len(basis.basic) == 2 else -1
+        side[k] = basis.side
+    return upper_mask, first, second, side
+
+
+def _solve_chunk(returns, durations, lo, hi, upper, capped):
+    B, n = upper.shape
+    upper_mask, first, second, side = _basis_arrays(n, capped)
+    pair = second >= 0
+    second_idx = np.where(pair, second, first)
+
+    # 상한에 걸린 자산의 비중 합, 듀레이션 기여, 수익률 기여 (B, K)
+    mass_upper = upper @ upper_mask.T
+    dur_upper = (upper * durations) @ upper_mask.T
+    ret_upper = (upper * returns) @ upper_mask.T
+    remaining = 1.0 - mass_upper
+
+    d_a = durations[first]
+    d_b = durations[second_idx]
+    target = np.where(side > 0, hi[:, None], lo[:, None])
+
+    # 듀레이션이 같은 두 자산의 쌍은 NaN/inf가 되어 아래 검사에서 제외된다
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w_pair = (target - dur_upper - d_b * remaining) / (d_a - d_b)
+        w_a = np.where(pair, w_pair, remaining)
+        w_b = np.where(pair, remaining - w_a, 0.0)
+
+        duration = dur_upper + d_a * w_a + d_b * w_b
+        u_a = upper[:, first]
+        u_b = upper[:, second_idx]
+
+        feasible = (
+            np.isfinite(w_a)
+            & (w_a >= -_TOL) & (w_a <= u_a + _TOL)
+            & (w_b >= -_TOL) & (w_b <= u_b + _TOL)
+            & (duration >= lo[:, None] - _TOL) & (duration <= hi[:, None] + _TOL)
+        )
+        feasible &= ~pair | (np.abs(d_a - d_b) > _TOL)
+
+        objective = ret_upper + returns[:, first] * w_a + returns[:, second_idx] * w_b
+        objective = np.where(feasible, objective, -np.inf)
+
+    best = np.argmax(objective, axis=1)
+    rows = np.arange(B)
+    any_feasible = feasible[rows, best]
+
+    weights = upper * upper_mask[best]
+    weights[rows, first[best]] = np.clip(w_a[rows, best], 0.0, None)
+    weights[rows, second_idx[best]] += np.where(
+        pair[best], np.clip(w_b[rows, best], 0.0, None), 0.0
+    )
+    weights[~any_feasible] = 0.0
+
+    obj = np.where(any_feasible, objective[rows, best], np.nan)
+    basis_index = np.where(any_feasible, best, -1)
+    return weights, obj, any_feasible, basis_index
+
+
+def solve_batch(
+    returns: np.ndarray,
+    durations: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    upper: np.ndarray,
+    min_return: np.ndarray | None = None,
+    chunk_size: int = 8192,
+) -> BatchSolution:
+    """B개의 듀레이션 매칭 LP를 한 번에 푼다.
+
+    Args:
+        returns: 세후 수익률 (n,) 또는 행별로 다른 경우 (B, n)
+        durations: 자산 듀레이션 (n,)
+        lo, hi: 듀레이션 밴드 (B,)
+        upper: 자산 비중 상한 (B, n)
+        min_return: 최소 수익률 제약 (B,), None이면 제약 없음
+    """
+    upper = np.atleast_2d(np.asarray(upper, dtype=float))
+    B, n = upper.shape
+    durations = np.asarray(durations, dtype=float)
+    returns = np.broadcast_to(np.asarray(returns, dtype=float), (B, n))
+    lo = np.broadcast_to(np.asarray(lo, dtype=float), (B,))
+    hi = np.broadcast_to(np.asarray(hi, dtype=float), (B,))
+
+    capped = tuple(int(i) for i in np.flatnonzero((upper < 1.0).any(axis=0)))
+
+    weights = np.zeros((B, n))
+    objective = np.full(B, np.nan)
+    feasible = np.zeros(B, dtype=bool)
+    basis_index = np.full(B, -1, dtype=np.intp)
+
+    for start in range(0, B, chunk_size):
+        sl = slice(start, start + chunk_size)
+        w, obj, ok, idx = _solve_chunk(returns[sl], durations, lo[sl], hi[sl], upper[sl], capped)
+        weights[sl], objective[sl], feasible[sl], basis_index[sl] = w, obj, ok, idx
+
+    if min_return is not None:
+        min_return = np.broadcast_to(np.asarray(min_return, dtype=float), (B,))
+        meets = feasible & (objective >= min_return - _TOL)
+        weights[~meets] = 0.0
+        objective = np.where(meets, objective, np.nan)
+        basis_index = np.where(meets, basis_index, -1)
+        feasible = meets
+
+    return BatchSolution(weights, objective, feasible, basis_index, enumerate_bases(n, capped))
+
+
+def basis_primal(
+    basis: LPBasis,
+    durations: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    upper: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """고정된 기저를 B개의 우변(듀레이션 밴드, 비중 상한)에 역대입한다.
+
+    Returns:
+        (비중 (B, n), 원문제 실행 가능 여부 (B,))
+    """
+    upper = np.atleast_2d(np.asarray(upper, dtype=float))
+    B, n = upper.shape
+    lo = np.broadcast_to(np.asarray(lo, dtype=float), (B,))
+    hi = np.broadcast_to(np.asarray(hi, dtype=float), (B,))
+
+    at_upper = np.zeros(n, dtype=bool)
+    at_upper[list(basis.at_upper)] = True
+    weights = np.where(at_upper, upper, 0.0)
+    remaining = 1.0 - weights.sum(axis=1)
+
+    a = basis.basic[0]
+    if len(basis.basic) == 1:
+        weights[:, a] = remaining
+    else:
+        b = basis.basic[1]
+        d_a, d_b = durations[a], durations[b]
+        if abs(d_a - d_b) <= _TOL:
+            return weights, np.zeros(B, dtype=bool)
+        target = hi if basis.side > 0 else lo
+        weights[:, a] = (target - weights @ durations - d_b * remaining) / (d_a - d_b)
+        weights[:, b] = remaining - weights[:, a]
+
+    duration = weights @ durations
+    feasible = (
+        (weights >= -_TOL).all(axis=1)
+        & (weights <= upper + _TOL).all(axis=1)
+        & (duration >= lo - _TOL) & (duration <= hi + _TOL)
+    )
+    return np.clip(weights, 0.0, None), feasible
+
+
+def basis_is_dual_feasible(basis: LPBasis, returns: np.ndarray, durations: np.ndarray) -> bool:
+    """기저의 축소 비용 부호를 검사한다. 쌍대해는 수익률과 듀레이션에만 의존하고 우변과 무관하다."""
+    n = len(returns)
+    a = basis.basic[0]
+    lam = 0.0
+    if len(basis.basic) == 2:
+        b = basis.basic[1]
+        if abs(durations[a] - durations[b]) <= _TOL:
+            return False
+        lam = (returns[a] - returns[b]) / (durations[a] - durations[b])
+        # 활성 상한 제약의 승수는 ≥ 0, 하한 제약은 ≤ 0
+        if lam * basis.side < -_TOL:
+            return False
+
+    mu = returns[a] - lam * durations[a]
+    reduced = returns - mu - lam * durations
+    at_upper = np.zeros(n, dtype=bool)
+    at_upper[list(basis.at_upper)] = True
+    basic = np.zeros(n, dtype=bool)
+    basic[list(basis.basic)] = True
+    return not (
+        (reduced[~basic & ~at_upper] > _TOL).any() or (reduced[~basic & at_upper] < -_TOL).any()
+    )
+
+
+def verify_basis(
+    basis: LPBasis,
+    returns: np.ndarray,
+    durations: np.ndarray,
+    lo: float,
+    hi: float,
+    upper: np.ndarray,
+) -> np.ndarray | None:
+    """기저가 주어진 우변에서 최적(KKT 만족)이면 비중 (n,)을, 아니면 None을 반환한다."""
+    if not basis_is_dual_feasible(basis, returns, durations):
+        return None
+    weights, feasible = basis_primal(basis, durations, lo, hi, upper)
+    return weights[0] if feasible[0] else None
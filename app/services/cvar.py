@@ -0,0 +1,155 @@
+"""CVaR 제약 시나리오 LP (Rockafellar–Uryasev).
+
+금리 시나리오 s마다 포트폴리오 만기 가치는 비중에 선형이다 (V_s · w, simulator와 같은 모형).
+목표 부족액 L_s = goal - V_s · w의 하위 (1-α) 꼬리 평균(CVaR)을 한도 이하로 제한한다.
+목적함수 R_i는 optimize_portfolio와 같은 lp_returns이고, V_s는 scenario_value_matrix의 선형 근사를 따른다.
+
+    max  Σ R_i w_i
+    s.t. 기존 제약 (듀레이션 매칭, 상품 한도, Σw = 1)
+         u_s ≥ goal - V_s · w - ζ,  u_s ≥ 0                       (시나리오 s = 1..S)
+         ζ + 1/((1-α)S) Σ_s u_s ≤ 허용 기대 부족액
+
+금액은 목표 금액으로 나눠 정규화하고, 시나리오 행은 희소 행렬로 만들어 HiGHS로 푼다.
+"""
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+from app.config import settings
+from app.models.asset import Asset
+from app.models.cvar import CVaROptimizationResult, CVaRRequest
+from app.services.optimizer import _base_constraints, _build_result, _empty_result, lp_returns
+from app.services.simulator import scenario_value_matrix
+
+
+def generate_rate_shifts(n_scenarios: int, rate_volatility: float, seed: int | None = None) -> np.ndarray:
+    """정규분포 금리 변동 시나리오 (S,)."""
+    return np.random.default_rng(seed).normal(0.0, rate_volatility, n_scenarios)
+
+
+def shortfall_risk(shortfall: np.ndarray, confidence: float) -> tuple[float, float]:
+    """시나리오 부족액의 VaR(α 분위수)와 CVaR(꼬리 평균). RU 공식의 ζ = VaR에서의 값과 같다."""
+    ordered = np.sort(shortfall)
+    var = float(ordered[int(np.ceil(confidence * len(ordered))) - 1])
+    k = 1.0 / ((1.0 - confidence) * len(ordered))
+    return var, var + k * float(np.maximum(ordered - var, 0.0).sum())
+
+
+def _cvar_problem(
+    assets: list[Asset],
+    req: CVaRRequest,
+    values: np.ndarray,
+    returns: np.ndarray,
+    durations: np.ndarray,
+    required_return: float | None,
+    epsilon: float,
+):
+    """변수 배치 [w (n) | ζ | u (S)]의 희소 LP 행렬을 만든다."""
+    S, n = values.shape
+    n_vars = n + 1 + S
+    zeta = n
+    k = 1.0 / ((1.0 - req.confidence) * S)
+
+    A_base, b_base = _base_constraints(
+        assets, returns, durations, req.time_horizon_months / 12,
+        req.monthly_contribution, epsilon, required_return,
+    )
+    base = sp.hstack([sp.csr_matrix(np.array(A_base)), sp.csr_matrix((len(A_base), 1 + S))])
+
+    # 시나리오 행: -V_s · w - ζ - u_s ≤ -1
+    rows = np.repeat(np.arange(S), n + 2)
+    cols = np.column_stack([
+        np.tile(np.arange(n), (S, 1)), np.full(S, zeta), n + 1 + np.arange(S)
+    ]).ravel()
+    vals = np.column_stack([-values, -np.ones(S), -np.ones(S)]).ravel()
+    scenario_rows = sp.csr_matrix((vals, (rows, cols)), shape=(S, n_vars))
+
+    # CVaR 행: ζ + k Σ u_s ≤ 허용 기대 부족액 / goal
+    cvar_row = sp.csr_matrix(
+        (np.concatenate([[1.0], np.full(S, k)]), (np.zeros(S + 1), np.arange(n, n_vars))),
+        shape=(1, n_vars),
+    )
+
+    A_ub = sp.vstack([base, scenario_rows, cvar_row], format="csr")
+    b_ub = np.concatenate([b_base, -np.ones(S), [req.max_shortfall / req.goal_amount]])
+    A_eq = sp.csr_matrix((np.ones(n), (np.zeros(n), np.arange(n))), shape=(1, n_vars))
+    bounds = np.column_stack([
+        np.concatenate([np.zeros(n), [-np.inf], np.zeros(S)]),
+        np.concatenate([np.ones(n), [np.inf], np.full(S, np.inf)]),
+    ])
+    cvar_objective = np.concatenate([np.zeros(n), [1.0], np.full(S, k)])
+    return A_ub, b_ub, A_eq, bounds, cvar_objective
+
+
+def optimize_cvar(
+    assets: list[Asset],
+    req: CVaRRequest,
+    required_return: float | None = None,
+    epsilon: float | None = None,
+) -> CVaROptimizationResult:
+    """목표 부족액의 CVaR를 제한하면서 기대 세후 수익률을 최대화한다."""
+    if epsilon is None:
+        epsilon = settings.duration_epsilon
+
+    n = len(assets)
+    if n == 0:
+        return CVaROptimizationResult(
+            **_empty_result("최적화 실패: 투자 가능한 자산이 없습니다.").model_dump()
+        )
+
+    if req.scenarios is not None:
+        shifts = np.array([s.rate_shift for s in req.scenarios])
+    else:
+        shifts = generate_rate_shifts(req.n_scenarios, req.rate_volatility, req.seed)
+    S = len(shifts)
+
+    returns = lp_returns(assets, req)
+    durations = np.array([a.duration for a in assets])
+    values = scenario_value_matrix(req, assets, shifts) / req.goal_amount
+
+    A_ub, b_ub, A_eq, bounds, cvar_objective = _cvar_problem(
+        assets, req, values, returns, durations, required_return, epsilon
+    )
+    c = np.concatenate([-returns, np.zeros(1 + S)])
+    size = dict(
+        n_scenarios=S,
+        n_variables=A_ub.shape[1],
+        n_constraints=A_ub.shape[0] + A_eq.shape[0],
+        n_nonzeros=A_ub.nnz + A_eq.nnz,
+    )
+
+    start = time.perf_counter()
+    result = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=[1.0], bounds=bounds, method="highs")
+    solve_time_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    if not result.success:
+        # CVaR 한도를 빼고 CVaR 최소화 문제를 풀어 달성 가능한 최소 기대 부족액을 안내한다
+        minimum = linprog(
+            cvar_objective, A_ub=A_ub[:-1], b_ub=b_ub[:-1], A_eq=A_eq, b_eq=[1.0],
+            bounds=bounds, method="highs",
+        )
+        message = "최적화 실패: 듀레이션 매칭과 상품 한도를 동시에 만족할 수 없습니다."
+        if minimum.success:
+            message = (
+                "최적화 실패: 기대 부족액 한도를 만족할 수 없습니다. "
+                f"달성 가능한 최소 기대 부족액은 {max(minimum.fun, 0.0) * req.goal_amount:,.0f}원입니다."
+            )
+        return CVaROptimizationResult(
+            **_empty_result(message).model_dump(), solve_time_ms=solve_time_ms, **size
+        )
+
+    weights = result.x[:n]
+    base = _build_result(assets, weights, returns, durations, req, epsilon)
+
+    shortfall = (1.0 - values @ weights) * req.goal_amount
+    var, cvar = shortfall_risk(shortfall, req.confidence)
+    return CVaROptimizationResult(
+        **base.model_dump(),
+        cvar_shortfall=round(cvar, 0),
+        value_at_risk=round(var, 0),
+        shortfall_probability=round(float((shortfall > 0).mean()), 4),
+        solve_time_ms=solve_time_ms,
+        **size,
+    )
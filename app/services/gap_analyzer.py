@@ -1,10 +1,13 @@
 import math
 
+import numpy as np
 from scipy.optimize import brentq
 
-from app.config import settings
-from app.models.gap import GapAnalysisResult
+from app.models.gap import GapAnalysisResult, GapSensitivities
 from app.models.goal import GoalInput
+from app.services.rate_store import current_snapshot
+from app.services.shared_cache import result_cache
+from app.services.tracing import span, traced
 
 
 def _future_value(principal: float, monthly: float, annual_rate: float, months: int) -> float:
@@ -34,13 +37,249 @@ def _future_value(principal: float, monthly: float, annual_rate: float, months:
     return fv_principal + fv_annuity
 
 
+def _future_value_array(
+    principal: np.ndarray | float,
+    monthly: np.ndarray | float,
+    annual_rate: np.ndarray | float,
+    months: np.ndarray | int,
+) -> np.ndarray:
+    """_future_value의 벡터화 버전. 인자는 서로 브로드캐스트 가능해야 한다."""
+    principal, monthly, annual_rate, months = np.broadcast_arrays(
+        np.asarray(principal, dtype=float),
+        np.asarray(monthly, dtype=float),
+        np.asarray(annual_rate, dtype=float),
+        np.asarray(months, dtype=float),
+    )
+    r_m = annual_rate / 12
+    simple = principal + monthly * np.maximum(months, 0)
+
+    # r_m == 0, r_m <= -1 분기는 단순 합산으로 대체 (0으로 나누기 방지용 더미 이율)
+    degenerate = (r_m == 0) | (r_m <= -1)
+    safe_r_m = np.where(degenerate, 1.0, r_m)
+    with np.errstate(over="ignore", invalid="ignore"):
+        compound = (1 + safe_r_m) ** months
+        fv = principal * compound + monthly * ((compound - 1) / safe_r_m)
+
+    fv = np.where(degenerate, simple, fv)
+    return np.where(months <= 0, principal, fv)
+
+
+def _future_value_rate_derivative_array(
+    principal: np.ndarray | float,
+    monthly: np.ndarray | float,
+    annual_rate: np.ndarray | float,
+    months: np.ndarray | int,
+) -> np.ndarray:
+    """연 수익률에 대한 미래가치의 도함수 ∂FV/∂r (벡터화).
+
+    ∂FV/∂r = (1/12) × [P·n·g^(n-1) + C·(n·g^(n-1)·r_m - (g^n - 1)) / r_m²],  g = 1 + r_m
+    r_m ≈ 0에서는 극한값 (1/12) × [P·n + C·n(n-1)/2]를 사용한다.
+    """
+    principal, monthly, annual_rate, months = np.broadcast_arrays(
+        np.asarray(principal, dtype=float),
+        np.asarray(monthly, dtype=float),
+        np.asarray(annual_rate, dtype=float),
+        np.asarray(months, dtype=float),
+    )
+    r_m = annual_rate / 12
+    near_zero = np.abs(r_m) < 1e-6
+    safe_r_m = np.where(near_zero, 1.0, r_m)
+    with np.errstate(over="ignore", invalid="ignore"):
+        g = 1 + safe_r_m
+        g_n1 = g ** (months - 1)
+        exact = (
+            principal * months * g_n1
+            + monthly * (months * g_n1 * safe_r_m - (g_n1 * g - 1)) / safe_r_m**2
+        ) / 12
+    limit = (principal * months + monthly * months * (months - 1) / 2) / 12
+    return np.where(months <= 0, 0.0, np.where(near_zero, limit, exact))
+
+
+def _future_value_rate_second_derivative_array(
+    principal: np.ndarray | float,
+    monthly: np.ndarray | float,
+    annual_rate: np.ndarray | float,
+    months: np.ndarray | int,
+) -> np.ndarray:
+    """연 수익률에 대한 미래가치의 2계 도함수 ∂²FV/∂r² (벡터화).
+
+    ∂²FV/∂r² = (1/144) × [P·n(n-1)·g^(n-2) + C·(n(n-1)·g^(n-2)·r_m² - 2n·g^(n-1)·r_m + 2(g^n - 1)) / r_m³]
+    n·r_m ≈ 0에서는 연금 항에 급수 (1/144) × C·n(n-1)(n-2)·(1/3 + r_m(n-3)/4)를 사용한다.
+    """
+    principal, monthly, annual_rate, months = np.broadcast_arrays(
+        np.asarray(principal, dtype=float),
+        np.asarray(monthly, dtype=float),
+        np.asarray(annual_rate, dtype=float),
+        np.asarray(months, dtype=float),
+    )
+    r_m = annual_rate / 12
+    n = months
+    # 분자는 O((n·r_m)³)이라 n·r_m이 작으면 상쇄 오차가 커진다: 2항 급수로 대체
+    near_zero = np.abs(r_m * n) < 1e-3
+    safe_r_m = np.where(near_zero, 1.0, r_m)
+    with np.errstate(over="ignore", invalid="ignore"):
+        g = 1 + safe_r_m
+        g_n2 = g ** (n - 2)
+        growth = np.expm1(n * np.log1p(safe_r_m))  # g^n - 1
+        exact = (
+            principal * n * (n - 1) * g_n2
+            + monthly * (
+                n * (n - 1) * g_n2 * safe_r_m**2 - 2 * n * g_n2 * g * safe_r_m + 2 * growth
+            ) / safe_r_m**3
+        ) / 144
+        limit = (
+            principal * n * (n - 1) * (1 + r_m) ** (n - 2)
+            + monthly * n * (n - 1) * (n - 2) * (1 / 3 + r_m * (n - 3) / 4)
+        ) / 144
+    return np.where(months <= 1, 0.0, np.where(near_zero, limit, exact))
+
+
+def _future_value_months_derivative_array(
+    principal: np.ndarray | float,
+    monthly: np.ndarray | float,
+    annual_rate: np.ndarray | float,
+    months: np.ndarray | int,
+) -> np.ndarray:
+    """목표 기간(연속 개월)에 대한 미래가치의 도함수 ∂FV/∂n (벡터화).
+
+    ∂FV/∂n = ln(g) × g^n × (P + C / r_m),  g = 1 + r_m
+    r_m ≈ 0에서는 극한값 C를 사용한다.
+    """
+    principal, monthly, annual_rate, months = np.broadcast_arrays(
+        np.asarray(principal, dtype=float),
+        np.asarray(monthly, dtype=float),
+        np.asarray(annual_rate, dtype=float),
+        np.asarray(months, dtype=float),
+    )
+    r_m = annual_rate / 12
+    near_zero = np.abs(r_m) < 1e-9
+    safe_r_m = np.where(near_zero, 1.0, r_m)
+    with np.errstate(over="ignore", invalid="ignore"):
+        log_g = np.log1p(safe_r_m)
+        exact = log_g * np.exp(months * log_g) * (principal + monthly / safe_r_m)
+    return np.where(near_zero, monthly + principal * r_m, exact)
+
+
+def _gap_sensitivities(
+    goal: GoalInput, safe_rate: float, required_return: float | None
+) -> GapSensitivities:
+    """안전자산 미래가치와 필요 수익률의 입력별 해석적 도함수.
+
+    필요 수익률 r*은 FV(r*) = goal의 근이므로 음함수 정리로
+    ∂r*/∂x = -(∂FV/∂x) / (∂FV/∂r)를 쓴다. r*가 구간 끝(0)이거나 없으면 None이다.
+    """
+    P, C, n = goal.initial_principal, goal.monthly_contribution, goal.time_horizon_months
+
+    def partials(rate: float) -> tuple[float, float, float, float]:
+        """(∂FV/∂P, ∂FV/∂C, ∂FV/∂n, ∂FV/∂r), 스칼라 닫힌 형태."""
+        r_m = rate / 12
+        if abs(r_m) < 1e-9:
+            return 1.0, float(n), C, (P * n + C * n * (n - 1) / 2) / 12
+        log_g = math.log1p(r_m)
+        g_n = math.exp(n * log_g)
+        annuity = math.expm1(n * log_g) / r_m
+        g_n1 = g_n / (1 + r_m)
+        d_rate = (P * n * g_n1 + C * (n * g_n1 - annuity) / r_m) / 12
+        return g_n, annuity, log_g * g_n * (P + C / r_m), d_rate
+
+    d_principal, d_contribution, d_month, d_rate = partials(safe_rate)
+    result = GapSensitivities(
+        future_value_per_contribution=round(d_contribution, 6),
+        future_value_per_month=round(d_month, 2),
+        future_value_per_rate=round(d_rate, 2),
+        future_value_per_principal=round(d_principal, 6),
+    )
+    if required_return is None or required_return <= 0:
+        return result
+
+    r_principal, r_contribution, r_month, slope = partials(required_return)
+    if slope <= 0:
+        return result
+    return result.model_copy(update={
+        "required_return_per_contribution": -r_contribution / slope,
+        "required_return_per_month": -r_month / slope,
+        "required_return_per_goal": 1.0 / slope,
+        "required_return_per_principal": -r_principal / slope,
+    })
+
+
+def required_annual_returns(
+    goal_amount: np.ndarray | float,
+    principal: np.ndarray | float,
+    monthly: np.ndarray | float,
+    months: np.ndarray | int,
+    safe_rate: float | None = None,
+    xtol: float = 1e-10,
+    max_iter: int = 100,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """analyze_gap의 필요 수익률 역산을 여러 목표에 대해 한 번에 수행한다.
+
+    brentq 대신 [0, 1] 구간에서 이분법으로 보호된 뉴턴법을 배열 전체에 적용한다.
+
+    Returns:
+        (required_return, optimization_needed, goal_achievable)
+        required_return은 최적화가 불필요하거나 달성 불가능한 항목에서 NaN이다.
+    """
+    if safe_rate is None:
+        safe_rate = current_snapshot().base_interest_rate
+
+    goal_amount, principal, monthly, months = np.broadcast_arrays(
+        np.asarray(goal_amount, dtype=float),
+        np.asarray(principal, dtype=float),
+        np.asarray(monthly, dtype=float),
+        np.asarray(months, dtype=float),
+    )
+
+    fv_safe = _future_value_array(principal, monthly, safe_rate, months)
+    optimization_needed = goal_amount - fv_safe > 0
+
+    f_low = _future_value_array(principal, monthly, 0.0, months) - goal_amount
+    f_high = _future_value_array(principal, monthly, 1.0, months) - goal_amount
+
+    zero_enough = optimization_needed & (f_low >= 0)
+    achievable = ~optimization_needed | (f_high >= 0)
+    solve = optimization_needed & ~zero_enough & achievable
+
+    lo = np.zeros_like(goal_amount)
+    hi = np.ones_like(goal_amount)
+    r = np.full_like(goal_amount, 0.5)
+    active = solve.copy()
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        f = _future_value_array(principal, monthly, r, months) - goal_amount
+        df = _future_value_rate_derivative_array(principal, monthly, r, months)
+
+        lo = np.where(active & (f < 0), r, lo)
+        hi = np.where(active & (f >= 0), r, hi)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = r - f / df
+        inside = (newton > lo) & (newton < hi) & np.isfinite(newton)
+        r_next = np.where(inside, newton, (lo + hi) / 2)
+
+        converged = np.abs(r_next - r) < xtol
+        r = np.where(active, r_next, r)
+        active &= ~converged
+
+    required = np.where(zero_enough, 0.0, np.where(solve, r, np.nan))
+    return required, optimization_needed, achievable
+
+
+@traced("analyze_gap")
 def analyze_gap(
     goal: GoalInput, safe_rate: float | None = None
 ) -> GapAnalysisResult:
     """Phase 2: 갭 분석 및 필요 수익률을 산출한다."""
     if safe_rate is None:
-        safe_rate = settings.base_interest_rate
+        safe_rate = current_snapshot().base_interest_rate
+    return result_cache.cached(
+        GapAnalysisResult, lambda: _analyze_gap(goal, safe_rate), "analyze_gap", goal, safe_rate
+    )
+
 
+def _analyze_gap(goal: GoalInput, safe_rate: float) -> GapAnalysisResult:
     fv_safe = _future_value(
         goal.initial_principal,
         goal.monthly_contribution,
@@ -79,7 +318,8 @@ def analyze_gap(
             required_return = None
         else:
             try:
-                required_return = brentq(_fv_diff, 0.0, 1.0, xtol=1e-8)
+                with span("brentq"):
+                    required_return = brentq(_fv_diff, 0.0, 1.0, xtol=1e-8)
             except ValueError:
                 goal_achievable = False
                 required_return = None
@@ -91,4 +331,5 @@ def analyze_gap(
         optimization_needed=optimization_needed,
         required_annual_return=required_return,
         goal_achievable=goal_achievable,
+        sensitivities=_gap_sensitivities(goal, safe_rate, required_return),
     )
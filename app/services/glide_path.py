@@ -0,0 +1,251 @@
+"""다기간 글라이드 패스 최적화.
+
+optimize_portfolio는 전 기간에 하나의 비중 벡터를 쓰지만, 잔여 기간(듀레이션 목표 T)은
+매달 줄어든다. 여기서는 구간(월 또는 연)마다 월 저축액의 배분을 따로 정하고,
+전 구간을 하나의 희소 LP로 풀어 만기 미래가치를 최대화한다.
+
+변수 (구간 k, 자산 i):
+    a_ki: 구간 k 동안 매월 자산 i에 넣는 금액 (원)
+    z_i:  초기 자본 중 자산 i 배분액 (원)
+    s_y:  y년차 말에 남은 ISA 미사용 한도 (다음 해로 이월)
+
+    max  Σ_ki F_ki a_ki + Σ_i G_i z_i                      (만기 미래가치)
+    s.t. Σ_i a_ki = C                                       (구간별 월 저축액)
+         lo_k Σ_i a_ki ≤ Σ_i D_i a_ki ≤ hi_k Σ_i a_ki       (잔여 기간 듀레이션 매칭)
+         Σ_i z_i = P,  z도 전체 기간 기준 듀레이션 매칭
+         Σ_{k∈y} m_k a_k,ISA (+ z_ISA) + s_y - s_{y-1} = 연 한도   (ISA 누적 한도)
+         a_k,청년도약 ≤ 월 한도, 만기 이후 구간은 0
+
+F, G는 optimize_portfolio와 같은 lp_returns로 계산한다 (ISA는 누적 과세 실효 수익률).
+
+제약 행렬은 구간별 블록 대각 구조에 ISA 이월 변수만 인접 연도를 잇는 형태라
+600개월 월별 문제도 HiGHS로 수십 ms 안에 풀린다.
+"""
+import math
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+from app.config import settings
+from app.models.asset import Asset, AssetClass, TaxBenefit
+from app.models.glide_path import GlidePathRequest, GlidePathResult, GlidePathStep
+from app.models.household import PrincipalAllocation
+from app.models.portfolio import AllocationItem
+from app.services.asset_universe import get_default_universe
+from app.services.gap_analyzer import _future_value_array
+from app.services.optimizer import lp_returns
+from app.services.rate_store import current_snapshot
+from app.services.tax import after_tax_return
+
+
+def _failure(message: str) -> GlidePathResult:
+    return GlidePathResult(success=False, steps=[], expected_future_value=0.0, message=message)
+
+
+def _growth_factors(
+    assets: list[Asset],
+    returns: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    horizon: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """구간별 월 1원 적립의 만기 가치 F (K, n)와 초기 자본 1원의 만기 가치 G (n,).
+
+    적립은 월말 납입이므로 t월 납입분은 (N - 1 - t)개월 동안 복리로 불어난다.
+    청년도약저축은 만기(또는 목표 시점) 이후 납입을 받지 않고, 만기 후에는 안전 금리로 재투자한다.
+    """
+    length = (ends - starts)[:, None]
+    F = (
+        _future_value_array(0.0, 1.0, returns[None, :], length)
+        * _future_value_array(1.0, 0.0, returns[None, :], (horizon - ends)[:, None])
+    )
+    G = _future_value_array(1.0, 0.0, returns, horizon)
+
+    maturity = min(horizon, settings.youth_savings_maturity_months)
+    safe_rate = after_tax_return(current_snapshot().base_interest_rate, TaxBenefit.NONE)
+    reinvest = _future_value_array(1.0, 0.0, safe_rate, horizon - maturity)
+    for i, asset in enumerate(assets):
+        if asset.asset_class == AssetClass.YOUTH_SAVINGS:
+            paid_until = np.minimum(ends, maturity)
+            paid = np.maximum(paid_until - starts, 0)
+            F[:, i] = (
+                _future_value_array(0.0, 1.0, returns[i], paid)
+                * _future_value_array(1.0, 0.0, returns[i], maturity - paid_until)
+                * reinvest
+            )
+            G[i] = 0.0
+    return F, G
+
+
+def optimize_glide_path(
+    request: GlidePathRequest,
+    assets: list[Asset] | None = None,
+    epsilon: float | None = None,
+) -> GlidePathResult:
+    """구간별 배분을 하나의 LP로 풀어 만기 미래가치를 최대화하는 글라이드 패스를 산출한다.
+
+    잔여 기간에서 ε을 뺀 값이 최장 듀레이션을 넘는 구간은 하한을 최장 듀레이션으로 낮춘다
+    (가능한 한 긴 자산으로 채운다).
+    """
+    if assets is None:
+        assets = get_default_universe(request.eligible_youth_savings)
+    if epsilon is None:
+        epsilon = settings.duration_epsilon
+
+    n = len(assets)
+    if n == 0:
+        return _failure("최적화 실패: 투자 가능한 자산이 없습니다.")
+
+    N = request.time_horizon_months
+    C = request.monthly_contribution
+    P = request.initial_principal
+    step = request.step_months
+
+    returns = lp_returns(assets, request)
+    durations = np.array([a.duration for a in assets])
+    d_min, d_max = float(durations.min()), float(durations.max())
+
+    starts = np.arange(0, N, step)
+    ends = np.minimum(starts + step, N)
+    K = len(starts)
+    remaining = (N - starts) / 12
+    hi = remaining + epsilon
+    lo = np.minimum(remaining - epsilon, d_max)
+
+    too_long = np.flatnonzero(hi < d_min)
+    if too_long.size:
+        k = int(too_long[0])
+        return _failure(
+            f"최적화 실패: 보유 자산의 최소 듀레이션({d_min:.1f}년)이 "
+            f"{starts[k]}개월차 목표 범위 상한({hi[k]:.1f}년)보다 깁니다."
+        )
+
+    F, G = _growth_factors(assets, returns, starts, ends, N)
+
+    isa = [i for i, a in enumerate(assets) if a.asset_class == AssetClass.ISA_DEPOSIT]
+    youth = [i for i, a in enumerate(assets) if a.asset_class == AssetClass.YOUTH_SAVINGS]
+    years = math.ceil(N / 12) if isa else 0
+
+    # 변수 배치: [a (K*n) | z (n) | s (years)]
+    a_idx = np.arange(K * n).reshape(K, n)
+    z_idx = K * n + np.arange(n)
+    s_idx = K * n + n + np.arange(years)
+    n_vars = K * n + n + years
+
+    c = -np.concatenate([F.ravel(), G, np.zeros(years)])
+
+    # 부등식: 구간별 듀레이션 밴드 2K행 + 초기 자본 밴드 2행
+    rows_ub = np.concatenate([
+        np.repeat(2 * np.arange(K), n),
+        np.repeat(2 * np.arange(K) + 1, n),
+        np.full(n, 2 * K),
+        np.full(n, 2 * K + 1),
+    ])
+    cols_ub = np.concatenate([a_idx.ravel(), a_idx.ravel(), z_idx, z_idx])
+    vals_ub = np.concatenate([
+        (durations[None, :] - hi[:, None]).ravel(),
+        (lo[:, None] - durations[None, :]).ravel(),
+        durations - (N / 12 + epsilon),
+        min(N / 12 - epsilon, d_max) - durations,
+    ])
+    A_ub = sp.csr_matrix((vals_ub, (rows_ub, cols_ub)), shape=(2 * K + 2, n_vars))
+    b_ub = np.zeros(2 * K + 2)
+
+    # 등식: 구간별 월 저축액 K행 + 초기 자본 1행 + ISA 연도별 이월 years행
+    rows_eq = [np.repeat(np.arange(K), n), np.full(n, K)]
+    cols_eq = [a_idx.ravel(), z_idx]
+    vals_eq = [np.ones(K * n), np.ones(n)]
+    b_eq = [np.full(K, C), [P]]
+    if isa:
+        i = isa[0]
+        year_of_step = starts // 12
+        rows_eq += [K + 1 + year_of_step, [K + 1], K + 1 + np.arange(years), K + 2 + np.arange(years - 1)]
+        cols_eq += [a_idx[:, i], [z_idx[i]], s_idx, s_idx[:-1]]
+        vals_eq += [(ends - starts).astype(float), [1.0], np.ones(years), -np.ones(years - 1)]
+        b_eq.append(np.full(years, settings.isa_annual_limit))
+        for j in isa[1:]:
+            # ISA 상품이 여럿이면 같은 한도를 공유한다
+            rows_eq += [K + 1 + year_of_step, [K + 1]]
+            cols_eq += [a_idx[:, j], [z_idx[j]]]
+            vals_eq += [(ends - starts).astype(float), [1.0]]
+    n_eq = K + 1 + years
+    A_eq = sp.csr_matrix(
+        (np.concatenate(vals_eq), (np.concatenate(rows_eq), np.concatenate(cols_eq))),
+        shape=(n_eq, n_vars),
+    )
+    b_eq = np.concatenate(b_eq)
+
+    lower = np.zeros(n_vars)
+    upper = np.full(n_vars, np.inf)
+    maturity = min(N, settings.youth_savings_maturity_months)
+    for i in youth:
+        upper[a_idx[:, i]] = np.where(starts < maturity, settings.youth_savings_monthly_limit, 0.0)
+        upper[z_idx[i]] = 0.0  # 적립식 상품: 거치 불가
+
+    result = linprog(
+        c,
+        A_ub=A_ub,
+        b_ub=b_ub,
+        A_eq=A_eq,
+        b_eq=b_eq,
+        bounds=np.column_stack([lower, upper]),
+        method="highs",
+    )
+
+    if not result.success:
+        return _failure("최적화 실패: 제약 조건 조합이 동시에 만족 불가합니다.")
+
+    a = result.x[: K * n].reshape(K, n)
+    z = result.x[K * n: K * n + n]
+    weights = a / C
+
+    steps: list[GlidePathStep] = []
+    for k in range(K):
+        w = weights[k]
+        allocations = [
+            AllocationItem(
+                asset_class=assets[i].asset_class,
+                name=assets[i].name,
+                weight=round(float(w[i]), 4),
+                monthly_amount=round(float(a[k, i]), 0),
+                duration_contribution=round(float(w[i] * durations[i]), 4),
+                after_tax_return=round(float(returns[i]), 6),
+            )
+            for i in range(n)
+            if w[i] >= 1e-6
+        ]
+        steps.append(
+            GlidePathStep(
+                start_month=int(starts[k]),
+                months=int(ends[k] - starts[k]),
+                remaining_years=round(float(remaining[k]), 4),
+                allocations=allocations,
+                portfolio_duration=round(float(w @ durations), 4),
+                portfolio_return=round(float(w @ returns), 6),
+            )
+        )
+
+    principal_allocations = [
+        PrincipalAllocation(
+            asset_class=assets[i].asset_class, name=assets[i].name, amount=round(float(z[i]), 0)
+        )
+        for i in range(n)
+        if z[i] >= 1.0
+    ]
+
+    expected_fv = float(-result.fun)
+    message = "최적화 완료"
+    if (remaining - epsilon > d_max).any():
+        message += (
+            f" (잔여 기간이 최장 듀레이션({d_max:.1f}년)을 넘는 구간은 최장 듀레이션 자산으로 채웠습니다)"
+        )
+
+    return GlidePathResult(
+        success=True,
+        steps=steps,
+        principal_allocations=principal_allocations,
+        expected_future_value=round(expected_fv, 0),
+        goal_achievable=expected_fv >= request.goal_amount,
+        message=message,
+    )
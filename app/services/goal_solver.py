@@ -0,0 +1,212 @@
+"""목표 역산: 최소 월 저축액, 최소 목표 기간, 최대 달성 가능 목표 금액.
+
+/optimize 파이프라인에서 목표 달성은 다음과 같다.
+    안전자산 미래가치 ≥ 목표  또는  듀레이션 매칭 최적 수익률 r* ≥ 필요 수익률
+미래가치는 수익률에 대해 증가하므로, 이는 실효 수익률 ρ = max(안전 금리, r*)로 계산한
+미래가치가 목표 이상인 것과 같다. r*는 월 저축액(한도 비중)과 기간(듀레이션 밴드)에 따라 변하므로
+연금 공식의 닫힌 해로 탐색 구간을 정하고, 배치 LP로 구한 ρ 위에서 단조 탐색한다.
+"""
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+from app.config import settings
+from app.models.asset import Asset
+from app.models.goal import GoalInput
+from app.models.goal_solver import GoalSolution
+from app.services.asset_universe import get_default_universe
+from app.services.batch_lp import asset_upper_bounds, duration_band, solve_batch
+from app.services.gap_analyzer import _future_value_array
+from app.services.rate_store import current_snapshot
+from app.services.tax import effective_after_tax_returns
+
+MAX_HORIZON_MONTHS = 600
+
+
+class GoalTargets(NamedTuple):
+    min_monthly_contribution: np.ndarray  # (B,) 원
+    min_time_horizon_months: np.ndarray  # (B,) 개월, 불가능하면 -1
+    max_goal_amount: np.ndarray  # (B,) 원
+    achievable: np.ndarray  # (B,) 현재 입력으로 달성 가능 여부
+
+
+def _annuity_factor(annual_rate: np.ndarray, months: np.ndarray) -> np.ndarray:
+    return _future_value_array(0.0, 1.0, annual_rate, months)
+
+
+def _growth_factor(annual_rate: np.ndarray, months: np.ndarray) -> np.ndarray:
+    return _future_value_array(1.0, 0.0, annual_rate, months)
+
+
+def _required_contribution(goal, principal, rate, months) -> np.ndarray:
+    """수익률 rate에서 목표에 도달하는 월 저축액 (연금 공식 역산)."""
+    shortfall = goal - principal * _growth_factor(rate, months)
+    return np.maximum(shortfall, 0.0) / _annuity_factor(rate, months)
+
+
+def _required_months(goal, principal, monthly, rate) -> np.ndarray:
+    """수익률 rate에서 목표에 도달하는 최소 개월 수의 연속 근사 (연금 공식 역산)."""
+    r_m = np.asarray(rate, dtype=float) / 12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(r_m != 0, monthly / np.where(r_m != 0, r_m, 1.0), np.inf)
+        ratio = (goal + annuity) / (principal + annuity)
+        compound = np.log(ratio) / np.log1p(r_m)
+        linear = (goal - principal) / monthly
+    months = np.where(r_m != 0, compound, linear)
+    return np.where(goal <= principal, 0.0, np.where(np.isfinite(months), months, np.inf))
+
+
+class _RateModel:
+    """(월 저축액, 기간)별 실효 수익률 ρ = max(안전 금리, r*)."""
+
+    def __init__(self, assets: list[Asset], safe_rate: float, epsilon: float):
+        self.assets = assets
+        self.safe_rate = safe_rate
+        self.epsilon = epsilon
+        self.durations = np.array([a.duration for a in assets])
+
+    @property
+    def max_matchable_months(self) -> int:
+        """듀레이션 밴드를 맞출 수 있는 최장 기간. 그 이후로는 안전 금리만 적용된다."""
+        if not self.assets:
+            return 0
+        return math.floor((self.durations.max() + self.epsilon) * 12 + 1e-9)
+
+    def __call__(self, principal: np.ndarray, monthly: np.ndarray, months: np.ndarray) -> np.ndarray:
+        principal, monthly, months = np.broadcast_arrays(
+            np.asarray(principal, dtype=float),
+            np.asarray(monthly, dtype=float),
+            np.asarray(months, dtype=float),
+        )
+        if not self.assets:
+            return np.full(monthly.shape, self.safe_rate)
+        lo, hi = duration_band(months.ravel() / 12, self.epsilon)
+        upper = asset_upper_bounds(self.assets, monthly.ravel())
+        # optimize_portfolio와 같은 목적함수 (ISA는 한도 비중에서의 실효 세후 수익률)
+        returns = effective_after_tax_returns(
+            self.assets, principal.ravel(), monthly.ravel(), months.ravel(), upper
+        )
+        solution = solve_batch(returns, self.durations, lo, hi, upper)
+        best = np.where(solution.feasible, solution.objective, -np.inf)
+        return np.maximum(best, self.safe_rate).reshape(monthly.shape)
+
+
+def solve_goal_targets(
+    goal_amount: np.ndarray,
+    initial_principal: np.ndarray,
+    monthly_contribution: np.ndarray,
+    time_horizon_months: np.ndarray,
+    assets: list[Asset],
+    safe_rate: float | None = None,
+    epsilon: float | None = None,
+    max_months: int = MAX_HORIZON_MONTHS,
+) -> GoalTargets:
+    """같은 자산 유니버스를 쓰는 여러 목표의 역산 값을 한 번에 계산한다.
+
+    - 최소 월 저축액: 현재 기간에서 목표에 도달하는 최소 월 저축액
+    - 최소 목표 기간: 현재 월 저축액으로 목표에 도달하는 최소 개월 수 (max_months 이내)
+    - 최대 목표 금액: 현재 월 저축액/기간으로 도달 가능한 최대 금액
+    """
+    if safe_rate is None:
+        safe_rate = current_snapshot().base_interest_rate
+    if epsilon is None:
+        epsilon = settings.duration_epsilon
+
+    goal, principal, monthly, months = (
+        np.asarray(a, dtype=float)
+        for a in np.broadcast_arrays(
+            goal_amount, initial_principal, monthly_contribution, time_horizon_months
+        )
+    )
+    rate = _RateModel(assets, safe_rate, epsilon)
+
+    # 최대 목표 금액: 현재 조건의 실효 수익률로 계산한 미래가치
+    current_rate = rate(principal, monthly, months)
+    max_goal = _future_value_array(principal, monthly, current_rate, months)
+    achievable = max_goal >= goal
+
+    # 최소 월 저축액: ρ는 월 저축액이 늘수록 (한도 비중이 줄어) 감소하므로
+    # 한도가 비중 1인 경우(ρ 최대)와 0에 수렴하는 경우(ρ 최소)의 역산값이 해를 감싼다.
+    rate_max = rate(principal, np.full_like(goal, 1.0), months)
+    rate_min = rate(principal, np.full_like(goal, 1e15), months)
+    lo = _required_contribution(goal, principal, rate_max, months)
+    hi = _required_contribution(goal, principal, rate_min, months)
+
+    def reaches(c: np.ndarray) -> np.ndarray:
+        return _future_value_array(principal, c, rate(principal, c, months), months) >= goal
+
+    hi = np.where(reaches(hi), hi, hi * 2)
+    for _ in range(100):
+        active = hi - lo > 1.0
+        if not active.any():
+            break
+        mid = (lo + hi) / 2
+        ok = reaches(mid)
+        hi = np.where(active & ok, mid, hi)
+        lo = np.where(active & ~ok, mid, lo)
+    min_monthly = np.ceil(hi)
+
+    # 최소 목표 기간: 듀레이션 매칭이 가능한 구간은 개월별로 모두 평가하고,
+    # 그 이후는 안전 금리의 연금 공식 역산으로 구한다.
+    min_months = np.full(goal.shape, -1, dtype=np.int64)
+    matchable = min(rate.max_matchable_months, max_months)
+    if matchable >= 1:
+        candidates = np.arange(1, matchable + 1, dtype=float)
+        grid_rate = rate(principal[..., None], monthly[..., None], candidates)
+        fv = _future_value_array(
+            principal[..., None], monthly[..., None], grid_rate, candidates
+        )
+        hit = fv >= goal[..., None]
+        first = np.argmax(hit, axis=-1)
+        min_months = np.where(hit.any(axis=-1), first + 1, -1)
+
+    safe_months = np.ceil(_required_months(goal, principal, monthly, safe_rate) - 1e-9)
+    safe_months = np.maximum(safe_months, 1)
+    fallback = (min_months < 0) & (safe_months <= max_months)
+    safe_months_int = np.where(fallback, safe_months, 1).astype(np.int64)
+    # 부동소수점 오차로 한 달 모자란 경우 보정
+    short = _future_value_array(principal, monthly, safe_rate, safe_months_int) < goal
+    safe_months_int = np.where(short, safe_months_int + 1, safe_months_int)
+    min_months = np.where(
+        fallback & (safe_months_int <= max_months), safe_months_int, min_months
+    )
+
+    return GoalTargets(min_monthly, min_months, max_goal, achievable)
+
+
+def solve_goal(
+    goal: GoalInput,
+    assets: list[Asset] | None = None,
+    safe_rate: float | None = None,
+    epsilon: float | None = None,
+) -> GoalSolution:
+    """목표 하나에 대해 최소 월 저축액, 최소 기간, 최대 목표 금액을 계산한다."""
+    if assets is None:
+        assets = get_default_universe(goal.eligible_youth_savings)
+
+    targets = solve_goal_targets(
+        np.array([goal.goal_amount]),
+        np.array([goal.initial_principal]),
+        np.array([goal.monthly_contribution]),
+        np.array([goal.time_horizon_months]),
+        assets,
+        safe_rate=safe_rate,
+        epsilon=epsilon,
+    )
+    months = int(targets.min_time_horizon_months[0])
+    return GoalSolution(
+        goal_achievable=bool(targets.achievable[0]),
+        min_monthly_contribution=float(targets.min_monthly_contribution[0]),
+        min_time_horizon_months=months if months > 0 else None,
+        max_goal_amount=float(np.floor(targets.max_goal_amount[0])),
+    )
+
+
+def suggestion_message(solution: GoalSolution) -> str:
+    """목표 미달 시 구체적인 조정 방안 문구."""
+    options = [f"월 저축액을 {solution.min_monthly_contribution:,.0f}원 이상으로 늘리거나"]
+    if solution.min_time_horizon_months is not None:
+        options.append(f"목표 기간을 {solution.min_time_horizon_months}개월 이상으로 연장하거나")
+    options.append(f"목표 금액을 {solution.max_goal_amount:,.0f}원 이하로 낮춰주세요.")
+    return " ".join(options)
@@ -0,0 +1,154 @@
+"""최적 포트폴리오의 민감도 (그릭스).
+
+듀레이션 매칭 LP의 최적 기저가 고정되면 비중은 우변(듀레이션 밴드, 상품 한도 비중)의 1차 함수다.
+- 기저 변수가 한 개: w_a = 1 - Σ u (상한 자산 u는 한도 비중)
+- 기저 변수가 두 개: Σw = 1과 활성 듀레이션 경계 Σ w D = target을 연립해 푼다
+따라서 ∂w/∂θ는 같은 2×2 계를 우변의 도함수로 한 번 더 풀면 얻는다.
+기저는 비중에서 복원하므로 솔버의 쌍대 값을 읽지 않는다 (duration_shadow_price는 기저로 계산한 쌍대 가격).
+
+매개변수 θ와 우변의 관계:
+- 목표 기간 n(개월): 활성 경계 target = n/12 ± ε → ∂target/∂n = 1/12
+- ε: 상한이 활성이면 +1, 하한이면 -1
+- 월 저축액 C: 한도 비중 u_i = limit_i / C → ∂u_i/∂C = -u_i / C
+
+수익률 R = Σ w_i r_i에서 r은 lp_returns(ISA는 누적 과세 실효 수익률)라 P, C, n에도 의존하므로
+∂R/∂θ = (∂w/∂θ) · r + w · ∂r/∂θ 이고, ∂r/∂θ는 tax.effective_after_tax_return_partials로 정확히 구한다.
+금리 민감도는 모든 자산의 세전 수익률이 같은 폭으로 움직일 때의 도함수로, 비중은 수익률에 의존하지 않는다.
+
+예상 미래가치는 원장(ledger_future_value: 한도 이월, 청년도약저축 만기 재예치, ISA 누적 과세) 기준이다.
+원장은 한도·세금 때문에 구간별로만 매끄러우므로 닫힌 형태 대신 기저를 따라 (w + h ∂w/∂θ, θ + h)로
+움직인 원장 가치의 중앙 차분으로 계산한다. 목표 기간은 원장이 개월 단위라 ±1개월 차분이다.
+"""
+import numpy as np
+
+from app.models.asset import Asset
+from app.models.goal import GoalInput
+from app.models.portfolio import PlanSensitivities
+from app.services.basis_cache import recover_basis
+from app.services.batch_lp import LPBasis, asset_upper_bounds, duration_band
+from app.services.ledger import after_tax_terminal_values
+from app.services.tax import effective_after_tax_return_partials
+
+# 원장 중앙 차분의 상대 보폭
+_LEDGER_STEP = 1e-4
+
+
+def _weight_derivatives(
+    basis: LPBasis, durations: np.ndarray, d_target: np.ndarray, d_upper: np.ndarray
+) -> np.ndarray:
+    """활성 경계와 상한 비중이 움직일 때 기저를 고정한 비중의 도함수 (K, n).
+
+    Args:
+        d_target: 매개변수별 활성 듀레이션 경계의 도함수 (K,)
+        d_upper: 매개변수별 자산 상한 비중의 도함수 (K, n)
+    """
+    K, n = d_upper.shape
+    dw = np.zeros((K, n))
+    at_upper = list(basis.at_upper)
+    dw[:, at_upper] = d_upper[:, at_upper]
+    d_mass = d_upper[:, at_upper].sum(axis=1)
+    d_duration = (d_upper[:, at_upper] * durations[at_upper]).sum(axis=1)
+
+    a = basis.basic[0]
+    if len(basis.basic) == 1:
+        dw[:, a] = -d_mass
+        return dw
+    b = basis.basic[1]
+    target = d_target if basis.side != 0 else np.zeros(K)
+    dw[:, a] = (target - d_duration + durations[b] * d_mass) / (durations[a] - durations[b])
+    dw[:, b] = -d_mass - dw[:, a]
+    return dw
+
+
+def _ledger_partials(
+    assets: list[Asset], weights: np.ndarray, dw: np.ndarray, goal: GoalInput
+) -> tuple[float, ...]:
+    """원장 세후 만기 가치의 (∂/∂n, ∂/∂ε, ∂/∂C, ∂/∂금리, ∂/∂P). dw는 (n, ε, C) 순서의 비중 도함수다."""
+    P, C, months = goal.initial_principal, goal.monthly_contribution, goal.time_horizon_months
+    gross = np.array([a.gross_return for a in assets])
+
+    def value(w: np.ndarray, principal: float = P, monthly: float = C, n: int = months) -> float:
+        return float(after_tax_terminal_values(assets, w, principal, monthly, n).sum())
+
+    if months > 1:
+        d_month = (value(weights + dw[0], n=months + 1) - value(weights - dw[0], n=months - 1)) / 2
+    else:
+        d_month = value(weights + dw[0], n=months + 1) - value(weights)
+
+    h = _LEDGER_STEP
+    d_epsilon = (value(weights + h * dw[1]) - value(weights - h * dw[1])) / (2 * h)
+
+    h_c = _LEDGER_STEP * C
+    d_contribution = (
+        value(weights + h_c * dw[2], monthly=C + h_c) - value(weights - h_c * dw[2], monthly=C - h_c)
+    ) / (2 * h_c)
+
+    h_p = _LEDGER_STEP * max(P, C)
+    if P >= h_p:
+        d_principal = (value(weights, principal=P + h_p) - value(weights, principal=P - h_p)) / (2 * h_p)
+    else:  # 초기 자본은 음수가 될 수 없으므로 0에서는 오른쪽 도함수
+        d_principal = (value(weights, principal=P + h_p) - value(weights, principal=P)) / h_p
+
+    h_r = _LEDGER_STEP * 0.1
+    shifted = after_tax_terminal_values(
+        assets, weights, P, C, months, gross[None, :] + np.array([[h_r], [-h_r]])
+    ).sum(axis=1)
+    d_rate = (shifted[0] - shifted[1]) / (2 * h_r)
+    return d_month, d_epsilon, d_contribution, d_rate, d_principal
+
+
+def duration_shadow_price(basis: LPBasis, returns: np.ndarray, durations: np.ndarray) -> float:
+    """활성 듀레이션 경계의 쌍대 가격 ∂R/∂target (활성 경계가 없으면 0)."""
+    if basis.side == 0 or len(basis.basic) < 2:
+        return 0.0
+    a, b = basis.basic
+    return float((returns[a] - returns[b]) / (durations[a] - durations[b]))
+
+
+def plan_sensitivities(
+    assets: list[Asset],
+    weights: np.ndarray,
+    returns: np.ndarray,
+    durations: np.ndarray,
+    goal: GoalInput,
+    epsilon: float,
+) -> PlanSensitivities | None:
+    """최적 비중의 기저를 복원해 수익률과 예상 미래가치의 민감도를 계산한다.
+
+    기저를 복원할 수 없으면 (퇴화 해) None을 반환한다.
+    """
+    P, C, months = goal.initial_principal, goal.monthly_contribution, goal.time_horizon_months
+    lo, hi = duration_band(months / 12, epsilon)
+    upper = asset_upper_bounds(assets, C)[0]
+    basis = recover_basis(weights, durations, float(lo[0]), float(hi[0]), upper)
+    if basis is None:
+        return None
+
+    # 매개변수 순서: 목표 기간(개월), ε, 월 저축액
+    n = len(assets)
+    capped = upper < 1.0
+    d_upper = np.zeros((3, n))
+    d_upper[2] = np.where(capped, -upper / C, 0.0)
+    d_target = np.array([1 / 12, float(basis.side), 0.0])
+    dw = _weight_derivatives(basis, durations, d_target, d_upper)
+
+    # lp_returns의 편미분: ISA 실효 수익률은 P, C, n과 (C를 통해) 한도 비중에 의존한다
+    dr = effective_after_tax_return_partials(assets, P, C, months, upper)
+    d_returns = np.stack([dr.months, np.zeros(n), dr.monthly + dr.position * d_upper[2]])
+    d_return = dw @ returns + d_returns @ weights
+
+    fv_month, fv_epsilon, fv_contribution, fv_rate, fv_principal = _ledger_partials(
+        assets, weights, dw, goal
+    )
+    return PlanSensitivities(
+        return_per_month=float(d_return[0]),
+        return_per_epsilon=float(d_return[1]),
+        return_per_contribution=float(d_return[2]),
+        return_per_rate=float(weights @ dr.gross),
+        future_value_per_month=round(fv_month, 2),
+        future_value_per_epsilon=round(fv_epsilon, 2),
+        future_value_per_contribution=round(fv_contribution, 6),
+        future_value_per_rate=round(fv_rate, 2),
+        future_value_per_principal=round(fv_principal, 6),
+        duration_shadow_price=duration_shadow_price(basis, returns, durations),
+    )
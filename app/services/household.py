@@ -0,0 +1,294 @@
+"""가구 단위 다중 목표 최적화.
+
+여러 목표가 하나의 월 예산과 청년도약저축/ISA 한도를 공유한다.
+목표별로 따로 optimize_portfolio를 호출하는 대신 하나의 희소 LP로 푼다.
+
+변수 (목표 g, 자산 i):
+    x_gi: 목표 g의 월 저축액 중 자산 i 투입액 (원)
+    z_gi: 목표 g의 초기 자본 중 자산 i 배분액 (원)
+
+    max  Σ_g FV_g / goal_g                     (목표별 충족률 합)
+    s.t. Σ_gi x_gi ≤ 월 예산
+         (T_g - ε) Σ_i x_gi ≤ Σ_i D_i x_gi ≤ (T_g + ε) Σ_i x_gi   (z_g도 동일)
+         FV_g = Σ_i AF_i(n_g) x_gi + Σ_i G_i(n_g) z_gi ≥ goal_g
+         Σ_i z_gi = P_g
+         Σ_g x_g,청년도약 ≤ 월 한도,  Σ_g (12 x_g,ISA + z_g,ISA) ≤ 연 한도
+
+AF_i(n), G_i(n)은 자산 i의 세후 수익률로 계산한 적립식/거치식 미래가치 계수다.
+ISA는 optimize_portfolio(lp_returns)처럼 목표 기간과 초기 자본별 누적 과세 실효 수익률을 쓴다.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+from app.config import settings
+from app.models.asset import Asset, AssetClass
+from app.models.household import (
+    GoalAllocation,
+    HouseholdInput,
+    HouseholdResult,
+    PrincipalAllocation,
+)
+from app.models.portfolio import AllocationItem
+from app.services.asset_universe import get_default_universe
+from app.services.batch_lp import asset_upper_bounds
+from app.services.gap_analyzer import _future_value_array
+from app.services.tax import effective_after_tax_returns
+
+
+class _SparseBuilder:
+    """COO 형식으로 제약 행을 쌓는다."""
+
+    def __init__(self, n_cols: int):
+        self.n_cols = n_cols
+        self.rows: list[np.ndarray] = []
+        self.cols: list[np.ndarray] = []
+        self.vals: list[np.ndarray] = []
+        self.rhs: list[float] = []
+
+    def add(self, cols: np.ndarray, vals: np.ndarray, rhs: float) -> None:
+        self.rows.append(np.full(len(cols), len(self.rhs)))
+        self.cols.append(np.asarray(cols))
+        self.vals.append(np.asarray(vals, dtype=float))
+        self.rhs.append(rhs)
+
+    def build(self) -> tuple[sp.csr_matrix | None, np.ndarray | None]:
+        if not self.rhs:
+            return None, None
+        matrix = sp.csr_matrix(
+            (np.concatenate(self.vals), (np.concatenate(self.rows), np.concatenate(self.cols))),
+            shape=(len(self.rhs), self.n_cols),
+        )
+        return matrix, np.array(self.rhs)
+
+
+class _HouseholdLP(NamedTuple):
+    returns: np.ndarray  # 목표별 세후 수익률 (G, n)
+    annuity: np.ndarray  # 적립식 미래가치 계수 (G, n)
+    growth: np.ndarray  # 거치식 미래가치 계수 (G, n)
+    c: np.ndarray
+    A_ub: sp.csr_matrix
+    b_ub: np.ndarray
+    A_eq: sp.csr_matrix | None
+    b_eq: np.ndarray | None
+    bounds: list[tuple[float, float | None]]
+    budget_row: int
+
+
+def _household_lp(
+    household: HouseholdInput, assets: list[Asset], epsilon: float, budget: float
+) -> _HouseholdLP:
+    """월 예산 budget 기준의 가구 LP.
+
+    목표별 세후 수익률은 월 예산 전체를 한 목표에 넣을 때의 lp_returns와 같아서
+    (ISA는 한도 비중에서의 누적 과세 실효 수익률) 예산에 따라 조금씩 달라진다.
+    """
+    goals = household.goals
+    G, n = len(goals), len(assets)
+    durations = np.array([a.duration for a in assets])
+    months = np.array([g.time_horizon_months for g in goals], dtype=float)
+    T = months / 12
+    amounts = np.array([g.goal_amount for g in goals])
+    principals = np.array([g.initial_principal for g in goals])
+
+    upper = np.broadcast_to(asset_upper_bounds(assets, budget), (G, n))
+    returns = effective_after_tax_returns(assets, principals, budget, months, upper)
+
+    # 자산별 미래가치 계수 (G, n)
+    annuity = _future_value_array(0.0, 1.0, returns, months[:, None])
+    growth = _future_value_array(1.0, 0.0, returns, months[:, None])
+
+    n_vars = 2 * G * n
+    x_idx = np.arange(G * n).reshape(G, n)
+    z_idx = G * n + x_idx
+
+    # 목적함수: 목표별 충족률 합 최대화 (linprog는 minimize)
+    c = -np.concatenate([(annuity / amounts[:, None]).ravel(), (growth / amounts[:, None]).ravel()])
+
+    ub = _SparseBuilder(n_vars)
+    eq = _SparseBuilder(n_vars)
+
+    for g in range(G):
+        # 1. 듀레이션 매칭 (월 저축, 초기 자본 각각)
+        for idx in (x_idx[g], z_idx[g]):
+            ub.add(idx, durations - (T[g] + epsilon), 0.0)
+            ub.add(idx, (T[g] - epsilon) - durations, 0.0)
+
+        # 2. 목표 달성: FV_g ≥ goal_g
+        ub.add(np.concatenate([x_idx[g], z_idx[g]]),
+               -np.concatenate([annuity[g], growth[g]]), -amounts[g])
+
+        # 3. 초기 자본 배분: Σ_i z_gi = P_g
+        eq.add(z_idx[g], np.ones(n), principals[g])
+
+    # 4. 월 예산
+    budget_row = len(ub.rhs)
+    ub.add(x_idx.ravel(), np.ones(G * n), budget)
+
+    # 5. 공유 한도: 청년도약저축 월 한도, ISA 연 한도
+    bounds = [(0.0, None)] * n_vars
+    for i, asset in enumerate(assets):
+        if asset.asset_class == AssetClass.YOUTH_SAVINGS:
+            ub.add(x_idx[:, i], np.ones(G), settings.youth_savings_monthly_limit)
+            for g in range(G):
+                bounds[z_idx[g, i]] = (0.0, 0.0)  # 적립식 상품: 거치 불가
+        elif asset.asset_class == AssetClass.ISA_DEPOSIT:
+            ub.add(np.concatenate([x_idx[:, i], z_idx[:, i]]),
+                   np.concatenate([np.full(G, 12.0), np.ones(G)]), settings.isa_annual_limit)
+
+    A_ub, b_ub = ub.build()
+    A_eq, b_eq = eq.build()
+    return _HouseholdLP(returns, annuity, growth, c, A_ub, b_ub, A_eq, b_eq, bounds, budget_row)
+
+
+def _minimum_budget(
+    household: HouseholdInput,
+    assets: list[Asset],
+    epsilon: float,
+    lp: _HouseholdLP,
+    max_rounds: int = 5,
+) -> float | None:
+    """모든 목표를 달성하는 최소 월 예산. 예산 제약을 빼고 총 월 저축액을 최소화한다.
+
+    세후 수익률이 예산에 따라 달라지므로 찾은 예산에서 수익률을 다시 계산해 값이 멈출 때까지 반복한다.
+    """
+    size = len(household.goals) * len(assets)
+    minimum_budget = None
+    for _ in range(max_rounds):
+        keep = np.arange(lp.A_ub.shape[0]) != lp.budget_row
+        minimum = linprog(
+            np.concatenate([np.ones(size), np.zeros(size)]),
+            A_ub=lp.A_ub[keep], b_ub=lp.b_ub[keep], A_eq=lp.A_eq, b_eq=lp.b_eq, bounds=lp.bounds,
+            method="highs",
+        )
+        if not minimum.success:
+            return None
+        found = float(np.ceil(minimum.fun))
+        if found == minimum_budget:
+            break
+        minimum_budget = found
+        lp = _household_lp(household, assets, epsilon, found)
+    return minimum_budget
+
+
+def _diagnose_household(
+    household: HouseholdInput,
+    assets: list[Asset],
+    epsilon: float,
+    minimum_budget: float | None,
+) -> str:
+    """LP 실패 시 원인을 진단한다."""
+    d_max = max(a.duration for a in assets)
+    unmatched = [
+        g.label for g in household.goals if g.time_horizon_months / 12 - epsilon > d_max
+    ]
+    if unmatched:
+        return (
+            "최적화 실패: 보유 자산의 최대 듀레이션"
+            f"({d_max:.1f}년)으로 듀레이션 매칭이 불가능한 목표가 있습니다: "
+            + ", ".join(unmatched)
+        )
+    if minimum_budget is not None:
+        return (
+            "최적화 실패: 모든 목표를 달성하려면 월 예산이 최소 "
+            f"{minimum_budget:,.0f}원 필요합니다 (현재 {household.monthly_budget:,.0f}원)."
+        )
+    return "최적화 실패: 제약 조건 조합이 동시에 만족 불가합니다."
+
+
+def optimize_household(
+    household: HouseholdInput,
+    assets: list[Asset] | None = None,
+    epsilon: float | None = None,
+) -> HouseholdResult:
+    """가구의 여러 목표에 월 예산과 상품 한도를 배분하는 최적 포트폴리오를 산출한다."""
+    if assets is None:
+        assets = get_default_universe(household.eligible_youth_savings)
+    if epsilon is None:
+        epsilon = settings.duration_epsilon
+
+    goals = household.goals
+    G, n = len(goals), len(assets)
+
+    if n == 0:
+        return HouseholdResult(
+            success=False,
+            goals=[],
+            monthly_budget=household.monthly_budget,
+            budget_used=0.0,
+            message="최적화 실패: 투자 가능한 자산이 없습니다.",
+        )
+
+    lp = _household_lp(household, assets, epsilon, household.monthly_budget)
+    returns, annuity, growth = lp.returns, lp.annuity, lp.growth
+    durations = np.array([a.duration for a in assets])
+    asset_pos = np.arange(n)
+
+    result = linprog(lp.c, A_ub=lp.A_ub, b_ub=lp.b_ub, A_eq=lp.A_eq, b_eq=lp.b_eq,
+                     bounds=lp.bounds, method="highs")
+
+    if not result.success:
+        return HouseholdResult(
+            success=False,
+            goals=[],
+            monthly_budget=household.monthly_budget,
+            budget_used=0.0,
+            message=_diagnose_household(
+                household, assets, epsilon, _minimum_budget(household, assets, epsilon, lp)
+            ),
+        )
+
+    x = result.x[: G * n].reshape(G, n)
+    z = result.x[G * n:].reshape(G, n)
+
+    goal_results: list[GoalAllocation] = []
+    for g, goal in enumerate(goals):
+        monthly = float(x[g].sum())
+        weights = x[g] / monthly if monthly > 1e-6 else np.zeros(n)
+
+        allocations = [
+            AllocationItem(
+                asset_class=assets[i].asset_class,
+                name=assets[i].name,
+                weight=round(float(weights[i]), 4),
+                monthly_amount=round(float(x[g, i]), 0),
+                duration_contribution=round(float(weights[i] * durations[i]), 4),
+                after_tax_return=round(float(returns[g, i]), 6),
+            )
+            for i in asset_pos
+            if weights[i] >= 1e-6
+        ]
+        principal_allocations = [
+            PrincipalAllocation(
+                asset_class=assets[i].asset_class,
+                name=assets[i].name,
+                amount=round(float(z[g, i]), 0),
+            )
+            for i in asset_pos
+            if z[g, i] >= 1.0
+        ]
+        fv = float(annuity[g] @ x[g] + growth[g] @ z[g])
+
+        goal_results.append(
+            GoalAllocation(
+                label=goal.label,
+                goal_amount=goal.goal_amount,
+                time_horizon_months=goal.time_horizon_months,
+                monthly_amount=round(monthly, 0),
+                allocations=allocations,
+                principal_allocations=principal_allocations,
+                portfolio_duration=round(float(weights @ durations), 4),
+                portfolio_return=round(float(weights @ returns[g]), 6),
+                expected_future_value=round(fv, 0),
+            )
+        )
+
+    return HouseholdResult(
+        success=True,
+        goals=goal_results,
+        monthly_budget=household.monthly_budget,
+        budget_used=round(float(x.sum()), 0),
+        message="최적화 완료",
+    )
@@ -0,0 +1,181 @@
+"""프로세스 내 비동기 작업 큐.
+
+오래 걸리는 분석(수천 개 시나리오 시뮬레이션, 다수 목표 최적화)을 요청 워커에서 떼어
+작업 스레드 풀에서 실행하고, 작업 ID로 상태·진행률·결과를 조회한다.
+- 큐 깊이: 대기 + 실행 중 작업이 max_pending에 이르면 새 작업을 거절한다 (QueueFullError)
+- 결과 보관: 끝난 작업은 ttl초 뒤 조회·제출 시점에 지운다
+- 취소: 대기 중이면 바로 취소하고, 실행 중이면 다음 progress() 호출에서 JobCancelled로 멈춘다
+
+작업은 제출 시점의 금리 스냅샷에 고정되어 실행된다 (요청과 같은 규약).
+numpy와 HiGHS가 무거운 계산 중 GIL을 놓으므로 스레드 풀로 충분하다.
+"""
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any
+
+from app.config import settings
+from app.models.jobs import JobInfo, JobStatus
+from app.services.rate_store import RateSnapshot, current_snapshot, pinned
+
+_ACTIVE = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class QueueFullError(RuntimeError):
+    """대기 + 실행 중 작업 수가 상한에 이르렀다."""
+
+
+class JobCancelled(Exception):
+    """실행 중 취소 요청을 확인했다."""
+
+
+class _Job:
+    __slots__ = (
+        "id", "kind", "snapshot", "status", "progress", "cancel_requested", "created_at",
+        "started_at", "finished_at", "expires_at", "error", "result", "future",
+    )
+
+    def __init__(self, kind: str, snapshot: RateSnapshot, now: float):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.snapshot = snapshot
+        self.status = JobStatus.QUEUED
+        self.progress = 0.0
+        self.cancel_requested = False
+        self.created_at = now
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.expires_at: float | None = None
+        self.error: str | None = None
+        self.result: Any = None
+        self.future: Future | None = None
+
+
+def _timestamp(value: float | None) -> datetime | None:
+    return None if value is None else datetime.fromtimestamp(value, timezone.utc)
+
+
+class JobContext:
+    """작업 함수에 넘기는 진행률 보고·취소 확인 창구."""
+
+    def __init__(self, job: _Job):
+        self._job = job
+
+    def progress(self, done: int, total: int) -> None:
+        """진행률을 갱신하고, 취소 요청이 있으면 JobCancelled를 던진다."""
+        if self._job.cancel_requested:
+            raise JobCancelled
+        self._job.progress = min(done / total, 1.0) if total > 0 else 1.0
+
+
+class JobManager:
+    """작업 스레드 풀, 작업 표, 만료 처리."""
+
+    def __init__(self, workers: int, max_pending: int, ttl: float, clock: Callable[[], float] = time.time):
+        self.workers = max(workers, 1)
+        self.max_pending = max(max_pending, 1)
+        self.ttl = ttl
+        self._clock = clock
+        self._jobs: dict[str, _Job] = {}
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None  # 첫 제출 때 만든다
+
+    def submit(self, kind: str, fn: Callable[[JobContext], Any]) -> JobInfo:
+        """fn(context)를 작업으로 등록하고 바로 반환한다. 큐가 가득 차면 QueueFullError."""
+        with self._lock:
+            self._purge()
+            pending = sum(job.status in _ACTIVE for job in self._jobs.values())
+            if pending >= self.max_pending:
+                raise QueueFullError(f"대기 중인 작업이 {pending}개로 상한에 도달했습니다.")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="gbi-job")
+            job = _Job(kind, current_snapshot(), self._clock())
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job, fn)
+            return self._info(job)
+
+    def get(self, job_id: str) -> JobInfo | None:
+        with self._lock:
+            self._purge()
+            job = self._jobs.get(job_id)
+            return None if job is None else self._info(job)
+
+    def cancel(self, job_id: str) -> JobInfo | None:
+        """취소를 요청한다. 대기 중이면 즉시 취소되고, 끝난 작업은 그대로 둔다."""
+        with self._lock:
+            self._purge()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status in _ACTIVE:
+                job.cancel_requested = True
+                if job.status == JobStatus.QUEUED and job.future.cancel():
+                    self._finish(job, JobStatus.CANCELLED)
+            return self._info(job)
+
+    def shutdown(self) -> None:
+        """대기 중인 작업을 버리고 실행 중인 작업에 취소를 요청한 뒤 스레드를 정리한다."""
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel_requested = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, job: _Job, fn: Callable[[JobContext], Any]) -> None:
+        with self._lock:
+            if job.cancel_requested:
+                self._finish(job, JobStatus.CANCELLED)
+                return
+            job.status = JobStatus.RUNNING
+            job.started_at = self._clock()
+        try:
+            with pinned(job.snapshot):
+                result = fn(JobContext(job))
+        except JobCancelled:
+            status, result, error = JobStatus.CANCELLED, None, None
+        except Exception as exc:  # 작업 실패는 상태로 돌려준다
+            status, result, error = JobStatus.FAILED, None, f"{type(exc).__name__}: {exc}"
+        else:
+            status, error = JobStatus.SUCCEEDED, None
+        with self._lock:
+            self._finish(job, status, result, error)
+
+    def _finish(self, job: _Job, status: JobStatus, result: Any = None, error: str | None = None) -> None:
+        now = self._clock()
+        job.status = status
+        job.result = result
+        job.error = error
+        if status == JobStatus.SUCCEEDED:
+            job.progress = 1.0
+        job.finished_at = now
+        job.expires_at = now + self.ttl
+
+    def _purge(self) -> None:
+        now = self._clock()
+        expired = [k for k, job in self._jobs.items() if job.expires_at is not None and job.expires_at <= now]
+        for k in expired:
+            del self._jobs[k]
+
+    @staticmethod
+    def _info(job: _Job) -> JobInfo:
+        return JobInfo(
+            id=job.id,
+            kind=job.kind,
+            status=job.status,
+            progress=round(job.progress, 4),
+            cancel_requested=job.cancel_requested,
+            rate_snapshot_version=job.snapshot.version,
+            created_at=_timestamp(job.created_at),
+            started_at=_timestamp(job.started_at),
+            finished_at=_timestamp(job.finished_at),
+            expires_at=_timestamp(job.expires_at),
+            error=job.error,
+            result=job.result,
+        )
+
+
+job_manager = JobManager(settings.job_workers, settings.job_queue_size, settings.job_result_ttl)
@@ -0,0 +1,215 @@
+"""월 × 자산 현금 원장.
+
+_future_value는 자산마다 닫힌 형태의 연금 공식을 쓰지만 실제 납입 흐름은 구간별로 끊긴다.
+- ISA: 계획 연도(12개월)마다 누적 납입이 isa_annual_limit을 넘으면 나머지를 대체 자산으로 보낸다
+- 청년도약저축: 원금과 월 youth_savings_monthly_limit 초과분은 대체 자산으로, 만기(youth_savings_maturity_months)
+  이후 납입분은 전액 대체 자산으로 보내고 만기 잔고(정부 기여분 포함 수익률)는 대체 자산에 재예치한다
+- 대체 자산: 파킹통장/CMA, 없으면 한도가 없는 자산(모두 한도가 있으면 전체) 중 듀레이션이 가장 짧은 자산
+
+납입 일정은 수익률과 무관하게 배열 연산으로 한 번에 만들고,
+잔고는 Σ_s c_s · g^(t-s) = g^t · cumsum(c_s · g^-s)로 월 루프 없이 계산한다.
+시점 규약은 _future_value와 같다 (원금은 0개월, 월 납입은 매월 말).
+
+after_tax_terminal_values는 누적 과세 자산(ISA)을 세전 수익률로 불린 뒤 만기 순이익에
+비과세 한도와 분리과세를 적용한다 (tax.cumulative_tax).
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from app.config import settings
+from app.models.asset import Asset, AssetClass
+from app.models.goal import GoalInput
+from app.services.tax import accrual_returns, after_tax_returns, cumulative_tax
+
+
+class Ledger(NamedTuple):
+    balances: np.ndarray  # (months + 1, n) 월말 자산별 잔고
+    contributions: np.ndarray  # (months + 1, n) 한도·만기 반영 후 실제 납입액 (만기 재예치 포함)
+    spilled: np.ndarray  # (months + 1,) 한도·만기로 대체 자산에 넘긴 납입액
+
+
+# _grow가 한 번에 만드는 (행, 개월, 자산) 배열의 원소 수 상한 (float64 16MB)
+_GROW_CHUNK_ELEMENTS = 1 << 21
+
+
+def fallback_index(assets: list[Asset]) -> int:
+    """한도 초과분을 받을 대체 자산의 인덱스."""
+    for i, asset in enumerate(assets):
+        if asset.asset_class == AssetClass.PARKING:
+            return i
+    capped = (AssetClass.YOUTH_SAVINGS, AssetClass.ISA_DEPOSIT)
+    free = [i for i, a in enumerate(assets) if a.asset_class not in capped] or range(len(assets))
+    return min(free, key=lambda i: assets[i].duration)
+
+
+def contribution_schedule(
+    assets: list[Asset],
+    weights: np.ndarray,
+    principal: float,
+    monthly: float,
+    months: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """한도와 만기를 반영한 월별 납입 일정 (months + 1, n)과 이월액 (months + 1,).
+
+    청년도약저축 만기 잔고의 재예치는 수익률에 의존하므로 여기에 포함하지 않는다.
+    """
+    weights = np.asarray(weights, dtype=float)
+    t = np.arange(months + 1)
+    amounts = np.where(t == 0, principal, monthly)
+    desired = amounts[:, None] * weights[None, :]
+    schedule = desired.copy()
+
+    for i, asset in enumerate(assets):
+        if asset.asset_class == AssetClass.YOUTH_SAVINGS:
+            # 적립식 상품이라 원금(0개월)은 넣을 수 없다 (LP도 원금 배분을 0으로 고정한다)
+            active = (t >= 1) & (t <= settings.youth_savings_maturity_months)
+            schedule[:, i] = np.where(
+                active, np.minimum(desired[:, i], settings.youth_savings_monthly_limit), 0.0
+            )
+        elif asset.asset_class == AssetClass.ISA_DEPOSIT:
+            # 계획 연도별 누적 납입을 한도에서 자른 뒤 차분한다 (원금은 첫해에 포함)
+            year = np.maximum(t - 1, 0) // 12
+            cumulative = np.cumsum(desired[:, i])
+            start = np.concatenate([[0.0], cumulative])[np.searchsorted(year, year)]
+            within = np.minimum(cumulative - start, settings.isa_annual_limit)
+            previous = np.concatenate([[0.0], within[:-1]])
+            first_of_year = np.concatenate([[True], year[1:] != year[:-1]])
+            schedule[:, i] = within - np.where(first_of_year, 0.0, previous)
+
+    spilled = (desired - schedule).sum(axis=1)
+    schedule[:, fallback_index(assets)] += spilled
+    return schedule, spilled
+
+
+def _youth_maturity(assets: list[Asset], months: int) -> int | None:
+    """만기 재예치가 일어나는 자산 인덱스 (목표 기간 안에 만기가 오는 경우만)."""
+    if months <= settings.youth_savings_maturity_months:
+        return None
+    for i, asset in enumerate(assets):
+        if asset.asset_class == AssetClass.YOUTH_SAVINGS:
+            return i
+    return None
+
+
+def terminal_values(
+    assets: list[Asset],
+    weights: np.ndarray,
+    principal: float,
+    monthly: float,
+    months: int,
+    annual_returns: np.ndarray | None = None,
+) -> np.ndarray:
+    """만기 시점 자산별 잔고. annual_returns가 (S, n)이면 시나리오별 (S, n)을 반환한다."""
+    if annual_returns is None:
+        annual_returns = after_tax_returns(np.array([a.gross_return for a in assets]), assets)
+    schedule, _ = contribution_schedule(assets, weights, principal, monthly, months)
+    return _grow(assets, schedule, months, np.asarray(annual_returns, dtype=float))
+
+
+def _grow(assets: list[Asset], schedule: np.ndarray, months: int, returns: np.ndarray) -> np.ndarray:
+    """납입 일정을 수익률 (..., n)로 불린 만기 잔고 (..., n). 청년도약저축 만기 재예치를 포함한다.
+
+    수익률 행마다 (개월 + 1, n) 배열을 만들므로, 메모리가 시나리오 수에 비례하지 않도록
+    _GROW_CHUNK_ELEMENTS 원소 단위로 행을 나눠 계산한다.
+    """
+    n = returns.shape[-1]
+    rows = returns.reshape(-1, n)
+    step = max(_GROW_CHUNK_ELEMENTS // ((months + 1) * max(n, 1)), 1)
+    if len(rows) <= step:
+        return _grow_rows(assets, schedule, months, returns)
+    values = np.concatenate([
+        _grow_rows(assets, schedule, months, rows[i:i + step]) for i in range(0, len(rows), step)
+    ])
+    return values.reshape(returns.shape)
+
+
+def _grow_rows(assets: list[Asset], schedule: np.ndarray, months: int, returns: np.ndarray) -> np.ndarray:
+    growth = 1.0 + returns[..., None, :] / 12  # (..., 1, n)
+    remaining = (months - np.arange(months + 1))[:, None]  # (months + 1, 1)
+    values = (schedule * growth ** remaining).sum(axis=-2)
+
+    youth = _youth_maturity(assets, months)
+    if youth is not None:
+        maturity = settings.youth_savings_maturity_months
+        fb = fallback_index(assets)
+        g_youth = growth[..., 0, youth]
+        g_fb = growth[..., 0, fb]
+        at_maturity = (
+            schedule[: maturity + 1, youth] * g_youth[..., None] ** (maturity - np.arange(maturity + 1))
+        ).sum(axis=-1)
+        values[..., youth] = 0.0
+        values[..., fb] += at_maturity * g_fb ** (months - maturity)
+    return values
+
+
+def after_tax_terminal_values(
+    assets: list[Asset],
+    weights: np.ndarray,
+    principal: float,
+    monthly: float,
+    months: int,
+    gross_returns: np.ndarray | None = None,
+) -> np.ndarray:
+    """만기 세후 자산별 가치. gross_returns가 (S, n)이면 시나리오별 (S, n)을 반환한다.
+
+    원천징수 자산은 세후 수익률로 복리 계산하고, 누적 과세 자산은 세전으로 불린 뒤 만기에 과세한다.
+    """
+    if gross_returns is None:
+        gross_returns = np.array([a.gross_return for a in assets])
+    schedule, _ = contribution_schedule(assets, weights, principal, monthly, months)
+    values = _grow(assets, schedule, months, accrual_returns(gross_returns, assets))
+    gains = values - schedule.sum(axis=0)
+    return values - cumulative_tax(gains[..., None, :], assets)[..., 0, :]
+
+
+def run_ledger(
+    assets: list[Asset],
+    weights: np.ndarray,
+    principal: float,
+    monthly: float,
+    months: int,
+    annual_returns: np.ndarray | None = None,
+) -> Ledger:
+    """월별 자산 잔고 원장을 계산한다."""
+    if annual_returns is None:
+        annual_returns = after_tax_returns(np.array([a.gross_return for a in assets]), assets)
+    growth = 1.0 + np.asarray(annual_returns, dtype=float) / 12
+    schedule, spilled = contribution_schedule(assets, weights, principal, monthly, months)
+    t = np.arange(months + 1)[:, None]
+
+    def balances_of(contributions: np.ndarray) -> np.ndarray:
+        return growth ** t * np.cumsum(contributions * growth ** -t, axis=0)
+
+    balances = balances_of(schedule)
+    youth = _youth_maturity(assets, months)
+    if youth is not None:
+        maturity = settings.youth_savings_maturity_months
+        transfer = balances[maturity, youth]
+        schedule[maturity, youth] -= transfer
+        schedule[maturity, fallback_index(assets)] += transfer
+        balances = balances_of(schedule)
+        balances[maturity:, youth] = 0.0  # 부동소수 잔차 제거
+    return Ledger(balances, schedule, spilled)
+
+
+def ledger_future_value(
+    assets: list[Asset],
+    weights: np.ndarray,
+    goal: GoalInput,
+    annual_returns: np.ndarray | None = None,
+) -> float:
+    """원장 기준 포트폴리오 만기 가치. annual_returns가 없으면 ISA 누적 과세까지 반영한 세후 가치."""
+    if annual_returns is None:
+        return float(
+            after_tax_terminal_values(
+                assets, weights, goal.initial_principal, goal.monthly_contribution,
+                goal.time_horizon_months,
+            ).sum()
+        )
+    return float(
+        terminal_values(
+            assets, weights, goal.initial_principal, goal.monthly_contribution,
+            goal.time_horizon_months, annual_returns,
+        ).sum()
+    )
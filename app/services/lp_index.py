@@ -0,0 +1,232 @@
+"""사전 계산된 최적 기저 인덱스.
+
+/optimize의 LP 해는 (청년도약저축 자격, 목표 기간, 월 저축액) 세 값으로 정해진다.
+필요 수익률은 목적함수(수익률 최대화)와 같은 방향의 제약이라 최적해를 바꾸지 않고
+달성 가능 여부만 가른다 (최적 수익률 ≥ 필요 수익률).
+
+오프라인에서 격자 전체를 batch_lp로 풀어 셀마다 최적 기저(상한 자산, 기저 변수, 활성 듀레이션 제약)를
+메모리 맵 파일에 저장한다. 조회 시에는 인접 격자점의 기저로 실제 입력의 해를 다시 계산하고
+KKT 조건(원문제 실행 가능성 + 쌍대 부호)을 검사해 최적성이 증명될 때만 사용한다.
+검사에 실패하면 linprog로 폴백하므로 인덱스가 오래되어도 결과는 항상 정확하다.
+
+파일 형식: 매직(8바이트) | 헤더 길이(uint32) | JSON 헤더 | 8바이트 정렬 | 셀 레코드 (자격별 months × contributions)
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from app.config import settings
+from app.models.asset import Asset
+from app.models.goal import GoalInput
+from app.models.portfolio import OptimizationResult
+from app.services.asset_universe import get_default_universe
+from app.services.batch_lp import (
+    LPBasis,
+    asset_upper_bounds,
+    duration_band,
+    solve_batch,
+    verify_basis,
+)
+from app.services.optimizer import _result_from_weights, lp_returns, optimize_portfolio
+from app.services.tax import effective_after_tax_returns
+
+MAGIC = b"GBILPIX1"
+RECORD_DTYPE = np.dtype([("upper", "<u2"), ("first", "i1"), ("second", "i1"), ("side", "i1")])
+
+
+def default_contribution_grid(points: int = 256) -> np.ndarray:
+    """월 저축액 격자: 10만~1억 로그 간격 + 한도가 비중 1에 닿는 경계값."""
+    grid = np.geomspace(10_0000, 1_0000_0000, points)
+    breakpoints = [settings.youth_savings_monthly_limit, settings.isa_annual_limit / 12]
+    return np.unique(np.round(np.concatenate([grid, breakpoints])))
+
+
+def _encode(bases: tuple[LPBasis, ...], basis_index: np.ndarray) -> np.ndarray:
+    """solve_batch의 기저 인덱스를 자기완결적인 셀 레코드로 바꾼다 (실행 불가능 셀은 first = -1)."""
+    table = np.zeros(len(bases) + 1, dtype=RECORD_DTYPE)
+    for k, basis in enumerate(bases):
+        table[k] = (
+            sum(1 << i for i in basis.at_upper),
+            basis.basic[0],
+            basis.basic[1] if len(basis.basic) == 2 else -1,
+            basis.side,
+        )
+    table[-1] = (0, -1, -1, 0)
+    return table[np.where(basis_index >= 0, basis_index, len(bases))]
+
+
+def build_index(
+    path: str | Path,
+    max_months: int = 600,
+    contributions: np.ndarray | None = None,
+    epsilon: float | None = None,
+) -> dict:
+    """자격 × 목표 기간(1..max_months) × 월 저축액 격자의 최적 기저를 계산해 파일로 저장한다."""
+    if epsilon is None:
+        epsilon = settings.duration_epsilon
+    if contributions is None:
+        contributions = default_contribution_grid()
+    contributions = np.asarray(contributions, dtype=float)
+
+    months = np.arange(1, max_months + 1)
+    M, K = len(months), len(contributions)
+    T = np.repeat(months / 12, K)
+    C = np.tile(contributions, M)
+    lo, hi = duration_band(T, epsilon)
+
+    tables: dict[str, dict] = {}
+    blocks: list[np.ndarray] = []
+    offset = 0
+    for eligible in (False, True):
+        assets = get_default_universe(eligible)
+        if len(assets) > 16:
+            raise ValueError("인덱스는 자산 16개 이하의 유니버스만 지원합니다.")
+        upper = asset_upper_bounds(assets, C)
+        returns = effective_after_tax_returns(assets, 0.0, C, np.repeat(months, K), upper)
+        durations = np.array([a.duration for a in assets])
+        solution = solve_batch(returns, durations, lo, hi, upper)
+        records = _encode(solution.bases, solution.basis_index)
+
+        tables[str(eligible).lower()] = {
+            "asset_classes": [a.asset_class.value for a in assets],
+            "offset": offset,
+            "feasible_cells": int(solution.feasible.sum()),
+        }
+        blocks.append(records)
+        offset += records.nbytes
+
+    header = json.dumps({
+        "version": 1,
+        "max_months": max_months,
+        "contributions": contributions.tolist(),
+        "epsilon": epsilon,
+        "tables": tables,
+    }).encode()
+    prefix = len(MAGIC) + 4 + len(header)
+    padding = -prefix % 8
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(4, "little"))
+        f.write(header)
+        f.write(b"\0" * padding)
+        for records in blocks:
+            f.write(records.tobytes())
+    tmp.replace(path)
+
+    return {
+        "path": str(path),
+        "cells": M * K * 2,
+        "bytes": path.stat().st_size,
+        **{f"feasible_{k}": v["feasible_cells"] for k, v in tables.items()},
+    }
+
+
+def _decode(record, n: int) -> LPBasis | None:
+    """셀 레코드를 기저로 되돌린다. 실행 불가능 셀이거나 유니버스와 맞지 않으면 None."""
+    first, second, side = int(record["first"]), int(record["second"]), int(record["side"])
+    if first < 0 or first >= n or second >= n:
+        return None
+    at_upper = tuple(i for i in range(n) if (int(record["upper"]) >> i) & 1)
+    basic = (first,) if second < 0 else (first, second)
+    return LPBasis(at_upper, basic, side)
+
+
+class LPIndex:
+    """메모리 맵으로 연 최적 기저 인덱스."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"LP 인덱스 파일 형식이 아닙니다: {self.path}")
+            size = int.from_bytes(f.read(4), "little")
+            self.header = json.loads(f.read(size))
+        prefix = len(MAGIC) + 4 + size
+        data_offset = prefix + (-prefix % 8)
+
+        self.max_months = int(self.header["max_months"])
+        self.contributions = np.array(self.header["contributions"])
+        shape = (self.max_months, len(self.contributions))
+        self._tables = {
+            key: (
+                table["asset_classes"],
+                np.memmap(self.path, dtype=RECORD_DTYPE, mode="r",
+                          offset=data_offset + table["offset"], shape=shape),
+            )
+            for key, table in self.header["tables"].items()
+        }
+
+    def lookup(
+        self,
+        assets: list[Asset],
+        goal: GoalInput,
+        required_return: float | None = None,
+        epsilon: float | None = None,
+    ) -> OptimizationResult | None:
+        """인접 격자점의 기저로 검증된 최적해를 만든다. 적중하지 못하면 None."""
+        if epsilon is None:
+            epsilon = settings.duration_epsilon
+
+        table = self._tables.get(str(goal.eligible_youth_savings).lower())
+        if table is None or not 1 <= goal.time_horizon_months <= self.max_months:
+            return None
+        asset_classes, records = table
+        if [a.asset_class.value for a in assets] != asset_classes:
+            return None
+
+        C = goal.monthly_contribution
+        k = int(np.searchsorted(self.contributions, C))
+        neighbours = {max(k - 1, 0), min(k, len(self.contributions) - 1)}
+        row = records[goal.time_horizon_months - 1]
+
+        returns = lp_returns(assets, goal)
+        durations = np.array([a.duration for a in assets])
+        T_years = goal.time_horizon_months / 12
+        upper = asset_upper_bounds(assets, C)[0]
+
+        for j in sorted(neighbours):
+            basis = _decode(row[j], len(assets))
+            if basis is None:
+                continue
+            weights = verify_basis(
+                basis, returns, durations, T_years - epsilon, T_years + epsilon, upper
+            )
+            if weights is None:
+                continue
+            return _result_from_weights(
+                assets, weights, returns, durations, goal, epsilon, required_return
+            )
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_lp_index() -> LPIndex | None:
+    """설정된 경로의 인덱스를 연다. 경로가 없거나 파일이 없으면 None."""
+    if not settings.lp_index_path:
+        return None
+    path = Path(settings.lp_index_path)
+    if not path.exists():
+        return None
+    return LPIndex(path)
+
+
+def quote_portfolio(
+    assets: list[Asset],
+    goal: GoalInput,
+    required_return: float | None = None,
+    index: LPIndex | None = None,
+) -> OptimizationResult:
+    """인덱스 조회로 최적 포트폴리오를 구하고, 적중하지 못하면 LP 솔버를 호출한다."""
+    if index is None:
+        index = get_lp_index()
+    if index is not None:
+        result = index.lookup(assets, goal, required_return)
+        if result is not None:
+            return result
+    return optimize_portfolio(assets, goal, required_return=required_return)
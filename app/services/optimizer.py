@@ -4,9 +4,14 @@ from scipy.optimize import linprog
 from app.config import settings
 from app.models.asset import Asset, AssetClass
 from app.models.goal import GoalInput
-from app.models.portfolio import AllocationItem, OptimizationResult
-from app.services.gap_analyzer import _future_value
-from app.services.tax import after_tax_return
+from app.models.portfolio import AllocationItem, ConstraintRelaxation, OptimizationResult
+from app.services.basis_cache import basis_cache
+from app.services.batch_lp import asset_upper_bounds
+from app.services.greeks import plan_sensitivities
+from app.services.ledger import ledger_future_value
+from app.services.shared_cache import result_cache
+from app.services.tracing import span
+from app.services.tax import effective_after_tax_returns
 
 
 def _diagnose_infeasibility(
@@ -53,40 +58,28 @@ def _diagnose_infeasibility(
     return "최적화 실패: " + " ".join(reasons)
 
 
-def optimize_portfolio(
-    assets: list[Asset],
-    goal: GoalInput,
-    required_return: float | None = None,
-    epsilon: float | None = None,
-) -> OptimizationResult:
-    """Phase 4: LP 솔버로 최적 포트폴리오를 산출한다."""
-    if epsilon is None:
-        epsilon = settings.duration_epsilon
-
-    n = len(assets)
-
-    # 빈 자산 유니버스 방어
-    if n == 0:
-        return OptimizationResult(
-            success=False,
-            allocations=[],
-            portfolio_duration=0.0,
-            portfolio_return=0.0,
-            expected_future_value=0.0,
-            message="최적화 실패: 투자 가능한 자산이 없습니다.",
-        )
-
-    T_years = goal.time_horizon_months / 12
-    C = goal.monthly_contribution
-
-    # 세후 수익률 벡터
-    returns = np.array([after_tax_return(a.gross_return, a.tax_benefit) for a in assets])
-    durations = np.array([a.duration for a in assets])
+def _empty_result(message: str) -> OptimizationResult:
+    return OptimizationResult(
+        success=False,
+        allocations=[],
+        portfolio_duration=0.0,
+        portfolio_return=0.0,
+        expected_future_value=0.0,
+        message=message,
+    )
 
-    # 목적함수: linprog는 minimize이므로 부호 반전
-    c = -returns
 
-    # 부등식 제약 (A_ub @ x <= b_ub)
+def _base_constraints(
+    assets: list[Asset],
+    returns: np.ndarray,
+    durations: np.ndarray,
+    T_years: float,
+    C: float,
+    epsilon: float,
+    required_return: float | None,
+) -> tuple[list[list[float]], list[float]]:
+    """듀레이션 매칭, 최소 수익률, 상품 한도 부등식 제약 (A_ub @ w <= b_ub)."""
+    n = len(assets)
     A_ub: list[list[float]] = []
     b_ub: list[float] = []
 
@@ -119,39 +112,12 @@ def optimize_portfolio(
             A_ub.append(row)
             b_ub.append(settings.isa_annual_limit)
 
-    # 등식 제약: Σw_i = 1
-    A_eq = [np.ones(n).tolist()]
-    b_eq = [1.0]
+    return A_ub, b_ub
 
-    # 범위: 0 ≤ w_i ≤ 1
-    bounds = [(0.0, 1.0)] * n
 
-    result = linprog(
-        c,
-        A_ub=A_ub,
-        b_ub=b_ub,
-        A_eq=A_eq,
-        b_eq=b_eq,
-        bounds=bounds,
-        method="highs",
-    )
-
-    if not result.success:
-        message = _diagnose_infeasibility(
-            assets, returns, durations, T_years, epsilon, required_return
-        )
-        return OptimizationResult(
-            success=False,
-            allocations=[],
-            portfolio_duration=0.0,
-            portfolio_return=0.0,
-            expected_future_value=0.0,
-            message=message,
-        )
-
-    weights = result.x
-
-    # 결과 구성
+def _allocations(
+    assets: list[Asset], weights: np.ndarray, returns: np.ndarray, C: float
+) -> list[AllocationItem]:
     allocations: list[AllocationItem] = []
     for i, asset in enumerate(assets):
         w = weights[i]
@@ -167,6 +133,20 @@ def optimize_portfolio(
                 after_tax_return=round(returns[i], 6),
             )
         )
+    return allocations
+
+
+def _build_result(
+    assets: list[Asset],
+    weights: np.ndarray,
+    returns: np.ndarray,
+    durations: np.ndarray,
+    goal: GoalInput,
+    epsilon: float,
+) -> OptimizationResult:
+    """LP 해(비중)로 배분 내역을 구성하고 듀레이션 매칭을 사후 검증한다."""
+    T_years = goal.time_horizon_months / 12
+    allocations = _allocations(assets, weights, returns, goal.monthly_contribution)
 
     portfolio_duration = float(weights @ durations)
     portfolio_return = float(weights @ returns)
@@ -183,12 +163,8 @@ def optimize_portfolio(
             message=f"듀레이션 매칭 검증 실패: 갭 {duration_gap:.2f}년 (허용 {epsilon}년)",
         )
 
-    expected_fv = _future_value(
-        goal.initial_principal,
-        goal.monthly_contribution,
-        portfolio_return,
-        goal.time_horizon_months,
-    )
+    # 한도 초과분 이월과 청년도약저축 만기를 반영한 월별 원장 기준 미래가치
+    expected_fv = ledger_future_value(assets, weights, goal)
 
     return OptimizationResult(
         success=True,
@@ -197,4 +173,202 @@ def optimize_portfolio(
         portfolio_return=round(portfolio_return, 6),
         expected_future_value=round(expected_fv, 0),
         message="최적화 완료",
+        sensitivities=plan_sensitivities(assets, weights, returns, durations, goal, epsilon),
+    )
+
+
+def _elastic_result(
+    assets: list[Asset],
+    returns: np.ndarray,
+    durations: np.ndarray,
+    goal: GoalInput,
+    epsilon: float,
+    required_return: float | None,
+    message: str,
+) -> OptimizationResult:
+    """실행 불가능할 때 제약 위반의 가중합을 최소화하는 가장 가까운 계획을 구한다 (phase-1 탄력 LP).
+
+    듀레이션 밴드 상·하한과 필요 수익률 행에 비음 여유 변수를 붙이고
+    상품 한도와 Σw = 1은 그대로 둔다. 위반이 같으면 수익률이 높은 계획을 고른다.
+    """
+    n = len(assets)
+    T_years = goal.time_horizon_months / 12
+    A_ub, b_ub = _base_constraints(
+        assets, returns, durations, T_years, goal.monthly_contribution, epsilon, required_return
+    )
+
+    # 변수 [w (n) | s_hi | s_lo | s_r], _base_constraints의 행 순서: 듀레이션 상한, 하한, 필요 수익률
+    n_slack = 3 if required_return is not None else 2
+    A = np.hstack([np.array(A_ub), np.zeros((len(A_ub), n_slack))])
+    A[np.arange(n_slack), n + np.arange(n_slack)] = -1.0
+
+    penalty = [settings.elastic_duration_weight] * 2 + [settings.elastic_return_weight] * (n_slack - 2)
+    c = np.concatenate([-1e-4 * returns, penalty])
+    A_eq = np.concatenate([np.ones(n), np.zeros(n_slack)])[None, :]
+    bounds = [(0.0, 1.0)] * n + [(0.0, None)] * n_slack
+
+    with span("linprog", n=n, elastic=True):
+        result = linprog(c, A_ub=A, b_ub=b_ub, A_eq=A_eq, b_eq=[1.0], bounds=bounds, method="highs")
+    if not result.success:
+        return _empty_result(message)
+
+    weights = result.x[:n]
+    slack = result.x[n:]
+    portfolio_duration = float(weights @ durations)
+    portfolio_return = float(weights @ returns)
+
+    relaxations: list[ConstraintRelaxation] = []
+    labels = [
+        ("duration_upper", T_years + epsilon, portfolio_duration),
+        ("duration_lower", T_years - epsilon, portfolio_duration),
+        ("required_return", required_return, portfolio_return),
+    ]
+    for (constraint, limit, achieved), violation in zip(labels, slack):
+        if violation > 1e-9:
+            relaxations.append(
+                ConstraintRelaxation(
+                    constraint=constraint,
+                    limit=round(limit, 6),
+                    achieved=round(achieved, 6),
+                    violation=round(violation, 6),
+                )
+            )
+
+    described = ", ".join(
+        f"필요 수익률 {r.violation:.2%}p" if r.constraint == "required_return"
+        else f"듀레이션 {'상한' if r.constraint == 'duration_upper' else '하한'} {r.violation:.2f}년"
+        for r in relaxations
+    )
+    return OptimizationResult(
+        success=False,
+        allocations=_allocations(assets, weights, returns, goal.monthly_contribution),
+        portfolio_duration=round(portfolio_duration, 4),
+        portfolio_return=round(portfolio_return, 6),
+        expected_future_value=round(ledger_future_value(assets, weights, goal), 0),
+        message=f"{message} 제약을 완화한 가장 가까운 포트폴리오: {described} 완화.",
+        relaxations=relaxations,
+    )
+
+
+def _result_from_weights(
+    assets: list[Asset],
+    weights: np.ndarray,
+    returns: np.ndarray,
+    durations: np.ndarray,
+    goal: GoalInput,
+    epsilon: float,
+    required_return: float | None,
+) -> OptimizationResult:
+    """필요 수익률 제약이 없는 최적 비중으로 결과를 만든다.
+
+    필요 수익률은 목적함수와 같은 방향이라 최적해를 바꾸지 않으므로,
+    최적 수익률이 필요 수익률에 못 미치면 원래 LP가 실행 불가능한 경우와 같다.
+    """
+    if required_return is not None and float(weights @ returns) < required_return - 1e-9:
+        T_years = goal.time_horizon_months / 12
+        message = _diagnose_infeasibility(
+            assets, returns, durations, T_years, epsilon, required_return
+        )
+        return _elastic_result(
+            assets, returns, durations, goal, epsilon, required_return, message
+        )
+    return _build_result(assets, weights, returns, durations, goal, epsilon)
+
+
+def lp_returns(assets: list[Asset], goal: GoalInput) -> np.ndarray:
+    """LP 목적함수의 자산별 세후 수익률.
+
+    누적 과세 자산(ISA)은 한도 비중까지 담았을 때의 실효 수익률을 쓴다.
+    실제 비중이 더 작으면 비과세 한도의 비율이 커지므로 보수적인 값이다.
+    """
+    C = goal.monthly_contribution
+    return effective_after_tax_returns(
+        assets, goal.initial_principal, C, goal.time_horizon_months, asset_upper_bounds(assets, C)[0]
+    )
+
+
+def optimize_portfolio(
+    assets: list[Asset],
+    goal: GoalInput,
+    required_return: float | None = None,
+    epsilon: float | None = None,
+) -> OptimizationResult:
+    """Phase 4: LP 솔버로 최적 포트폴리오를 산출한다."""
+    if epsilon is None:
+        epsilon = settings.duration_epsilon
+    return result_cache.cached(
+        OptimizationResult,
+        lambda: _optimize_portfolio(assets, goal, required_return, epsilon),
+        "optimize_portfolio", assets, goal, required_return, epsilon,
+    )
+
+
+def _optimize_portfolio(
+    assets: list[Asset], goal: GoalInput, required_return: float | None, epsilon: float
+) -> OptimizationResult:
+    n = len(assets)
+
+    # 빈 자산 유니버스 방어
+    if n == 0:
+        return _empty_result("최적화 실패: 투자 가능한 자산이 없습니다.")
+
+    T_years = goal.time_horizon_months / 12
+    C = goal.monthly_contribution
+
+    # 세후 수익률 벡터 (ISA는 비과세 한도 반영)
+    returns = lp_returns(assets, goal)
+    durations = np.array([a.duration for a in assets])
+
+    # 캐시된 최적 기저가 우변 범위 안이면 역대입으로 푼다
+    cached = basis_cache.lookup(assets, returns, durations, goal, epsilon)
+    if cached is not None:
+        return _result_from_weights(
+            assets, cached, returns, durations, goal, epsilon, required_return
+        )
+
+    # 듀레이션 밴드가 자산 듀레이션 범위 밖이면 LP는 반드시 실행 불가능하다: 바로 탄력 LP로 간다
+    if durations.max() < T_years - epsilon or durations.min() > T_years + epsilon:
+        message = _diagnose_infeasibility(
+            assets, returns, durations, T_years, epsilon, required_return
+        )
+        return _elastic_result(
+            assets, returns, durations, goal, epsilon, required_return, message
+        )
+
+    # 목적함수: linprog는 minimize이므로 부호 반전
+    c = -returns
+
+    # 부등식 제약 (A_ub @ x <= b_ub)
+    # 필요 수익률은 최적해를 바꾸지 않으므로 LP에서 빼고 풀이 후 비교한다 (기저를 항상 캐시할 수 있다)
+    A_ub, b_ub = _base_constraints(assets, returns, durations, T_years, C, epsilon, None)
+
+    # 등식 제약: Σw_i = 1
+    A_eq = [np.ones(n).tolist()]
+    b_eq = [1.0]
+
+    # 범위: 0 ≤ w_i ≤ 1
+    bounds = [(0.0, 1.0)] * n
+
+    with span("linprog", n=n):
+        result = linprog(
+            c,
+            A_ub=A_ub,
+            b_ub=b_ub,
+            A_eq=A_eq,
+            b_eq=b_eq,
+            bounds=bounds,
+            method="highs",
+        )
+
+    if not result.success:
+        message = _diagnose_infeasibility(
+            assets, returns, durations, T_years, epsilon, required_return
+        )
+        return _elastic_result(
+            assets, returns, durations, goal, epsilon, required_return, message
+        )
+
+    basis_cache.store(assets, result.x, returns, durations, goal, epsilon)
+    return _result_from_weights(
+        assets, result.x, returns, durations, goal, epsilon, required_return
     )
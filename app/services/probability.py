@@ -0,0 +1,163 @@
+"""목표 달성 확률의 해석적 근사.
+
+금리 수준 변동 Δ ~ N(0, σ²)에서 포트폴리오 만기 가치는 scenario_value_matrix 모형을 따른다.
+
+    V(Δ) = Σ_i w_i · F(r_i + k_i Δ) · (1 - ½ |D_i - T| |Δ|)
+
+|Δ| 항 때문에 V는 Δ = 0에서 꺾이므로 Δ의 부호별로 따로 2차 전개한다 (side = ±1).
+- V'  = Σ w_i (k_i F'_i - side · h_i F_i)
+- V'' = Σ w_i (k_i² F''_i - 2 side · h_i k_i F'_i)
+여기서 h_i = ½ |D_i - T|, F', F''는 연금 공식의 수익률 도함수다.
+
+각 반직선에서 V(Δ) ≥ goal은 Δ에 대한 2차 부등식이라 성립 구간이 최대 두 개이고,
+P(V ≥ goal)은 구간별 정규분포 확률의 합으로 닫힌 형태가 된다.
+단일 로그정규 근사와 달리 재투자 이익과 듀레이션 갭 손실이 거의 상쇄되는 포트폴리오에서도
+같은 모형을 Δ 표본으로 직접 평가한 결과와 잘 맞는다.
+
+수익률은 scenario_value_matrix와 같이 이자마다 분리과세하는 세후 수익률(after_tax_return)을 쓴다.
+ISA 비과세 한도를 반영한 lp_returns보다 약간 보수적이지만, 전개 검증과 같은 모형을 유지하려는 의도된 선택이다.
+
+모든 연산이 배열 단위라 수천 개 목표를 마이크로초 단위로 계산한다.
+expansion_check_probability는 같은 V(Δ)를 Δ 표본으로 직접 평가해 2차 전개 오차만 확인한다.
+월별 금리 경로를 따라가는 검증이 아니며, 경로에 따른 재최적화·가격 변동은 rolling 시뮬레이션이 다룬다.
+"""
+import numpy as np
+from scipy.special import ndtr
+
+from app.config import settings
+from app.models.asset import Asset
+from app.models.goal import GoalInput
+from app.models.portfolio import AllocationItem
+from app.services.gap_analyzer import (
+    _future_value_array,
+    _future_value_rate_derivative_array,
+    _future_value_rate_second_derivative_array,
+)
+from app.services.simulator import scenario_value_matrix
+from app.services.tax import after_tax_returns
+
+
+def success_probability(
+    assets: list[Asset],
+    weights: np.ndarray,
+    goal_amount: np.ndarray | float,
+    principal: np.ndarray | float,
+    monthly: np.ndarray | float,
+    months: np.ndarray | int,
+    rate_volatility: float | None = None,
+) -> np.ndarray:
+    """여러 목표·포트폴리오의 목표 달성 확률 (B,).
+
+    Args:
+        weights: 포트폴리오 비중 (B, n) 또는 (n,)
+        goal_amount, principal, monthly, months: 목표별 입력 (B,) 또는 스칼라
+    """
+    if rate_volatility is None:
+        rate_volatility = settings.success_rate_volatility
+
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    inputs = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (goal_amount, principal, monthly, months))
+    )
+    B = max(len(inputs[0]), len(weights))
+    weights = np.broadcast_to(weights, (B, weights.shape[1]))
+    goal_amount, principal, monthly, months = (np.broadcast_to(x, (B,))[:, None] for x in inputs)
+
+    returns = after_tax_returns(np.array([a.gross_return for a in assets]), assets)
+    keep = after_tax_returns(np.ones(len(assets)), assets)  # 세전 수익률 1단위당 세후 수익률
+    durations = np.array([a.duration for a in assets])
+
+    F = _future_value_array(principal, monthly, returns, months)
+    dF = keep * _future_value_rate_derivative_array(principal, monthly, returns, months)
+    d2F = keep**2 * _future_value_rate_second_derivative_array(principal, monthly, returns, months)
+    h = 0.5 * np.abs(durations - months / 12)
+
+    value = (weights * F).sum(axis=1)
+    scale = np.where(value > 0, value, 1.0)
+    c = 1.0 - goal_amount[:, 0] / scale
+    sigma = max(rate_volatility, 1e-12)
+    prob = np.zeros(B)
+    for side in (1.0, -1.0):
+        # Δ의 부호가 side인 반직선에서 V(Δ)/V₀ - goal/V₀의 2차 전개
+        b = (weights * (dF - side * h * F)).sum(axis=1) / scale
+        q = 0.5 * (weights * (d2F - 2 * side * h * dF)).sum(axis=1) / scale
+        prob += _half_line_mass(q, b, c, sigma, side)
+    return np.where(value > 0, np.clip(prob, 0.0, 1.0), np.nan)
+
+
+def _half_line_mass(
+    q: np.ndarray, b: np.ndarray, c: np.ndarray, sigma: float, side: float
+) -> np.ndarray:
+    """Δ ~ N(0, σ²)에서 qΔ² + bΔ + c ≥ 0 이고 Δ의 부호가 side일 확률."""
+    linear = np.abs(q) * sigma <= 1e-12 * np.abs(b)
+    disc = b * b - 4 * q * c
+    root = np.sqrt(np.maximum(disc, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 상쇄를 피하는 근의 공식
+        t = -0.5 * (b + np.copysign(root, b))
+        small = np.fmin(t / q, c / t)
+        large = np.fmax(t / q, c / t)
+        cut = -c / b
+
+    # 성립 구간을 최대 두 개의 [lo, hi]로 표현한다 (빈 구간은 lo ≥ hi)
+    real = disc >= 0
+    up = ~linear & (q > 0)
+    down = ~linear & (q < 0)
+    empty = np.full_like(c, np.inf)
+    lo1 = np.where(
+        up | (linear & ((b < 0) | ((b == 0) & (c >= 0)))), -np.inf,
+        np.where(down & real, small, np.where(linear & (b > 0), cut, empty)),
+    )
+    hi1 = np.where(
+        up, np.where(real, small, np.inf),
+        np.where(down & real, large, np.where(linear & (b < 0), cut, empty)),
+    )
+    lo2 = np.where(up & real, large, empty)  # 아래로 볼록이면 큰 근 바깥쪽도 성립
+
+    side_lo, side_hi = (0.0, np.inf) if side > 0 else (-np.inf, 0.0)
+    mass = np.zeros_like(c)
+    for lo, hi in ((lo1, hi1), (lo2, empty)):
+        lo, hi = np.maximum(lo, side_lo), np.minimum(hi, side_hi)
+        mass += np.where(hi > lo, ndtr(hi / sigma) - ndtr(lo / sigma), 0.0)
+    return mass
+
+
+def allocation_weights(assets: list[Asset], allocations: list[AllocationItem]) -> np.ndarray:
+    """배분 결과를 자산 순서의 비중 벡터로 바꾼다."""
+    weights = {a.asset_class: a.weight for a in allocations}
+    return np.array([weights.get(a.asset_class, 0.0) for a in assets])
+
+
+def plan_success_probability(
+    assets: list[Asset],
+    weights: np.ndarray,
+    goal: GoalInput,
+    rate_volatility: float | None = None,
+) -> float:
+    """단일 계획의 목표 달성 확률."""
+    return float(
+        success_probability(
+            assets, weights, goal.goal_amount, goal.initial_principal,
+            goal.monthly_contribution, goal.time_horizon_months, rate_volatility,
+        )[0]
+    )
+
+
+def expansion_check_probability(
+    assets: list[Asset],
+    weights: np.ndarray,
+    goal: GoalInput,
+    rate_volatility: float | None = None,
+    n_paths: int = 100_000,
+    seed: int | None = None,
+) -> float:
+    """Δ ~ N(0, σ²)를 표본 추출해 V(Δ) ≥ goal인 비율을 센다 (2차 전개 검증용).
+
+    success_probability와 같은 평행 이동 모형(scenario_value_matrix)을 전개 없이 평가할 뿐
+    경로 모형이 아니므로, 두 값의 차이는 전개 오차와 표본 오차만 나타낸다.
+    """
+    if rate_volatility is None:
+        rate_volatility = settings.success_rate_volatility
+    shifts = np.random.default_rng(seed).normal(0.0, rate_volatility, n_paths)
+    values = scenario_value_matrix(goal, assets, shifts) @ np.asarray(weights, dtype=float)
+    return float((values >= goal.goal_amount).mean())
@@ -0,0 +1,119 @@
+"""버전이 붙은 금리 스냅샷 저장소.
+
+기준 금리와 상품별 세전 수익률을 불변 스냅샷(RateSnapshot)으로 묶고,
+새 스냅샷은 완성된 뒤 포인터 하나를 바꿔 끼우는 방식으로 발행한다.
+- 읽기: store.current는 속성 하나를 읽을 뿐이라 잠금이 없다 (CPython에서 참조 대입은 원자적)
+- 쓰기: 버전 번호와 이력을 맞추기 위해 발행끼리만 잠금으로 직렬화한다
+
+요청은 시작 시점의 스냅샷을 컨텍스트 변수에 고정(pin)하므로, 처리 도중 새 스냅샷이 발행되어도
+한 요청 안의 갭 분석·자산 유니버스·시뮬레이션은 모두 같은 금리를 본다.
+현재 스냅샷은 current_snapshot()으로 읽는다 (고정된 것이 없으면 최신 스냅샷).
+
+최적 기저 캐시는 자산 수익률을 키에 포함하므로 발행 즉시 새 금리의 조회는 이전 항목과 섞이지 않고,
+이전 스냅샷에 고정된 요청은 기존 항목을 계속 쓴다.
+"""
+import json
+import threading
+from collections import deque
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from types import MappingProxyType
+from typing import NamedTuple
+
+from app.config import settings
+from app.models.asset import AssetClass
+from app.models.rates import RateSnapshotInput
+
+DEFAULT_GROSS_RETURNS: Mapping[AssetClass, float] = MappingProxyType({
+    AssetClass.PARKING: 0.030,
+    AssetClass.YOUTH_SAVINGS: 0.06,  # 정부 기여분은 자산 유니버스에서 더한다
+    AssetClass.ISA_DEPOSIT: 0.035,
+    AssetClass.TIME_DEPOSIT: 0.033,
+    AssetClass.BOND_ETF_3Y: 0.038,
+    AssetClass.BOND_ETF_10Y: 0.042,
+})
+
+
+class RateSnapshot(NamedTuple):
+    version: int
+    created_at: datetime
+    source: str
+    base_interest_rate: float
+    gross_returns: Mapping[AssetClass, float]  # 읽기 전용 (MappingProxyType)
+
+
+class RateStore:
+    """불변 금리 스냅샷의 원자적 교체와 최근 이력."""
+
+    def __init__(self, base_interest_rate: float, gross_returns: Mapping[AssetClass, float], history: int):
+        self._lock = threading.Lock()
+        self._history: deque[RateSnapshot] = deque(maxlen=max(history, 1))
+        self._current = self._append(1, "settings", base_interest_rate, dict(gross_returns))
+
+    def _append(
+        self, version: int, source: str, base_interest_rate: float, gross_returns: dict
+    ) -> RateSnapshot:
+        snapshot = RateSnapshot(
+            version=version,
+            created_at=datetime.now(timezone.utc),
+            source=source,
+            base_interest_rate=float(base_interest_rate),
+            gross_returns=MappingProxyType({AssetClass(k): float(v) for k, v in gross_returns.items()}),
+        )
+        self._history.append(snapshot)
+        return snapshot
+
+    @property
+    def current(self) -> RateSnapshot:
+        return self._current
+
+    def publish(
+        self,
+        base_interest_rate: float | None = None,
+        gross_returns: Mapping[AssetClass, float] | None = None,
+        source: str = "admin",
+    ) -> RateSnapshot:
+        """현재 스냅샷에 변경분을 덮어쓴 새 스냅샷을 만들고 포인터를 교체한다."""
+        with self._lock:
+            previous = self._current
+            merged = {**previous.gross_returns, **(gross_returns or {})}
+            rate = previous.base_interest_rate if base_interest_rate is None else base_interest_rate
+            snapshot = self._append(previous.version + 1, source, rate, merged)
+            self._current = snapshot  # 완성된 스냅샷만 보이도록 마지막에 교체
+            return snapshot
+
+    def load_file(self, path: str | Path) -> RateSnapshot:
+        """JSON 파일 {"base_interest_rate": ..., "gross_returns": {"parking": ...}}을 발행한다."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        data.setdefault("source", f"file:{Path(path).name}")
+        req = RateSnapshotInput.model_validate(data)
+        return self.publish(req.base_interest_rate, req.gross_returns, req.source)
+
+    def history(self) -> list[RateSnapshot]:
+        return list(self._history)
+
+
+rate_store = RateStore(settings.base_interest_rate, DEFAULT_GROSS_RETURNS, settings.rate_snapshot_history)
+if settings.rate_snapshot_path:
+    rate_store.load_file(settings.rate_snapshot_path)
+
+_pinned: ContextVar[RateSnapshot | None] = ContextVar("pinned_rate_snapshot", default=None)
+
+
+def current_snapshot() -> RateSnapshot:
+    """현재 요청에 고정된 스냅샷, 없으면 최신 스냅샷."""
+    return _pinned.get() or rate_store.current
+
+
+@contextmanager
+def pinned(snapshot: RateSnapshot | None = None) -> Iterator[RateSnapshot]:
+    """블록 안의 current_snapshot()을 한 스냅샷으로 고정한다."""
+    snapshot = snapshot or rate_store.current
+    token = _pinned.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _pinned.reset(token)
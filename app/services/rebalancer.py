@@ -0,0 +1,316 @@
+"""보유 자산 기반 리밸런싱.
+
+기존 고객은 이미 자산을 보유하고 있으므로 목표 비중 대신 증분 거래(매수/매도)를 산출한다.
+
+변수 (계좌별, 자산 i):
+    b_i: 매수(납입) 금액,  s_i: 매도(해지) 금액,  u_lo, u_hi: 듀레이션 밴드 이탈 슬랙 (원·년)
+
+    max  Σ R_i (h_i + b_i - s_i) - Σ c_i s_i / T - λ (u_lo + u_hi)
+    s.t. Σ b_i = Σ (1 - c_i) s_i + 신규 납입액                     (현금 흐름)
+         Σ (D_i - hi)(h_i + b_i - s_i) ≤ u_hi                        (듀레이션 밴드, 탄력 제약)
+         Σ (lo - D_i)(h_i + b_i - s_i) ≤ u_lo
+         Σ s_i ≤ 매도 한도 × Σ h_i                                   (회전율)
+         0 ≤ s_i ≤ h_i,  b_청년도약 ≤ 월 한도,  b_ISA ≤ 올해 남은 ISA 한도
+
+c_i는 매도 금액당 비용(미실현 이익에 대한 세금 + 예금/청년도약저축 중도해지 비용)이며,
+잔여 기간 T(년)에 걸쳐 상각해 연 수익률과 같은 단위로 비교한다.
+R_i는 계좌별 세후 수익률로, ISA는 lp_returns처럼 누적 과세 실효 수익률을 쓴다 (account_returns).
+매도 한도 때문에 듀레이션 밴드에 못 들어가는 계좌도 슬랙으로 최대한 가깝게 맞춘다.
+
+야간 배치에서는 계좌 수백 개의 LP를 블록 대각 희소 행렬로 묶어 HiGHS 한 번에 푼다.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+from app.config import settings
+from app.models.asset import Asset, AssetClass
+from app.models.rebalance import Holding, RebalanceAccount, RebalanceResult, Trade
+from app.services.asset_universe import get_default_universe
+from app.services.batch_lp import asset_upper_bounds
+from app.services.tax import after_tax_return, effective_after_tax_returns
+
+# 듀레이션 밴드 이탈 1년당 벌점 (연 수익률 단위). 어떤 수익률 차이보다 커야 한다.
+_DURATION_SLACK_PENALTY = 1.0
+
+
+class RebalanceBatch(NamedTuple):
+    buy: np.ndarray  # (B, n) 원
+    sell: np.ndarray  # (B, n) 원
+    cost: np.ndarray  # (B, n) 매도에 따른 세금 + 중도해지 비용 (원)
+    duration_gap: np.ndarray  # (B,) 밴드 이탈폭 (년)
+    success: np.ndarray  # (B,) bool
+
+
+def early_termination_penalties(assets: list[Asset]) -> np.ndarray:
+    """자산별 중도해지 비용률 (해지 금액 대비)."""
+    penalty = np.zeros(len(assets))
+    for i, asset in enumerate(assets):
+        if asset.asset_class == AssetClass.YOUTH_SAVINGS:
+            penalty[i] = settings.youth_savings_early_termination_penalty
+        elif asset.asset_class in (AssetClass.TIME_DEPOSIT, AssetClass.ISA_DEPOSIT):
+            penalty[i] = settings.deposit_early_termination_penalty
+    return penalty
+
+
+def sell_cost_rates(assets: list[Asset], holdings: np.ndarray, basis: np.ndarray) -> np.ndarray:
+    """매도 금액 1원당 비용 (B, n): 중도해지 비용 + 미실현 이익 비중 × 세율."""
+    tax_rate = np.array([1.0 - after_tax_return(1.0, a.tax_benefit) for a in assets])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gain_ratio = np.where(holdings > 0, np.clip(1.0 - basis / holdings, 0.0, 1.0), 0.0)
+    return early_termination_penalties(assets) + gain_ratio * tax_rate
+
+
+def account_returns(
+    assets: list[Asset], holdings: np.ndarray, cash: np.ndarray, months: np.ndarray
+) -> np.ndarray:
+    """계좌별 자산 세후 수익률 (B, n).
+
+    현재 평가액을 초기 자본, 신규 납입액을 월 저축액으로 보고 lp_returns와 같은 방식으로
+    ISA의 누적 과세 실효 수익률을 구한다 (한도 비중에서의 값).
+    """
+    upper = asset_upper_bounds(assets, np.maximum(cash, 1.0))
+    return effective_after_tax_returns(assets, holdings.sum(axis=1), cash, months, upper)
+
+
+def _solve_block(c, A_eq, b_eq, A_ub, b_ub, lower, upper):
+    return linprog(
+        c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
+        bounds=np.column_stack([lower, upper]), method="highs",
+    )
+
+
+def _block_problem(
+    returns, durations, holdings, cost_rate, cash, lo, hi, years, buy_cap, turnover_cap
+):
+    """B개 계좌의 LP를 블록 대각 희소 행렬로 만든다. 변수 배치는 계좌별 [b (n) | s (n) | u_lo | u_hi]."""
+    B, n = holdings.shape
+    V = 2 * n + 2
+    base = (np.arange(B) * V)[:, None]
+    b_cols = base + np.arange(n)
+    s_cols = base + n + np.arange(n)
+    u_lo = base[:, 0] + 2 * n
+    u_hi = u_lo + 1
+
+    scale = np.maximum(holdings.sum(axis=1) + cash, 1.0)[:, None]
+    c = np.zeros(B * V)
+    c[b_cols] = -returns / scale
+    c[s_cols] = (returns + cost_rate / years[:, None]) / scale
+    c[u_lo] = c[u_hi] = _DURATION_SLACK_PENALTY / scale[:, 0]
+
+    # 등식: 현금 흐름 (계좌당 1행)
+    eq_rows = np.repeat(np.arange(B), 2 * n)
+    eq_cols = np.hstack([b_cols, s_cols]).ravel()
+    eq_vals = np.hstack([np.ones((B, n)), -(1.0 - cost_rate)]).ravel()
+    A_eq = sp.csr_matrix((eq_vals, (eq_rows, eq_cols)), shape=(B, B * V))
+
+    # 부등식: 듀레이션 상한, 하한, 회전율 (계좌당 3행)
+    over = durations[None, :] - hi[:, None]
+    under = lo[:, None] - durations[None, :]
+    row = 3 * np.arange(B)[:, None]
+    ub_rows = np.hstack([
+        np.repeat(row, 2 * n + 1, axis=1),
+        np.repeat(row + 1, 2 * n + 1, axis=1),
+        np.repeat(row + 2, n, axis=1),
+    ]).ravel()
+    ub_cols = np.hstack([b_cols, s_cols, u_hi[:, None], b_cols, s_cols, u_lo[:, None], s_cols]).ravel()
+    ub_vals = np.hstack([
+        over, -over, -np.ones((B, 1)),
+        under, -under, -np.ones((B, 1)),
+        np.ones((B, n)),
+    ]).ravel()
+    A_ub = sp.csr_matrix((ub_vals, (ub_rows, ub_cols)), shape=(3 * B, B * V))
+    b_ub = np.column_stack([
+        -(over * holdings).sum(axis=1),
+        -(under * holdings).sum(axis=1),
+        turnover_cap * holdings.sum(axis=1),
+    ]).ravel()
+
+    lower = np.zeros(B * V)
+    upper = np.full(B * V, np.inf)
+    upper[b_cols] = buy_cap
+    upper[s_cols] = holdings
+    return c, A_eq, cash.astype(float), A_ub, b_ub, lower, upper
+
+
+def solve_rebalance_batch(
+    assets: list[Asset],
+    holdings: np.ndarray,
+    basis: np.ndarray,
+    cash: np.ndarray,
+    months: np.ndarray,
+    youth_eligible: np.ndarray,
+    isa_contributed: np.ndarray,
+    max_turnover: np.ndarray,
+    epsilon: float | None = None,
+    chunk_size: int = 200,
+) -> RebalanceBatch:
+    """B개 계좌의 리밸런싱 거래를 계산한다. 입력은 모두 (B,) 또는 (B, n) 배열이다."""
+    if epsilon is None:
+        epsilon = settings.duration_epsilon
+
+    holdings = np.atleast_2d(np.asarray(holdings, dtype=float))
+    B, n = holdings.shape
+    basis = np.asarray(basis, dtype=float)
+    cash, months, isa_contributed, max_turnover = (
+        np.broadcast_to(np.asarray(a, dtype=float), (B,))
+        for a in (cash, months, isa_contributed, max_turnover)
+    )
+    youth_eligible = np.broadcast_to(np.asarray(youth_eligible, dtype=bool), (B,))
+
+    returns = account_returns(assets, holdings, cash, months)
+    durations = np.array([a.duration for a in assets])
+    cost_rate = sell_cost_rates(assets, holdings, basis)
+
+    T = months / 12
+    hi = T + epsilon
+    lo = np.minimum(T - epsilon, durations.max())
+    years = np.maximum(T, 1 / 12)
+
+    buy_cap = np.full((B, n), np.inf)
+    for i, asset in enumerate(assets):
+        if asset.asset_class == AssetClass.YOUTH_SAVINGS:
+            buy_cap[:, i] = np.where(youth_eligible, settings.youth_savings_monthly_limit, 0.0)
+        elif asset.asset_class == AssetClass.ISA_DEPOSIT:
+            buy_cap[:, i] = np.maximum(settings.isa_annual_limit - isa_contributed, 0.0)
+
+    buy = np.zeros((B, n))
+    sell = np.zeros((B, n))
+    slack = np.zeros(B)
+    success = np.zeros(B, dtype=bool)
+    V = 2 * n + 2
+
+    def solve(sl: slice) -> None:
+        problem = _block_problem(
+            returns[sl], durations, holdings[sl], cost_rate[sl], cash[sl], lo[sl], hi[sl],
+            years[sl], buy_cap[sl], max_turnover[sl],
+        )
+        result = _solve_block(*problem)
+        if not result.success:
+            if sl.stop - sl.start > 1:
+                # 블록 전체가 실패하면 계좌별로 나눠 실패 계좌만 격리한다
+                for k in range(sl.start, sl.stop):
+                    solve(slice(k, k + 1))
+            return
+        x = result.x.reshape(-1, V)
+        buy[sl], sell[sl] = x[:, :n], x[:, n:2 * n]
+        slack[sl] = x[:, 2 * n] + x[:, 2 * n + 1]
+        success[sl] = True
+
+    for start in range(0, B, chunk_size):
+        solve(slice(start, min(start + chunk_size, B)))
+
+    # 비용이 없는 자산의 동시 매수/매도는 순거래로 정리한다
+    net = buy - sell
+    free = cost_rate <= 0
+    buy = np.where(free, np.maximum(net, 0.0), buy)
+    sell = np.where(free, np.maximum(-net, 0.0), sell)
+
+    total = np.maximum(holdings.sum(axis=1) + cash - (cost_rate * sell).sum(axis=1), 1.0)
+    return RebalanceBatch(buy, sell, cost_rate * sell, slack / total, success)
+
+
+def rebalance_accounts(
+    accounts: list[RebalanceAccount],
+    assets: list[Asset] | None = None,
+    epsilon: float | None = None,
+) -> list[RebalanceResult]:
+    """계좌 목록의 리밸런싱 거래를 한 번에 계산한다."""
+    if assets is None:
+        assets = get_default_universe(eligible_youth_savings=True)
+
+    index = {a.asset_class: i for i, a in enumerate(assets)}
+    B, n = len(accounts), len(assets)
+    holdings = np.zeros((B, n))
+    basis = np.zeros((B, n))
+    unknown: dict[int, list[str]] = {}
+    for b, account in enumerate(accounts):
+        for h in account.holdings:
+            i = index.get(h.asset_class)
+            if i is None:
+                unknown.setdefault(b, []).append(h.asset_class.value)
+                continue
+            holdings[b, i] += h.amount
+            basis[b, i] += h.amount if h.cost_basis is None else h.cost_basis
+
+    cash = np.array([a.monthly_contribution for a in accounts], dtype=float)
+    months = np.array([a.time_horizon_months for a in accounts], dtype=float)
+    batch = solve_rebalance_batch(
+        assets,
+        holdings,
+        basis,
+        cash=cash,
+        months=months,
+        youth_eligible=np.array([a.eligible_youth_savings for a in accounts]),
+        isa_contributed=np.array([a.isa_contributed_this_year for a in accounts]),
+        max_turnover=np.array([
+            settings.rebalance_max_turnover if a.max_turnover is None else a.max_turnover
+            for a in accounts
+        ]),
+        epsilon=epsilon,
+    )
+
+    returns = account_returns(assets, holdings, cash, months)
+    durations = np.array([a.duration for a in assets])
+    after = holdings + batch.buy - batch.sell
+
+    results: list[RebalanceResult] = []
+    for b, account in enumerate(accounts):
+        before_total = holdings[b].sum()
+        after_total = after[b].sum()
+        duration_before = float(holdings[b] @ durations / before_total) if before_total > 0 else 0.0
+
+        if not batch.success[b] or b in unknown:
+            message = "리밸런싱 실패: 제약 조건 조합이 동시에 만족 불가합니다."
+            if b in unknown:
+                message = "리밸런싱 실패: 유니버스에 없는 보유 자산이 있습니다: " + ", ".join(unknown[b])
+            results.append(RebalanceResult(
+                account_id=account.account_id,
+                success=False,
+                trades=[],
+                duration_before=round(duration_before, 4),
+                duration_after=round(duration_before, 4),
+                portfolio_return_after=0.0,
+                turnover=0.0,
+                transaction_cost=0.0,
+                message=message,
+            ))
+            continue
+
+        trades = [
+            Trade(
+                asset_class=assets[i].asset_class,
+                name=assets[i].name,
+                buy=round(float(batch.buy[b, i]), 0),
+                sell=round(float(batch.sell[b, i]), 0),
+                cost=round(float(batch.cost[b, i]), 0),
+            )
+            for i in range(n)
+            if batch.buy[b, i] >= 1.0 or batch.sell[b, i] >= 1.0
+        ]
+        holdings_after = [
+            Holding(asset_class=assets[i].asset_class, amount=round(float(after[b, i]), 0))
+            for i in range(n)
+            if after[b, i] >= 1.0
+        ]
+        gap = float(batch.duration_gap[b])
+        message = "리밸런싱 완료"
+        if gap > 1e-6:
+            message += f" (매도 한도로 듀레이션 밴드를 {gap:.2f}년 벗어남)"
+
+        results.append(RebalanceResult(
+            account_id=account.account_id,
+            success=True,
+            trades=trades,
+            holdings_after=holdings_after,
+            duration_before=round(duration_before, 4),
+            duration_after=round(float(after[b] @ durations / after_total), 4) if after_total > 0 else 0.0,
+            duration_gap=round(gap, 4),
+            portfolio_return_after=round(float(after[b] @ returns[b] / after_total), 6) if after_total > 0 else 0.0,
+            turnover=round(float(batch.sell[b].sum() / before_total), 4) if before_total > 0 else 0.0,
+            transaction_cost=round(float(batch.cost[b].sum()), 0),
+            message=message,
+        ))
+    return results
@@ -0,0 +1,130 @@
+"""수익률 불확실성 집합에 대한 강건 최적화.
+
+세전 수익률은 점 추정치라 작은 변화에도 LP 해가 다른 꼭짓점으로 넘어간다.
+각 자산의 세후 수익률이 R_i - δ_i ~ R_i 사이에 있다고 보고 최악의 경우를 최대화한다.
+R_i는 optimize_portfolio와 같은 lp_returns라서 δ = 0이면 두 결과가 같다.
+
+- box: 모든 자산이 동시에 최악 → 강건 대응 문제는 수익률을 R_i - δ_i로 바꾼 같은 크기의 LP
+- budget (Bertsimas–Sim): 최대 Γ개 자산만 최악. 내부 최대화의 쌍대를 취하면
+      max  Σ R_i w_i - Γ z - Σ p_i
+      s.t. z + p_i ≥ δ_i w_i,  z, p_i ≥ 0
+  로 변수 n+1개, 제약 n개만 늘어난 선형 문제가 된다.
+
+필요 수익률 제약에도 같은 최악 수익률을 적용한다.
+"""
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+from app.config import settings
+from app.models.asset import Asset
+from app.models.robust import RobustOptimizationResult, RobustRequest
+from app.services.gap_analyzer import _future_value
+from app.services.optimizer import (
+    _base_constraints,
+    _build_result,
+    _diagnose_infeasibility,
+    _empty_result,
+    lp_returns,
+)
+from app.services.tax import after_tax_returns
+
+
+def return_deviations(assets: list[Asset], req: RobustRequest) -> np.ndarray:
+    """자산별 세후 수익률 최대 편차 δ_i. 기본값은 듀레이션에 비례한다 (가격 변동 위험)."""
+    gross = np.array([
+        req.deviations.get(a.asset_class, 0.0) if req.deviations is not None
+        else a.duration * settings.robust_uncertainty_per_duration
+        for a in assets
+    ])
+    return after_tax_returns(gross, assets)
+
+
+def optimize_robust(
+    assets: list[Asset],
+    req: RobustRequest,
+    required_return: float | None = None,
+    epsilon: float | None = None,
+) -> RobustOptimizationResult:
+    """불확실성 집합 내 최악의 세후 수익률을 최대화하는 포트폴리오를 산출한다."""
+    if epsilon is None:
+        epsilon = settings.duration_epsilon
+
+    extra = dict(uncertainty_set=req.uncertainty_set, budget=req.budget)
+    n = len(assets)
+    if n == 0:
+        return RobustOptimizationResult(
+            **_empty_result("최적화 실패: 투자 가능한 자산이 없습니다.").model_dump(), **extra
+        )
+
+    T_years = req.time_horizon_months / 12
+    returns = lp_returns(assets, req)
+    durations = np.array([a.duration for a in assets])
+    delta = return_deviations(assets, req)
+
+    # Γ ≥ n이면 budget 집합은 box와 같다
+    use_box = req.uncertainty_set == "box" or req.budget >= n
+    gamma = float(n) if use_box else req.budget
+
+    if use_box:
+        worst = returns - delta
+        A_ub, b_ub = _base_constraints(
+            assets, worst, durations, T_years, req.monthly_contribution, epsilon, required_return
+        )
+        c = -worst
+        A_eq = [np.ones(n).tolist()]
+        bounds = [(0.0, 1.0)] * n
+    else:
+        # 변수 배치 [w (n) | z | p (n)]
+        A_base, b_ub = _base_constraints(
+            assets, returns, durations, T_years, req.monthly_contribution, epsilon, None
+        )
+        n_vars = 2 * n + 1
+        base = sp.hstack([sp.csr_matrix(np.array(A_base)), sp.csr_matrix((len(A_base), n + 1))])
+
+        # δ_i w_i - z - p_i ≤ 0
+        idx = np.arange(n)
+        protection = sp.csr_matrix(
+            (
+                np.column_stack([delta, -np.ones(n), -np.ones(n)]).ravel(),
+                (np.repeat(idx, 3), np.column_stack([idx, np.full(n, n), n + 1 + idx]).ravel()),
+            ),
+            shape=(n, n_vars),
+        )
+
+        worst_row = np.concatenate([returns, [-gamma], -np.ones(n)])
+        blocks = [base, protection]
+        b_ub = list(b_ub) + [0.0] * n
+        if required_return is not None:
+            blocks.append(sp.csr_matrix(-worst_row))
+            b_ub.append(-required_return)
+        A_ub = sp.vstack(blocks, format="csr")
+
+        c = -worst_row
+        A_eq = sp.csr_matrix((np.ones(n), (np.zeros(n), idx)), shape=(1, n_vars))
+        bounds = [(0.0, 1.0)] * n + [(0.0, None)] * (n + 1)
+
+    result = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=[1.0], bounds=bounds, method="highs")
+
+    if not result.success:
+        message = _diagnose_infeasibility(
+            assets, returns - delta, durations, T_years, epsilon, required_return
+        )
+        return RobustOptimizationResult(**_empty_result(message).model_dump(), **extra)
+
+    weights = result.x[:n]
+    worst_case = float(-result.fun)
+    base = _build_result(assets, weights, returns, durations, req, epsilon)
+    return RobustOptimizationResult(
+        **base.model_dump(),
+        uncertainty_set=req.uncertainty_set,
+        budget=gamma,
+        worst_case_return=round(worst_case, 6),
+        worst_case_future_value=round(
+            _future_value(
+                req.initial_principal, req.monthly_contribution, worst_case,
+                req.time_horizon_months,
+            ),
+            0,
+        ),
+    )
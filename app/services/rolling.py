@@ -0,0 +1,140 @@
+"""롤링 호라이즌 재최적화 시뮬레이션.
+
+고객 생애주기를 모사한다: 금리가 경로를 따라 움직이는 동안 재최적화 주기마다
+잔여 기간 T에 맞춰 듀레이션 매칭 최적화를 다시 풀고, 만기 자산을 목표 금액과 비교한다.
+
+- 금리: 재최적화 주기마다 기준 금리 변동폭이 랜덤워크로 움직인다 (σ × √(주기/12) × Z).
+- 재최적화: 모든 경로의 LP를 시점별로 batch_lp.solve_batch 한 번에 푼다 (경로별 수익률 행렬).
+- 보유 구간: 자산 전체와 월 저축액이 그 시점의 비중으로 월복리 성장하고,
+  구간 말 금리 변동 Δy에 대해 잔여 듀레이션만큼 가격 변동 -D × Δy가 반영된다.
+
+청년도약저축/ISA 한도는 /optimize와 같이 월 저축액 기준 비중 상한으로 적용한다.
+ISA 수익률도 /optimize(lp_returns)처럼 누적 과세 실효 수익률을 쓰되, 시점마다 잔여 기간과
+그 시점의 자산을 초기 자본으로 다시 계산한다.
+"""
+import numpy as np
+
+from app.config import settings
+from app.models.asset import Asset, TaxBenefit
+from app.models.simulation import (
+    RollingSimulationRequest,
+    RollingSimulationResponse,
+    TerminalValueDistribution,
+)
+from app.services.asset_universe import get_default_universe
+from app.services.batch_lp import asset_upper_bounds, duration_band, solve_batch
+from app.services.gap_analyzer import _future_value_array
+from app.services.rate_store import current_snapshot
+from app.services.tax import after_tax_return, effective_after_tax_returns
+
+
+def rolling_terminal_values(
+    req: RollingSimulationRequest,
+    assets: list[Asset],
+    base_rate: float | None = None,
+    epsilon: float | None = None,
+) -> dict[str, np.ndarray]:
+    """경로별 만기 자산과 시점별 포트폴리오 듀레이션/수익률을 계산한다.
+
+    Returns:
+        terminal: (P,) GBI 포트폴리오 만기 자산
+        simple: (P,) 단순 적금 만기 자산
+        duration: (S, P) 재최적화 시점별 포트폴리오 듀레이션
+        portfolio_return: (S, P) 재최적화 시점별 포트폴리오 세후 수익률
+    """
+    if base_rate is None:
+        base_rate = current_snapshot().base_interest_rate
+    if epsilon is None:
+        epsilon = settings.duration_epsilon
+
+    P = req.n_paths
+    N = req.time_horizon_months
+    C = req.monthly_contribution
+    rng = np.random.default_rng(req.seed)
+
+    starts = np.arange(0, N, req.rebalance_months)
+    lengths = np.minimum(starts + req.rebalance_months, N) - starts
+    S = len(starts)
+
+    # 금리 경로: 재최적화 시점별 변동폭 (S + 1, P), 0시점은 변동 없음
+    steps = rng.standard_normal((S, P)) * req.rate_volatility * np.sqrt(lengths / 12)[:, None]
+    shifts = np.vstack([np.zeros(P), np.cumsum(steps, axis=0)])
+
+    gross = np.array([a.gross_return for a in assets])
+    durations = np.array([a.duration for a in assets])
+    upper = asset_upper_bounds(assets, np.full(P, C))
+    d_max = float(durations.max()) if assets else 0.0
+    safe_after_tax = after_tax_return(1.0, TaxBenefit.NONE)
+
+    wealth = np.full(P, float(req.initial_principal))
+    simple = wealth.copy()
+    duration_path = np.zeros((S, P))
+    return_path = np.zeros((S, P))
+
+    for s in range(S):
+        # 제약을 만족할 수 없는 경로는 파킹(안전 금리, 듀레이션 0)으로 대기한다
+        safe = np.maximum(base_rate + shifts[s], 0.0) * safe_after_tax
+        port_return = safe
+        port_duration = np.zeros(P)
+
+        if assets:
+            returns = effective_after_tax_returns(
+                assets, wealth, C, N - starts[s], upper,
+                gross_returns=np.maximum(gross + shifts[s][:, None], 0.0),
+            )
+            remaining = (N - starts[s]) / 12
+            lo, hi = duration_band(np.full(P, remaining), epsilon)
+            lo = np.minimum(lo, d_max)  # 잔여 기간이 최장 듀레이션보다 길면 최장 자산으로 채운다
+            solution = solve_batch(returns, durations, lo, hi, upper)
+            port_return = np.where(solution.feasible, solution.objective, safe)
+            port_duration = solution.weights @ durations
+
+        m = lengths[s]
+        wealth = _future_value_array(wealth, C, port_return, m)
+        held = np.maximum(port_duration - m / 12, 0.0)
+        wealth *= np.maximum(1.0 - held * (shifts[s + 1] - shifts[s]), 0.0)
+        simple = _future_value_array(simple, C, safe, m)
+
+        duration_path[s] = port_duration
+        return_path[s] = port_return
+
+    return {
+        "terminal": wealth,
+        "simple": simple,
+        "duration": duration_path,
+        "portfolio_return": return_path,
+    }
+
+
+def simulate_rolling(
+    req: RollingSimulationRequest,
+    assets: list[Asset] | None = None,
+    base_rate: float | None = None,
+    epsilon: float | None = None,
+) -> RollingSimulationResponse:
+    """금리 경로별 롤링 재최적화 시뮬레이션의 목표 달성 확률과 만기 자산 분포를 반환한다."""
+    if assets is None:
+        assets = get_default_universe(req.eligible_youth_savings)
+
+    paths = rolling_terminal_values(req, assets, base_rate=base_rate, epsilon=epsilon)
+    terminal = paths["terminal"]
+    p5, p25, p50, p75, p95 = np.percentile(terminal, [5, 25, 50, 75, 95])
+
+    return RollingSimulationResponse(
+        n_paths=req.n_paths,
+        n_rebalances=paths["duration"].shape[0],
+        success_probability=round(float((terminal >= req.goal_amount).mean()), 4),
+        terminal_value=TerminalValueDistribution(
+            mean=round(float(terminal.mean()), 0),
+            p5=round(float(p5), 0),
+            p25=round(float(p25), 0),
+            p50=round(float(p50), 0),
+            p75=round(float(p75), 0),
+            p95=round(float(p95), 0),
+        ),
+        simple_savings_success_probability=round(
+            float((paths["simple"] >= req.goal_amount).mean()), 4
+        ),
+        mean_duration_path=np.round(paths["duration"].mean(axis=1), 4).tolist(),
+        mean_return_path=np.round(paths["portfolio_return"].mean(axis=1), 6).tolist(),
+    )
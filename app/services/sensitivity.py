@@ -0,0 +1,112 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from app.config import settings
+from app.models.asset import Asset
+from app.models.sensitivity import SensitivityGridRequest, SensitivityGridResult
+from app.services.asset_universe import get_default_universe
+from app.services.batch_lp import asset_upper_bounds, duration_band, solve_batch
+from app.services.gap_analyzer import required_annual_returns
+from app.services.probability import success_probability
+from app.services.tax import effective_after_tax_returns
+
+
+def _to_grid(values: np.ndarray) -> list[list[float | None]]:
+    return [[None if np.isnan(v) else float(v) for v in row] for row in values]
+
+
+def horizon_axis(req: SensitivityGridRequest) -> np.ndarray:
+    """목표 기간 축: 정수 개월로 반올림 후 중복을 제거한다."""
+    months = np.linspace(
+        req.time_horizon_min_months, req.time_horizon_max_months, req.time_horizon_steps
+    )
+    return np.unique(np.rint(months).astype(int))
+
+
+class SensitivityGridArrays(NamedTuple):
+    """격자 결과 배열. 2차원 배열은 (월 저축액, 목표 기간) 모양이고 값이 없는 칸은 NaN이다."""
+
+    monthly_contributions: np.ndarray
+    time_horizons_months: np.ndarray
+    optimization_needed: np.ndarray
+    required_annual_return: np.ndarray
+    portfolio_return: np.ndarray
+    feasible: np.ndarray
+    success_probability: np.ndarray
+
+
+def compute_sensitivity_grid(
+    req: SensitivityGridRequest,
+    assets: list[Asset] | None = None,
+    safe_rate: float | None = None,
+    epsilon: float | None = None,
+) -> SensitivityGridResult:
+    """월 저축액 × 목표 기간 격자 전체의 필요 수익률, 최적 수익률, 달성 가능 여부, 달성 확률을 계산한다.
+
+    격자의 모든 칸을 벡터화된 필요 수익률 역산과 배치 LP로 한 번에 푼다.
+    """
+    grid = sensitivity_grid_arrays(req, assets, safe_rate, epsilon)
+    return SensitivityGridResult(
+        monthly_contributions=grid.monthly_contributions.tolist(),
+        time_horizons_months=grid.time_horizons_months.tolist(),
+        optimization_needed=grid.optimization_needed.tolist(),
+        required_annual_return=_to_grid(grid.required_annual_return),
+        portfolio_return=_to_grid(grid.portfolio_return),
+        feasible=grid.feasible.tolist(),
+        success_probability=_to_grid(grid.success_probability),
+    )
+
+
+def sensitivity_grid_arrays(
+    req: SensitivityGridRequest,
+    assets: list[Asset] | None = None,
+    safe_rate: float | None = None,
+    epsilon: float | None = None,
+) -> SensitivityGridArrays:
+    """compute_sensitivity_grid의 계산부. 반올림은 JSON 응답과 같다 (수익률 6자리, 확률 4자리)."""
+    if assets is None:
+        assets = get_default_universe(req.eligible_youth_savings)
+    if epsilon is None:
+        epsilon = settings.duration_epsilon
+
+    contributions = np.round(np.linspace(
+        req.monthly_contribution_min, req.monthly_contribution_max, req.monthly_contribution_steps
+    ))
+    months = horizon_axis(req)
+    shape = (len(contributions), len(months))
+
+    C = np.repeat(contributions, len(months))
+    n = np.tile(months, len(contributions))
+
+    required, needed, achievable = required_annual_returns(
+        req.goal_amount, req.initial_principal, C, n, safe_rate=safe_rate
+    )
+
+    # optimize_portfolio(lp_returns)와 같은 목적함수: ISA는 칸마다 한도 비중에서의 실효 세후 수익률
+    upper = asset_upper_bounds(assets, C)
+    returns = effective_after_tax_returns(assets, req.initial_principal, C, n, upper)
+    durations = np.array([a.duration for a in assets])
+    lo, hi = duration_band(n / 12, epsilon)
+    solution = solve_batch(returns, durations, lo, hi, upper)
+
+    # /optimize와 같은 판정: 안전자산만으로 충분하거나, 최적 수익률이 필요 수익률 이상
+    reaches = solution.feasible & (solution.objective >= np.nan_to_num(required, nan=np.inf) - 1e-9)
+    feasible = ~needed | (achievable & reaches)
+
+    probability = np.full(len(C), np.nan)
+    solved = needed & solution.feasible
+    if solved.any():
+        probability[solved] = success_probability(
+            assets, solution.weights[solved], req.goal_amount, req.initial_principal, C[solved], n[solved]
+        )
+
+    return SensitivityGridArrays(
+        monthly_contributions=contributions,
+        time_horizons_months=months.astype(np.int64),
+        optimization_needed=needed.reshape(shape),
+        required_annual_return=np.round(required, 6).reshape(shape),
+        portfolio_return=np.round(solution.objective, 6).reshape(shape),
+        feasible=feasible.reshape(shape),
+        success_probability=np.round(probability, 4).reshape(shape),
+    )
@@ -0,0 +1,215 @@
+"""워커 프로세스 간 공유 결과 캐시 (메모리 맵 파일).
+
+uvicorn --workers N에서는 프로세스마다 메모리가 따로라 프로세스 내 캐시의 적중률이 1/N 수준이다.
+analyze_gap / optimize_portfolio 결과를 모든 워커가 같은 파일에 MAP_SHARED로 매핑해 나눠 쓴다.
+별도 서비스 없이 파일 하나로 동작하고, 재시작해도 파일이 남아 있으면 따뜻한 결과를 그대로 쓴다.
+
+레이아웃: 헤더 64바이트 + 고정 크기 슬롯 (slots개). 슬롯은 WAYS개씩 묶은 집합(set)에 키 해시로 배치한다.
+  슬롯 = seq(u64) | stamp(u64) | key(16B) | length(u32) | crc32(u32) | payload(JSON)
+- 읽기: 잠금 없음 (seqlock). seq가 홀수(쓰는 중)이거나 읽기 전후 seq가 다르면 버리고, CRC로 한 번 더 확인한다.
+- 쓰기: 프로세스 내 잠금 + 집합 범위의 fcntl 레코드 잠금으로 같은 집합의 쓰기만 짧게 직렬화한다.
+- 축출: 집합 안에서 stamp(마지막 쓰기·적중 시각)가 가장 오래된 슬롯 (집합 단위 근사 LRU).
+키에는 결과 버전(RESULT_VERSION), 함수 이름, 입력 전체, 설정 값을 넣는다.
+파일은 재시작·배포 후에도 남으므로, 계산 방식이 바뀌어 같은 입력의 결과가 달라지면 RESULT_VERSION을 올려
+이전 배포의 결과를 쓰지 않게 한다 (스키마 모양이 바뀐 것만은 ValidationError로도 걸러진다). 금리는 입력(자산 수익률, 안전 금리)으로 들어가므로
+스냅샷이 바뀌면 자연히 다른 키가 된다. payload보다 큰 결과는 캐시하지 않는다.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from typing import TypeVar
+
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
+
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # POSIX 전용: 없으면 공유 캐시를 끈다
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+WAYS = 8
+# 캐시되는 계산(갭 분석, 최적화)의 결과가 바뀌는 변경마다 올린다.
+# 버전별 결과 지문은 tests/test_services/test_shared_cache.py의 RESULT_FINGERPRINTS에 고정한다.
+RESULT_VERSION = 3
+_MAGIC = b"GBIRC001"
+_HEADER = struct.Struct("<8sIII")  # magic, slots, slot_size, ways
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<QQ16sII")  # seq, stamp, key, length, crc32
+_SEQ = struct.Struct("<Q")
+
+
+class SharedResultCache:
+    """메모리 맵 파일 위의 고정 슬롯 결과 캐시. path가 없으면 아무것도 하지 않는다."""
+
+    def __init__(self, path: str | None, slots: int = 4096, slot_size: int = 4096):
+        self.hits = 0
+        self.misses = 0
+        self._mm: mmap.mmap | None = None
+        self._fd = -1
+        self._lock = threading.Lock()
+        if path is None:
+            return
+        if fcntl is None:
+            logger.warning("공유 결과 캐시는 POSIX에서만 동작합니다: 비활성화합니다.")
+            return
+        self.sets = max(slots // WAYS, 1)
+        self.slot_size = max(slot_size, _SLOT.size + 64)
+        self.capacity = self.slot_size - _SLOT.size
+        header = _HEADER.pack(_MAGIC, self.sets * WAYS, self.slot_size, WAYS)
+        size = _HEADER_SIZE + self.sets * WAYS * self.slot_size
+        self._fd = _open_file(path, header, size)
+        self._mm = mmap.mmap(self._fd, size)
+
+    @property
+    def enabled(self) -> bool:
+        return self._mm is not None
+
+    def key(self, name: str, *parts) -> bytes:
+        """결과 버전, 함수 이름, 입력, 현재 설정 값으로 16바이트 키를 만든다."""
+        return hashlib.blake2b(to_json((RESULT_VERSION, name, parts, settings)), digest_size=16).digest()
+
+    def get(self, key: bytes, model: type[M]) -> M | None:
+        payload = self._read(key)
+        result = None
+        if payload is not None:
+            try:
+                result = model.model_validate_json(payload)
+            except ValidationError:  # 다른 버전의 스키마로 쓰인 결과
+                result = None
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, key: bytes, result: BaseModel) -> bool:
+        payload = result.model_dump_json().encode()
+        if len(payload) > self.capacity:
+            return False
+        self._write(key, payload)
+        return True
+
+    def cached(self, model: type[M], compute: Callable[[], M], name: str, *parts) -> M:
+        """캐시에 있으면 그 결과를, 없으면 compute()를 실행해 저장한 결과를 반환한다."""
+        if self._mm is None:
+            return compute()
+        key = self.key(name, *parts)
+        result = self.get(key, model)
+        if result is None:
+            result = compute()
+            self.put(key, result)
+        return result
+
+    def _offset(self, key: bytes) -> int:
+        bucket = int.from_bytes(key[:8], "little") % self.sets
+        return _HEADER_SIZE + bucket * WAYS * self.slot_size
+
+    def _read(self, key: bytes) -> bytes | None:
+        mm = self._mm
+        base = self._offset(key)
+        for way in range(WAYS):
+            at = base + way * self.slot_size
+            seq, _, slot_key, length, crc = _SLOT.unpack_from(mm, at)
+            if seq == 0 or seq & 1 or slot_key != key or length > self.capacity:
+                continue
+            payload = mm[at + _SLOT.size:at + _SLOT.size + length]
+            if _SEQ.unpack_from(mm, at)[0] != seq or zlib.crc32(payload) != crc:
+                continue  # 읽는 중 다른 워커가 덮어썼다
+            _SEQ.pack_into(mm, at + 8, time.time_ns())  # stamp 갱신 (경합해도 축출 순서만 흔들린다)
+            return payload
+        return None
+
+    def _write(self, key: bytes, payload: bytes) -> None:
+        mm = self._mm
+        base = self._offset(key)
+        set_bytes = WAYS * self.slot_size
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, set_bytes, base, os.SEEK_SET)
+            try:
+                victim, oldest = base, None
+                for way in range(WAYS):
+                    at = base + way * self.slot_size
+                    seq, stamp, slot_key, _, _ = _SLOT.unpack_from(mm, at)
+                    if slot_key == key or seq == 0:
+                        victim = at
+                        break
+                    if oldest is None or stamp < oldest:
+                        victim, oldest = at, stamp
+                seq = _SEQ.unpack_from(mm, victim)[0] | 1
+                _SEQ.pack_into(mm, victim, seq)  # 홀수: 쓰는 중
+                mm[victim + _SLOT.size:victim + _SLOT.size + len(payload)] = payload
+                _SLOT.pack_into(mm, victim, seq, time.time_ns(), key, len(payload), zlib.crc32(payload))
+                _SEQ.pack_into(mm, victim, seq + 1)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, set_bytes, base, os.SEEK_SET)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        """모든 슬롯을 비운다 (같은 파일을 쓰는 모든 워커에 적용된다)."""
+        if self._mm is not None:
+            with self._lock:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX)
+                try:
+                    self._mm[_HEADER_SIZE:] = bytes(len(self._mm) - _HEADER_SIZE)
+                finally:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        self.hits = self.misses = 0
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            os.close(self._fd)
+            self._mm = None
+
+
+def _open_file(path: str, header: bytes, size: int) -> int:
+    """캐시 파일을 열고, 새 파일이면 초기화한다.
+
+    슬롯 구성이 다른 기존 파일은 새 파일로 원자적으로 교체한다 (이미 매핑한 다른 프로세스는
+    교체 전 inode를 계속 쓰므로 SIGBUS 없이 안전하다).
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        current = os.fstat(fd).st_size
+        if current == 0:
+            os.ftruncate(fd, size)
+            os.pwrite(fd, header, 0)
+            return fd
+        if current == size and os.pread(fd, len(header), 0) == header:
+            return fd
+        tmp = f"{path}.{os.getpid()}.tmp"
+        new = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.ftruncate(new, size)
+        os.pwrite(new, header, 0)
+        os.replace(tmp, path)
+        logger.warning("공유 결과 캐시 파일의 슬롯 구성이 달라 새로 만들었습니다: %s", path)
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
+    return new
+
+
+result_cache = SharedResultCache(
+    settings.shared_cache_path, settings.shared_cache_slots, settings.shared_cache_slot_size
+)
@@ -1,3 +1,7 @@
+from typing import NamedTuple
+
+import numpy as np
+
 from app.config import settings
 from app.models.asset import Asset
 from app.models.goal import GoalInput
@@ -7,8 +11,11 @@ from app.models.simulation import (
     ScenarioResult,
     SimulationResponse,
 )
-from app.services.gap_analyzer import _future_value
-from app.services.tax import after_tax_return
+from app.services.gap_analyzer import _future_value, _future_value_array
+from app.services.ledger import after_tax_terminal_values
+from app.services.rate_store import current_snapshot
+from app.services.tax import after_tax_returns
+from app.services.tracing import traced
 
 DEFAULT_SCENARIOS = [
     RateScenario(label="금리 급락 (-1.5%)", rate_shift=-0.015),
@@ -22,9 +29,9 @@ def _portfolio_fv_under_shift(
     goal: GoalInput,
     portfolio: OptimizationResult,
     assets: list[Asset],
-    rate_shift: float,
-) -> float:
-    """금리 변동 시 포트폴리오의 미래가치를 계산한다.
+    rate_shifts: np.ndarray,
+) -> np.ndarray:
+    """금리 변동 시나리오별 포트폴리오의 세후 미래가치 (S,)를 한 번에 계산한다.
 
     듀레이션 매칭 면역화 효과:
     - 가격 변동 효과: ΔP ≈ -D × Δy × PV (금리 상승 시 가격 하락)
@@ -32,99 +39,147 @@ def _portfolio_fv_under_shift(
     - 듀레이션 매칭 시 두 효과가 상쇄
     - 잔여 효과는 (D_portfolio - T)^2 × convexity 에 비례 (2차 효과)
     """
-    asset_map = {a.asset_class: a for a in assets}
-    total_fv = 0.0
     T_years = goal.time_horizon_months / 12
+    shifts = np.asarray(rate_shifts, dtype=float)
 
     if not portfolio.allocations:
-        return _future_value(
+        return np.full(shifts.shape, _future_value(
             goal.initial_principal,
             goal.monthly_contribution,
             0.0,
             goal.time_horizon_months,
-        )
+        ))
 
+    index = {a.asset_class: i for i, a in enumerate(assets)}
+    weights = np.zeros(len(assets))
+    total_fv = np.zeros(shifts.shape)
     for alloc in portfolio.allocations:
-        asset = asset_map.get(alloc.asset_class)
-        if asset is None:
+        i = index.get(alloc.asset_class)
+        if i is None:
             # 포트폴리오에 포함된 자산이 유니버스에 없으면 무위험 수익률로 대체
-            monthly_amount = alloc.monthly_amount
-            weight_principal = alloc.weight * goal.initial_principal
             total_fv += _future_value(
-                weight_principal, monthly_amount, 0.0, goal.time_horizon_months
+                alloc.weight * goal.initial_principal, alloc.monthly_amount, 0.0,
+                goal.time_horizon_months,
             )
             continue
+        weights[i] += alloc.weight
+
+    # 기본 수익률에 금리 변동 반영 (음수 방어), 자산별 만기 세후 잔고는 월별 원장으로 계산
+    gross = np.array([a.gross_return for a in assets])
+    shifted_gross = np.maximum(gross[None, :] + shifts[:, None], 0.0)
+    asset_fv = after_tax_terminal_values(
+        assets, weights, goal.initial_principal, goal.monthly_contribution,
+        goal.time_horizon_months, shifted_gross,
+    )
+    durations = np.array([a.duration for a in assets])
+    factor = _immunization_factor(durations[None, :], T_years, shifts[:, None])
+    return total_fv + (asset_fv * factor).sum(axis=1)
+
+
+def _immunization_factor(
+    duration: np.ndarray | float, T_years: float, rate_shift: np.ndarray | float
+) -> np.ndarray | float:
+    """듀레이션 매칭 면역화 보정 계수.
+
+    듀레이션이 목표와 일치하면 금리 변동의 1차 효과가 상쇄되고
+    잔여 2차 효과만 남는다 (convexity bonus).
+    """
+    # 면역화 보정: 듀레이션 갭이 작을수록 금리 변동 영향 감소
+    # 갭과 금리변동이 모두 클 때만 유의미한 영향
+    immunization_adjustment = np.abs(duration - T_years) * np.abs(rate_shift) * 0.5
+    return np.clip(1.0 - immunization_adjustment, 0.85, 1.15)
 
-        # 기본 수익률에 금리 변동 반영 (음수 방어)
-        shifted_gross = max(asset.gross_return + rate_shift, 0.0)
-        shifted_after_tax = after_tax_return(shifted_gross, asset.tax_benefit)
-
-        monthly_amount = alloc.monthly_amount
-        weight_principal = alloc.weight * goal.initial_principal
-
-        asset_fv = _future_value(
-            weight_principal,
-            monthly_amount,
-            shifted_after_tax,
-            goal.time_horizon_months,
-        )
-
-        # 듀레이션 매칭 면역화 보정
-        # 듀레이션이 목표와 일치하면 금리 변동의 1차 효과가 상쇄됨
-        # 잔여 2차 효과만 남음 (convexity bonus)
-        duration_gap = asset.duration - T_years
-        # 면역화 보정: 듀레이션 갭이 작을수록 금리 변동 영향 감소
-        # 갭과 금리변동이 모두 클 때만 유의미한 영향
-        immunization_adjustment = abs(duration_gap) * abs(rate_shift) * 0.5
-        immunization_factor = max(0.85, min(1.15, 1.0 - immunization_adjustment))
-
-        total_fv += asset_fv * immunization_factor
-
-    return total_fv
 
+def scenario_value_matrix(
+    goal: GoalInput,
+    assets: list[Asset],
+    rate_shifts: np.ndarray,
+) -> np.ndarray:
+    """시나리오별 자산 비중 1의 만기 가치 (S, n).
 
-def simulate_scenarios(
+    _portfolio_fv_under_shift에서 한도 이월과 청년도약저축 만기 재예치를 뺀 선형 근사로,
+    ISA도 비과세 한도 없이 이자마다 분리과세한다. 비중에 선형이므로 포트폴리오 미래가치는 V @ w로 계산된다 (시나리오 LP 용).
+    """
+    shifts = np.asarray(rate_shifts, dtype=float)[:, None]
+    gross = np.array([a.gross_return for a in assets])[None, :]
+    durations = np.array([a.duration for a in assets])[None, :]
+    shifted_after_tax = after_tax_returns(np.maximum(gross + shifts, 0.0), assets)
+    fv = _future_value_array(
+        goal.initial_principal, goal.monthly_contribution, shifted_after_tax,
+        goal.time_horizon_months,
+    )
+    return fv * _immunization_factor(durations, goal.time_horizon_months / 12, shifts)
+
+
+class ScenarioColumns(NamedTuple):
+    """시나리오별 결과를 열로 모은 것 (행 객체 없이 바이너리 응답에 그대로 싣는다)."""
+
+    base_rate: float
+    labels: list[str]
+    rate_shift: np.ndarray
+    new_rate: np.ndarray
+    simple_savings_fv: np.ndarray
+    portfolio_fv: np.ndarray
+
+
+@traced("simulate_scenarios")
+def scenario_columns(
     goal: GoalInput,
     portfolio: OptimizationResult,
     assets: list[Asset],
     base_rate: float | None = None,
     scenarios: list[RateScenario] | None = None,
-) -> SimulationResponse:
-    """Section 5: 금리 변동 시뮬레이션을 수행한다."""
+) -> ScenarioColumns:
+    """Section 5의 계산부: 모든 시나리오를 배열 연산 한 번으로 계산한다 (반올림 전 값)."""
     if base_rate is None:
-        base_rate = settings.base_interest_rate
+        base_rate = current_snapshot().base_interest_rate
     if scenarios is None:
         scenarios = DEFAULT_SCENARIOS
 
-    results: list[ScenarioResult] = []
-
-    for scenario in scenarios:
-        new_rate = base_rate + scenario.rate_shift
-
-        # (A) 단순 적금 — 금리가 음수가 되면 0%로 클램프
-        safe_rate = max(new_rate, 0.0)
-        safe_after_tax = safe_rate * (1 - settings.interest_income_tax_rate)
-        simple_fv = _future_value(
-            goal.initial_principal,
-            goal.monthly_contribution,
-            safe_after_tax,
-            goal.time_horizon_months,
+    shifts = np.array([s.rate_shift for s in scenarios], dtype=float)
+    new_rates = base_rate + shifts
+
+    # (A) 단순 적금 — 금리가 음수가 되면 0%로 클램프
+    safe_after_tax = np.maximum(new_rates, 0.0) * (1 - settings.interest_income_tax_rate)
+    simple_fv = _future_value_array(
+        goal.initial_principal, goal.monthly_contribution, safe_after_tax, goal.time_horizon_months
+    )
+
+    # (B) GBI 포트폴리오
+    portfolio_fv = _portfolio_fv_under_shift(goal, portfolio, assets, shifts)
+    return ScenarioColumns(
+        base_rate, [s.label for s in scenarios], shifts, new_rates, simple_fv, portfolio_fv
+    )
+
+
+def scenario_response(columns: ScenarioColumns) -> SimulationResponse:
+    """열을 JSON 응답 모델로 바꾼다 (시나리오마다 ScenarioResult 하나)."""
+    results = [
+        ScenarioResult(
+            label=label,
+            rate_shift=shift,
+            new_rate=round(new_rate, 4),
+            simple_savings_fv=round(simple_fv, 0),
+            portfolio_fv=round(portfolio_fv, 0),
+            difference=round(portfolio_fv - simple_fv, 0),
         )
-
-        # (B) GBI 포트폴리오
-        portfolio_fv = _portfolio_fv_under_shift(
-            goal, portfolio, assets, scenario.rate_shift
+        for label, shift, new_rate, simple_fv, portfolio_fv in zip(
+            columns.labels,
+            columns.rate_shift.tolist(),
+            columns.new_rate.tolist(),
+            columns.simple_savings_fv.tolist(),
+            columns.portfolio_fv.tolist(),
         )
+    ]
+    return SimulationResponse(base_rate=columns.base_rate, results=results)
 
-        results.append(
-            ScenarioResult(
-                label=scenario.label,
-                rate_shift=scenario.rate_shift,
-                new_rate=round(new_rate, 4),
-                simple_savings_fv=round(simple_fv, 0),
-                portfolio_fv=round(portfolio_fv, 0),
-                difference=round(portfolio_fv - simple_fv, 0),
-            )
-        )
 
-    return SimulationResponse(base_rate=base_rate, results=results)
+def simulate_scenarios(
+    goal: GoalInput,
+    portfolio: OptimizationResult,
+    assets: list[Asset],
+    base_rate: float | None = None,
+    scenarios: list[RateScenario] | None = None,
+) -> SimulationResponse:
+    """Section 5: 금리 변동 시뮬레이션을 수행한다."""
+    return scenario_response(scenario_columns(goal, portfolio, assets, base_rate, scenarios))
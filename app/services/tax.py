@@ -1,5 +1,20 @@
+"""세금 계산.
+
+after_tax_return은 자산 하나의 명목 세후 수익률이다 (이자 지급 시 원천징수).
+배열 엔진은 자산을 두 과세 방식으로 나눈다.
+- 원천징수 (일반 예금·ETF): 매 이자에 세율을 바로 적용하므로 세후 수익률로 복리 계산하면 된다
+- 누적 과세 (ISA): 보유 기간의 순이익(손익 통산)을 해지 시점에 모아 비과세 한도를 먼저 빼고
+  남은 금액에 분리과세율을 적용한다
+
+cumulative_tax는 (..., 개월, 자산) 모양의 월별 이익 배열을 받아 시점별 누적 세액을 한 번에 계산한다.
+앞쪽 축은 시나리오·경로 등 무엇이든 될 수 있다.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
 from app.config import settings
-from app.models.asset import TaxBenefit
+from app.models.asset import Asset, TaxBenefit
 
 
 def after_tax_return(gross_return: float, tax_benefit: TaxBenefit) -> float:
@@ -19,3 +34,184 @@ def after_tax_return(gross_return: float, tax_benefit: TaxBenefit) -> float:
     if tax_benefit == TaxBenefit.SEPARATE_TAX:
         return gross_return * (1 - settings.isa_separate_tax_rate)
     return gross_return * (1 - settings.interest_income_tax_rate)
+
+
+def tax_rates(assets: list[Asset]) -> np.ndarray:
+    """자산별 이자 세율 (n,)."""
+    rates = {
+        TaxBenefit.TAX_FREE: 0.0,
+        TaxBenefit.SEPARATE_TAX: settings.isa_separate_tax_rate,
+        TaxBenefit.NONE: settings.interest_income_tax_rate,
+    }
+    return np.array([rates[a.tax_benefit] for a in assets])
+
+
+def cumulative_taxed(assets: list[Asset]) -> np.ndarray:
+    """만기(해지) 시점에 누적 순이익으로 과세하는 자산 (n,) bool."""
+    return np.array([a.tax_benefit == TaxBenefit.SEPARATE_TAX for a in assets], dtype=bool)
+
+
+def after_tax_returns(gross_returns: np.ndarray, assets: list[Asset]) -> np.ndarray:
+    """after_tax_return의 배열 버전 (..., n)."""
+    gross = np.asarray(gross_returns, dtype=float)
+    return np.where(gross > 0, gross * (1 - tax_rates(assets)), gross)
+
+
+def accrual_returns(gross_returns: np.ndarray, assets: list[Asset]) -> np.ndarray:
+    """잔고가 실제로 불어나는 수익률 (..., n): 원천징수 자산은 세후, 누적 과세 자산은 세전."""
+    gross = np.asarray(gross_returns, dtype=float)
+    return np.where(cumulative_taxed(assets), gross, after_tax_returns(gross, assets))
+
+
+def cumulative_tax(gains: np.ndarray, assets: list[Asset], allowance: float | None = None) -> np.ndarray:
+    """누적 과세 자산의 시점별 누적 세액 (gains와 같은 모양).
+
+    Args:
+        gains: 월별 이익 (..., months, n). 손실은 음수로 넣으면 이후 이익과 통산된다.
+        allowance: 비과세 한도 (기본: settings.isa_tax_free_allowance)
+
+    원천징수 자산은 잔고 계산에서 이미 세후 수익률을 썼으므로 0이다.
+    """
+    if allowance is None:
+        allowance = settings.isa_tax_free_allowance
+    gains = np.asarray(gains, dtype=float)
+    net = np.cumsum(gains, axis=-2)
+    rates = np.where(cumulative_taxed(assets), tax_rates(assets), 0.0)
+    return rates * np.maximum(net - allowance, 0.0)
+
+
+def _future_value_and_slope(
+    principal: float, monthly: float, rates: np.ndarray, months: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """양의 연 수익률 rates에서의 미래가치와 ∂FV/∂rate (gap_analyzer의 연금 공식과 같다)."""
+    r_m = rates / 12
+    compound = np.exp(months * np.log1p(r_m))
+    annuity = (compound - 1) / r_m
+    g_n1 = compound / (1 + r_m)
+    slope = (principal * months * g_n1 + monthly * (months * g_n1 - annuity) / r_m) / 12
+    return principal * compound + monthly * annuity, slope
+
+
+def _future_value_partials(
+    principal: float | np.ndarray, monthly: float | np.ndarray, rates: np.ndarray, months: float | np.ndarray
+) -> tuple[np.ndarray, ...]:
+    """양의 연 수익률 rates에서의 (FV, ∂FV/∂P, ∂FV/∂C, ∂FV/∂n, ∂FV/∂rate). n은 연속 변수로 미분한다."""
+    r_m = rates / 12
+    log_g = np.log1p(r_m)
+    compound = np.exp(months * log_g)
+    annuity = (compound - 1) / r_m
+    g_n1 = compound / (1 + r_m)
+    d_rate = (principal * months * g_n1 + monthly * (months * g_n1 - annuity) / r_m) / 12
+    d_months = log_g * compound * (principal + monthly / r_m)
+    return principal * compound + monthly * annuity, compound, annuity, d_months, d_rate
+
+
+def effective_after_tax_returns(
+    assets: list[Asset],
+    principal: float | np.ndarray,
+    monthly: float | np.ndarray,
+    months: int | np.ndarray,
+    position: np.ndarray,
+    gross_returns: np.ndarray | None = None,
+    newton_steps: int = 2,
+) -> np.ndarray:
+    """누적 과세까지 반영한 자산별 실효 세후 수익률 (..., n).
+
+    비중 position (..., n)으로 보유할 때 만기 세후 가치를 만드는 연 수익률이다.
+    principal, monthly, months는 스칼라 또는 position의 앞쪽 축 (...,) 모양의 배열이다.
+    원천징수 자산은 after_tax_returns와 같고, 누적 과세 자산은 비과세 한도 덕분에 그보다 높다.
+    세금은 세전 가치에 비해 작으므로 세전 수익률에서 시작한 뉴턴법 몇 단계로 충분하다.
+    """
+    if gross_returns is None:
+        gross_returns = np.array([a.gross_return for a in assets])
+    position = np.asarray(position, dtype=float)
+    gross = np.broadcast_to(np.asarray(gross_returns, dtype=float), position.shape)
+    flat = after_tax_returns(gross, assets)
+    taxed = cumulative_taxed(assets)
+    months = np.asarray(months)[..., None]
+    if not taxed.any() or np.all(months <= 0):
+        return flat
+    held = months > 0
+    months = np.maximum(months, 1)  # 0개월은 세금이 없으므로 뉴턴법만 안전하게 돌린다
+
+    principal = np.asarray(principal, dtype=float)[..., None]
+    monthly = np.asarray(monthly, dtype=float)[..., None]
+    size = np.maximum(position[..., taxed], 1e-12)
+    start = gross[..., taxed]
+    rate = np.maximum(start, 1e-9)
+    value, slope = _future_value_and_slope(principal, monthly, rate, months)
+    gain = size * (value - principal - monthly * months)
+    tax = settings.isa_separate_tax_rate * np.maximum(gain - settings.isa_tax_free_allowance, 0.0)
+    tax = np.where(held, tax, 0.0)
+    target = value - tax / size  # 비중 1당 세후 만기 가치
+
+    for step in range(newton_steps):
+        if step:
+            value, slope = _future_value_and_slope(principal, monthly, rate, months)
+        rate = rate - (value - target) / slope
+
+    effective = flat.copy()
+    effective[..., taxed] = np.where(tax > 0, rate, start)
+    return effective
+
+
+class EffectiveReturnPartials(NamedTuple):
+    """effective_after_tax_returns의 입력별 편미분. 모두 position과 같은 (..., n) 모양이다."""
+
+    principal: np.ndarray  # ∂r/∂초기 자본 (원당)
+    monthly: np.ndarray  # ∂r/∂월 저축액 (원당)
+    months: np.ndarray  # ∂r/∂기간 (개월당)
+    position: np.ndarray  # ∂r/∂자기 비중
+    gross: np.ndarray  # ∂r_i/∂세전 수익률_i
+
+
+def effective_after_tax_return_partials(
+    assets: list[Asset],
+    principal: float | np.ndarray,
+    monthly: float | np.ndarray,
+    months: int | np.ndarray,
+    position: np.ndarray,
+    gross_returns: np.ndarray | None = None,
+) -> EffectiveReturnPartials:
+    """effective_after_tax_returns의 편미분.
+
+    누적 과세 자산의 실효 수익률 ρ는 FV(ρ) = 세후 만기 가치(target)의 해이므로 음함수 미분으로
+    ∂ρ/∂θ = (∂target/∂θ - ∂FV(ρ)/∂θ) / ∂FV/∂ρ 이다. 비과세 한도 안쪽(세금 0)에서는 ρ가 세전 수익률과 같다.
+    """
+    if gross_returns is None:
+        gross_returns = np.array([a.gross_return for a in assets])
+    position = np.asarray(position, dtype=float)
+    gross = np.broadcast_to(np.asarray(gross_returns, dtype=float), position.shape)
+    zeros = np.zeros(position.shape)
+    d_principal, d_monthly, d_months, d_position = (zeros.copy() for _ in range(4))
+    d_gross = np.where(gross > 0, 1.0 - tax_rates(assets), 1.0)
+    taxed = cumulative_taxed(assets)
+    n = np.asarray(months, dtype=float)[..., None]
+    if not taxed.any() or np.all(n <= 0):
+        return EffectiveReturnPartials(d_principal, d_monthly, d_months, d_position, d_gross)
+    held = n > 0
+    n = np.maximum(n, 1)
+
+    P = np.asarray(principal, dtype=float)[..., None]
+    C = np.asarray(monthly, dtype=float)[..., None]
+    rate_tax = settings.isa_separate_tax_rate
+    allowance = settings.isa_tax_free_allowance
+    size = np.maximum(position[..., taxed], 1e-12)
+    value, V_P, V_C, V_n, V_g = _future_value_partials(P, C, np.maximum(gross[..., taxed], 1e-9), n)
+    gain = size * (value - P - C * n)
+    active = held & (gain > allowance)  # 세금이 붙는 구간에서만 ρ가 세전 수익률과 다르다
+
+    rho = effective_after_tax_returns(assets, principal, monthly, months, position, gross_returns)[..., taxed]
+    _, F_P, F_C, F_n, F_rho = _future_value_partials(P, C, rho, n)
+
+    def implicit(d_value: np.ndarray, d_paid: np.ndarray | float, d_fv: np.ndarray) -> np.ndarray:
+        # target = V - τ · (s(V - 납입) - 한도) / s
+        d_target = d_value - rate_tax * (d_value - d_paid)
+        return np.where(active, (d_target - d_fv) / F_rho, 0.0)
+
+    d_principal[..., taxed] = implicit(V_P, 1.0, F_P)
+    d_monthly[..., taxed] = implicit(V_C, n, F_C)
+    d_months[..., taxed] = implicit(V_n, C, F_n)
+    d_position[..., taxed] = np.where(active, -rate_tax * allowance / size**2 / F_rho, 0.0)
+    d_gross[..., taxed] = np.where(active, (1 - rate_tax) * V_g / F_rho, 1.0)
+    return EffectiveReturnPartials(d_principal, d_monthly, d_months, d_position, d_gross)
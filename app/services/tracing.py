@@ -0,0 +1,175 @@
+"""프로세스 내 요청 추적 (스팬 링 버퍼, 꼬리 기반 샘플링).
+
+요청마다 Trace 하나를 컨텍스트 변수에 두고, 단계 함수가 span()으로 구간을 기록한다.
+- 스팬: analyze_gap, brentq, universe, linprog, simulate_scenarios, endpoint, serialize 등
+- 꼬리 기반 샘플링: 요청이 끝난 뒤 지연이 slow_ms 이상이거나 5xx면 항상, 나머지는 sample_rate 비율만 남긴다
+- 보관: 최근 capacity개 요청만 링 버퍼(deque)에 둔다
+- 내보내기: Chrome Trace Event 형식 JSON (Perfetto, chrome://tracing에서 바로 열린다)
+
+추적 중이 아닐 때 span()은 컨텍스트 변수 조회 한 번으로 끝난다.
+동기 엔드포인트와 asyncio.to_thread는 컨텍스트를 복사하므로 작업 스레드의 스팬도 같은 요청에 모인다.
+"""
+import functools
+import itertools
+import os
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any, NamedTuple, TypeVar
+
+from app.config import settings
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# perf_counter_ns → 에폭 나노초 (뷰어에 실제 시각이 보이도록)
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+
+class Span(NamedTuple):
+    name: str
+    start_ns: int  # perf_counter_ns
+    duration_ns: int
+    thread: int
+    args: dict[str, Any] | None
+
+
+class Trace:
+    __slots__ = ("id", "name", "start_ns", "duration_ns", "status", "spans", "endpoint_end_ns")
+
+    def __init__(self, trace_id: int, name: str):
+        self.id = trace_id
+        self.name = name
+        self.start_ns = time.perf_counter_ns()
+        self.duration_ns = 0
+        self.status = 0
+        self.spans: list[Span] = []  # list.append는 스레드 안전하다
+        self.endpoint_end_ns: int | None = None
+
+
+_current: ContextVar[Trace | None] = ContextVar("gbi_trace", default=None)
+
+
+def current_trace() -> Trace | None:
+    return _current.get()
+
+
+class span:
+    """with span("linprog", n=6): ... — 추적 중인 요청이면 구간을 기록한다."""
+
+    __slots__ = ("name", "args", "trace", "start")
+
+    def __init__(self, name: str, **args: Any):
+        self.name = name
+        self.args = args or None
+        self.trace = _current.get()
+
+    def __enter__(self) -> "span":
+        if self.trace is not None:
+            self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.trace is not None:
+            self.trace.spans.append(Span(
+                self.name, self.start, time.perf_counter_ns() - self.start, threading.get_ident(), self.args
+            ))
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """함수 전체를 스팬 하나로 기록하는 데코레이터."""
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class Tracer:
+    """완료된 요청 추적의 링 버퍼와 꼬리 기반 샘플링."""
+
+    def __init__(
+        self,
+        capacity: int,
+        slow_ms: float,
+        sample_rate: float,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.capacity = capacity
+        self.slow_ns = int(slow_ms * 1e6)
+        self.sample_rate = sample_rate
+        self._rng = rng
+        self._ids = itertools.count(1)
+        self._buffer: deque[Trace] = deque(maxlen=max(capacity, 1))
+        self.finished = 0
+        self.kept = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def start(self, name: str) -> tuple[Trace, Any]:
+        """요청 추적을 시작하고 현재 컨텍스트에 건다. (trace, 복원 토큰)을 반환한다."""
+        trace = Trace(next(self._ids), name)
+        return trace, _current.set(trace)
+
+    def finish(self, trace: Trace, token: Any, status: int) -> bool:
+        """추적을 끝내고 샘플링 규칙에 맞으면 보관한다."""
+        _current.reset(token)
+        trace.duration_ns = time.perf_counter_ns() - trace.start_ns
+        trace.status = status
+        self.finished += 1
+        keep = trace.duration_ns >= self.slow_ns or status >= 500 or self._rng() < self.sample_rate
+        if keep:
+            self._buffer.append(trace)  # 가득 차면 가장 오래된 추적이 밀려난다
+            self.kept += 1
+        return keep
+
+    def traces(self) -> list[Trace]:
+        return list(self._buffer)
+
+    def clear(self) -> None:
+        self._buffer.clear()
+        self.finished = self.kept = 0
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Chrome Trace Event 형식. 요청 하나가 트랙(tid) 하나가 되고 스팬은 시간으로 중첩된다."""
+        pid = os.getpid()
+        events: list[dict[str, Any]] = []
+        for trace in self.traces():
+            tid = trace.id
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": f"#{trace.id} {trace.name} ({trace.duration_ns / 1e6:.1f} ms)"},
+            })
+            events.append(_event(trace.name, "request", trace.start_ns, trace.duration_ns, pid, tid,
+                                 {"status": trace.status}))
+            for s in trace.spans:
+                events.append(_event(s.name, "phase", s.start_ns, s.duration_ns, pid, tid,
+                                     {"thread": s.thread, **(s.args or {})}))
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "finished_requests": self.finished,
+                "kept_requests": self.kept,
+                "slow_ms": self.slow_ns / 1e6,
+                "sample_rate": self.sample_rate,
+            },
+        }
+
+
+def _event(name: str, cat: str, start_ns: int, duration_ns: int, pid: int, tid: int, args: dict) -> dict:
+    return {
+        "name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+        "ts": (start_ns + _EPOCH_OFFSET_NS) / 1000, "dur": duration_ns / 1000, "args": args,
+    }
+
+
+tracer = Tracer(settings.trace_buffer_size, settings.trace_slow_ms, settings.trace_sample_rate)
@@ -9,6 +9,7 @@ const state = {
   gapResult: null,
   optimizationResult: null,
   simulationResult: null,
+  live: null,  // 실시간 채널이 미리 계산한 결과 { key, gap, optimize, simulate }
 };
 
 let allocationChartInstance = null;
@@ -70,6 +71,60 @@ async function apiPost(endpoint, body) {
   return res.json();
 }
 
+// =============================================
+// Live Recompute (WebSocket)
+// =============================================
+
+// 입력이 바뀔 때마다 목표를 서버로 흘려보내고, 단계별 결과를 받는다.
+// 서버가 디바운스와 이전 계산 취소를 맡으므로 클라이언트는 최신 seq의 메시지만 반영하면 된다.
+class LiveChannel {
+  constructor(path, onMessage) {
+    this.path = path;
+    this.onMessage = onMessage;
+    this.seq = 0;
+    this.pending = null;
+    this.retryMs = 500;
+    this.connect();
+  }
+
+  connect() {
+    const proto = location.protocol === 'https:' ? 'wss' : 'ws';
+    this.ws = new WebSocket(`${proto}://${location.host}${this.path}`);
+    this.ws.addEventListener('open', () => {
+      this.retryMs = 500;
+      if (this.pending) this.ws.send(JSON.stringify(this.pending));
+    });
+    this.ws.addEventListener('message', (event) => {
+      const message = JSON.parse(event.data);
+      if (message.seq === this.seq) this.onMessage(message);  // 이전 갱신의 응답은 버린다
+    });
+    this.ws.addEventListener('close', () => {
+      setTimeout(() => this.connect(), this.retryMs);
+      this.retryMs = Math.min(this.retryMs * 2, 10000);
+    });
+  }
+
+  send(goal) {
+    this.seq += 1;
+    this.pending = { seq: this.seq, goal };
+    if (this.ws.readyState === WebSocket.OPEN) this.ws.send(JSON.stringify(this.pending));
+  }
+}
+
+const liveChannel = 'WebSocket' in window
+  ? new LiveChannel(`${API_BASE}/live`, (message) => {
+      if (!state.live || !['gap', 'optimize', 'simulate'].includes(message.phase)) return;
+      state.live[message.phase] = message.data;
+    })
+  : null;
+
+// 실시간 채널이 같은 입력으로 이미 계산했으면 그 결과를 쓰고, 아니면 REST로 요청한다.
+async function livePhaseOrPost(phase, endpoint, body) {
+  const live = state.live;
+  if (live && live.key === JSON.stringify(body) && live[phase]) return live[phase];
+  return apiPost(endpoint, body);
+}
+
 // =============================================
 // Step Navigation
 // =============================================
@@ -99,7 +154,7 @@ document.querySelectorAll('.btn-back').forEach(btn => {
 // Validation
 // =============================================
 
-function validateGoalInput(input) {
+function goalInputErrors(input) {
   const errors = [];
   if (!input.goal_amount || input.goal_amount <= 0) {
     errors.push('목표 금액은 0보다 커야 합니다.');
@@ -113,6 +168,11 @@ function validateGoalInput(input) {
   if (input.initial_principal < 0) {
     errors.push('초기 자본은 0 이상이어야 합니다.');
   }
+  return errors;
+}
+
+function validateGoalInput(input) {
+  const errors = goalInputErrors(input);
   if (errors.length > 0) {
     showError(errors.join('\n'));
     return false;
@@ -124,24 +184,35 @@ function validateGoalInput(input) {
 // Step 1 → Step 2: Gap Analysis
 // =============================================
 
-document.getElementById('goal-form').addEventListener('submit', async (e) => {
-  e.preventDefault();
-
-  const goalInput = {
+function readGoalInput() {
+  return {
     goal_amount: parseFloat(document.getElementById('goal_amount').value),
     time_horizon_months: parseInt(document.getElementById('time_horizon_months').value),
     monthly_contribution: parseFloat(document.getElementById('monthly_contribution').value),
     initial_principal: parseFloat(document.getElementById('initial_principal').value) || 0,
     eligible_youth_savings: document.getElementById('eligible_youth_savings').checked,
   };
+}
+
+// 입력 중에는 오류를 띄우지 않고, 유효한 입력만 실시간 채널로 보낸다
+document.getElementById('goal-form').addEventListener('input', () => {
+  const goalInput = readGoalInput();
+  if (!liveChannel || goalInputErrors(goalInput).length > 0) return;
+  state.live = { key: JSON.stringify(goalInput) };
+  liveChannel.send(goalInput);
+});
+
+document.getElementById('goal-form').addEventListener('submit', async (e) => {
+  e.preventDefault();
 
+  const goalInput = readGoalInput();
   if (!validateGoalInput(goalInput)) return;
 
   state.goalInput = goalInput;
   setButtonLoading('btn-analyze', true);
 
   try {
-    const gapResult = await apiPost('/gap-analysis', goalInput);
+    const gapResult = await livePhaseOrPost('gap', '/gap-analysis', goalInput);
     state.gapResult = gapResult;
     renderGapResult(gapResult);
     showStep(2);
@@ -189,7 +260,7 @@ document.getElementById('btn-optimize').addEventListener('click', async () => {
   setButtonLoading('btn-optimize', true);
 
   try {
-    const result = await apiPost('/optimize', state.goalInput);
+    const result = await livePhaseOrPost('optimize', '/optimize', state.goalInput);
     state.optimizationResult = result;
 
     if (!result.success) {
@@ -282,7 +353,7 @@ document.getElementById('btn-simulate').addEventListener('click', async () => {
 
   try {
     const simRequest = { ...state.goalInput };
-    const result = await apiPost('/simulate', simRequest);
+    const result = await livePhaseOrPost('simulate', '/simulate', simRequest);
     state.simulationResult = result;
     renderSimulationResult(result);
     showStep(4);
@@ -392,6 +463,7 @@ document.getElementById('btn-restart').addEventListener('click', () => {
   state.gapResult = null;
   state.optimizationResult = null;
   state.simulationResult = null;
+  state.live = null;
 
   if (allocationChartInstance) {
     allocationChartInstance.destroy();
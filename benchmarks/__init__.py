@@ -0,0 +1,6 @@
+"""서비스/엔드포인트 마이크로 벤치마크 및 회귀 게이트.
+
+실행:
+    python -m benchmarks run -o baseline.json
+    python -m benchmarks compare baseline.json current.json --threshold 0.25
+"""
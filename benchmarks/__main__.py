@@ -0,0 +1,134 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import click
+
+from benchmarks.runner import METRICS, compare_results, load_results, run_benchmarks, save_results
+
+
+@click.group()
+def cli() -> None:
+    """GBI 로보 어드바이저 벤치마크 도구."""
+
+
+@cli.command()
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path),
+              default=Path("benchmarks/results/current.json"), show_default=True,
+              help="결과 JSON 저장 경로")
+@click.option("-k", "--filter", "name_filter", default=None,
+              help="이름에 이 문자열이 포함된 벤치마크만 실행")
+@click.option("--size", type=click.Choice(["small", "typical", "extreme"]), multiple=True,
+              help="입력 크기 필터 (여러 번 지정 가능)")
+@click.option("--repeat", default=5, show_default=True, help="반복 측정 횟수")
+@click.option("--min-time", default=0.05, show_default=True, help="반복당 최소 측정 시간 (초)")
+def run(output: Path, name_filter: str | None, size: tuple[str, ...], repeat: int,
+        min_time: float) -> None:
+    """벤치마크를 실행하고 결과를 JSON 베이스라인으로 저장한다."""
+    from benchmarks.cases import BENCHMARKS
+
+    selected = [
+        b for b in BENCHMARKS.values()
+        if (name_filter is None or name_filter in b.name) and (not size or b.size in size)
+    ]
+    if not selected:
+        raise click.UsageError("조건에 맞는 벤치마크가 없습니다.")
+
+    def report(name: str, result: dict) -> None:
+        error = f"  error={result['error']:.4g}" if "error" in result else ""
+        click.echo(f"{name:<40} {result['median_us']:>14,.1f} us  (loops={result['loops']}){error}")
+
+    data = run_benchmarks(selected, repeat=repeat, min_time=min_time, on_result=report)
+    save_results(data, output)
+    click.echo(f"\n{len(selected)}개 결과 저장: {output}")
+
+
+@cli.command()
+@click.argument("baseline", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("current", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--metric", type=click.Choice(METRICS), default="median_us", show_default=True)
+@click.option("--threshold", default=0.25, show_default=True,
+              help="허용 회귀 비율 (0.25 = 25% 느려지면 실패)")
+def compare(baseline: Path, current: Path, metric: str, threshold: float) -> None:
+    """베이스라인 대비 회귀가 있으면 종료 코드 1로 실패한다."""
+    report = compare_results(load_results(baseline), load_results(current), metric, threshold)
+
+    for row in report.rows:
+        flag = "REGRESSED" if row.regressed else "ok"
+        click.echo(
+            f"{row.name:<40} {row.baseline:>14,.1f} -> {row.current:>14,.1f} us "
+            f"({row.ratio:6.2f}x) {flag}"
+        )
+    for name in report.missing:
+        click.echo(f"{name:<40} 현재 결과에 없음")
+    for name in report.added:
+        click.echo(f"{name:<40} 신규 (베이스라인 없음)")
+
+    if report.regressions:
+        click.echo(
+            f"\n회귀 {len(report.regressions)}건: {metric}가 {threshold:.0%} 이상 증가했습니다.",
+            err=True,
+        )
+        sys.exit(1)
+    click.echo(f"\n회귀 없음 ({metric}, 허용 {threshold:.0%})")
+
+
+def _parse_levels(ctx, param, value: str) -> list[int]:
+    try:
+        levels = [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise click.BadParameter("쉼표로 구분된 정수여야 합니다 (예: 1,8,32).")
+    if not levels or min(levels) < 1:
+        raise click.BadParameter("동시성은 1 이상이어야 합니다.")
+    return levels
+
+
+@cli.command()
+@click.option("--base-url", default=None, help="대상 서버 URL (미지정 시 --spawn 필요)")
+@click.option("--spawn", is_flag=True, help="uvicorn으로 앱을 로컬에서 직접 띄운다")
+@click.option("--workers", default=1, show_default=True, help="--spawn 시 uvicorn 워커 수")
+@click.option("-c", "--concurrency", "levels", default="1,8,32", show_default=True,
+              callback=_parse_levels, help="쉼표로 구분된 동시성 단계")
+@click.option("-d", "--duration", default=10.0, show_default=True, help="단계별 실행 시간 (초)")
+@click.option("-n", "--requests", "total_requests", type=int, default=None,
+              help="단계별 최대 요청 수")
+@click.option("--seed", default=0, show_default=True, help="요청 믹스 시드")
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help="결과 JSON 저장 경로")
+def loadtest(base_url: str | None, spawn: bool, workers: int, levels: list[int],
+             duration: float, total_requests: int | None, seed: int,
+             output: Path | None) -> None:
+    """요청 믹스로 부하를 걸어 엔드포인트별 처리량과 p50/p95/p99 지연시간을 측정한다."""
+    from benchmarks.loadtest import run_load_test, spawn_server
+
+    if base_url is None and not spawn:
+        raise click.UsageError("--base-url 또는 --spawn 중 하나를 지정하세요.")
+
+    def execute(url: str) -> dict:
+        return asyncio.run(run_load_test(url, levels, duration, total_requests, seed=seed))
+
+    if spawn:
+        with spawn_server(workers=workers) as url:
+            data = execute(url)
+        data["meta"]["workers"] = workers
+    else:
+        data = execute(base_url)
+
+    for level in data["levels"]:
+        click.echo(f"\n동시성 {level['concurrency']} ({level['elapsed_s']}s)")
+        click.echo(f"{'endpoint':<28}{'req':>7}{'err':>5}{'rps':>9}"
+                   f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        rows = [*level["endpoints"].items(), ("TOTAL", level["total"])]
+        for name, m in rows:
+            latency = "".join(
+                f"{'-':>9}" if m[key] is None else f"{m[key]:>9.1f}" for key in ("p50_ms", "p95_ms", "p99_ms")
+            )
+            click.echo(f"{name:<28}{m['requests']:>7}{m['errors']:>5}{m['throughput_rps']:>9.1f}{latency}")
+
+    if output is not None:
+        save_results(data, output)
+        click.echo(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    cli()
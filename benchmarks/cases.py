@@ -0,0 +1,585 @@
+"""벤치마크 케이스 정의.
+
+각 케이스는 준비(setup) 함수로 등록되며, setup은 측정 대상인 인자 없는 호출 객체를 반환한다.
+입력 크기는 small / typical / extreme 세 단계로 구분한다.
+"""
+import asyncio
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from app.config import settings
+from app.main import app
+from app.models.asset import Asset, AssetClass, TaxBenefit
+from app.models.cvar import CVaRRequest
+from app.models.glide_path import GlidePathRequest
+from app.models.goal import GoalInput
+from app.models.household import HouseholdGoal, HouseholdInput
+from app.models.portfolio import OptimizationResult
+from app.models.robust import RobustRequest
+from app.models.sensitivity import SensitivityGridRequest
+from app.models.simulation import RateScenario, RollingSimulationRequest
+from app.services.asset_universe import get_default_universe
+from app.services.basis_cache import basis_cache
+from app.services.batch_lp import asset_upper_bounds
+from app.services.cvar import optimize_cvar
+from app.services.duration import macaulay_duration
+from app.services.gap_analyzer import _future_value, analyze_gap
+from app.services.glide_path import optimize_glide_path
+from app.services.greeks import plan_sensitivities
+from app.services.household import optimize_household
+from app.services.ledger import ledger_future_value
+from app.services.lp_index import LPIndex, build_index
+from app.services.optimizer import lp_returns, optimize_portfolio
+from app.services.probability import (
+    allocation_weights,
+    expansion_check_probability,
+    plan_success_probability,
+    success_probability,
+)
+from app.services.rebalancer import solve_rebalance_batch
+from app.services.robust import optimize_robust
+from app.services.shared_cache import SharedResultCache, result_cache
+from app.services.sensitivity import compute_sensitivity_grid
+from app.services.rolling import simulate_rolling
+from app.services.simulator import simulate_scenarios
+from app.services.tax import cumulative_tax, effective_after_tax_returns
+from benchmarks.runner import Benchmark
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+SMALL_GOAL = GoalInput(
+    goal_amount=1900_0000,
+    time_horizon_months=12,
+    monthly_contribution=150_0000,
+)
+NOAH_GOAL = GoalInput(
+    goal_amount=1_0000_0000,
+    time_horizon_months=60,
+    monthly_contribution=150_0000,
+    eligible_youth_savings=True,
+)
+EXTREME_GOAL = GoalInput(
+    goal_amount=50_0000_0000,
+    time_horizon_months=600,
+    monthly_contribution=300_0000,
+    initial_principal=5000_0000,
+    eligible_youth_savings=True,
+)
+INFEASIBLE_GOAL = GoalInput(
+    goal_amount=100_0000_0000,
+    time_horizon_months=600,
+    monthly_contribution=10_0000,
+)
+
+
+def benchmark(name: str, group: str, size: str, reports_error: bool = False):
+    """setup 함수를 벤치마크 레지스트리에 등록한다."""
+
+    def decorator(setup: Callable[[], Callable[[], object]]):
+        BENCHMARKS[name] = Benchmark(
+            name=name, group=group, size=size, setup=setup, reports_error=reports_error
+        )
+        return setup
+
+    return decorator
+
+
+def synthetic_universe(n: int, seed: int = 0) -> list[Asset]:
+    """대규모 유니버스 벤치마크용 가상 자산 n개를 생성한다."""
+    rng = np.random.default_rng(seed)
+    durations = np.sort(rng.uniform(0.0, 20.0, size=n))
+    returns = 0.025 + 0.002 * durations + rng.normal(0.0, 0.003, size=n)
+    classes = list(AssetClass)
+    return [
+        Asset(
+            name=f"가상 자산 {i}",
+            asset_class=classes[i % len(classes)],
+            gross_return=float(returns[i]),
+            duration=float(durations[i]),
+            tax_benefit=TaxBenefit.NONE,
+        )
+        for i in range(n)
+    ]
+
+
+# ============================================================
+# 미래가치
+# ============================================================
+
+@benchmark("future_value/small", group="future_value", size="small")
+def _future_value_small():
+    return lambda: _future_value(0, 150_0000, 0.035, 12)
+
+
+@benchmark("future_value/typical", group="future_value", size="typical")
+def _future_value_typical():
+    return lambda: _future_value(0, 150_0000, 0.035, 60)
+
+
+@benchmark("future_value/extreme", group="future_value", size="extreme")
+def _future_value_extreme():
+    return lambda: _future_value(5000_0000, 300_0000, 0.99, 600)
+
+
+def _ledger_setup(goal: GoalInput):
+    assets = get_default_universe(True)
+    weights = np.full(len(assets), 1 / len(assets))
+    return lambda: ledger_future_value(assets, weights, goal)
+
+
+@benchmark("ledger/typical", group="ledger", size="typical")
+def _ledger_typical():
+    return _ledger_setup(NOAH_GOAL)
+
+
+@benchmark("ledger/extreme", group="ledger", size="extreme")
+def _ledger_extreme():
+    return _ledger_setup(EXTREME_GOAL)
+
+
+@benchmark("cumulative_tax/extreme", group="cumulative_tax", size="extreme")
+def _cumulative_tax_extreme():
+    # 1,000 시나리오 × 600개월 × 자산 6개의 월별 이익
+    assets = get_default_universe(True)
+    gains = np.random.default_rng(0).normal(5_0000, 2_0000, size=(1000, 600, len(assets)))
+    return lambda: cumulative_tax(gains, assets)
+
+
+@benchmark("effective_after_tax_returns/grid", group="effective_after_tax_returns", size="extreme")
+def _effective_returns_grid():
+    # LP 인덱스 격자 (600개월 × 256 저축액)
+    assets = get_default_universe(True)
+    C = np.tile(np.geomspace(10_0000, 1000_0000, 256), 600)
+    months = np.repeat(np.arange(1, 601), 256)
+    upper = asset_upper_bounds(assets, C)
+    return lambda: effective_after_tax_returns(assets, 0.0, C, months, upper)
+
+
+# ============================================================
+# 갭 분석
+# ============================================================
+
+@benchmark("analyze_gap/small", group="analyze_gap", size="small")
+def _analyze_gap_small():
+    return lambda: analyze_gap(SMALL_GOAL)
+
+
+@benchmark("analyze_gap/typical", group="analyze_gap", size="typical")
+def _analyze_gap_typical():
+    return lambda: analyze_gap(NOAH_GOAL)
+
+
+@benchmark("analyze_gap/extreme", group="analyze_gap", size="extreme")
+def _analyze_gap_extreme():
+    return lambda: analyze_gap(EXTREME_GOAL)
+
+
+@benchmark("analyze_gap/infeasible", group="analyze_gap", size="extreme")
+def _analyze_gap_infeasible():
+    return lambda: analyze_gap(INFEASIBLE_GOAL)
+
+
+# ============================================================
+# 포트폴리오 최적화
+# ============================================================
+
+@benchmark("optimize_portfolio/small", group="optimize_portfolio", size="small")
+def _optimize_small():
+    assets = get_default_universe(False)
+    required = analyze_gap(SMALL_GOAL).required_annual_return
+    return lambda: optimize_portfolio(assets, SMALL_GOAL, required_return=required)
+
+
+@benchmark("optimize_portfolio/typical", group="optimize_portfolio", size="typical")
+def _optimize_typical():
+    assets = get_default_universe(True)
+    required = analyze_gap(NOAH_GOAL).required_annual_return
+    return lambda: optimize_portfolio(assets, NOAH_GOAL, required_return=required)
+
+
+@benchmark("optimize_portfolio/extreme", group="optimize_portfolio", size="extreme")
+def _optimize_extreme():
+    assets = synthetic_universe(500)
+    return lambda: optimize_portfolio(assets, EXTREME_GOAL, required_return=0.03)
+
+
+@benchmark("optimize_portfolio/infeasible", group="optimize_portfolio", size="typical")
+def _optimize_infeasible():
+    # 듀레이션 밴드와 필요 수익률을 모두 만족할 수 없어 탄력 LP로 가장 가까운 계획을 구하는 경로
+    assets = get_default_universe(False)
+    goal = GoalInput(goal_amount=10_0000_0000, time_horizon_months=240, monthly_contribution=150_0000)
+    return lambda: optimize_portfolio(assets, goal, required_return=0.08)
+
+
+@benchmark("optimize_portfolio/uncached", group="optimize_portfolio", size="typical")
+def _optimize_uncached():
+    # 매 호출 전에 기저 캐시를 비워 LP 솔버 경로를 측정한다 (typical은 캐시 적중 경로)
+    # 공유 결과 캐시가 켜져 있으면 두 번째 호출부터 LP를 풀지 않으므로 꺼진 환경에서만 측정한다
+    assert not result_cache.enabled, "optimize_portfolio/uncached는 GBI_SHARED_CACHE_PATH 없이 실행해야 합니다"
+    assets = get_default_universe(True)
+    required = analyze_gap(NOAH_GOAL).required_annual_return
+
+    def run():
+        basis_cache.clear()
+        return optimize_portfolio(assets, NOAH_GOAL, required_return=required)
+
+    return run
+
+
+@benchmark("optimize_portfolio/shared-cache", group="optimize_portfolio", size="typical")
+def _optimize_shared_cache():
+    # 다른 워커가 이미 채운 공유 결과 캐시 적중 경로 (키 해시 + seqlock 읽기 + JSON 검증)
+    cache = SharedResultCache(str(Path(tempfile.mkdtemp()) / "results.bin"), slots=1024)
+    assets = get_default_universe(True)
+    required = analyze_gap(NOAH_GOAL).required_annual_return
+
+    def compute():
+        return optimize_portfolio(assets, NOAH_GOAL, required_return=required)
+
+    args = ("optimize_portfolio", assets, NOAH_GOAL, required, settings.duration_epsilon)
+    cache.cached(OptimizationResult, compute, *args)
+    return lambda: cache.cached(OptimizationResult, compute, *args)
+
+
+@benchmark("optimize_portfolio/indexed", group="optimize_portfolio", size="typical")
+def _optimize_indexed():
+    path = Path(tempfile.mkdtemp()) / "lp_index.bin"
+    build_index(path, max_months=120)
+    index = LPIndex(path)
+    assets = get_default_universe(True)
+    required = analyze_gap(NOAH_GOAL).required_annual_return
+    return lambda: index.lookup(assets, NOAH_GOAL, required)
+
+
+# 강건 최적화: 같은 입력의 optimize_portfolio 대비 풀이 시간 증가분을 본다
+@benchmark("optimize_robust_box/typical", group="optimize_robust_box", size="typical")
+def _robust_box_typical():
+    assets = get_default_universe(True)
+    req = RobustRequest(**NOAH_GOAL.model_dump(), uncertainty_set="box")
+    return lambda: optimize_robust(assets, req)
+
+
+@benchmark("optimize_robust_budget/typical", group="optimize_robust_budget", size="typical")
+def _robust_budget_typical():
+    assets = get_default_universe(True)
+    req = RobustRequest(**NOAH_GOAL.model_dump(), uncertainty_set="budget", budget=2.0)
+    return lambda: optimize_robust(assets, req)
+
+
+@benchmark("optimize_robust_budget/extreme", group="optimize_robust_budget", size="extreme")
+def _robust_budget_extreme():
+    assets = synthetic_universe(500)
+    req = RobustRequest(**EXTREME_GOAL.model_dump(), uncertainty_set="budget", budget=10.0)
+    return lambda: optimize_robust(assets, req, required_return=0.03)
+
+
+# ============================================================
+# 금리 시뮬레이션
+# ============================================================
+
+def _simulation_setup(goal: GoalInput, assets: list[Asset], scenarios):
+    required = analyze_gap(goal).required_annual_return
+    portfolio = optimize_portfolio(assets, goal, required_return=required)
+    return lambda: simulate_scenarios(goal, portfolio, assets, scenarios=scenarios)
+
+
+@benchmark("simulate_scenarios/typical", group="simulate_scenarios", size="typical")
+def _simulate_typical():
+    return _simulation_setup(NOAH_GOAL, get_default_universe(True), None)
+
+
+@benchmark("simulate_scenarios/extreme", group="simulate_scenarios", size="extreme")
+def _simulate_extreme():
+    shifts = np.linspace(-0.03, 0.03, 1000)
+    scenarios = [
+        RateScenario(label=f"시나리오 {i}", rate_shift=float(s))
+        for i, s in enumerate(shifts)
+    ]
+    return _simulation_setup(EXTREME_GOAL, get_default_universe(True), scenarios)
+
+
+@benchmark("simulate_rolling/typical", group="simulate_rolling", size="typical")
+def _rolling_typical():
+    req = RollingSimulationRequest(**NOAH_GOAL.model_dump(), n_paths=1000, seed=0)
+    return lambda: simulate_rolling(req)
+
+
+@benchmark("simulate_rolling/extreme", group="simulate_rolling", size="extreme")
+def _rolling_extreme():
+    # 10k 경로 × 10회 재최적화
+    goal = NOAH_GOAL.model_copy(update={"time_horizon_months": 120})
+    req = RollingSimulationRequest(**goal.model_dump(), n_paths=10_000, seed=0)
+    return lambda: simulate_rolling(req)
+
+
+@benchmark("plan_sensitivities/typical", group="plan_sensitivities", size="typical")
+def _plan_sensitivities_typical():
+    assets = get_default_universe(True)
+    weights = _optimized_weights(NOAH_GOAL, assets)
+    returns = lp_returns(assets, NOAH_GOAL)
+    durations = np.array([a.duration for a in assets])
+    return lambda: plan_sensitivities(assets, weights, returns, durations, NOAH_GOAL, 0.5)
+
+
+def _optimized_weights(goal: GoalInput, assets: list[Asset]) -> np.ndarray:
+    required = analyze_gap(goal).required_annual_return
+    return allocation_weights(assets, optimize_portfolio(assets, goal, required_return=required).allocations)
+
+
+@benchmark("success_probability/typical", group="success_probability", size="typical")
+def _success_probability_typical():
+    assets = get_default_universe(True)
+    weights = _optimized_weights(NOAH_GOAL, assets)
+    return lambda: plan_success_probability(assets, weights, NOAH_GOAL)
+
+
+@benchmark("success_probability/extreme", group="success_probability", size="extreme")
+def _success_probability_extreme():
+    # 한 포트폴리오에 대해 목표 금액 10k개를 한 번에 평가
+    assets = get_default_universe(True)
+    weights = _optimized_weights(NOAH_GOAL, assets)
+    goals = NOAH_GOAL.goal_amount * np.linspace(0.9, 1.1, 10_000)
+    return lambda: success_probability(assets, weights, goals, 0.0, NOAH_GOAL.monthly_contribution, 60)
+
+
+@benchmark(
+    "success_probability/validation", group="success_probability", size="extreme", reports_error=True
+)
+def _success_probability_validation():
+    # 같은 금리 변동 모형을 Δ 표본 10만 개로 직접 평가해 해석적 근사의 2차 전개 오차 |analytic - sampled|를 남긴다
+    assets = get_default_universe(True)
+    weights = _optimized_weights(NOAH_GOAL, assets)
+    analytic = plan_success_probability(assets, weights, NOAH_GOAL)
+    return lambda: abs(
+        analytic - expansion_check_probability(assets, weights, NOAH_GOAL, n_paths=100_000, seed=0)
+    )
+
+
+# ============================================================
+# What-if 격자
+# ============================================================
+
+GRID_REQUEST = SensitivityGridRequest(
+    goal_amount=1_0000_0000,
+    eligible_youth_savings=True,
+    monthly_contribution_min=50_0000,
+    monthly_contribution_max=300_0000,
+    monthly_contribution_steps=50,
+    time_horizon_min_months=12,
+    time_horizon_max_months=120,
+    time_horizon_steps=60,
+)
+
+
+@benchmark("sensitivity_grid/typical", group="sensitivity_grid", size="typical")
+def _sensitivity_grid_typical():
+    return lambda: compute_sensitivity_grid(GRID_REQUEST)
+
+
+# ============================================================
+# CVaR 시나리오 LP
+# ============================================================
+
+def _cvar_setup(n_scenarios: int):
+    assets = get_default_universe(True)
+    req = CVaRRequest(**NOAH_GOAL.model_dump(), n_scenarios=n_scenarios, seed=0, max_shortfall=1e12)
+    return lambda: optimize_cvar(assets, req)
+
+
+@benchmark("optimize_cvar/typical", group="optimize_cvar", size="typical")
+def _cvar_typical():
+    return _cvar_setup(2000)
+
+
+@benchmark("optimize_cvar/extreme", group="optimize_cvar", size="extreme")
+def _cvar_extreme():
+    return _cvar_setup(10_000)
+
+
+# ============================================================
+# 글라이드 패스
+# ============================================================
+
+@benchmark("glide_path/typical", group="glide_path", size="typical")
+def _glide_path_typical():
+    req = GlidePathRequest(**NOAH_GOAL.model_dump(), step_months=1)
+    return lambda: optimize_glide_path(req)
+
+
+@benchmark("glide_path/extreme", group="glide_path", size="extreme")
+def _glide_path_extreme():
+    req = GlidePathRequest(**EXTREME_GOAL.model_dump(), step_months=1)
+    return lambda: optimize_glide_path(req)
+
+
+# ============================================================
+# 리밸런싱
+# ============================================================
+
+def _rebalance_setup(n_accounts: int):
+    assets = get_default_universe(True)
+    rng = np.random.default_rng(0)
+    n = len(assets)
+    holdings = rng.uniform(0, 1000_0000, (n_accounts, n)) * (rng.random((n_accounts, n)) < 0.5)
+    kwargs = dict(
+        assets=assets,
+        holdings=holdings,
+        basis=holdings * rng.uniform(0.9, 1.0, (n_accounts, n)),
+        cash=rng.uniform(0, 300_0000, n_accounts),
+        months=rng.integers(6, 240, n_accounts),
+        youth_eligible=rng.random(n_accounts) < 0.3,
+        isa_contributed=0.0,
+        max_turnover=0.2,
+    )
+    return lambda: solve_rebalance_batch(**kwargs)
+
+
+@benchmark("rebalance/typical", group="rebalance", size="typical")
+def _rebalance_typical():
+    return _rebalance_setup(200)
+
+
+@benchmark("rebalance/extreme", group="rebalance", size="extreme")
+def _rebalance_extreme():
+    return _rebalance_setup(10_000)
+
+
+# ============================================================
+# 가구 다중 목표
+# ============================================================
+
+def _household(n_goals: int, budget: float) -> HouseholdInput:
+    return HouseholdInput(
+        goals=[
+            HouseholdGoal(
+                label=f"목표{i}", goal_amount=100_0000 * (i + 1), time_horizon_months=6 + 2 * i
+            )
+            for i in range(n_goals)
+        ],
+        monthly_budget=budget,
+        eligible_youth_savings=True,
+    )
+
+
+@benchmark("household/typical", group="household", size="typical")
+def _household_typical():
+    household = _household(3, 500_0000)
+    return lambda: optimize_household(household)
+
+
+@benchmark("household/extreme", group="household", size="extreme")
+def _household_extreme():
+    household = _household(40, 2000_0000)
+    return lambda: optimize_household(household)
+
+
+# ============================================================
+# 듀레이션
+# ============================================================
+
+def _bond_cash_flows(years: int, freq: int) -> tuple[list[float], list[float]]:
+    periods = [(k + 1) / freq for k in range(years * freq)]
+    cash_flows = [3.0 / freq] * len(periods)
+    cash_flows[-1] += 100.0
+    return cash_flows, periods
+
+
+@benchmark("macaulay_duration/small", group="macaulay_duration", size="small")
+def _duration_small():
+    cf, t = _bond_cash_flows(5, 2)
+    return lambda: macaulay_duration(cf, t, 0.035)
+
+
+@benchmark("macaulay_duration/typical", group="macaulay_duration", size="typical")
+def _duration_typical():
+    cf, t = _bond_cash_flows(10, 12)
+    return lambda: macaulay_duration(cf, t, 0.035)
+
+
+@benchmark("macaulay_duration/extreme", group="macaulay_duration", size="extreme")
+def _duration_extreme():
+    cf, t = _bond_cash_flows(50, 120)
+    return lambda: macaulay_duration(cf, t, 0.035)
+
+
+# ============================================================
+# 엔드포인트 (in-process ASGI)
+# ============================================================
+
+def _endpoint_setup(method: str, path: str, payload: dict | None = None, headers: dict | None = None):
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    )
+
+    def call():
+        resp = loop.run_until_complete(client.request(method, path, json=payload, headers=headers))
+        resp.raise_for_status()
+        return resp
+
+    return call
+
+
+def _payload(goal: GoalInput) -> dict:
+    return goal.model_dump()
+
+
+@benchmark("endpoint/index", group="endpoint", size="typical")
+def _endpoint_index():
+    return _endpoint_setup("GET", "/")
+
+
+@benchmark("endpoint/assets", group="endpoint", size="typical")
+def _endpoint_assets():
+    return _endpoint_setup("GET", "/api/v1/assets?eligible_youth_savings=true")
+
+
+@benchmark("endpoint/gap-analysis", group="endpoint", size="typical")
+def _endpoint_gap():
+    return _endpoint_setup("POST", "/api/v1/gap-analysis", _payload(NOAH_GOAL))
+
+
+@benchmark("endpoint/optimize", group="endpoint", size="typical")
+def _endpoint_optimize():
+    return _endpoint_setup("POST", "/api/v1/optimize", _payload(NOAH_GOAL))
+
+
+@benchmark("endpoint/optimize-extreme", group="endpoint", size="extreme")
+def _endpoint_optimize_extreme():
+    return _endpoint_setup("POST", "/api/v1/optimize", _payload(EXTREME_GOAL))
+
+
+@benchmark("endpoint/simulate", group="endpoint", size="typical")
+def _endpoint_simulate():
+    return _endpoint_setup("POST", "/api/v1/simulate", _payload(NOAH_GOAL))
+
+
+@benchmark("endpoint/sensitivity-grid", group="endpoint", size="typical")
+def _endpoint_sensitivity_grid():
+    return _endpoint_setup("POST", "/api/v1/sensitivity-grid", GRID_REQUEST.model_dump())
+
+
+def _extreme_simulation_payload() -> dict:
+    payload = _payload(EXTREME_GOAL)
+    payload["scenarios"] = [
+        {"label": f"시나리오 {i}", "rate_shift": float(s)}
+        for i, s in enumerate(np.linspace(-0.03, 0.03, 1000))
+    ]
+    return payload
+
+
+@benchmark("endpoint/simulate-extreme", group="endpoint", size="extreme")
+def _endpoint_simulate_extreme():
+    return _endpoint_setup("POST", "/api/v1/simulate", _extreme_simulation_payload())
+
+
+@benchmark("endpoint/simulate-extreme-msgpack", group="endpoint", size="extreme")
+def _endpoint_simulate_extreme_msgpack():
+    # 같은 요청을 열 지향 msgpack으로 받는다 (행 객체 생성·JSON 인코딩 없음)
+    return _endpoint_setup(
+        "POST", "/api/v1/simulate", _extreme_simulation_payload(), {"Accept": "application/vnd.msgpack"}
+    )
@@ -0,0 +1,176 @@
+"""로컬 앱 대상 비동기 부하 생성기.
+
+동시성(concurrency) 단계별로 요청 믹스를 재생하고, 엔드포인트별 처리량과
+p50/p95/p99 지연시간을 측정한다. 워커 수 산정을 위해 여러 동시성 단계를 한 번에 실행할 수 있다.
+"""
+import asyncio
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import httpx
+import numpy as np
+
+from benchmarks.workload import LoadRequest, cycle_workload
+
+
+def _summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """성공한 요청의 지연 분포. 성공한 요청이 없으면 지연 항목은 None이다 (0ms로 보이지 않도록)."""
+    count = len(latencies)
+    summary = {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+    if not latencies:
+        return {**summary, **dict.fromkeys(("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"))}
+    arr = np.array(latencies) * 1000
+    return {
+        **summary,
+        "mean_ms": round(float(arr.mean()), 3),
+        "p50_ms": round(float(np.percentile(arr, 50)), 3),
+        "p95_ms": round(float(np.percentile(arr, 95)), 3),
+        "p99_ms": round(float(np.percentile(arr, 99)), 3),
+        "max_ms": round(float(arr.max()), 3),
+    }
+
+
+async def _run_level(
+    client: httpx.AsyncClient,
+    workload: Iterator[LoadRequest],
+    concurrency: int,
+    duration: float | None,
+    total_requests: int | None,
+) -> dict:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    issued = 0
+    deadline = time.perf_counter() + duration if duration is not None else None
+
+    def next_request() -> LoadRequest | None:
+        nonlocal issued
+        if total_requests is not None and issued >= total_requests:
+            return None
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        issued += 1
+        return next(workload)
+
+    async def worker() -> None:
+        while (req := next_request()) is not None:
+            start = time.perf_counter()
+            try:
+                resp = await client.request(req.method, req.path, json=req.payload)
+                ok = resp.status_code < 500
+            except httpx.HTTPError:
+                ok = False
+            elapsed = time.perf_counter() - start
+            if ok:
+                latencies[req.path].append(elapsed)
+            else:
+                errors[req.path] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    endpoints = {
+        path: _summarize(latencies[path], errors[path], elapsed)
+        for path in sorted(latencies.keys() | errors.keys())
+    }
+    all_latencies = [x for values in latencies.values() for x in values]
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "total": _summarize(all_latencies, sum(errors.values()), elapsed),
+        "endpoints": endpoints,
+    }
+
+
+async def run_load_test(
+    base_url: str,
+    concurrency_levels: list[int],
+    duration: float | None = 10.0,
+    total_requests: int | None = None,
+    workload_size: int = 500,
+    seed: int = 0,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict:
+    """동시성 단계별로 부하를 걸고 결과를 JSON 직렬화 가능한 dict로 반환한다.
+
+    duration(초)과 total_requests 중 먼저 도달하는 조건에서 단계를 종료한다.
+    """
+    if duration is None and total_requests is None:
+        raise ValueError("duration 또는 total_requests 중 하나는 지정해야 합니다.")
+
+    levels = []
+    limits = httpx.Limits(max_connections=max(concurrency_levels))
+    async with httpx.AsyncClient(
+        base_url=base_url, transport=transport, limits=limits, timeout=60.0
+    ) as client:
+        for concurrency in concurrency_levels:
+            workload = cycle_workload(workload_size, seed)
+            levels.append(
+                await _run_level(client, workload, concurrency, duration, total_requests)
+            )
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "base_url": base_url,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "duration_s": duration,
+            "total_requests": total_requests,
+            "workload_size": workload_size,
+            "seed": seed,
+        },
+        "levels": levels,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def spawn_server(workers: int = 1, port: int | None = None, timeout: float = 30.0):
+    """uvicorn으로 앱을 로컬에서 띄우고 준비되면 base_url을 반환한다."""
+    port = port or _free_port()
+    cmd = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    proc = subprocess.Popen(cmd)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"서버 프로세스가 종료되었습니다 (코드 {proc.returncode}).")
+            try:
+                if httpx.get(f"{base_url}/api/v1/assets", timeout=1.0).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{timeout}초 안에 서버가 준비되지 않았습니다.")
+            time.sleep(0.2)
+        yield base_url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
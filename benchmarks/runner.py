@@ -0,0 +1,156 @@
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import scipy
+
+# 회귀 판정에 사용할 수 있는 지표 (모두 1회 호출당 마이크로초)
+METRICS = ("min_us", "median_us", "mean_us", "max_us")
+
+
+@dataclass
+class Benchmark:
+    name: str
+    group: str
+    size: str
+    setup: Callable[[], Callable[[], object]]
+    # True면 측정 대상 호출이 기준값과의 오차를 반환하고, 워밍업 호출의 값을 결과의 error로 남긴다
+    reports_error: bool = False
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+    ratio: float
+    regressed: bool
+
+
+@dataclass
+class ComparisonReport:
+    metric: str
+    threshold: float
+    rows: list[Comparison] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    added: list[str] = field(default_factory=list)
+
+    @property
+    def regressions(self) -> list[Comparison]:
+        return [row for row in self.rows if row.regressed]
+
+
+def _calibrate(fn: Callable[[], object], min_time: float) -> int:
+    """1회 반복 측정이 min_time 이상 걸리도록 루프 횟수를 정한다."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            return loops
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+
+def measure(bench: Benchmark, repeat: int = 5, min_time: float = 0.05) -> dict:
+    """벤치마크 하나를 측정하고 1회 호출당 시간 통계를 반환한다."""
+    fn = bench.setup()
+    warmup = fn()  # 워밍업 (import, 캐시 등 1회성 비용 제외)
+    loops = _calibrate(fn, min_time)
+
+    per_call: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_call.append((time.perf_counter() - start) / loops * 1e6)
+
+    result = {
+        "group": bench.group,
+        "size": bench.size,
+        "loops": loops,
+        "repeat": repeat,
+        "min_us": round(min(per_call), 3),
+        "median_us": round(statistics.median(per_call), 3),
+        "mean_us": round(statistics.fmean(per_call), 3),
+        "max_us": round(max(per_call), 3),
+    }
+    if bench.reports_error:
+        result["error"] = float(warmup)
+    return result
+
+
+def run_benchmarks(
+    benchmarks: list[Benchmark],
+    repeat: int = 5,
+    min_time: float = 0.05,
+    on_result: Callable[[str, dict], None] | None = None,
+) -> dict:
+    """벤치마크 목록을 실행하고 JSON 베이스라인 형식으로 결과를 반환한다."""
+    results: dict[str, dict] = {}
+    for bench in benchmarks:
+        results[bench.name] = measure(bench, repeat=repeat, min_time=min_time)
+        if on_result is not None:
+            on_result(bench.name, results[bench.name])
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+        },
+        "results": results,
+    }
+
+
+def save_results(data: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def load_results(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare_results(
+    baseline: dict,
+    current: dict,
+    metric: str = "median_us",
+    threshold: float = 0.25,
+) -> ComparisonReport:
+    """두 결과를 비교해 metric이 threshold 비율 이상 느려진 항목을 회귀로 표시한다."""
+    if metric not in METRICS:
+        raise ValueError(f"알 수 없는 지표입니다: {metric} (가능: {', '.join(METRICS)})")
+    if threshold < 0:
+        raise ValueError("threshold는 0 이상이어야 합니다.")
+
+    base = baseline["results"]
+    cur = current["results"]
+    report = ComparisonReport(metric=metric, threshold=threshold)
+
+    for name in sorted(base.keys() & cur.keys()):
+        b = float(base[name][metric])
+        c = float(cur[name][metric])
+        ratio = c / b if b > 0 else float("inf") if c > 0 else 1.0
+        report.rows.append(
+            Comparison(
+                name=name,
+                baseline=b,
+                current=c,
+                ratio=ratio,
+                regressed=ratio > 1 + threshold,
+            )
+        )
+
+    report.missing = sorted(base.keys() - cur.keys())
+    report.added = sorted(cur.keys() - base.keys())
+    return report
@@ -0,0 +1,113 @@
+"""부하 테스트용 요청 믹스.
+
+엣지케이스 목표, 페르소나 목표, 달성 불가능한 목표를 엔드포인트별 가중치에 따라 섞어 재생한다.
+엣지케이스 목표는 tests/test_services/test_edge_cases.py가 이름으로 가져다 쓰는 단일 정의다.
+"""
+import itertools
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from app.models.goal import GoalInput
+
+# 엣지케이스
+EDGE_CASE_GOALS: dict[str, GoalInput] = {
+    # 월 10만원으로 1년 안에 10억
+    "tiny_contribution": GoalInput(goal_amount=10_0000_0000, time_horizon_months=12,
+                                   monthly_contribution=10_0000),
+    # 초기 자본이 목표를 이미 초과
+    "principal_covers_goal": GoalInput(goal_amount=1000_0000, time_horizon_months=60,
+                                       monthly_contribution=100_0000, initial_principal=2000_0000),
+    # 12개월, 안전자산으로 약간 부족
+    "short_horizon": GoalInput(goal_amount=1900_0000, time_horizon_months=12,
+                               monthly_contribution=150_0000),
+    # 1개월에 150만원 → 200만원 (연 400% 필요)
+    "one_month_gap": GoalInput(goal_amount=200_0000, time_horizon_months=1,
+                               monthly_contribution=150_0000),
+    # 1개월에 100배
+    "one_month_impossible": GoalInput(goal_amount=1_0000_0000, time_horizon_months=1,
+                                      monthly_contribution=10_0000),
+    # 노아의 목표, 청년도약저축 자격 없음
+    "without_youth_savings": GoalInput(goal_amount=1_0000_0000, time_horizon_months=60,
+                                       monthly_contribution=150_0000),
+    # 3개월 목표 기간
+    "very_short_horizon": GoalInput(goal_amount=500_0000, time_horizon_months=3,
+                                    monthly_contribution=150_0000),
+    # 100억
+    "very_large_goal": GoalInput(goal_amount=100_0000_0000, time_horizon_months=60,
+                                 monthly_contribution=150_0000),
+}
+
+# 페르소나 목표
+PERSONA_GOALS: list[GoalInput] = [
+    # 노아: 25세 신입사원, 5년 뒤 1억, 월 150만원
+    GoalInput(goal_amount=1_0000_0000, time_horizon_months=60, monthly_contribution=150_0000,
+              eligible_youth_savings=True),
+    # 3년 뒤 결혼자금 5천만원, 월 120만원
+    GoalInput(goal_amount=5000_0000, time_horizon_months=36, monthly_contribution=120_0000,
+              initial_principal=500_0000, eligible_youth_savings=True),
+    # 7년 뒤 주택 계약금 2억, 월 200만원
+    GoalInput(goal_amount=2_0000_0000, time_horizon_months=84, monthly_contribution=200_0000,
+              initial_principal=2000_0000),
+    # 6개월 비상금 600만원, 월 90만원
+    GoalInput(goal_amount=600_0000, time_horizon_months=6, monthly_contribution=90_0000),
+]
+
+# 달성 불가능한 목표
+INFEASIBLE_GOALS: list[GoalInput] = [
+    GoalInput(goal_amount=10_0000_0000, time_horizon_months=6, monthly_contribution=10_0000),
+    GoalInput(goal_amount=100_0000_0000, time_horizon_months=60, monthly_contribution=150_0000),
+    GoalInput(goal_amount=1_0000_0000, time_horizon_months=12, monthly_contribution=50_0000,
+              eligible_youth_savings=True),
+]
+
+# 엔드포인트별 요청 비율 (UI 위자드 흐름: 갭 분석 > 최적화 > 시뮬레이션)
+ENDPOINT_WEIGHTS: dict[str, float] = {
+    "/api/v1/gap-analysis": 0.45,
+    "/api/v1/optimize": 0.35,
+    "/api/v1/simulate": 0.20,
+}
+
+# 목표 유형별 비율
+GOAL_MIX_WEIGHTS: dict[str, float] = {
+    "persona": 0.6,
+    "edge_case": 0.25,
+    "infeasible": 0.15,
+}
+
+
+@dataclass(frozen=True)
+class LoadRequest:
+    method: str
+    path: str
+    payload: dict | None
+    kind: str
+
+
+def _goal_pools() -> dict[str, list[GoalInput]]:
+    return {
+        "persona": PERSONA_GOALS,
+        "edge_case": list(EDGE_CASE_GOALS.values()),
+        "infeasible": INFEASIBLE_GOALS,
+    }
+
+
+def build_workload(size: int, seed: int = 0) -> list[LoadRequest]:
+    """가중치에 따라 size개의 요청을 결정적으로 생성한다."""
+    rng = random.Random(seed)
+    pools = _goal_pools()
+    kinds = list(GOAL_MIX_WEIGHTS)
+    paths = list(ENDPOINT_WEIGHTS)
+
+    requests: list[LoadRequest] = []
+    for _ in range(size):
+        kind = rng.choices(kinds, weights=[GOAL_MIX_WEIGHTS[k] for k in kinds])[0]
+        path = rng.choices(paths, weights=[ENDPOINT_WEIGHTS[p] for p in paths])[0]
+        goal = rng.choice(pools[kind])
+        requests.append(LoadRequest("POST", path, goal.model_dump(), kind))
+    return requests
+
+
+def cycle_workload(size: int, seed: int = 0) -> Iterator[LoadRequest]:
+    """요청 믹스를 무한히 반복한다."""
+    return itertools.cycle(build_workload(size, seed))
@@ -1,4 +1,19 @@
+import re
+import threading
+import time
+
+import numpy as np
 import pytest
+from fastapi.testclient import TestClient
+
+from app.api.columnar import columnar, decode_columns, packb, unpackb
+from app.api.v1.endpoints import jobs, live, rates
+from app.config import settings
+from app.main import BASE_DIR, app
+from app.services import rate_store as rate_store_module
+from app.services.jobs import JobManager
+from app.services.rate_store import DEFAULT_GROSS_RETURNS, RateStore
+from app.services.tracing import tracer
 
 
 NOAH_PAYLOAD = {
@@ -17,6 +32,7 @@ class TestGapAnalysisEndpoint:
         data = resp.json()
         assert data["optimization_needed"] is True
         assert data["gap"] > 0
+        assert data["sensitivities"]["required_return_per_goal"] > 0
 
 
 class TestAssetsEndpoint:
@@ -46,6 +62,8 @@ class TestOptimizeEndpoint:
         assert len(data["allocations"]) > 0
         total_weight = sum(a["weight"] for a in data["allocations"])
         assert abs(total_weight - 1.0) < 0.01
+        assert 0.0 <= data["success_probability"] <= 1.0
+        assert data["sensitivities"]["future_value_per_contribution"] > 0
 
     def test_optimize_easy_goal(self, client):
         easy = {
@@ -60,6 +78,108 @@ class TestOptimizeEndpoint:
         assert data["message"] == "안전자산만으로 목표 달성 가능합니다."
 
 
+class TestCVaREndpoint:
+    def test_cvar(self, client):
+        payload = {**NOAH_PAYLOAD, "n_scenarios": 500, "seed": 0, "max_shortfall": 1e12}
+        resp = client.post("/api/v1/optimize/cvar", json=payload)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["success"] is True
+        assert data["n_scenarios"] == 500
+        assert data["solve_time_ms"] > 0
+
+    def test_invalid_confidence(self, client):
+        payload = {**NOAH_PAYLOAD, "confidence": 1.5}
+        resp = client.post("/api/v1/optimize/cvar", json=payload)
+        assert resp.status_code == 422
+
+
+class TestRatesEndpoint:
+    @pytest.fixture
+    def store(self, monkeypatch):
+        store = RateStore(0.035, DEFAULT_GROSS_RETURNS, history=4)
+        monkeypatch.setattr(rate_store_module, "rate_store", store)
+        monkeypatch.setattr(rates, "rate_store", store)
+        return store
+
+    def test_current_rates_and_header(self, client, store):
+        resp = client.get("/api/v1/rates")
+        assert resp.status_code == 200
+        assert resp.json()["version"] == 1
+        assert resp.headers["x-rate-snapshot-version"] == "1"
+
+    def test_admin_disabled_without_token(self, client, store, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", None)
+        resp = client.put("/api/v1/admin/rates", json={"base_interest_rate": 0.03})
+        assert resp.status_code == 403
+
+    def test_publish_updates_universe(self, client, store, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        payload = {"gross_returns": {"parking": 0.027}}
+        assert client.put("/api/v1/admin/rates", json=payload).status_code == 401
+        resp = client.put("/api/v1/admin/rates", json=payload, headers={"X-Admin-Token": "secret"})
+        assert resp.status_code == 200
+        assert resp.json()["version"] == 2
+
+        assets = client.get("/api/v1/assets")
+        assert assets.headers["x-rate-snapshot-version"] == "2"
+        parking = next(a for a in assets.json() if a["asset_class"] == "parking")
+        assert parking["gross_return"] == 0.027
+
+
+class TestOptimizeFallbackEndpoint:
+    def test_unreachable_horizon_returns_nearest_plan(self, client):
+        payload = {**NOAH_PAYLOAD, "goal_amount": 6_0000_0000, "time_horizon_months": 240}
+        resp = client.post("/api/v1/optimize", json=payload)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["success"] is False
+        assert data["allocations"]
+        assert any(r["constraint"] == "duration_lower" for r in data["relaxations"])
+
+
+class TestBasisCacheEndpoint:
+    def test_stats_after_optimize(self, client):
+        client.post("/api/v1/optimize", json=NOAH_PAYLOAD)
+        resp = client.get("/api/v1/optimize/basis-cache")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["hits"] + data["misses"] >= 1
+        assert 0.0 <= data["hit_rate"] <= 1.0
+
+
+class TestRobustEndpoint:
+    def test_robust_optimize(self, client):
+        resp = client.post(
+            "/api/v1/optimize/robust", json={**NOAH_PAYLOAD, "uncertainty_set": "budget", "budget": 1.0}
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["uncertainty_set"] == "budget"
+        assert data["worst_case_return"] <= data["portfolio_return"] + 1e-9
+
+    def test_invalid_uncertainty_set(self, client):
+        resp = client.post("/api/v1/optimize/robust", json={**NOAH_PAYLOAD, "uncertainty_set": "ellipsoid"})
+        assert resp.status_code == 422
+
+
+class TestGoalSolverEndpoint:
+    def test_goal_solver(self, client):
+        payload = {**NOAH_PAYLOAD, "time_horizon_months": 36}
+        resp = client.post("/api/v1/goal-solver", json=payload)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["goal_achievable"] is False
+        assert data["min_monthly_contribution"] > NOAH_PAYLOAD["monthly_contribution"]
+        assert data["max_goal_amount"] < NOAH_PAYLOAD["goal_amount"]
+
+    def test_optimize_failure_suggests_numbers(self, client):
+        payload = {**NOAH_PAYLOAD, "time_horizon_months": 36}
+        data = client.post("/api/v1/optimize", json=payload).json()
+        assert data["success"] is False
+        assert "원 이상으로 늘리거나" in data["message"]
+
+
 class TestSimulateEndpoint:
     def test_simulate_noah(self, client):
         payload = {
@@ -76,8 +196,358 @@ class TestSimulateEndpoint:
         assert data["base_rate"] == 0.035
 
 
+class TestRollingSimulationEndpoint:
+    def test_rolling(self, client):
+        payload = {**NOAH_PAYLOAD, "n_paths": 500, "seed": 0}
+        resp = client.post("/api/v1/simulate/rolling", json=payload)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["n_rebalances"] == 5
+        assert 0.0 <= data["success_probability"] <= 1.0
+
+    def test_too_many_paths(self, client):
+        payload = {**NOAH_PAYLOAD, "n_paths": 1_000_000}
+        resp = client.post("/api/v1/simulate/rolling", json=payload)
+        assert resp.status_code == 422
+
+
+class TestSensitivityGridEndpoint:
+    def test_grid(self, client):
+        payload = {
+            "goal_amount": 1_0000_0000,
+            "eligible_youth_savings": True,
+            "monthly_contribution_min": 50_0000,
+            "monthly_contribution_max": 300_0000,
+            "monthly_contribution_steps": 50,
+            "time_horizon_min_months": 12,
+            "time_horizon_max_months": 120,
+            "time_horizon_steps": 60,
+        }
+        resp = client.post("/api/v1/sensitivity-grid", json=payload)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert len(data["feasible"]) == 50
+        assert len(data["feasible"][0]) == len(data["time_horizons_months"])
+        probabilities = [p for row in data["success_probability"] for p in row if p is not None]
+        assert probabilities and all(0.0 <= p <= 1.0 for p in probabilities)
+
+    def test_invalid_range(self, client):
+        payload = {
+            "goal_amount": 1_0000_0000,
+            "monthly_contribution_min": 300_0000,
+            "monthly_contribution_max": 50_0000,
+            "time_horizon_min_months": 12,
+            "time_horizon_max_months": 120,
+        }
+        resp = client.post("/api/v1/sensitivity-grid", json=payload)
+        assert resp.status_code == 422
+
+
+class TestGlidePathEndpoint:
+    def test_glide_path(self, client):
+        payload = {**NOAH_PAYLOAD, "step_months": 12}
+        resp = client.post("/api/v1/glide-path", json=payload)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["success"] is True
+        assert [s["start_month"] for s in data["steps"]] == [0, 12, 24, 36, 48]
+
+    def test_invalid_step(self, client):
+        payload = {**NOAH_PAYLOAD, "step_months": 6}
+        resp = client.post("/api/v1/glide-path", json=payload)
+        assert resp.status_code == 422
+
+
+class TestHouseholdEndpoint:
+    def test_household_optimize(self, client):
+        payload = {
+            "goals": [
+                {"label": "비상금", "goal_amount": 600_0000, "time_horizon_months": 6},
+                {"label": "결혼자금", "goal_amount": 3000_0000, "time_horizon_months": 36},
+            ],
+            "monthly_budget": 250_0000,
+            "eligible_youth_savings": True,
+        }
+        resp = client.post("/api/v1/household/optimize", json=payload)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["success"] is True
+        assert [g["label"] for g in data["goals"]] == ["비상금", "결혼자금"]
+
+    def test_empty_goals(self, client):
+        payload = {"goals": [], "monthly_budget": 150_0000}
+        resp = client.post("/api/v1/household/optimize", json=payload)
+        assert resp.status_code == 422
+
+
+class TestRebalanceEndpoint:
+    def test_rebalance(self, client):
+        payload = {
+            "accounts": [
+                {
+                    "account_id": "A-1",
+                    "time_horizon_months": 60,
+                    "monthly_contribution": 150_0000,
+                    "holdings": [{"asset_class": "parking", "amount": 1000_0000}],
+                },
+                {"account_id": "A-2", "time_horizon_months": 24, "monthly_contribution": 50_0000},
+            ]
+        }
+        resp = client.post("/api/v1/rebalance", json=payload)
+        assert resp.status_code == 200
+        results = resp.json()["results"]
+        assert [r["account_id"] for r in results] == ["A-1", "A-2"]
+        assert all(r["success"] for r in results)
+
+    def test_empty_accounts(self, client):
+        resp = client.post("/api/v1/rebalance", json={"accounts": []})
+        assert resp.status_code == 422
+
+
 class TestValidation:
     def test_invalid_goal_amount(self, client):
         payload = {**NOAH_PAYLOAD, "goal_amount": -100}
         resp = client.post("/api/v1/optimize", json=payload)
         assert resp.status_code == 422
+
+
+class TestJobsEndpoint:
+    @pytest.fixture(autouse=True)
+    def manager(self, monkeypatch):
+        manager = JobManager(workers=1, max_pending=4, ttl=60.0)
+        monkeypatch.setattr(jobs, "job_manager", manager)
+        yield manager
+        manager.shutdown()
+
+    def _wait(self, client, job_id: str) -> dict:
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            data = client.get(f"/api/v1/jobs/{job_id}").json()
+            if data["status"] not in ("queued", "running"):
+                return data
+            time.sleep(0.01)
+        raise AssertionError("작업이 끝나지 않았습니다.")
+
+    def test_simulation_job_matches_simulate(self, client):
+        scenarios = [{"label": f"{s:+.4f}", "rate_shift": s} for s in (i / 10000 - 0.03 for i in range(600))]
+        payload = {**NOAH_PAYLOAD, "scenarios": scenarios}
+        resp = client.post("/api/v1/jobs", json={"kind": "simulate", "request": payload})
+        assert resp.status_code == 202
+        data = self._wait(client, resp.json()["id"])
+        assert data["status"] == "succeeded"
+        assert data["progress"] == 1.0
+
+        direct = client.post("/api/v1/simulate", json={**NOAH_PAYLOAD, "scenarios": scenarios[:5]}).json()
+        assert data["result"]["results"][:5] == direct["results"]
+        assert len(data["result"]["results"]) == 600
+
+    def test_optimization_job(self, client):
+        resp = client.post("/api/v1/jobs", json={"kind": "optimize", "goals": [NOAH_PAYLOAD] * 3})
+        data = self._wait(client, resp.json()["id"])
+        assert data["status"] == "succeeded"
+        assert data["result"][0] == client.post("/api/v1/optimize", json=NOAH_PAYLOAD).json()
+
+    def test_queue_full_and_cancel(self, client, manager):
+        release = threading.Event()
+        submitted = [manager.submit("optimize", lambda ctx: [] if release.wait(5) else None) for _ in range(4)]
+        resp = client.post("/api/v1/jobs", json={"kind": "optimize", "goals": [NOAH_PAYLOAD]})
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == "5"
+
+        # 대기 중인 작업을 취소하면 자리가 난다
+        assert client.delete(f"/api/v1/jobs/{submitted[-1].id}").json()["status"] == "cancelled"
+        assert client.post("/api/v1/jobs", json={"kind": "optimize", "goals": [NOAH_PAYLOAD]}).status_code == 202
+        release.set()
+
+    def test_unknown_job(self, client):
+        assert client.get("/api/v1/jobs/nope").status_code == 404
+        assert client.delete("/api/v1/jobs/nope").status_code == 404
+
+
+class TestLiveEndpoint:
+    @pytest.fixture(autouse=True)
+    def fast_debounce(self, monkeypatch):
+        monkeypatch.setattr(settings, "live_debounce_ms", 20)
+
+    @staticmethod
+    def _phases(ws, seq: int) -> dict:
+        """seq의 done/cancelled/error까지 받은 메시지를 단계별로 모은다."""
+        received = {}
+        while True:
+            message = ws.receive_json()
+            assert message["seq"] == seq
+            received[message["phase"]] = message["data"]
+            if message["phase"] in ("done", "cancelled", "error"):
+                return received
+
+    def test_debounced_updates_push_every_phase(self, client):
+        with client.websocket_connect("/api/v1/live") as ws:
+            for seq, contribution in enumerate((100_0000, 120_0000, 150_0000)):
+                ws.send_json({"seq": seq, "goal": {**NOAH_PAYLOAD, "monthly_contribution": contribution}})
+            received = self._phases(ws, 2)  # 앞의 두 갱신은 디바운스로 계산하지 않는다
+
+        assert list(received) == ["gap", "optimize", "simulate", "done"]
+        assert received["gap"] == client.post("/api/v1/gap-analysis", json=NOAH_PAYLOAD).json()
+        assert received["optimize"] == client.post("/api/v1/optimize", json=NOAH_PAYLOAD).json()
+        assert received["simulate"] == client.post("/api/v1/simulate", json=NOAH_PAYLOAD).json()
+
+    def test_superseded_update_skips_remaining_phases(self, client, monkeypatch):
+        release = threading.Event()
+        optimize_goal = live.optimize_goal
+
+        def slow_optimize(goal, gap_result):
+            release.wait(5)
+            return optimize_goal(goal, gap_result)
+
+        monkeypatch.setattr(live, "optimize_goal", slow_optimize)
+        with client.websocket_connect("/api/v1/live") as ws:
+            ws.send_json({"seq": 0, "goal": NOAH_PAYLOAD})
+            assert ws.receive_json()["phase"] == "gap"
+            ws.send_json({"seq": 1, "goal": {**NOAH_PAYLOAD, "goal_amount": 9000_0000}})
+            time.sleep(0.1)
+            release.set()
+            assert list(self._phases(ws, 0)) == ["cancelled"]
+            assert list(self._phases(ws, 1)) == ["gap", "optimize", "simulate", "done"]
+
+    def test_invalid_update_keeps_channel_open(self, client):
+        with client.websocket_connect("/api/v1/live") as ws:
+            ws.send_json({"seq": 0, "goal": {**NOAH_PAYLOAD, "goal_amount": -1}})
+            error = self._phases(ws, 0)["error"]
+            assert error[0]["loc"] == ["goal", "goal_amount"]
+            ws.send_json({"seq": 1, "goal": NOAH_PAYLOAD})
+            assert "done" in self._phases(ws, 1)
+
+
+class TestStaticAssets:
+    def _asset_urls(self, client):
+        resp = client.get("/")
+        assert resp.status_code == 200
+        return re.findall(r'(?:href|src)="(/static/[^"]+)"', resp.text)
+
+    def test_index_links_hashed_assets(self, client):
+        urls = self._asset_urls(client)
+        assert len(urls) == 2
+        for url in urls:
+            resp = client.get(url, headers={"accept-encoding": "gzip"})
+            assert resp.status_code == 200
+            assert resp.headers["cache-control"] == "public, max-age=31536000, immutable"
+            assert resp.headers["content-encoding"] == "gzip"
+            assert "accept-encoding" in resp.headers["vary"]
+
+    def test_identity_matches_source_file(self, client):
+        url = next(u for u in self._asset_urls(client) if u.endswith(".js"))
+        resp = client.get(url, headers={"accept-encoding": "identity"})
+        assert "content-encoding" not in resp.headers
+        assert resp.content == (BASE_DIR / "static/js/app.js").read_bytes()
+
+    def test_revalidation(self, client):
+        resp = client.get("/static/js/app.js")
+        assert resp.headers["cache-control"] == "no-cache"
+        again = client.get("/static/js/app.js", headers={"if-none-match": resp.headers["etag"]})
+        assert again.status_code == 304
+        assert again.content == b""
+
+    def test_urls_follow_root_path(self):
+        # 경로 접두사 프록시(--root-path /gbi) 뒤에서는 자산 URL에도 접두사가 붙는다
+        proxied = TestClient(app, root_path="/gbi")
+        resp = proxied.get("/")
+        urls = re.findall(r'(?:href|src)="([^"]+)"', resp.text)
+        asset_urls = [u for u in urls if "/static/" in u]
+        assert len(asset_urls) == 2
+        for url in asset_urls:
+            assert url.startswith("/gbi/static/")
+            assert proxied.get(url).status_code == 200
+
+    def test_unknown_and_method(self, client):
+        assert client.get("/static/js/missing.js").status_code == 404
+        assert client.post("/static/js/app.js").status_code == 405
+
+
+class TestDebugTracesEndpoint:
+    @pytest.fixture
+    def traced(self, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        monkeypatch.setattr(tracer, "slow_ns", 0)  # 모든 요청을 남긴다
+        tracer.clear()
+        yield
+        tracer.clear()
+
+    def test_requires_admin(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", None)
+        assert client.get("/api/v1/debug/traces").status_code == 403
+
+    def test_optimize_phases_in_chrome_format(self, client, traced):
+        client.post("/api/v1/optimize", json=NOAH_PAYLOAD)
+        resp = client.get("/api/v1/debug/traces", headers={"X-Admin-Token": "secret"})
+        assert resp.status_code == 200
+        events = resp.json()["traceEvents"]
+        root = next(e for e in events if e["ph"] == "X" and e["name"] == "POST /api/v1/optimize")
+        phases = {e["name"] for e in events if e["ph"] == "X" and e["tid"] == root["tid"]}
+        assert {"analyze_gap", "universe", "endpoint", "serialize"} <= phases
+        assert root["args"]["status"] == 200
+
+    def test_clear(self, client, traced):
+        client.get("/api/v1/assets")
+        assert client.delete("/api/v1/debug/traces", headers={"X-Admin-Token": "secret"}).status_code == 204
+        assert [t.name for t in tracer.traces()] == ["DELETE /api/v1/debug/traces"]  # 비운 뒤 끝난 자신만 남는다
+
+
+class TestColumnarResponses:
+    MSGPACK_HEADERS = {"Accept": "application/vnd.msgpack"}
+
+    def test_simulate_columns_match_json(self, client):
+        payload = {
+            **NOAH_PAYLOAD,
+            "scenarios": [{"label": f"시나리오 {i}", "rate_shift": (i - 50) / 2000} for i in range(101)],
+        }
+        rows = client.post("/api/v1/simulate", json=payload).json()
+        resp = client.post("/api/v1/simulate", json=payload, headers=self.MSGPACK_HEADERS)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/vnd.msgpack"
+        body = unpackb(resp.content)
+        assert body["format"] == "gbi.columnar.v1"
+        assert body["meta"]["base_rate"] == rows["base_rate"]
+        columns = decode_columns(body)
+        assert columns["label"] == [r["label"] for r in rows["results"]]
+        for name in ("rate_shift", "new_rate", "simple_savings_fv", "portfolio_fv", "difference"):
+            assert columns[name].dtype == np.float64
+            assert columns[name].tolist() == [r[name] for r in rows["results"]]
+
+    def test_sensitivity_grid_nulls_are_nan(self, client):
+        payload = {
+            "goal_amount": 1_0000_0000,
+            "monthly_contribution_min": 10_0000,
+            "monthly_contribution_max": 300_0000,
+            "monthly_contribution_steps": 5,
+            "time_horizon_min_months": 12,
+            "time_horizon_max_months": 120,
+            "time_horizon_steps": 6,
+        }
+        grid = client.post("/api/v1/sensitivity-grid", json=payload).json()
+        resp = client.post("/api/v1/sensitivity-grid", json=payload, headers=self.MSGPACK_HEADERS)
+        columns = decode_columns(unpackb(resp.content))
+        assert columns["required_annual_return"].shape == (5, 6)
+        assert columns["time_horizons_months"].tolist() == grid["time_horizons_months"]
+        assert columns["feasible"].tolist() == grid["feasible"]
+        expected = np.array(grid["required_annual_return"], dtype=float)  # None → NaN
+        np.testing.assert_array_equal(columns["required_annual_return"], expected)
+
+    def test_json_stays_default(self, client):
+        for accept in (None, "*/*", "application/json", "application/json, application/vnd.msgpack;q=0.5"):
+            headers = {} if accept is None else {"Accept": accept}
+            resp = client.post("/api/v1/simulate", json=NOAH_PAYLOAD, headers=headers)
+            assert resp.headers["content-type"] == "application/json"
+
+    def test_round_trip(self):
+        value = {
+            "small": [0, 1, -1, -32, 127],
+            "large": [128, -33, 2**40, -(2**40), 2**64 - 1],
+            "text": ["", "가" * 20, "x" * 300, "y" * 70_000],
+            "nested": {"none": None, "flags": [True, False], "pi": 3.5},
+            "many": list(range(20)),
+        }
+        assert unpackb(packb(value)) == value
+        array = np.arange(70_000, dtype=np.float64)
+        decoded = decode_columns(unpackb(packb(columnar({"x": array, "empty": np.zeros((0, 3))}))))
+        np.testing.assert_array_equal(decoded["x"], array)
+        assert decoded["empty"].shape == (0, 3)
@@ -0,0 +1,49 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.main import app
+from benchmarks.loadtest import run_load_test
+from benchmarks.workload import ENDPOINT_WEIGHTS, build_workload
+
+
+class TestWorkload:
+    def test_deterministic_for_seed(self):
+        assert build_workload(50, seed=1) == build_workload(50, seed=1)
+
+    def test_mix_covers_all_kinds_and_endpoints(self):
+        workload = build_workload(300)
+        assert {r.kind for r in workload} == {"persona", "edge_case", "infeasible"}
+        assert {r.path for r in workload} == set(ENDPOINT_WEIGHTS)
+
+
+class TestLoadTest:
+    def test_in_process_run_reports_percentiles(self):
+        transport = httpx.ASGITransport(app=app)
+        data = asyncio.run(
+            run_load_test("http://test", [1, 4], duration=None, total_requests=40,
+                          transport=transport)
+        )
+        assert [level["concurrency"] for level in data["levels"]] == [1, 4]
+        for level in data["levels"]:
+            total = level["total"]
+            assert total["requests"] == 40
+            assert total["errors"] == 0
+            assert total["p50_ms"] <= total["p95_ms"] <= total["p99_ms"]
+
+    def test_all_failed_reports_no_latency(self):
+        async def refuse(request):
+            raise httpx.ConnectError("거부", request=request)
+
+        data = asyncio.run(
+            run_load_test("http://test", [2], duration=None, total_requests=10,
+                          transport=httpx.MockTransport(refuse))
+        )
+        total = data["levels"][0]["total"]
+        assert (total["requests"], total["errors"]) == (0, 10)
+        assert total["p50_ms"] is None and total["p99_ms"] is None and total["max_ms"] is None
+
+    def test_requires_stop_condition(self):
+        with pytest.raises(ValueError):
+            asyncio.run(run_load_test("http://test", [1], duration=None, total_requests=None))
@@ -0,0 +1,61 @@
+import pytest
+
+from benchmarks.cases import BENCHMARKS
+from benchmarks.runner import Benchmark, compare_results, measure, run_benchmarks
+
+
+def _results(**medians: float) -> dict:
+    return {
+        "meta": {},
+        "results": {
+            name: {"min_us": v, "median_us": v, "mean_us": v, "max_us": v}
+            for name, v in medians.items()
+        },
+    }
+
+
+class TestCompare:
+    def test_no_regression_within_threshold(self):
+        report = compare_results(_results(a=100.0), _results(a=120.0), threshold=0.25)
+        assert report.regressions == []
+
+    def test_regression_beyond_threshold(self):
+        report = compare_results(_results(a=100.0, b=50.0), _results(a=130.0, b=40.0),
+                                 threshold=0.25)
+        assert [r.name for r in report.regressions] == ["a"]
+
+    def test_missing_and_added(self):
+        report = compare_results(_results(a=1.0, old=1.0), _results(a=1.0, new=1.0))
+        assert report.missing == ["old"]
+        assert report.added == ["new"]
+
+    def test_unknown_metric_raises(self):
+        with pytest.raises(ValueError, match="지표"):
+            compare_results(_results(a=1.0), _results(a=1.0), metric="p99")
+
+
+class TestRunner:
+    def test_measure_reports_per_call_stats(self):
+        bench = Benchmark(name="noop", group="test", size="small", setup=lambda: lambda: None)
+        result = measure(bench, repeat=2, min_time=0.001)
+        assert result["loops"] >= 1
+        assert 0 <= result["min_us"] <= result["median_us"] <= result["max_us"]
+
+    def test_measure_records_reported_error(self):
+        checked = Benchmark(name="check", group="test", size="small", setup=lambda: lambda: 0.25,
+                            reports_error=True)
+        timed = Benchmark(name="noop", group="test", size="small", setup=lambda: lambda: 0.25)
+        assert measure(checked, repeat=1, min_time=0.001)["error"] == 0.25
+        assert "error" not in measure(timed, repeat=1, min_time=0.001)
+
+    def test_run_benchmarks_baseline_format(self):
+        bench = Benchmark(name="noop", group="test", size="small", setup=lambda: lambda: None)
+        data = run_benchmarks([bench], repeat=1, min_time=0.001)
+        assert set(data) == {"meta", "results"}
+        assert "noop" in data["results"]
+
+    @pytest.mark.parametrize("name", sorted(BENCHMARKS))
+    def test_every_case_runs(self, name):
+        """모든 벤치마크 케이스가 오류 없이 1회 실행된다."""
+        fn = BENCHMARKS[name].setup()
+        fn()
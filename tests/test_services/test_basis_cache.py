@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from app.models.goal import GoalInput
+from app.services import optimizer
+from app.services.asset_universe import get_default_universe
+from app.services.basis_cache import BasisCache, recover_basis
+from app.services.batch_lp import asset_upper_bounds
+
+
+def _goal(months: int, contribution: float, eligible: bool = True) -> GoalInput:
+    return GoalInput(
+        goal_amount=1_0000_0000,
+        time_horizon_months=months,
+        monthly_contribution=contribution,
+        eligible_youth_savings=eligible,
+    )
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = BasisCache(256)
+    monkeypatch.setattr(optimizer, "basis_cache", cache)
+    return cache
+
+
+def _uncached(monkeypatch, assets, goal, required):
+    monkeypatch.setattr(optimizer, "basis_cache", BasisCache(0))
+    return optimizer.optimize_portfolio(assets, goal, required_return=required)
+
+
+class TestBasisCache:
+    def test_nearby_goal_hits(self, cache):
+        assets = get_default_universe(True)
+        optimizer.optimize_portfolio(assets, _goal(60, 150_0000))
+        assert cache.stats()["misses"] == 1 and len(cache) == 1
+
+        optimizer.optimize_portfolio(assets, _goal(61, 151_0000))
+        assert cache.stats()["hits"] == 1
+
+    def test_cached_results_match_solver(self, cache, monkeypatch):
+        rng = np.random.default_rng(0)
+        cases = []
+        for _ in range(300):
+            eligible = bool(rng.integers(2))
+            goal = _goal(int(rng.integers(1, 100)), float(rng.uniform(10_0000, 500_0000)), eligible)
+            required = float(rng.uniform(0.02, 0.05)) if rng.random() < 0.5 else None
+            assets = get_default_universe(eligible)
+            cases.append((assets, goal, required, optimizer.optimize_portfolio(assets, goal, required)))
+        assert cache.stats()["hit_rate"] > 0.8
+
+        for assets, goal, required, cached in cases:
+            expected = _uncached(monkeypatch, assets, goal, required)
+            assert cached.success == expected.success
+            assert cached.message == expected.message
+            assert cached.portfolio_return == pytest.approx(expected.portfolio_return, abs=1e-6)
+
+    def test_different_rates_do_not_share_bases(self, cache):
+        assets = get_default_universe(True)
+        optimizer.optimize_portfolio(assets, _goal(60, 150_0000))
+        shifted = [a.model_copy(update={"gross_return": a.gross_return + 0.01}) for a in assets]
+        optimizer.optimize_portfolio(shifted, _goal(60, 150_0000))
+        assert cache.stats()["hits"] == 0
+
+    def test_ranges_contain_solve_point(self, cache):
+        assets = get_default_universe(True)
+        optimizer.optimize_portfolio(assets, _goal(60, 150_0000))
+        (entries,) = cache._universes.values()
+        (entry,) = entries.values()
+        assert entry.months_range[0] <= 60 <= entry.months_range[1]
+        assert entry.contribution_range[0] <= 150_0000 <= entry.contribution_range[1]
+
+    def test_disabled(self, monkeypatch):
+        cache = BasisCache(0)
+        monkeypatch.setattr(optimizer, "basis_cache", cache)
+        assets = get_default_universe(True)
+        optimizer.optimize_portfolio(assets, _goal(60, 150_0000))
+        optimizer.optimize_portfolio(assets, _goal(60, 150_0000))
+        assert len(cache) == 0 and cache.stats()["hits"] == 0
+
+
+class TestRecoverBasis:
+    def test_pair_on_upper_band(self):
+        assets = get_default_universe(False)
+        durations = np.array([a.duration for a in assets])
+        upper = asset_upper_bounds(assets, 150_0000)[0]
+        weights = np.array([0.0, 0.0, 0.0, 0.5, 0.5])
+        duration = float(weights @ durations)
+        basis = recover_basis(weights, durations, duration - 1.0, duration, upper)
+        assert basis.basic == (3, 4) and basis.side == 1
+
+    def test_degenerate_returns_none(self):
+        assets = get_default_universe(False)
+        durations = np.array([a.duration for a in assets])
+        upper = np.ones(len(assets))
+        weights = np.full(len(assets), 1 / len(assets))
+        assert recover_basis(weights, durations, 0.0, 10.0, upper) is None
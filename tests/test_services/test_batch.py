@@ -0,0 +1,181 @@
+import csv
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from app.api.v1.endpoints.optimize import optimize
+from app.batch import main, plan_row
+from app.models.asset import AssetClass
+from app.models.goal import GoalInput
+from app.services import rate_store as rate_store_module
+from app.services.batch import BatchError, checkpoint_path, read_rows, run_batch
+from app.services.rate_store import DEFAULT_GROSS_RETURNS, RateStore, current_snapshot
+
+FIELDS = ["customer_id", "goal_amount", "time_horizon_months", "monthly_contribution",
+          "initial_principal", "eligible_youth_savings"]
+
+
+def _write_csv(path, n, bad_rows=()):
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for i in range(n):
+            if i in bad_rows:
+                writer.writerow([f"C{i}", "-1", "x", "1", "", ""])
+            else:
+                writer.writerow([f"C{i}", 1_0000_0000, 24 + i, 150_0000, "" if i % 2 else 0, "true"])
+    return path
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def _row_number(fields):
+    return {"n": int(fields["time_horizon_months"])}
+
+
+class _Interrupt(BaseException):
+    """중단 흉내 (행 실패로 잡히지 않도록 Exception이 아니다)."""
+
+
+def _interrupt_at_30(fields):
+    if fields["customer_id"] == "C30":
+        raise _Interrupt
+    return _row_number(fields)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = RateStore(0.035, DEFAULT_GROSS_RETURNS, history=4)
+    monkeypatch.setattr(rate_store_module, "rate_store", store)
+    return store
+
+
+class TestReadRows:
+    def test_csv_drops_empty_cells(self, tmp_path):
+        rows, total = read_rows(_write_csv(tmp_path / "in.csv", 2))
+        rows = list(rows)
+        assert total is None
+        assert rows[0]["initial_principal"] == "0"
+        assert "initial_principal" not in rows[1]
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(BatchError):
+            read_rows(tmp_path / "in.xlsx")
+
+
+class TestPlanRow:
+    def test_matches_optimize_endpoint(self):
+        fields = {"customer_id": "C1", "goal_amount": "100000000", "time_horizon_months": "60",
+                  "monthly_contribution": "1500000", "eligible_youth_savings": "true"}
+        record = plan_row(fields)
+        goal = GoalInput(goal_amount=1_0000_0000, time_horizon_months=60,
+                         monthly_contribution=150_0000, eligible_youth_savings=True)
+        assert record["extra"] == {"customer_id": "C1"}
+        assert record["optimization"] == optimize(goal)
+        assert len(record["simulation"].results) == 4
+
+
+class TestRunBatch:
+    def test_writes_rows_in_order_with_failures(self, tmp_path):
+        source = _write_csv(tmp_path / "in.csv", 5, bad_rows={2})
+        output = tmp_path / "out.jsonl"
+        summary = run_batch(source, output, plan_row, chunk_size=2)
+
+        records = _records(output)
+        assert [r["row"] for r in records] == [0, 1, 2, 3, 4]
+        assert "error" in records[2] and "ValidationError" in records[2]["error"]
+        assert records[0]["extra"] == {"customer_id": "C0"}
+        assert (summary.rows, summary.failed) == (5, 1)
+
+    def test_process_pool_matches_inline(self, tmp_path):
+        source = _write_csv(tmp_path / "in.csv", 40)
+        inline, pooled = tmp_path / "inline.jsonl", tmp_path / "pooled.jsonl"
+        run_batch(source, inline, _row_number, chunk_size=3)
+        run_batch(source, pooled, _row_number, chunk_size=3, workers=2)
+        assert pooled.read_bytes() == inline.read_bytes()
+
+    def test_progress_reports_each_chunk(self, tmp_path):
+        source = _write_csv(tmp_path / "in.csv", 7)
+        seen = []
+        run_batch(source, tmp_path / "out.jsonl", _row_number, chunk_size=3, progress=seen.append)
+        assert [p.rows for p in seen] == [3, 6, 7]
+
+    def test_refuses_existing_output(self, tmp_path):
+        source = _write_csv(tmp_path / "in.csv", 3)
+        output = tmp_path / "out.jsonl"
+        output.write_text("keep", encoding="utf-8")
+        with pytest.raises(BatchError):
+            run_batch(source, output, _row_number)
+        assert output.read_text(encoding="utf-8") == "keep"
+        run_batch(source, output, _row_number, overwrite=True)
+        assert len(_records(output)) == 3
+
+
+class TestResume:
+    def test_resume_after_interrupt(self, tmp_path):
+        source = _write_csv(tmp_path / "in.csv", 50)
+        output = tmp_path / "out.jsonl"
+        with pytest.raises(_Interrupt):
+            run_batch(source, output, _interrupt_at_30, chunk_size=10)
+        assert json.loads(checkpoint_path(output).read_text())["rows"] == 30
+        with output.open("ab") as f:
+            f.write(b'{"row": 30, "partial')  # 체크포인트 뒤에 쓰다 만 줄
+
+        summary = run_batch(source, output, _row_number, chunk_size=10, resume=True)
+        assert summary.resumed_from == 30
+        assert [r["row"] for r in _records(output)] == list(range(50))
+
+    def test_resume_keeps_checkpoint_rates(self, tmp_path, store):
+        source = _write_csv(tmp_path / "in.csv", 50)
+        output = tmp_path / "out.jsonl"
+        with pytest.raises(_Interrupt):
+            run_batch(source, output, _interrupt_at_30, chunk_size=10)
+        store.publish(base_interest_rate=0.05, gross_returns={AssetClass.PARKING: 0.01})
+
+        def rate(fields):
+            return {"rate": current_snapshot().base_interest_rate}
+
+        # 재개 분은 체크포인트의 금리(발행 이전)로 계산한다
+        run_batch(source, output, rate, chunk_size=10, resume=True)
+        assert {r["rate"] for r in _records(output)[30:]} == {0.035}
+
+    def test_rejects_changed_input(self, tmp_path):
+        source = _write_csv(tmp_path / "in.csv", 5)
+        output = tmp_path / "out.jsonl"
+        run_batch(source, output, _row_number)
+        _write_csv(source, 6)
+        with pytest.raises(BatchError):
+            run_batch(source, output, _row_number, resume=True)
+
+    def test_resume_without_checkpoint(self, tmp_path):
+        with pytest.raises(BatchError):
+            run_batch(_write_csv(tmp_path / "in.csv", 1), tmp_path / "out.jsonl", _row_number, resume=True)
+
+    def test_resume_without_output(self, tmp_path):
+        source = _write_csv(tmp_path / "in.csv", 3)
+        output = tmp_path / "out.jsonl"
+        run_batch(source, output, _row_number)
+        output.unlink()
+        with pytest.raises(BatchError):
+            run_batch(source, output, _row_number, resume=True)
+
+
+class TestCli:
+    def test_plans_file(self, tmp_path):
+        source = _write_csv(tmp_path / "in.csv", 3)
+        output = tmp_path / "out.jsonl"
+        result = CliRunner().invoke(main, [str(source), "-o", str(output), "-j", "1", "-q"])
+        assert result.exit_code == 0, result.output
+        assert "3행" in result.output
+        assert [r["extra"]["customer_id"] for r in _records(output)] == ["C0", "C1", "C2"]
+
+    def test_existing_output_fails(self, tmp_path):
+        source = _write_csv(tmp_path / "in.csv", 1)
+        output = tmp_path / "out.jsonl"
+        output.touch()
+        result = CliRunner().invoke(main, [str(source), "-o", str(output), "-j", "1"])
+        assert result.exit_code == 1
+        assert "--resume" in result.output
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from app.services.asset_universe import get_default_universe
+from app.services.batch_lp import asset_upper_bounds, duration_band, solve_batch
+from app.services.tax import after_tax_return
+
+
+def _linprog(returns, durations, lo, hi, upper):
+    n = len(returns)
+    return linprog(
+        -returns,
+        A_ub=[durations, -durations],
+        b_ub=[hi, -lo],
+        A_eq=[np.ones(n)],
+        b_eq=[1.0],
+        bounds=list(zip([0.0] * n, upper)),
+        method="highs",
+    )
+
+
+class TestSolveBatch:
+    @pytest.mark.parametrize("eligible", [True, False])
+    def test_matches_linprog_on_default_universe(self, eligible):
+        assets = get_default_universe(eligible)
+        returns = np.array([after_tax_return(a.gross_return, a.tax_benefit) for a in assets])
+        durations = np.array([a.duration for a in assets])
+
+        rng = np.random.default_rng(0)
+        C = rng.uniform(10_0000, 500_0000, 200)
+        T = rng.integers(1, 120, 200) / 12
+        upper = asset_upper_bounds(assets, C)
+        lo, hi = duration_band(T, 0.5)
+
+        solution = solve_batch(returns, durations, lo, hi, upper)
+
+        for i in range(len(C)):
+            res = _linprog(returns, durations, lo[i], hi[i], upper[i])
+            assert res.success == solution.feasible[i]
+            if res.success:
+                assert solution.objective[i] == pytest.approx(-res.fun, abs=1e-9)
+
+    def test_weights_satisfy_constraints(self):
+        rng = np.random.default_rng(1)
+        n = 8
+        durations = rng.uniform(0, 10, n)
+        returns = rng.uniform(0, 0.1, (300, n))
+        upper = np.ones((300, n))
+        upper[:, [2, 5]] = rng.uniform(0, 1, (300, 2))
+        T = rng.uniform(0, 10, 300)
+
+        solution = solve_batch(returns, durations, T - 0.5, T + 0.5, upper)
+
+        w = solution.weights[solution.feasible]
+        assert np.allclose(w.sum(axis=1), 1.0)
+        assert (w >= 0).all()
+        assert (w <= upper[solution.feasible] + 1e-9).all()
+        d = w @ durations
+        assert (d >= T[solution.feasible] - 0.5 - 1e-9).all()
+        assert (d <= T[solution.feasible] + 0.5 + 1e-9).all()
+
+    def test_infeasible_duration_band(self):
+        """최대 듀레이션보다 긴 목표 기간은 실행 불가능."""
+        solution = solve_batch(
+            np.array([0.03, 0.04]), np.array([0.0, 2.0]), np.array([5.0]), np.array([6.0]),
+            np.ones((1, 2)),
+        )
+        assert not solution.feasible[0]
+        assert np.isnan(solution.objective[0])
+
+    def test_min_return_filters(self):
+        solution = solve_batch(
+            np.array([0.03, 0.04]), np.array([0.0, 2.0]), np.array([0.5, 0.5]),
+            np.array([1.5, 1.5]), np.ones((2, 2)), min_return=np.array([0.03, 0.05]),
+        )
+        assert solution.feasible.tolist() == [True, False]
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from app.models.cvar import CVaRRequest
+from app.models.simulation import RateScenario
+from app.services.asset_universe import get_default_universe
+from app.services.cvar import optimize_cvar, shortfall_risk
+from app.services.optimizer import optimize_portfolio
+
+
+def _request(**overrides) -> CVaRRequest:
+    params = dict(
+        goal_amount=1_0000_0000,
+        time_horizon_months=60,
+        monthly_contribution=150_0000,
+        eligible_youth_savings=True,
+        n_scenarios=2000,
+        seed=0,
+    )
+    params.update(overrides)
+    return CVaRRequest(**params)
+
+
+@pytest.fixture
+def assets():
+    return get_default_universe(True)
+
+
+class TestShortfallRisk:
+    def test_tail_mean(self):
+        shortfall = np.arange(100, dtype=float)  # 0..99
+        var, cvar = shortfall_risk(shortfall, 0.9)
+        assert var == 89
+        assert cvar == pytest.approx(np.mean(np.arange(90, 100)))
+
+
+class TestCVaROptimizer:
+    @pytest.mark.parametrize("overrides", [{}, {"time_horizon_months": 36, "initial_principal": 3000_0000}])
+    def test_loose_limit_matches_nominal(self, assets, overrides):
+        req = _request(goal_amount=1_1000_0000, max_shortfall=1e12, **overrides)
+        result = optimize_cvar(assets, req)
+        nominal = optimize_portfolio(assets, req)
+        assert result.success is True
+        assert result.allocations == nominal.allocations
+        assert result.portfolio_return == pytest.approx(nominal.portfolio_return, abs=1e-6)
+
+    def test_tighter_limit_trades_return_for_safety(self):
+        assets = get_default_universe(False)
+        req = _request(goal_amount=2_0000_0000, eligible_youth_savings=False, rate_volatility=0.02)
+        loose = optimize_cvar(assets, req.model_copy(update={"max_shortfall": 1e12}))
+        infeasible = optimize_cvar(assets, req.model_copy(update={"max_shortfall": 0}))
+        minimum = float(infeasible.message.split("부족액은 ")[1].split("원")[0].replace(",", ""))
+        assert minimum < loose.cvar_shortfall
+
+        limit = (minimum + loose.cvar_shortfall) / 2
+        tight = optimize_cvar(assets, req.model_copy(update={"max_shortfall": limit}))
+        assert tight.success is True
+        assert tight.cvar_shortfall <= limit + 1
+        assert tight.portfolio_return < loose.portfolio_return
+
+    def test_infeasible_limit_reports_minimum(self, assets):
+        result = optimize_cvar(assets, _request(goal_amount=2_0000_0000, max_shortfall=0))
+        assert result.success is False
+        assert "최소 기대 부족액" in result.message
+        assert result.n_scenarios == 2000
+
+    def test_user_scenarios(self, assets):
+        scenarios = [RateScenario(label=f"s{i}", rate_shift=s) for i, s in enumerate([-0.015, 0.0, 0.01])]
+        result = optimize_cvar(assets, _request(scenarios=scenarios, max_shortfall=1e12))
+        assert result.n_scenarios == 3
+
+    def test_reports_problem_size_and_time(self, assets):
+        result = optimize_cvar(assets, _request(n_scenarios=5000, max_shortfall=1e12))
+        n = len(assets)
+        assert result.n_variables == n + 1 + 5000
+        assert result.n_constraints >= 5000 + 1
+        assert result.n_nonzeros >= 5000 * (n + 2)
+        assert 0 < result.solve_time_ms < 5000
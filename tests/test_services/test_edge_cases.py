@@ -9,6 +9,7 @@ from app.services.gap_analyzer import _future_value, analyze_gap
 from app.services.optimizer import optimize_portfolio
 from app.services.simulator import simulate_scenarios
 from app.services.tax import after_tax_return
+from benchmarks.workload import EDGE_CASE_GOALS
 
 
 # ============================================================
@@ -18,11 +19,7 @@ from app.services.tax import after_tax_return
 class TestGapAnalyzerEdgeCases:
     def test_impossible_goal_tiny_contribution(self):
         """월 10만원으로 1년 안에 10억은 불가능."""
-        goal = GoalInput(
-            goal_amount=10_0000_0000,
-            time_horizon_months=12,
-            monthly_contribution=10_0000,
-        )
+        goal = EDGE_CASE_GOALS["tiny_contribution"]
         result = analyze_gap(goal)
         assert result.optimization_needed is True
         assert result.goal_achievable is False
@@ -30,12 +27,7 @@ class TestGapAnalyzerEdgeCases:
 
     def test_initial_principal_covers_goal(self):
         """초기자본이 목표를 이미 초과."""
-        goal = GoalInput(
-            goal_amount=1000_0000,
-            time_horizon_months=60,
-            monthly_contribution=100_0000,
-            initial_principal=2000_0000,
-        )
+        goal = EDGE_CASE_GOALS["principal_covers_goal"]
         result = analyze_gap(goal)
         assert result.optimization_needed is False
         assert result.gap == 0
@@ -43,11 +35,7 @@ class TestGapAnalyzerEdgeCases:
 
     def test_short_horizon_achievable(self):
         """12개월로 약간 부족한 경우 → 달성 가능."""
-        goal = GoalInput(
-            goal_amount=1900_0000,
-            time_horizon_months=12,
-            monthly_contribution=150_0000,
-        )
+        goal = EDGE_CASE_GOALS["short_horizon"]
         result = analyze_gap(goal)
         assert result.optimization_needed is True
         assert result.goal_achievable is True
@@ -55,22 +43,14 @@ class TestGapAnalyzerEdgeCases:
 
     def test_one_month_horizon_too_much_gap(self):
         """1개월에 150만→200만은 연 400% 수익률 필요 → 불가능."""
-        goal = GoalInput(
-            goal_amount=200_0000,
-            time_horizon_months=1,
-            monthly_contribution=150_0000,
-        )
+        goal = EDGE_CASE_GOALS["one_month_gap"]
         result = analyze_gap(goal)
         assert result.optimization_needed is True
         assert result.goal_achievable is False
 
     def test_one_month_impossible(self):
         """1개월로 100배 목표는 불가능."""
-        goal = GoalInput(
-            goal_amount=1_0000_0000,
-            time_horizon_months=1,
-            monthly_contribution=10_0000,
-        )
+        goal = EDGE_CASE_GOALS["one_month_impossible"]
         result = analyze_gap(goal)
         assert result.goal_achievable is False
 
@@ -154,11 +134,7 @@ class TestOptimizerEdgeCases:
 
     def test_infeasible_required_return(self):
         """달성 불가능한 수익률 요구."""
-        goal = GoalInput(
-            goal_amount=1_0000_0000,
-            time_horizon_months=60,
-            monthly_contribution=150_0000,
-        )
+        goal = EDGE_CASE_GOALS["without_youth_savings"]
         assets = get_default_universe(eligible_youth_savings=False)
         result = optimize_portfolio(
             assets=assets,
@@ -170,12 +146,7 @@ class TestOptimizerEdgeCases:
 
     def test_without_youth_savings_still_works(self):
         """청년도약 없이도 최적화 가능."""
-        goal = GoalInput(
-            goal_amount=1_0000_0000,
-            time_horizon_months=60,
-            monthly_contribution=150_0000,
-            eligible_youth_savings=False,
-        )
+        goal = EDGE_CASE_GOALS["without_youth_savings"]
         gap = analyze_gap(goal)
         assets = get_default_universe(eligible_youth_savings=False)
         result = optimize_portfolio(
@@ -191,11 +162,7 @@ class TestOptimizerEdgeCases:
 
     def test_very_short_horizon(self):
         """3개월 목표 기간."""
-        goal = GoalInput(
-            goal_amount=500_0000,
-            time_horizon_months=3,
-            monthly_contribution=150_0000,
-        )
+        goal = EDGE_CASE_GOALS["very_short_horizon"]
         assets = get_default_universe(eligible_youth_savings=False)
         result = optimize_portfolio(assets=assets, goal=goal)
         # 듀레이션 매칭이 매우 짧은 목표에서도 실행됨
@@ -300,11 +267,7 @@ class TestAPIEdgeCases:
 
     def test_very_large_goal(self, client):
         """매우 큰 목표 (100억)."""
-        resp = client.post("/api/v1/gap-analysis", json={
-            "goal_amount": 100_0000_0000,
-            "time_horizon_months": 60,
-            "monthly_contribution": 150_0000,
-        })
+        resp = client.post("/api/v1/gap-analysis", json=EDGE_CASE_GOALS["very_large_goal"].model_dump())
         assert resp.status_code == 200
         data = resp.json()
         assert data["goal_achievable"] is False
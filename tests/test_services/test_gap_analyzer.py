@@ -1,7 +1,14 @@
 import pytest
 
 from app.models.goal import GoalInput
-from app.services.gap_analyzer import analyze_gap, _future_value
+import numpy as np
+
+from app.services.gap_analyzer import (
+    _future_value,
+    _future_value_array,
+    analyze_gap,
+    required_annual_returns,
+)
 
 
 class TestFutureValue:
@@ -50,3 +57,69 @@ class TestGapAnalyzer:
                 noah_goal.time_horizon_months,
             )
             assert abs(fv - noah_goal.goal_amount) < 1.0  # 1원 이내 오차
+
+
+class TestVectorizedGap:
+    def test_future_value_array_matches_scalar(self):
+        cases = [(0, 100_0000, 0.0, 60), (500_0000, 150_0000, 0.035, 60),
+                 (0, 100_0000, -0.02, 60), (500_0000, 100_0000, 0.05, 0)]
+        for p, c, r, n in cases:
+            assert _future_value_array(p, c, r, n) == pytest.approx(_future_value(p, c, r, n))
+
+    def test_required_returns_match_analyze_gap(self):
+        goals = [
+            GoalInput(goal_amount=1_0000_0000, time_horizon_months=60, monthly_contribution=150_0000),
+            GoalInput(goal_amount=1000_0000, time_horizon_months=60, monthly_contribution=150_0000),
+            GoalInput(goal_amount=10_0000_0000, time_horizon_months=12, monthly_contribution=10_0000),
+            GoalInput(goal_amount=3000_0000, time_horizon_months=24, monthly_contribution=100_0000,
+                      initial_principal=600_0000),
+        ]
+        required, needed, achievable = required_annual_returns(
+            np.array([g.goal_amount for g in goals]),
+            np.array([g.initial_principal for g in goals]),
+            np.array([g.monthly_contribution for g in goals]),
+            np.array([g.time_horizon_months for g in goals]),
+        )
+        for i, goal in enumerate(goals):
+            result = analyze_gap(goal)
+            assert needed[i] == result.optimization_needed
+            assert achievable[i] == result.goal_achievable
+            if result.required_annual_return is None:
+                assert np.isnan(required[i])
+            else:
+                assert required[i] == pytest.approx(result.required_annual_return, abs=1e-8)
+
+
+class TestGapSensitivities:
+    @pytest.mark.parametrize(
+        "field, update, step",
+        [
+            ("required_return_per_contribution", "monthly_contribution", 1000.0),
+            ("required_return_per_month", "time_horizon_months", 1),
+            ("required_return_per_goal", "goal_amount", 10_0000.0),
+            ("required_return_per_principal", "initial_principal", 10_0000.0),
+        ],
+    )
+    def test_implicit_derivative_matches_finite_difference(self, noah_goal, field, update, step):
+        analytic = getattr(analyze_gap(noah_goal).sensitivities, field)
+        base = getattr(noah_goal, update)
+        up = analyze_gap(noah_goal.model_copy(update={update: base + step})).required_annual_return
+        down = analyze_gap(noah_goal.model_copy(update={update: base - step})).required_annual_return
+        assert analytic == pytest.approx((up - down) / (2 * step), rel=1e-3)
+
+    def test_safe_future_value_derivatives(self, noah_goal):
+        s = analyze_gap(noah_goal).sensitivities
+
+        def fv(P=0.0, C=150_0000, r=0.035, n=60):
+            return _future_value(P, C, r, n)
+
+        assert s.future_value_per_contribution == pytest.approx((fv(C=150_1000) - fv(C=149_9000)) / 2000)
+        assert s.future_value_per_rate == pytest.approx((fv(r=0.0351) - fv(r=0.0349)) / 0.0002, rel=1e-6)
+        assert s.future_value_per_month == pytest.approx(fv(n=61) - fv(n=60), rel=0.01)
+        assert s.future_value_per_principal == pytest.approx(fv(P=1.0) - fv(P=0.0))
+
+    def test_no_required_return_derivatives_when_not_needed(self):
+        easy = GoalInput(goal_amount=1000_0000, time_horizon_months=60, monthly_contribution=150_0000)
+        s = analyze_gap(easy).sensitivities
+        assert s.required_return_per_goal is None
+        assert s.future_value_per_contribution > 60
@@ -0,0 +1,98 @@
+import time
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.models.asset import AssetClass
+from app.models.glide_path import GlidePathRequest
+from app.services.asset_universe import get_default_universe
+from app.services.glide_path import optimize_glide_path
+from app.services.optimizer import lp_returns
+
+
+def _request(**overrides) -> GlidePathRequest:
+    params = dict(
+        goal_amount=1_0000_0000,
+        time_horizon_months=60,
+        monthly_contribution=300_0000,
+        eligible_youth_savings=True,
+        step_months=1,
+    )
+    params.update(overrides)
+    return GlidePathRequest(**params)
+
+
+def _isa_by_year(result, months: int) -> np.ndarray:
+    used = np.zeros((months + 11) // 12)
+    for step in result.steps:
+        for item in step.allocations:
+            if item.asset_class == AssetClass.ISA_DEPOSIT:
+                used[step.start_month // 12] += item.monthly_amount * step.months
+    for p in result.principal_allocations:
+        if p.asset_class == AssetClass.ISA_DEPOSIT:
+            used[0] += p.amount
+    return used
+
+
+class TestGlidePath:
+    @pytest.mark.parametrize("step_months", [1, 12])
+    def test_duration_tracks_remaining_horizon(self, step_months):
+        eps = settings.duration_epsilon
+        result = optimize_glide_path(_request(step_months=step_months))
+        assert result.success is True
+        assert len(result.steps) == 60 // step_months
+        for step in result.steps:
+            assert step.remaining_years - eps - 1e-3 <= step.portfolio_duration
+            assert step.portfolio_duration <= step.remaining_years + eps + 1e-3
+            assert sum(a.monthly_amount for a in step.allocations) == pytest.approx(300_0000, abs=6)
+
+    def test_duration_shortens_over_time(self):
+        result = optimize_glide_path(_request())
+        durations = [s.portfolio_duration for s in result.steps]
+        assert durations[0] > durations[-1]
+
+    def test_cumulative_isa_cap(self):
+        result = optimize_glide_path(_request(initial_principal=1000_0000))
+        used = _isa_by_year(result, 60)
+        allowance = settings.isa_annual_limit * np.arange(1, len(used) + 1)
+        assert (np.cumsum(used) <= allowance + 12 * len(result.steps)).all()
+
+    def test_youth_savings_stops_at_maturity(self):
+        result = optimize_glide_path(_request(time_horizon_months=120))
+        for step in result.steps:
+            youth = [a for a in step.allocations if a.asset_class == AssetClass.YOUTH_SAVINGS]
+            if step.start_month >= settings.youth_savings_maturity_months:
+                assert youth == []
+            else:
+                assert all(a.monthly_amount <= settings.youth_savings_monthly_limit + 1 for a in youth)
+
+    def test_future_value_matches_month_by_month(self):
+        req = _request(eligible_youth_savings=False)
+        result = optimize_glide_path(req)
+        assets = get_default_universe(False)
+        rates = dict(zip([a.name for a in assets], lp_returns(assets, req)))
+        N = req.time_horizon_months
+        fv = sum(
+            item.monthly_amount * (1 + rates[item.name] / 12) ** (N - 1 - t)
+            for step in result.steps
+            for t in range(step.start_month, step.start_month + step.months)
+            for item in step.allocations
+        )
+        assert result.expected_future_value == pytest.approx(fv, rel=1e-6)
+        assert result.goal_achievable is (result.expected_future_value >= req.goal_amount)
+
+    def test_long_horizon_clips_to_max_duration(self):
+        result = optimize_glide_path(_request(time_horizon_months=600))
+        assert result.success is True
+        assert result.steps[0].portfolio_duration == pytest.approx(7.8, abs=1e-3)
+        assert "최장 듀레이션" in result.message
+
+    def test_600_month_monthly_solves_fast(self):
+        req = _request(time_horizon_months=600, initial_principal=5000_0000)
+        optimize_glide_path(req)
+        start = time.perf_counter()
+        result = optimize_glide_path(req)
+        assert result.success is True
+        assert len(result.steps) == 600
+        assert time.perf_counter() - start < 1.0
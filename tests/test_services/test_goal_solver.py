@@ -0,0 +1,104 @@
+import pytest
+
+from app.models.goal import GoalInput
+from app.services.asset_universe import get_default_universe
+from app.services.gap_analyzer import analyze_gap
+from app.services.goal_solver import solve_goal, solve_goal_targets
+from app.services.optimizer import optimize_portfolio
+
+
+def _pipeline_succeeds(goal: GoalInput) -> bool:
+    """/optimize 파이프라인 기준 목표 달성 여부 (HiGHS 허용오차 대신 1e-6 여유)."""
+    gap = analyze_gap(goal)
+    if not gap.optimization_needed:
+        return True
+    if not gap.goal_achievable:
+        return False
+    assets = get_default_universe(goal.eligible_youth_savings)
+    result = optimize_portfolio(assets, goal, gap.required_annual_return - 1e-6)
+    return result.success and result.portfolio_return >= gap.required_annual_return - 1e-6
+
+
+@pytest.fixture
+def short_goal():
+    """노아가 3년 안에 1억을 모으려는 경우 → 현재 저축액으로는 불가능."""
+    return GoalInput(
+        goal_amount=1_0000_0000,
+        time_horizon_months=36,
+        monthly_contribution=150_0000,
+        eligible_youth_savings=True,
+    )
+
+
+class TestGoalSolver:
+    def test_noah_is_achievable(self, noah_goal):
+        solution = solve_goal(noah_goal)
+        assert solution.goal_achievable is True
+        assert solution.min_monthly_contribution <= noah_goal.monthly_contribution
+        assert solution.min_time_horizon_months <= noah_goal.time_horizon_months
+        assert solution.max_goal_amount >= noah_goal.goal_amount
+
+    def test_min_contribution_is_tight(self, short_goal):
+        solution = solve_goal(short_goal)
+        assert solution.goal_achievable is False
+
+        c = solution.min_monthly_contribution
+        assert _pipeline_succeeds(short_goal.model_copy(update={"monthly_contribution": c}))
+        assert not _pipeline_succeeds(
+            short_goal.model_copy(update={"monthly_contribution": c - 1000})
+        )
+
+    def test_min_horizon_is_tight(self, short_goal):
+        months = solve_goal(short_goal).min_time_horizon_months
+        assert months is not None
+        assert _pipeline_succeeds(short_goal.model_copy(update={"time_horizon_months": months}))
+        assert not _pipeline_succeeds(
+            short_goal.model_copy(update={"time_horizon_months": months - 1})
+        )
+
+    def test_max_goal_is_tight(self, short_goal):
+        amount = solve_goal(short_goal).max_goal_amount
+        assert _pipeline_succeeds(short_goal.model_copy(update={"goal_amount": amount}))
+        assert not _pipeline_succeeds(
+            short_goal.model_copy(update={"goal_amount": amount * 1.001})
+        )
+
+    def test_horizon_beyond_duration_matching_uses_safe_rate(self):
+        """듀레이션 매칭이 불가능한 장기 구간은 안전 금리 연금 역산으로 구한다."""
+        goal = GoalInput(
+            goal_amount=3_0000_0000,
+            time_horizon_months=60,
+            monthly_contribution=100_0000,
+        )
+        months = solve_goal(goal).min_time_horizon_months
+        assert months is not None and months > 100
+        assert _pipeline_succeeds(goal.model_copy(update={"time_horizon_months": months}))
+        assert not _pipeline_succeeds(goal.model_copy(update={"time_horizon_months": months - 1}))
+
+    def test_batch_matches_single(self, noah_goal, short_goal):
+        goals = [noah_goal, short_goal]
+        targets = solve_goal_targets(
+            [g.goal_amount for g in goals],
+            [g.initial_principal for g in goals],
+            [g.monthly_contribution for g in goals],
+            [g.time_horizon_months for g in goals],
+            get_default_universe(True),
+        )
+        for i, goal in enumerate(goals):
+            single = solve_goal(goal)
+            assert targets.min_monthly_contribution[i] == single.min_monthly_contribution
+            assert targets.min_time_horizon_months[i] == single.min_time_horizon_months
+
+    @pytest.mark.filterwarnings("error::RuntimeWarning")
+    def test_principal_alone_reaches_goal(self):
+        goal = GoalInput(
+            goal_amount=1000_0000,
+            time_horizon_months=36,
+            monthly_contribution=50_0000,
+            initial_principal=2000_0000,
+            eligible_youth_savings=True,
+        )
+        solution = solve_goal(goal)
+        assert solution.goal_achievable
+        assert solution.min_monthly_contribution == 0.0
+        assert solution.min_time_horizon_months == 1
@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from app.models.asset import AssetClass
+from app.models.goal import GoalInput
+from app.services.asset_universe import get_default_universe
+from app.services.basis_cache import basis_cache
+from app.services.optimizer import _base_constraints, lp_returns, optimize_portfolio
+
+CASES = [
+    # (청년도약저축 자격, 목표 기간, 월 저축액): 듀레이션 상한 활성, 청년 한도 활성, 듀레이션 하한 활성
+    (False, 36, 150_0000),
+    (True, 60, 150_0000),
+    (True, 48, 50_0000),
+]
+# ISA 기저 변수 + 누적 과세, ISA 한도 비중 활성, 청년도약저축과 함께
+ISA_CASES = [
+    (False, 48, 150_0000, 1000_0000),
+    (False, 36, 300_0000, 0),
+    (True, 36, 150_0000, 1000_0000),
+]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    basis_cache.clear()
+    yield
+    basis_cache.clear()
+
+
+def _goal(youth: bool, months: int, contribution: float) -> GoalInput:
+    return GoalInput(
+        goal_amount=1_0000_0000, time_horizon_months=months, monthly_contribution=contribution,
+        eligible_youth_savings=youth,
+    )
+
+
+def _highs_marginals(assets, goal: GoalInput, epsilon: float):
+    returns = lp_returns(assets, goal)
+    durations = np.array([a.duration for a in assets])
+    A_ub, b_ub = _base_constraints(
+        assets, returns, durations, goal.time_horizon_months / 12, goal.monthly_contribution, epsilon, None
+    )
+    result = linprog(
+        -returns, A_ub=A_ub, b_ub=b_ub, A_eq=[np.ones(len(assets))], b_eq=[1.0],
+        bounds=[(0.0, 1.0)] * len(assets), method="highs",
+    )
+    return result.ineqlin.marginals
+
+
+class TestPlanSensitivities:
+    @pytest.mark.parametrize("youth, months, contribution", CASES)
+    def test_duration_duals_match_highs(self, youth, months, contribution):
+        assets = get_default_universe(youth)
+        goal = _goal(youth, months, contribution)
+        s = optimize_portfolio(assets, goal, epsilon=0.5).sensitivities
+        m = _highs_marginals(assets, goal, 0.5)
+        # 행 0: Σ w D ≤ T + ε, 행 1: -Σ w D ≤ -(T - ε), 목적함수는 -R. ε는 수익률 모형에 들어가지 않는다.
+        assert s.return_per_epsilon == pytest.approx(-(m[0] + m[1]), abs=1e-12)
+        assert s.duration_shadow_price == pytest.approx(-(m[0] - m[1]), abs=1e-12)
+
+    @pytest.mark.parametrize("youth, months, contribution, principal", ISA_CASES)
+    def test_derivatives_match_finite_difference_of_optimize(self, youth, months, contribution, principal):
+        """ISA를 담은 계획에서 모든 도함수가 optimize_portfolio 결과의 차분과 맞는다."""
+        assets = get_default_universe(youth)
+        goal = _goal(youth, months, contribution).model_copy(update={"initial_principal": principal})
+        base = optimize_portfolio(assets, goal)
+        assert any(a.asset_class == AssetClass.ISA_DEPOSIT for a in base.allocations)
+        s = base.sensitivities
+
+        def diff(step, up, down):
+            return (step, (up.portfolio_return - down.portfolio_return) / (2 * step),
+                    (up.expected_future_value - down.expected_future_value) / (2 * step))
+
+        def changed(**update):
+            return optimize_portfolio(assets, goal.model_copy(update=update))
+
+        def shifted(shift):
+            moved = [a.model_copy(update={"gross_return": a.gross_return + shift}) for a in assets]
+            return optimize_portfolio(moved, goal)
+
+        checks = {
+            "month": diff(1, changed(time_horizon_months=months + 1), changed(time_horizon_months=months - 1)),
+            "epsilon": diff(0.05, optimize_portfolio(assets, goal, epsilon=0.55),
+                            optimize_portfolio(assets, goal, epsilon=0.45)),
+            "contribution": diff(1_0000, changed(monthly_contribution=contribution + 1_0000),
+                                 changed(monthly_contribution=contribution - 1_0000)),
+            "rate": diff(5e-4, shifted(5e-4), shifted(-5e-4)),
+        }
+        # 결과의 반올림(수익률 6자리, 미래가치 원 단위)이 차분에 주는 오차만큼 abs를 허용한다
+        for name, (step, fd_return, fd_value) in checks.items():
+            assert getattr(s, f"return_per_{name}") == pytest.approx(fd_return, rel=0.01, abs=1e-6 / step), name
+            assert getattr(s, f"future_value_per_{name}") == pytest.approx(fd_value, rel=1e-3, abs=1 / step), name
+
+        richer = changed(initial_principal=principal + 10_0000)
+        fd_principal = (richer.expected_future_value - base.expected_future_value) / 10_0000
+        assert s.future_value_per_principal == pytest.approx(fd_principal, rel=1e-3)
+
+    @pytest.mark.parametrize("youth, months, contribution", CASES)
+    def test_contribution_derivatives_match_finite_difference(self, youth, months, contribution):
+        assets = get_default_universe(youth)
+        goal = _goal(youth, months, contribution)
+        s = optimize_portfolio(assets, goal).sensitivities
+        step = 1000.0
+        up = optimize_portfolio(assets, goal.model_copy(update={"monthly_contribution": contribution + step}))
+        down = optimize_portfolio(assets, goal.model_copy(update={"monthly_contribution": contribution - step}))
+        fd = (up.expected_future_value - down.expected_future_value) / (2 * step)
+        assert s.future_value_per_contribution == pytest.approx(fd, rel=1e-3)
+
+    def test_youth_limit_lowers_return_per_contribution(self):
+        """청년도약저축 한도가 걸리면 저축액이 늘수록 고수익 비중이 줄어 수익률이 낮아진다."""
+        assets = get_default_universe(True)
+        s = optimize_portfolio(assets, _goal(True, 60, 150_0000)).sensitivities
+        assert s.return_per_contribution < 0
+        assert 0 < s.return_per_rate <= 1
+
+    def test_cached_basis_gives_same_sensitivities(self):
+        assets = get_default_universe(True)
+        goal = _goal(True, 48, 50_0000)
+        solved = optimize_portfolio(assets, goal).sensitivities
+        cached = optimize_portfolio(assets, goal).sensitivities
+        assert basis_cache.hits == 1
+        assert cached.model_dump() == pytest.approx(solved.model_dump(), rel=1e-9)
+
+    def test_infeasible_plan_has_no_sensitivities(self):
+        assets = get_default_universe(False)
+        result = optimize_portfolio(assets, _goal(False, 240, 150_0000))
+        assert result.success is False
+        assert result.sensitivities is None
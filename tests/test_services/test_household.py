@@ -0,0 +1,142 @@
+import pytest
+
+from app.config import settings
+from app.models.asset import AssetClass
+from app.models.goal import GoalInput
+from app.models.household import HouseholdGoal, HouseholdInput
+from app.services.asset_universe import get_default_universe
+from app.services.household import optimize_household
+from app.services.optimizer import lp_returns, optimize_portfolio
+
+
+@pytest.fixture
+def household():
+    """비상금(6개월), 결혼자금(3년), 주택 자금(7년)을 동시에 준비하는 가구."""
+    return HouseholdInput(
+        goals=[
+            HouseholdGoal(label="비상금", goal_amount=600_0000, time_horizon_months=6),
+            HouseholdGoal(
+                label="결혼자금", goal_amount=3000_0000, time_horizon_months=36,
+                initial_principal=500_0000,
+            ),
+            HouseholdGoal(
+                label="주택 자금", goal_amount=8000_0000, time_horizon_months=84,
+                initial_principal=1000_0000,
+            ),
+        ],
+        monthly_budget=250_0000,
+        eligible_youth_savings=True,
+    )
+
+
+def _monthly_in(result, asset_class: AssetClass) -> float:
+    return sum(
+        item.monthly_amount
+        for goal in result.goals
+        for item in goal.allocations
+        if item.asset_class == asset_class
+    )
+
+
+class TestHouseholdOptimizer:
+    def test_all_goals_reached(self, household):
+        result = optimize_household(household)
+        assert result.success is True
+        assert len(result.goals) == 3
+        assert result.budget_used <= household.monthly_budget + 1
+        for goal in result.goals:
+            assert goal.expected_future_value >= goal.goal_amount - 1
+
+    def test_duration_band_per_goal(self, household):
+        eps = settings.duration_epsilon
+        result = optimize_household(household)
+        for goal in result.goals:
+            T = goal.time_horizon_months / 12
+            assert T - eps - 1e-3 <= goal.portfolio_duration <= T + eps + 1e-3
+
+    def test_principal_fully_allocated(self, household):
+        result = optimize_household(household)
+        for spec, goal in zip(household.goals, result.goals):
+            allocated = sum(p.amount for p in goal.principal_allocations)
+            assert allocated == pytest.approx(spec.initial_principal, abs=len(goal.principal_allocations))
+
+    def test_shared_limits(self, household):
+        result = optimize_household(household)
+        youth = _monthly_in(result, AssetClass.YOUTH_SAVINGS)
+        assert youth <= settings.youth_savings_monthly_limit + 1
+
+        isa_principal = sum(
+            p.amount
+            for goal in result.goals
+            for p in goal.principal_allocations
+            if p.asset_class == AssetClass.ISA_DEPOSIT
+        )
+        isa_yearly = 12 * _monthly_in(result, AssetClass.ISA_DEPOSIT) + isa_principal
+        assert isa_yearly <= settings.isa_annual_limit + 12 * len(result.goals) + 1
+
+    def test_single_goal_matches_optimizer(self):
+        """목표가 하나이면 optimize_portfolio의 최적 수익률과 같은 배분을 찾는다."""
+        goal = GoalInput(
+            goal_amount=1_0000_0000, time_horizon_months=60,
+            monthly_contribution=150_0000, eligible_youth_savings=True,
+        )
+        household = HouseholdInput(
+            goals=[HouseholdGoal(label="목돈", goal_amount=1_0000_0000, time_horizon_months=60)],
+            monthly_budget=150_0000,
+            eligible_youth_savings=True,
+        )
+        result = optimize_household(household)
+        single = optimize_portfolio(get_default_universe(True), goal, 0.0)
+        assert result.success is True
+        assert result.goals[0].portfolio_return == pytest.approx(single.portfolio_return, abs=1e-5)
+
+    def test_returns_match_optimizer(self):
+        """목표별 세후 수익률은 월 예산 전체를 넣은 같은 목표의 lp_returns다 (ISA 누적 과세 반영)."""
+        household = HouseholdInput(
+            goals=[HouseholdGoal(label="목돈", goal_amount=5000_0000, time_horizon_months=36,
+                                 initial_principal=3000_0000)],
+            monthly_budget=150_0000,
+            eligible_youth_savings=True,
+        )
+        goal = GoalInput(
+            goal_amount=5000_0000, time_horizon_months=36, initial_principal=3000_0000,
+            monthly_contribution=150_0000, eligible_youth_savings=True,
+        )
+        assets = get_default_universe(True)
+        expected = dict(zip([a.name for a in assets], lp_returns(assets, goal)))
+        result = optimize_household(household, assets)
+        assert result.success is True
+        assert result.goals[0].allocations
+        for item in result.goals[0].allocations:
+            assert item.after_tax_return == pytest.approx(expected[item.name], abs=1e-6)
+
+    def test_budget_shortfall_reports_minimum(self, household):
+        household.monthly_budget = 50_0000
+        result = optimize_household(household)
+        assert result.success is False
+        assert "월 예산이 최소" in result.message
+
+        minimum = float(result.message.split("최소 ")[1].split("원")[0].replace(",", ""))
+        household.monthly_budget = minimum + 1
+        assert optimize_household(household).success is True
+
+    def test_unmatched_horizon_is_reported(self, household):
+        household.goals.append(
+            HouseholdGoal(label="노후 자금", goal_amount=1_0000_0000, time_horizon_months=240)
+        )
+        result = optimize_household(household)
+        assert result.success is False
+        assert "노후 자금" in result.message
+
+    def test_scales_to_dozens_of_goals(self):
+        goals = [
+            HouseholdGoal(
+                label=f"목표{i}", goal_amount=100_0000 * (i + 1), time_horizon_months=6 + 2 * i
+            )
+            for i in range(40)
+        ]
+        household = HouseholdInput(goals=goals, monthly_budget=2000_0000, eligible_youth_savings=True)
+        result = optimize_household(household)
+        assert result.success is True
+        assert len(result.goals) == 40
+        assert _monthly_in(result, AssetClass.YOUTH_SAVINGS) <= settings.youth_savings_monthly_limit + 40
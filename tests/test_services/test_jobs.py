@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from app.models.jobs import JobStatus
+from app.models.simulation import SimulationResponse
+from app.services.jobs import JobManager, QueueFullError
+from app.services.rate_store import current_snapshot
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def manager(clock):
+    manager = JobManager(workers=1, max_pending=2, ttl=60.0, clock=clock)
+    yield manager
+    manager.shutdown()
+
+
+def _wait(manager: JobManager, job_id: str, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        info = manager.get(job_id)
+        if info.status not in (JobStatus.QUEUED, JobStatus.RUNNING):
+            return info
+        time.sleep(0.005)
+    raise AssertionError("작업이 끝나지 않았습니다.")
+
+
+def _response(base_rate: float = 0.035) -> SimulationResponse:
+    return SimulationResponse(base_rate=base_rate, results=[])
+
+
+def _blocking(release: threading.Event):
+    def run(ctx):
+        release.wait(5)
+        return _response()
+    return run
+
+
+class TestJobManager:
+    def test_runs_with_pinned_snapshot(self, manager):
+        snapshot = current_snapshot()
+        info = manager.submit("simulate", lambda ctx: _response(current_snapshot().base_interest_rate))
+        assert info.status == JobStatus.QUEUED
+        assert info.rate_snapshot_version == snapshot.version
+        done = _wait(manager, info.id)
+        assert done.status == JobStatus.SUCCEEDED
+        assert done.result.base_rate == snapshot.base_interest_rate
+        assert done.progress == 1.0
+
+    def test_failure_is_reported(self, manager):
+        info = manager.submit("optimize", lambda ctx: 1 / 0)
+        done = _wait(manager, info.id)
+        assert done.status == JobStatus.FAILED
+        assert "ZeroDivisionError" in done.error
+
+    def test_queue_depth_is_bounded(self, manager):
+        release = threading.Event()
+        manager.submit("simulate", _blocking(release))
+        manager.submit("simulate", _blocking(release))
+        with pytest.raises(QueueFullError):
+            manager.submit("simulate", _blocking(release))
+        release.set()
+
+    def test_cancel_queued_job(self, manager):
+        release = threading.Event()
+        running = manager.submit("simulate", _blocking(release))
+        queued = manager.submit("simulate", _blocking(release))
+        cancelled = manager.cancel(queued.id)
+        assert cancelled.status == JobStatus.CANCELLED
+        release.set()
+        assert _wait(manager, running.id).status == JobStatus.SUCCEEDED
+
+    def test_cancel_running_job_at_next_progress(self, manager):
+        started = threading.Event()
+
+        def run(ctx):
+            for i in range(10_000):
+                ctx.progress(i, 10_000)
+                started.set()
+                time.sleep(0.001)
+            return _response()
+
+        info = manager.submit("simulate", run)
+        assert started.wait(5)
+        assert manager.cancel(info.id).cancel_requested is True
+        done = _wait(manager, info.id)
+        assert done.status == JobStatus.CANCELLED
+        assert done.progress < 1
+        assert done.result is None
+
+    def test_results_expire_after_ttl(self, manager, clock):
+        info = manager.submit("simulate", lambda ctx: _response())
+        done = _wait(manager, info.id)
+        assert done.expires_at is not None
+        clock.now += 59
+        assert manager.get(info.id) is not None
+        clock.now += 1
+        assert manager.get(info.id) is None
+        assert manager.cancel(info.id) is None
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.asset_universe import get_default_universe
+from app.services import ledger
+from app.services.gap_analyzer import _future_value
+from app.services.ledger import (
+    after_tax_terminal_values,
+    contribution_schedule,
+    fallback_index,
+    run_ledger,
+    terminal_values,
+)
+from app.services.tax import after_tax_return
+
+
+@pytest.fixture
+def assets():
+    return get_default_universe(True)
+
+
+def _returns(assets) -> np.ndarray:
+    return np.array([after_tax_return(a.gross_return, a.tax_benefit) for a in assets])
+
+
+def _one_hot(assets, index: int) -> np.ndarray:
+    w = np.zeros(len(assets))
+    w[index] = 1.0
+    return w
+
+
+class TestLedger:
+    def test_matches_annuity_when_no_limit_binds(self, assets):
+        weights = np.array([0.2, 0.4, 0.1, 0.1, 0.1, 0.1])
+        values = terminal_values(assets, weights, 0.0, 150_0000, 48)
+        returns = _returns(assets)
+        expected = [_future_value(0.0, w * 150_0000, r, 48) for w, r in zip(weights, returns)]
+        assert values == pytest.approx(expected, rel=1e-10)
+
+    def test_balances_end_at_terminal_values(self, assets):
+        weights = np.array([0.2, 0.4, 0.1, 0.1, 0.1, 0.1])
+        ledger = run_ledger(assets, weights, 500_0000, 150_0000, 120)
+        assert ledger.balances.shape == (121, len(assets))
+        assert ledger.balances[-1] == pytest.approx(
+            terminal_values(assets, weights, 500_0000, 150_0000, 120), rel=1e-9
+        )
+
+    def test_isa_annual_cap_spills_to_parking(self, assets):
+        isa = next(i for i, a in enumerate(assets) if a.asset_class.value == "isa_deposit")
+        schedule, spilled = contribution_schedule(assets, _one_hot(assets, isa), 0.0, 200_0000, 36)
+        yearly = [schedule[1 + 12 * y: 13 + 12 * y, isa].sum() for y in range(3)]
+        assert yearly == pytest.approx([settings.isa_annual_limit] * 3)
+        assert spilled.sum() == pytest.approx(36 * 200_0000 - 3 * settings.isa_annual_limit)
+        assert schedule[:, fallback_index(assets)].sum() == pytest.approx(spilled.sum())
+
+    def test_youth_maturity_reinvests_in_fallback(self, assets):
+        youth = next(i for i, a in enumerate(assets) if a.asset_class.value == "youth_savings")
+        months = 84
+        ledger = run_ledger(assets, _one_hot(assets, youth), 0.0, 50_0000, months)
+        maturity = settings.youth_savings_maturity_months
+
+        returns = _returns(assets)
+        at_maturity = _future_value(0.0, 50_0000, returns[youth], maturity)
+        assert ledger.balances[maturity - 1, youth] > 0
+        assert ledger.balances[-1, youth] == 0.0
+        fb = fallback_index(assets)
+        expected = _future_value(at_maturity, 50_0000, returns[fb], months - maturity)
+        assert ledger.balances[-1, fb] == pytest.approx(expected, rel=1e-9)
+        assert terminal_values(assets, _one_hot(assets, youth), 0.0, 50_0000, months).sum() == \
+            pytest.approx(expected, rel=1e-9)
+
+    def test_youth_monthly_limit(self, assets):
+        youth = next(i for i, a in enumerate(assets) if a.asset_class.value == "youth_savings")
+        schedule, spilled = contribution_schedule(assets, _one_hot(assets, youth), 0.0, 100_0000, 12)
+        assert schedule[1:, youth].max() == settings.youth_savings_monthly_limit
+        assert spilled[1:] == pytest.approx(np.full(12, 100_0000 - settings.youth_savings_monthly_limit))
+
+    def test_youth_takes_no_principal(self, assets):
+        youth = next(i for i, a in enumerate(assets) if a.asset_class.value == "youth_savings")
+        schedule, spilled = contribution_schedule(assets, _one_hot(assets, youth), 1000_0000, 50_0000, 12)
+        assert schedule[0, youth] == 0.0
+        assert schedule[0, fallback_index(assets)] == 1000_0000
+        assert spilled[0] == 1000_0000
+        assert schedule[1:, youth] == pytest.approx(np.full(12, 50_0000))
+
+    def test_scenario_batch(self, assets):
+        weights = np.full(len(assets), 1 / len(assets))
+        base = _returns(assets)
+        shifted = np.stack([base - 0.01, base, base + 0.01])
+        values = terminal_values(assets, weights, 0.0, 150_0000, 600, shifted).sum(axis=1)
+        assert values[1] == pytest.approx(terminal_values(assets, weights, 0.0, 150_0000, 600).sum())
+        assert values[0] < values[1] < values[2]
+
+    def test_scenario_chunks_match_single_pass(self, assets, monkeypatch):
+        weights = np.full(len(assets), 1 / len(assets))
+        shifted = _returns(assets) + np.linspace(-0.02, 0.02, 7)[:, None]
+        whole = after_tax_terminal_values(assets, weights, 0.0, 150_0000, 600, shifted)
+        monkeypatch.setattr(ledger, "_GROW_CHUNK_ELEMENTS", 601 * len(assets) * 2)  # 2행씩
+        np.testing.assert_allclose(after_tax_terminal_values(assets, weights, 0.0, 150_0000, 600, shifted), whole)
+
+    def test_after_tax_isa_uses_allowance(self, assets):
+        isa = next(i for i, a in enumerate(assets) if a.asset_class.value == "isa_deposit")
+        weights = _one_hot(assets, isa)
+        gross = np.array([a.gross_return for a in assets])
+        pre_tax = terminal_values(assets, weights, 0.0, 100_0000, 48, gross)[isa]
+        gain = pre_tax - 48 * 100_0000
+        expected = pre_tax - settings.isa_separate_tax_rate * max(gain - settings.isa_tax_free_allowance, 0.0)
+
+        values = after_tax_terminal_values(assets, weights, 0.0, 100_0000, 48)
+        assert values[isa] == pytest.approx(expected, rel=1e-12)
+        assert values[isa] > terminal_values(assets, weights, 0.0, 100_0000, 48)[isa]
+
+        shifted = np.stack([gross - 0.01, gross, gross + 0.01])
+        batch = after_tax_terminal_values(assets, weights, 0.0, 100_0000, 48, shifted)
+        assert batch.shape == (3, len(assets))
+        assert batch[1] == pytest.approx(values, rel=1e-12)
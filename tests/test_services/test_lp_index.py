@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from app.models.goal import GoalInput
+from app.services.asset_universe import get_default_universe
+from app.services.lp_index import LPIndex, build_index, quote_portfolio
+from app.services.optimizer import optimize_portfolio
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    path = tmp_path_factory.mktemp("lp_index") / "index.bin"
+    build_index(path, max_months=120, contributions=np.geomspace(10_0000, 1000_0000, 64))
+    return LPIndex(path)
+
+
+def _goal(months: int, contribution: float, eligible: bool) -> GoalInput:
+    return GoalInput(
+        goal_amount=1_0000_0000,
+        time_horizon_months=months,
+        monthly_contribution=contribution,
+        eligible_youth_savings=eligible,
+    )
+
+
+class TestLPIndex:
+    def test_lookup_matches_solver(self, index):
+        rng = np.random.default_rng(0)
+        hits = 0
+        for _ in range(300):
+            eligible = bool(rng.integers(2))
+            goal = _goal(int(rng.integers(1, 100)), float(rng.uniform(10_0000, 800_0000)), eligible)
+            assets = get_default_universe(eligible)
+            required = float(rng.uniform(0.02, 0.05))
+            result = index.lookup(assets, goal, required)
+            if result is None:
+                continue
+            hits += 1
+            expected = optimize_portfolio(assets, goal, required_return=required)
+            assert result.success == expected.success
+            assert result.portfolio_return == pytest.approx(expected.portfolio_return, abs=1e-6)
+            assert result.portfolio_duration == pytest.approx(expected.portfolio_duration, abs=0.5)
+        assert hits > 250
+
+    def test_miss_outside_grid(self, index):
+        assets = get_default_universe(True)
+        assert index.lookup(assets, _goal(240, 150_0000, True)) is None
+
+    def test_miss_on_different_universe(self, index):
+        assets = get_default_universe(True)[:-1]
+        assert index.lookup(assets, _goal(60, 150_0000, True)) is None
+
+    def test_quote_falls_back_to_solver(self, index):
+        assets = get_default_universe(False)
+        goal = _goal(200, 150_0000, False)
+        assert quote_portfolio(assets, goal, index=index) == optimize_portfolio(assets, goal)
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "bogus.bin"
+        path.write_bytes(b"not an index")
+        with pytest.raises(ValueError):
+            LPIndex(path)
@@ -1,5 +1,6 @@
 import pytest
 
+from app.models.goal import GoalInput
 from app.services.asset_universe import get_default_universe
 from app.services.gap_analyzer import analyze_gap
 from app.services.optimizer import optimize_portfolio
@@ -71,3 +72,41 @@ class TestOptimizer:
         )
         for alloc in result.allocations:
             assert alloc.weight >= 0
+
+
+class TestElasticFallback:
+    def _goal(self, months: int) -> GoalInput:
+        return GoalInput(goal_amount=1_0000_0000, time_horizon_months=months, monthly_contribution=150_0000)
+
+    def test_duration_band_relaxed_to_longest_asset(self):
+        assets = get_default_universe(False)
+        result = optimize_portfolio(assets, self._goal(240))
+        assert result.success is False
+        (relaxation,) = result.relaxations
+        assert relaxation.constraint == "duration_lower"
+        assert relaxation.limit == pytest.approx(19.5)
+        assert relaxation.achieved == pytest.approx(max(a.duration for a in assets))
+        assert relaxation.violation == pytest.approx(19.5 - relaxation.achieved)
+        assert sum(a.weight for a in result.allocations) == pytest.approx(1.0, abs=1e-3)
+
+    def test_required_return_relaxed_within_band(self):
+        assets = get_default_universe(False)
+        best = optimize_portfolio(assets, self._goal(60))
+        result = optimize_portfolio(assets, self._goal(60), required_return=0.10)
+        assert result.success is False
+        (relaxation,) = result.relaxations
+        assert relaxation.constraint == "required_return"
+        assert relaxation.violation == pytest.approx(0.10 - best.portfolio_return, abs=1e-5)
+        assert abs(result.portfolio_duration - 5.0) <= 0.5 + 1e-6
+        assert result.expected_future_value > 0
+        assert "완화" in result.message
+
+    def test_both_constraints_relaxed(self):
+        assets = get_default_universe(False)
+        result = optimize_portfolio(assets, self._goal(240), required_return=0.10)
+        assert {r.constraint for r in result.relaxations} == {"duration_lower", "required_return"}
+
+    def test_feasible_has_no_relaxations(self, noah_goal):
+        result = optimize_portfolio(get_default_universe(True), noah_goal)
+        assert result.success is True
+        assert result.relaxations == []
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from app.models.asset import AssetClass
+from app.models.goal import GoalInput
+from app.services.asset_universe import get_default_universe
+from app.services.gap_analyzer import analyze_gap
+from app.services.optimizer import optimize_portfolio
+from app.services.probability import (
+    allocation_weights,
+    plan_success_probability,
+    expansion_check_probability,
+    success_probability,
+)
+from app.services.simulator import scenario_value_matrix
+
+
+@pytest.fixture
+def assets():
+    return get_default_universe(True)
+
+
+def _optimized(assets, goal: GoalInput) -> np.ndarray:
+    required = analyze_gap(goal).required_annual_return
+    return allocation_weights(assets, optimize_portfolio(assets, goal, required_return=required).allocations)
+
+
+def _at_base_value(assets, weights, goal: GoalInput, ratio: float) -> GoalInput:
+    """포트폴리오 기준 만기 가치의 ratio배를 목표로 하는 입력."""
+    base = float((scenario_value_matrix(goal, assets, np.zeros(1)) @ weights)[0])
+    return goal.model_copy(update={"goal_amount": base * ratio})
+
+
+class TestSuccessProbability:
+    @pytest.mark.parametrize("months", [24, 60, 120])
+    @pytest.mark.parametrize("ratio", [0.98, 1.0, 1.01])
+    @pytest.mark.parametrize("volatility", [0.005, 0.02])
+    def test_matches_sampled_shifts(self, assets, months, ratio, volatility):
+        goal = GoalInput(
+            goal_amount=1_0000_0000, time_horizon_months=months, monthly_contribution=150_0000,
+            eligible_youth_savings=True,
+        )
+        weights = _optimized(assets, goal)
+        goal = _at_base_value(assets, weights, goal, ratio)
+        analytic = plan_success_probability(assets, weights, goal, volatility)
+        simulated = expansion_check_probability(assets, weights, goal, volatility, n_paths=50_000, seed=0)
+        assert analytic == pytest.approx(simulated, abs=0.02)
+
+    def test_knife_edge_duration_gap(self, assets):
+        """재투자 이익과 듀레이션 갭 손실이 거의 상쇄되는 경우에도 표본 결과와 맞는다."""
+        weights = np.zeros(len(assets))
+        classes = [a.asset_class for a in assets]
+        weights[classes.index(AssetClass.ISA_DEPOSIT)] = 0.5
+        weights[classes.index(AssetClass.BOND_ETF_10Y)] = 0.5
+        goal = GoalInput(goal_amount=1, time_horizon_months=47, monthly_contribution=150_0000)
+        goal = _at_base_value(assets, weights, goal, 1.0)
+        analytic = plan_success_probability(assets, weights, goal, 0.01)
+        simulated = expansion_check_probability(assets, weights, goal, 0.01, n_paths=50_000, seed=0)
+        assert analytic == pytest.approx(simulated, abs=0.02)
+
+    def test_vectorized_over_goals(self, assets):
+        weights = np.full(len(assets), 1 / len(assets))
+        goals = np.linspace(8000_0000, 1_2000_0000, 1000)
+        probs = success_probability(assets, weights, goals, 0.0, 150_0000, 60)
+        assert probs.shape == (1000,)
+        assert np.all((probs >= 0) & (probs <= 1))
+        assert np.all(np.diff(probs) <= 1e-12)  # 목표가 클수록 확률은 줄어든다
+
+    def test_batch_matches_single(self, assets):
+        weights = np.full(len(assets), 1 / len(assets))
+        goal = GoalInput(goal_amount=1_0000_0000, time_horizon_months=60, monthly_contribution=150_0000)
+        batch = success_probability(
+            assets, np.tile(weights, (3, 1)), [goal.goal_amount] * 3, 0.0, 150_0000, [60, 60, 60]
+        )
+        assert batch == pytest.approx([plan_success_probability(assets, weights, goal)] * 3)
+
+    def test_zero_volatility_is_deterministic(self, assets):
+        weights = np.full(len(assets), 1 / len(assets))
+        goal = GoalInput(goal_amount=1_0000_0000, time_horizon_months=60, monthly_contribution=150_0000)
+        below = _at_base_value(assets, weights, goal, 0.999)
+        above = _at_base_value(assets, weights, goal, 1.001)
+        assert plan_success_probability(assets, weights, below, 0.0) == pytest.approx(1.0)
+        assert plan_success_probability(assets, weights, above, 0.0) == pytest.approx(0.0)
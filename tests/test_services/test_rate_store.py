@@ -0,0 +1,89 @@
+import json
+import threading
+
+import pytest
+
+from app.models.asset import AssetClass
+from app.services import rate_store as rate_store_module
+from app.services.asset_universe import get_default_universe
+from app.services.gap_analyzer import analyze_gap
+from app.services.rate_store import DEFAULT_GROSS_RETURNS, RateStore, current_snapshot, pinned
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = RateStore(0.035, DEFAULT_GROSS_RETURNS, history=4)
+    monkeypatch.setattr(rate_store_module, "rate_store", store)
+    return store
+
+
+def _parking(assets) -> float:
+    return next(a.gross_return for a in assets if a.asset_class == AssetClass.PARKING)
+
+
+class TestRateStore:
+    def test_publish_merges_and_versions(self, store):
+        first = store.current
+        second = store.publish(gross_returns={AssetClass.PARKING: 0.025}, source="test")
+        assert second.version == first.version + 1
+        assert second.gross_returns[AssetClass.PARKING] == 0.025
+        assert second.gross_returns[AssetClass.BOND_ETF_10Y] == first.gross_returns[AssetClass.BOND_ETF_10Y]
+        assert second.base_interest_rate == first.base_interest_rate
+        assert first.gross_returns[AssetClass.PARKING] == 0.030  # 이전 스냅샷은 그대로
+
+    def test_snapshots_are_immutable(self, store):
+        with pytest.raises(TypeError):
+            store.current.gross_returns[AssetClass.PARKING] = 0.5
+
+    def test_history_is_bounded(self, store):
+        for i in range(6):
+            store.publish(base_interest_rate=0.03 + i * 0.001)
+        assert [s.version for s in store.history()] == [4, 5, 6, 7]
+
+    def test_load_file(self, store, tmp_path):
+        path = tmp_path / "rates.json"
+        path.write_text(json.dumps({"base_interest_rate": 0.03, "gross_returns": {"parking": 0.028}}))
+        snapshot = store.load_file(path)
+        assert snapshot.base_interest_rate == 0.03
+        assert snapshot.gross_returns[AssetClass.PARKING] == 0.028
+        assert snapshot.source == "file:rates.json"
+
+    def test_load_invalid_file(self, store, tmp_path):
+        path = tmp_path / "rates.json"
+        path.write_text(json.dumps({"gross_returns": {"parking": 5.0}}))
+        with pytest.raises(ValueError):
+            store.load_file(path)
+        assert store.current.version == 1
+
+
+class TestPinning:
+    def test_pinned_snapshot_survives_publish(self, store, noah_goal):
+        with pinned() as snapshot:
+            before = analyze_gap(noah_goal)
+            store.publish(base_interest_rate=0.05, gross_returns={AssetClass.PARKING: 0.04})
+            assert current_snapshot() is snapshot
+            assert _parking(get_default_universe()) == 0.030
+            assert analyze_gap(noah_goal) == before
+        assert _parking(get_default_universe()) == 0.04
+        assert analyze_gap(noah_goal).future_value_safe > before.future_value_safe
+
+    def test_readers_see_consistent_snapshots(self, store):
+        """발행 중에도 읽는 쪽은 항상 한 번에 발행된 (기준 금리, 수익률) 조합만 본다."""
+        seen = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                s = store.current
+                seen.append((s.base_interest_rate, s.gross_returns[AssetClass.PARKING]))
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for i in range(200):
+            rate = 0.01 + i * 1e-4
+            store.publish(base_interest_rate=rate, gross_returns={AssetClass.PARKING: rate})
+        stop.set()
+        for t in threads:
+            t.join()
+        assert all(pair == (0.035, 0.030) or pair[0] == pair[1] for pair in seen)
@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.models.asset import AssetClass
+from app.models.rebalance import Holding, RebalanceAccount
+from app.services.asset_universe import get_default_universe
+from app.models.goal import GoalInput
+from app.services.optimizer import lp_returns
+from app.services.rebalancer import account_returns, rebalance_accounts, solve_rebalance_batch
+
+
+def _account(**overrides) -> RebalanceAccount:
+    params = dict(account_id="acc", time_horizon_months=60, monthly_contribution=150_0000)
+    params.update(overrides)
+    return RebalanceAccount(**params)
+
+
+def _sold(result, asset_class: AssetClass) -> float:
+    return sum(t.sell for t in result.trades if t.asset_class == asset_class)
+
+
+class TestRebalancer:
+    def test_new_money_only(self):
+        [result] = rebalance_accounts([_account(eligible_youth_savings=True)])
+        assert result.success is True
+        assert all(t.sell == 0 for t in result.trades)
+        assert sum(t.buy for t in result.trades) == pytest.approx(150_0000, abs=len(result.trades))
+        assert 4.5 - 1e-3 <= result.duration_after <= 5.5 + 1e-3
+        assert result.duration_gap == 0
+
+    def test_turnover_cap(self):
+        account = _account(
+            holdings=[Holding(asset_class=AssetClass.PARKING, amount=5000_0000)],
+            max_turnover=0.1,
+        )
+        [result] = rebalance_accounts([account])
+        assert result.success is True
+        assert _sold(result, AssetClass.PARKING) <= 500_0000 + 1
+        assert result.turnover <= 0.1 + 1e-4
+        # 매도 한도 때문에 밴드에 못 들어가면 이탈폭을 보고한다
+        assert result.duration_gap > 0
+        assert "벗어남" in result.message
+
+    def test_full_turnover_reaches_band(self):
+        account = _account(
+            time_horizon_months=24,
+            holdings=[Holding(asset_class=AssetClass.BOND_ETF_10Y, amount=3000_0000)],
+            max_turnover=1.0,
+        )
+        [result] = rebalance_accounts([account])
+        assert result.duration_before == pytest.approx(7.8)
+        assert 1.5 - 1e-3 <= result.duration_after <= 2.5 + 1e-3
+        assert result.duration_gap == 0
+
+    def test_cost_includes_penalty_and_tax(self):
+        account = _account(
+            time_horizon_months=60,
+            holdings=[
+                Holding(asset_class=AssetClass.TIME_DEPOSIT, amount=1000_0000, cost_basis=900_0000)
+            ],
+            max_turnover=1.0,
+        )
+        [result] = rebalance_accounts([account])
+        sold = _sold(result, AssetClass.TIME_DEPOSIT)
+        assert sold > 0
+        rate = settings.deposit_early_termination_penalty + 0.1 * settings.interest_income_tax_rate
+        assert result.transaction_cost == pytest.approx(sold * rate, abs=2)
+
+    def test_unrealized_gain_blocks_switch(self, monkeypatch):
+        """ISA 예금의 세후 수익률이 더 높아도 이익 실현 세금이 크면 갈아타지 않는다."""
+        monkeypatch.setattr(settings, "deposit_early_termination_penalty", 0.0)
+        accounts = [
+            _account(
+                account_id=f"gain{g}",
+                time_horizon_months=12,
+                monthly_contribution=0,
+                max_turnover=1.0,
+                holdings=[Holding(
+                    asset_class=AssetClass.TIME_DEPOSIT,
+                    amount=1000_0000,
+                    cost_basis=1000_0000 * (1 - g),
+                )],
+            )
+            for g in (0.0, 0.1)
+        ]
+        no_gain, high_gain = rebalance_accounts(accounts)
+        assert _sold(no_gain, AssetClass.TIME_DEPOSIT) == pytest.approx(1000_0000)
+        assert _sold(high_gain, AssetClass.TIME_DEPOSIT) == 0
+
+    def test_isa_room(self):
+        account = _account(monthly_contribution=3000_0000, isa_contributed_this_year=1900_0000,
+                           time_horizon_months=12)
+        [result] = rebalance_accounts([account])
+        isa = sum(t.buy for t in result.trades if t.asset_class == AssetClass.ISA_DEPOSIT)
+        assert isa <= 100_0000 + 1
+
+    def test_batch_matches_single(self):
+        assets = get_default_universe(True)
+        rng = np.random.default_rng(0)
+        B, n = 50, len(assets)
+        holdings = rng.uniform(0, 1000_0000, (B, n)) * (rng.random((B, n)) < 0.5)
+        args = dict(
+            assets=assets,
+            holdings=holdings,
+            basis=holdings * 0.95,
+            cash=rng.uniform(0, 300_0000, B),
+            months=rng.integers(6, 240, B),
+            youth_eligible=rng.random(B) < 0.5,
+            isa_contributed=0.0,
+            max_turnover=0.2,
+        )
+        batch = solve_rebalance_batch(**args, chunk_size=16)
+        assert batch.success.all()
+        for b in (0, 17, 49):
+            single = solve_rebalance_batch(**{
+                **args,
+                "holdings": holdings[b:b + 1],
+                "basis": args["basis"][b:b + 1],
+                "cash": args["cash"][b:b + 1],
+                "months": args["months"][b:b + 1],
+                "youth_eligible": args["youth_eligible"][b:b + 1],
+            })
+            after_batch = holdings[b] + batch.buy[b] - batch.sell[b]
+            after_single = holdings[b] + single.buy[0] - single.sell[0]
+            assert after_batch == pytest.approx(after_single, abs=1.0)
+
+    def test_returns_match_optimizer(self):
+        """보유 평가액을 초기 자본으로 본 목표의 lp_returns와 같은 수익률로 계좌를 평가한다."""
+        assets = get_default_universe(True)
+        holdings = np.array([[0.0, 0.0, 2000_0000, 1000_0000, 0.0, 0.0], [0.0] * 6])
+        cash, months = np.array([150_0000, 300_0000]), np.array([36, 84])
+        returns = account_returns(assets, holdings, cash, months)
+        for b in range(2):
+            goal = GoalInput(
+                goal_amount=1_0000_0000, time_horizon_months=int(months[b]),
+                monthly_contribution=cash[b], initial_principal=holdings[b].sum(),
+            )
+            np.testing.assert_allclose(returns[b], lp_returns(assets, goal))
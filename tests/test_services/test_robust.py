@@ -0,0 +1,98 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.models.robust import RobustRequest
+from app.services.asset_universe import get_default_universe
+from app.services.optimizer import optimize_portfolio
+from app.services.robust import optimize_robust, return_deviations
+
+
+def _request(**overrides) -> RobustRequest:
+    params = dict(
+        goal_amount=1_0000_0000,
+        time_horizon_months=60,
+        monthly_contribution=150_0000,
+        eligible_youth_savings=True,
+    )
+    params.update(overrides)
+    return RobustRequest(**params)
+
+
+@pytest.fixture
+def assets():
+    return get_default_universe(True)
+
+
+def _weights(result, assets) -> np.ndarray:
+    by_name = {a.name: a.weight for a in result.allocations}
+    return np.array([by_name.get(a.name, 0.0) for a in assets])
+
+
+class TestReturnDeviations:
+    def test_default_scales_with_duration(self, assets):
+        delta = return_deviations(assets, _request())
+        durations = np.array([a.duration for a in assets])
+        order = np.argsort(durations)
+        assert np.all(delta >= 0)
+        assert delta[order[-1]] > delta[order[0]]
+
+    def test_explicit_deviations(self, assets):
+        req = _request(deviations={assets[0].asset_class: 0.01})
+        delta = return_deviations(assets, req)
+        assert delta[0] > 0
+        assert np.all(delta[1:] == 0)
+
+
+class TestRobustOptimizer:
+    @pytest.mark.parametrize("overrides", [{}, {"time_horizon_months": 36, "initial_principal": 3000_0000}])
+    def test_zero_budget_matches_nominal(self, assets, overrides):
+        req = _request(budget=0.0, **overrides)
+        robust = optimize_robust(assets, req)
+        nominal = optimize_portfolio(assets, req)
+        assert robust.success
+        assert robust.allocations == nominal.allocations
+        assert robust.portfolio_return == pytest.approx(nominal.portfolio_return, abs=1e-6)
+        assert robust.worst_case_return == pytest.approx(nominal.portfolio_return, abs=1e-6)
+
+    def test_full_budget_equals_box(self, assets):
+        budget = optimize_robust(assets, _request(budget=len(assets)))
+        box = optimize_robust(assets, _request(uncertainty_set="box"))
+        assert budget.success and box.success
+        assert budget.worst_case_return == pytest.approx(box.worst_case_return, abs=1e-6)
+
+    def test_worst_case_matches_enumeration(self, assets):
+        req = _request(budget=2.0)
+        result = optimize_robust(assets, req)
+        assert result.success
+        w = _weights(result, assets)
+        delta = return_deviations(assets, req)
+        worst_loss = max(
+            sum(delta[i] * w[i] for i in subset)
+            for subset in itertools.combinations(range(len(assets)), 2)
+        )
+        assert result.worst_case_return == pytest.approx(result.portfolio_return - worst_loss, abs=1e-4)
+
+    def test_worst_case_bounded_by_nominal(self, assets):
+        nominal = optimize_portfolio(assets, _request())
+        for gamma in (0.5, 1.0, 3.0):
+            result = optimize_robust(assets, _request(budget=gamma))
+            assert result.worst_case_return <= nominal.portfolio_return + 1e-9
+            assert result.worst_case_future_value <= nominal.expected_future_value + 1
+
+    def test_required_return_applies_to_worst_case(self, assets):
+        req = _request(budget=1.0)
+        free = optimize_robust(assets, req)
+        result = optimize_robust(assets, req, required_return=free.worst_case_return - 0.001)
+        assert result.success
+        assert result.worst_case_return >= free.worst_case_return - 0.001 - 1e-9
+
+    def test_unreachable_required_return_fails(self, assets):
+        result = optimize_robust(assets, _request(uncertainty_set="box"), required_return=0.2)
+        assert not result.success
+        assert result.message.startswith("최적화 실패")
+
+    def test_empty_universe(self):
+        result = optimize_robust([], _request())
+        assert not result.success
@@ -0,0 +1,91 @@
+import time
+
+import numpy as np
+import pytest
+
+from app.models.goal import GoalInput
+from app.models.simulation import RollingSimulationRequest
+from app.services.asset_universe import get_default_universe
+from app.services.gap_analyzer import _future_value
+from app.services.optimizer import optimize_portfolio
+from app.services.rolling import rolling_terminal_values, simulate_rolling
+
+
+def _request(**overrides) -> RollingSimulationRequest:
+    params = dict(
+        goal_amount=1_0000_0000,
+        time_horizon_months=60,
+        monthly_contribution=150_0000,
+        eligible_youth_savings=True,
+        n_paths=2000,
+        seed=7,
+    )
+    params.update(overrides)
+    return RollingSimulationRequest(**params)
+
+
+class TestRollingSimulation:
+    def test_single_rebalance_without_volatility_matches_optimizer(self):
+        req = _request(rebalance_months=60, rate_volatility=0.0, n_paths=3)
+        assets = get_default_universe(True)
+        paths = rolling_terminal_values(req, assets)
+
+        goal = GoalInput(
+            goal_amount=req.goal_amount,
+            time_horizon_months=60,
+            monthly_contribution=req.monthly_contribution,
+            eligible_youth_savings=True,
+        )
+        static = optimize_portfolio(assets, goal)
+        expected = _future_value(0, req.monthly_contribution, static.portfolio_return, 60)
+        assert paths["terminal"] == pytest.approx(np.full(3, expected), rel=1e-5)
+
+    @pytest.mark.parametrize("youth, months, principal", [(False, 48, 1000_0000), (True, 36, 1000_0000)])
+    def test_first_step_uses_optimizer_isa_returns(self, youth, months, principal):
+        req = _request(
+            time_horizon_months=months, initial_principal=principal, eligible_youth_savings=youth,
+            rate_volatility=0.0, n_paths=3,
+        )
+        assets = get_default_universe(youth)
+        paths = rolling_terminal_values(req, assets)
+
+        goal = GoalInput(
+            goal_amount=req.goal_amount,
+            time_horizon_months=months,
+            monthly_contribution=req.monthly_contribution,
+            initial_principal=principal,
+            eligible_youth_savings=youth,
+        )
+        static = optimize_portfolio(assets, goal)
+        assert "isa_deposit" in {a.asset_class.value for a in static.allocations}
+        assert paths["portfolio_return"][0] == pytest.approx(np.full(3, static.portfolio_return), abs=1e-6)
+        assert paths["duration"][0] == pytest.approx(np.full(3, static.portfolio_duration), abs=1e-4)
+
+    def test_seed_is_reproducible(self):
+        a = simulate_rolling(_request())
+        b = simulate_rolling(_request())
+        assert a == b
+
+    def test_duration_follows_remaining_horizon(self):
+        result = simulate_rolling(_request(time_horizon_months=120, rate_volatility=0.0))
+        assert result.n_rebalances == 10
+        durations = result.mean_duration_path
+        assert durations[-1] < durations[0]
+        assert all(d2 <= d1 + 1e-6 for d1, d2 in zip(durations, durations[1:]))
+
+    def test_distribution_is_ordered(self):
+        result = simulate_rolling(_request())
+        tv = result.terminal_value
+        assert tv.p5 <= tv.p25 <= tv.p50 <= tv.p75 <= tv.p95
+        assert 0.0 <= result.success_probability <= 1.0
+
+    def test_beats_simple_savings(self):
+        result = simulate_rolling(_request())
+        assert result.success_probability >= result.simple_savings_success_probability
+
+    def test_10k_paths_10_rebalances_within_seconds(self):
+        req = _request(time_horizon_months=120, n_paths=10_000)
+        start = time.perf_counter()
+        result = simulate_rolling(req)
+        assert result.n_rebalances == 10
+        assert time.perf_counter() - start < 5.0
@@ -0,0 +1,113 @@
+import pytest
+
+from app.models.goal import GoalInput
+from app.models.sensitivity import SensitivityGridRequest
+from app.services.asset_universe import get_default_universe
+from app.services.gap_analyzer import analyze_gap
+from app.services.optimizer import optimize_portfolio
+from app.services.sensitivity import compute_sensitivity_grid
+
+
+@pytest.fixture
+def grid_request():
+    return SensitivityGridRequest(
+        goal_amount=1_0000_0000,
+        eligible_youth_savings=True,
+        monthly_contribution_min=50_0000,
+        monthly_contribution_max=300_0000,
+        monthly_contribution_steps=6,
+        time_horizon_min_months=12,
+        time_horizon_max_months=108,
+        time_horizon_steps=9,
+    )
+
+
+class TestSensitivityGrid:
+    def test_grid_shape(self, grid_request):
+        grid = compute_sensitivity_grid(grid_request)
+        assert len(grid.monthly_contributions) == 6
+        assert len(grid.time_horizons_months) == 9
+        for matrix in (grid.required_annual_return, grid.portfolio_return, grid.feasible):
+            assert len(matrix) == 6
+            assert all(len(row) == 9 for row in matrix)
+
+    def test_cells_match_pipeline(self, grid_request):
+        """각 칸이 analyze_gap + optimize_portfolio 결과와 일치한다."""
+        grid = compute_sensitivity_grid(grid_request)
+        assets = get_default_universe(True)
+
+        for i, C in enumerate(grid.monthly_contributions):
+            for j, months in enumerate(grid.time_horizons_months):
+                goal = GoalInput(
+                    goal_amount=grid_request.goal_amount,
+                    time_horizon_months=months,
+                    monthly_contribution=C,
+                    eligible_youth_savings=True,
+                )
+                gap = analyze_gap(goal)
+                assert grid.optimization_needed[i][j] == gap.optimization_needed
+
+                if gap.required_annual_return is None:
+                    assert grid.required_annual_return[i][j] is None
+                else:
+                    assert grid.required_annual_return[i][j] == pytest.approx(
+                        gap.required_annual_return, abs=1e-6
+                    )
+
+                if not gap.optimization_needed:
+                    assert grid.feasible[i][j] is True
+                    continue
+                if not gap.goal_achievable:
+                    assert grid.feasible[i][j] is False
+                    continue
+                result = optimize_portfolio(assets, goal, gap.required_annual_return)
+                assert grid.feasible[i][j] == result.success
+                if result.success:
+                    assert grid.portfolio_return[i][j] == pytest.approx(
+                        result.portfolio_return, abs=1e-5
+                    )
+
+    def test_portfolio_return_matches_optimize(self):
+        """초기 자본과 ISA 누적 과세가 있어도 격자의 최적 수익률이 optimize_portfolio와 같다."""
+        req = SensitivityGridRequest(
+            goal_amount=5000_0000,
+            initial_principal=500_0000,
+            eligible_youth_savings=True,
+            monthly_contribution_min=30_0000,
+            monthly_contribution_max=300_0000,
+            monthly_contribution_steps=4,
+            time_horizon_min_months=12,
+            time_horizon_max_months=96,
+            time_horizon_steps=8,
+        )
+        grid = compute_sensitivity_grid(req)
+        assets = get_default_universe(True)
+        for i, C in enumerate(grid.monthly_contributions):
+            for j, months in enumerate(grid.time_horizons_months):
+                goal = GoalInput(
+                    goal_amount=req.goal_amount,
+                    time_horizon_months=months,
+                    monthly_contribution=C,
+                    initial_principal=req.initial_principal,
+                    eligible_youth_savings=True,
+                )
+                result = optimize_portfolio(assets, goal)
+                assert (grid.portfolio_return[i][j] is not None) == result.success
+                if result.success:
+                    assert grid.portfolio_return[i][j] == pytest.approx(result.portfolio_return, abs=1e-5)
+
+    def test_long_horizon_has_no_matching_portfolio(self, grid_request):
+        """최장 듀레이션(7.8년) + ε보다 긴 기간은 듀레이션 매칭 불가."""
+        grid = compute_sensitivity_grid(grid_request)
+        j = grid.time_horizons_months.index(108)
+        assert all(row[j] is None for row in grid.portfolio_return)
+
+    def test_invalid_range_rejected(self):
+        with pytest.raises(ValueError):
+            SensitivityGridRequest(
+                goal_amount=1_0000_0000,
+                monthly_contribution_min=200_0000,
+                monthly_contribution_max=100_0000,
+                time_horizon_min_months=12,
+                time_horizon_max_months=60,
+            )
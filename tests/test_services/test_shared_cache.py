@@ -0,0 +1,170 @@
+import hashlib
+import itertools
+import multiprocessing
+
+import pytest
+from pydantic_core import to_json
+
+from app.models.gap import GapAnalysisResult
+from app.models.goal import GoalInput
+from app.services import gap_analyzer, optimizer, shared_cache
+from app.services.asset_universe import get_default_universe
+from app.services.basis_cache import basis_cache
+from app.services.shared_cache import _SEQ, WAYS, SharedResultCache
+
+NOAH = GoalInput(
+    goal_amount=1_0000_0000,
+    time_horizon_months=60,
+    monthly_contribution=150_0000,
+    eligible_youth_savings=True,
+)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "results.bin")
+
+
+@pytest.fixture
+def cache(path):
+    cache = SharedResultCache(path, slots=WAYS * 4, slot_size=2048)
+    yield cache
+    cache.close()
+
+
+def _gap(amount: float) -> GapAnalysisResult:
+    return GapAnalysisResult(
+        future_value_safe=amount,
+        goal_amount=amount,
+        gap=0.0,
+        optimization_needed=False,
+        goal_achievable=True,
+    )
+
+
+def _child_lookup(path: str, queue) -> None:
+    cache = SharedResultCache(path, slots=WAYS * 4, slot_size=2048)
+    result = cache.get(cache.key("gap", 1), GapAnalysisResult)
+    queue.put(None if result is None else result.goal_amount)
+
+
+class TestSharedResultCache:
+    def test_disabled_without_path(self):
+        cache = SharedResultCache(None)
+        assert not cache.enabled
+        assert cache.cached(GapAnalysisResult, lambda: _gap(1.0), "gap", 1).goal_amount == 1.0
+        assert cache.stats()["misses"] == 0
+
+    def test_round_trip(self, cache):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return _gap(5.0)
+
+        first = cache.cached(GapAnalysisResult, compute, "gap", 5)
+        second = cache.cached(GapAnalysisResult, compute, "gap", 5)
+        assert first == second
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_shared_across_processes(self, cache, path):
+        cache.put(cache.key("gap", 1), _gap(7.0))
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        child = ctx.Process(target=_child_lookup, args=(path, queue))
+        child.start()
+        child.join(10)
+        assert queue.get(timeout=5) == 7.0
+
+    def test_evicts_least_recently_used_in_set(self, path):
+        cache = SharedResultCache(path, slots=WAYS, slot_size=2048)  # 집합 하나
+        keys = [cache.key("gap", i) for i in range(WAYS + 1)]
+        for i, key in enumerate(keys[:WAYS]):
+            cache.put(key, _gap(float(i)))
+        assert cache.get(keys[0], GapAnalysisResult) is not None  # 적중으로 가장 최근이 된다
+        cache.put(keys[WAYS], _gap(99.0))
+        assert cache.get(keys[0], GapAnalysisResult) is not None
+        assert cache.get(keys[1], GapAnalysisResult) is None
+        assert cache.get(keys[WAYS], GapAnalysisResult).goal_amount == 99.0
+        cache.close()
+
+    def test_slot_being_written_is_a_miss(self, cache):
+        key = cache.key("gap", 3)
+        cache.put(key, _gap(3.0))
+        at = next(
+            cache._offset(key) + way * cache.slot_size
+            for way in range(WAYS)
+            if _SEQ.unpack_from(cache._mm, cache._offset(key) + way * cache.slot_size)[0]
+        )
+        seq = _SEQ.unpack_from(cache._mm, at)[0]
+        _SEQ.pack_into(cache._mm, at, seq + 1)  # 홀수: 다른 워커가 쓰는 중
+        assert cache.get(key, GapAnalysisResult) is None
+
+    def test_oversized_result_is_not_cached(self, path):
+        cache = SharedResultCache(path, slots=WAYS, slot_size=128)
+        assert cache.put(cache.key("gap", 1), _gap(1.0)) is False
+        cache.close()
+
+    def test_result_version_changes_the_key(self, cache, monkeypatch):
+        cache.cached(GapAnalysisResult, lambda: _gap(1.0), "gap", 1)
+        monkeypatch.setattr(shared_cache, "RESULT_VERSION", shared_cache.RESULT_VERSION + 1)
+        # 계산 방식이 바뀐 배포는 이전 결과를 보지 않는다
+        assert cache.cached(GapAnalysisResult, lambda: _gap(2.0), "gap", 1).goal_amount == 2.0
+        assert cache.stats()["hits"] == 0
+
+    def test_geometry_change_replaces_file(self, cache, path):
+        cache.put(cache.key("gap", 1), _gap(1.0))
+        other = SharedResultCache(path, slots=WAYS * 8, slot_size=2048)
+        assert other.get(other.key("gap", 1), GapAnalysisResult) is None
+        assert cache.get(cache.key("gap", 1), GapAnalysisResult) is not None  # 기존 매핑은 그대로 유효
+        other.close()
+
+
+class TestServiceIntegration:
+    def test_gap_and_optimize_results_are_shared(self, cache, path, monkeypatch):
+        monkeypatch.setattr(gap_analyzer, "result_cache", cache)
+        monkeypatch.setattr(optimizer, "result_cache", cache)
+        assets = get_default_universe(True)
+        gap = gap_analyzer.analyze_gap(NOAH)
+        result = optimizer.optimize_portfolio(assets, NOAH, gap.required_annual_return)
+
+        worker = SharedResultCache(path, slots=WAYS * 4, slot_size=2048)  # 다른 워커
+        monkeypatch.setattr(gap_analyzer, "result_cache", worker)
+        monkeypatch.setattr(optimizer, "result_cache", worker)
+        assert gap_analyzer.analyze_gap(NOAH) == gap
+        assert optimizer.optimize_portfolio(assets, NOAH, gap.required_annual_return) == result
+        assert worker.stats()["hits"] == 2
+        worker.close()
+
+    def test_rates_change_the_key(self, cache, monkeypatch):
+        monkeypatch.setattr(gap_analyzer, "result_cache", cache)
+        low = gap_analyzer.analyze_gap(NOAH, safe_rate=0.03)
+        high = gap_analyzer.analyze_gap(NOAH, safe_rate=0.04)
+        assert high.future_value_safe > low.future_value_safe
+        assert cache.stats()["hits"] == 0
+
+
+# RESULT_VERSION별 캐시 대상 계산 결과의 지문. 결과가 바뀌면 버전을 올리고 새 지문을 추가한다.
+RESULT_FINGERPRINTS = {
+    1: "ee0a84eafdfc987c32338b21c762c121f9b140aab43e2a04dadbcb8a1ce34f19",
+    2: "9239701a1440b34b1e90865b5f2137532b0577e3b4066ba9ae585ebbbb644994",
+    3: "7ee1cd74ae122b04861f38c0da34849034329986531eff2f0587dda1751a71d2",
+}
+
+
+def _results_fingerprint() -> str:
+    basis_cache.clear()  # 재사용한 기저의 결과는 마지막 자리까지 같지 않을 수 있다
+    digest = hashlib.sha256()
+    for months, principal, youth in itertools.product((12, 36, 60, 120), (0, 3000_0000), (False, True)):
+        goal = NOAH.model_copy(update=dict(
+            time_horizon_months=months, initial_principal=principal, eligible_youth_savings=youth,
+        ))
+        digest.update(to_json(gap_analyzer._analyze_gap(goal, 0.035)))
+        digest.update(to_json(optimizer._optimize_portfolio(get_default_universe(youth), goal, None, 0.5)))
+    return digest.hexdigest()
+
+
+def test_result_version_tracks_cached_results():
+    """캐시되는 결과가 바뀌었는데 RESULT_VERSION을 그대로 두면 이전 배포의 결과를 계속 쓴다."""
+    assert RESULT_FINGERPRINTS.get(shared_cache.RESULT_VERSION) == _results_fingerprint()
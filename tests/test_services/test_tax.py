@@ -1,7 +1,19 @@
+import numpy as np
 import pytest
 
-from app.models.asset import TaxBenefit
-from app.services.tax import after_tax_return
+from app.config import settings
+from app.models.asset import AssetClass, TaxBenefit
+from app.services.asset_universe import get_default_universe
+from app.services.batch_lp import asset_upper_bounds
+from app.services.gap_analyzer import _future_value
+from app.services.tax import (
+    accrual_returns,
+    after_tax_return,
+    after_tax_returns,
+    cumulative_tax,
+    effective_after_tax_return_partials,
+    effective_after_tax_returns,
+)
 
 
 class TestAfterTaxReturn:
@@ -21,3 +33,82 @@ class TestAfterTaxReturn:
 
     def test_zero_return(self):
         assert after_tax_return(0.0, TaxBenefit.NONE) == 0.0
+
+
+@pytest.fixture
+def assets():
+    return get_default_universe(True)
+
+
+def _isa(assets) -> int:
+    return next(i for i, a in enumerate(assets) if a.asset_class == AssetClass.ISA_DEPOSIT)
+
+
+class TestTaxEngine:
+    def test_array_matches_scalar(self, assets):
+        gross = np.array([[0.03, 0.06, 0.035, -0.01, 0.0, 0.042]])
+        expected = [after_tax_return(g, a.tax_benefit) for g, a in zip(gross[0], assets)]
+        assert after_tax_returns(gross, assets)[0] == pytest.approx(expected, abs=1e-15)
+
+    def test_accrual_keeps_isa_gross(self, assets):
+        gross = np.array([a.gross_return for a in assets])
+        accrued = accrual_returns(gross, assets)
+        isa = _isa(assets)
+        assert accrued[isa] == gross[isa]
+        assert np.delete(accrued, isa) == pytest.approx(np.delete(after_tax_returns(gross, assets), isa))
+
+    def test_cumulative_tax_applies_allowance_after_loss_netting(self, assets):
+        isa = _isa(assets)
+        gains = np.zeros((2, 3, len(assets)))  # (시나리오, 개월, 자산)
+        gains[0, :, isa] = [150_0000, 100_0000, 100_0000]
+        gains[1, :, isa] = [300_0000, -200_0000, 150_0000]
+        gains[:, :, 0] = 100_0000  # 원천징수 자산은 누적 과세 대상이 아니다
+
+        tax = cumulative_tax(gains, assets, allowance=200_0000)
+        rate = settings.isa_separate_tax_rate
+        assert tax.shape == gains.shape
+        assert tax[0, :, isa] == pytest.approx([0.0, 50_0000 * rate, 150_0000 * rate])
+        assert tax[1, :, isa] == pytest.approx([100_0000 * rate, 0.0, 50_0000 * rate])
+        assert not tax[..., 0].any()
+
+    def test_isa_under_allowance_earns_gross(self, assets):
+        upper = asset_upper_bounds(assets, 30_0000)[0]
+        effective = effective_after_tax_returns(assets, 0.0, 30_0000, 36, upper)
+        isa = _isa(assets)
+        assert effective[isa] == assets[isa].gross_return
+
+    def test_effective_return_reproduces_after_tax_value(self, assets):
+        P, C, months = 1000_0000, 150_0000, 60
+        position = asset_upper_bounds(assets, C)[0]
+        effective = effective_after_tax_returns(assets, P, C, months, position)
+        isa = _isa(assets)
+        flat = after_tax_return(assets[isa].gross_return, TaxBenefit.SEPARATE_TAX)
+        assert flat < effective[isa] < assets[isa].gross_return
+
+        gross_value = position[isa] * _future_value(P, C, assets[isa].gross_return, months)
+        gain = gross_value - position[isa] * (P + C * months)
+        after_tax = gross_value - settings.isa_separate_tax_rate * (gain - settings.isa_tax_free_allowance)
+        assert position[isa] * _future_value(P, C, effective[isa], months) == pytest.approx(after_tax, rel=1e-8)
+
+    def test_effective_returns_broadcast_over_goals(self, assets):
+        C = np.array([30_0000, 150_0000, 400_0000])
+        months = np.array([36, 60, 120])
+        upper = asset_upper_bounds(assets, C)
+        batch = effective_after_tax_returns(assets, 0.0, C, months, upper)
+        for k in range(len(C)):
+            single = effective_after_tax_returns(assets, 0.0, C[k], months[k], upper[k])
+            assert batch[k] == pytest.approx(single, abs=1e-12)
+
+    @pytest.mark.parametrize("P, C, months", [(3000_0000, 150_0000, 36), (0, 300_0000, 60), (0, 150_0000, 12)])
+    def test_effective_return_partials_match_finite_difference(self, assets, P, C, months):
+        position = asset_upper_bounds(assets, C)[0]
+        gross = np.array([a.gross_return for a in assets])
+        partials = effective_after_tax_return_partials(assets, P, C, months, position)
+
+        base = dict(principal=P, monthly=C, months=months, position=position, gross_returns=gross)
+        steps = [("principal", "principal", 1e3), ("monthly", "monthly", 1e2), ("months", "months", 1e-3),
+                 ("position", "position", 1e-6), ("gross_returns", "gross", 1e-7)]
+        for arg, field, h in steps:
+            up = effective_after_tax_returns(assets, **{**base, arg: base[arg] + h})
+            down = effective_after_tax_returns(assets, **{**base, arg: base[arg] - h})
+            assert getattr(partials, field) == pytest.approx((up - down) / (2 * h), rel=1e-5, abs=1e-12)
@@ -0,0 +1,69 @@
+import asyncio
+
+from app.services.tracing import Tracer, current_trace, span, traced
+
+
+def _run(tracer: Tracer, fn, name: str = "GET /x", status: int = 200):
+    trace, token = tracer.start(name)
+    try:
+        fn()
+    finally:
+        kept = tracer.finish(trace, token, status)
+    return trace, kept
+
+
+@traced("work")
+def _work():
+    with span("inner", size=3):
+        pass
+
+
+class TestTracer:
+    def test_span_is_noop_outside_trace(self):
+        assert current_trace() is None
+        with span("orphan"):
+            pass
+        assert _work() is None
+
+    def test_records_nested_spans(self):
+        tracer = Tracer(8, slow_ms=0, sample_rate=0)
+        trace, kept = _run(tracer, _work)
+        assert kept
+        assert [s.name for s in trace.spans] == ["inner", "work"]
+        inner, outer = trace.spans
+        assert inner.args == {"size": 3}
+        assert outer.start_ns <= inner.start_ns
+        assert inner.start_ns + inner.duration_ns <= outer.start_ns + outer.duration_ns
+        assert current_trace() is None
+
+    def test_spans_from_worker_threads_join_the_request(self):
+        tracer = Tracer(8, slow_ms=0, sample_rate=0)
+        trace, _ = _run(tracer, lambda: asyncio.run(asyncio.to_thread(_work)))
+        assert {s.name for s in trace.spans} == {"inner", "work"}
+
+    def test_tail_sampling(self):
+        draws = iter([0.5, 0.001])
+        tracer = Tracer(8, slow_ms=1000, sample_rate=0.01, rng=lambda: next(draws))
+        assert not _run(tracer, lambda: None)[1]  # 빠르고 표본에서 빠짐
+        assert _run(tracer, lambda: None)[1]  # 빠르지만 표본
+        assert _run(tracer, lambda: None, status=503)[1]  # 오류는 항상
+        tracer.slow_ns = 0
+        assert _run(tracer, lambda: None)[1]  # 기준 이상은 항상 (rng를 쓰지 않는다)
+        assert (tracer.finished, tracer.kept) == (4, 3)
+
+    def test_ring_buffer_keeps_latest(self):
+        tracer = Tracer(2, slow_ms=0, sample_rate=0)
+        for i in range(5):
+            _run(tracer, lambda: None, name=f"GET /{i}")
+        assert [t.name for t in tracer.traces()] == ["GET /3", "GET /4"]
+
+    def test_chrome_trace_format(self):
+        tracer = Tracer(8, slow_ms=0, sample_rate=0)
+        trace, _ = _run(tracer, _work)
+        events = tracer.chrome_trace()["traceEvents"]
+        assert events[0]["ph"] == "M" and events[0]["tid"] == trace.id
+        complete = [e for e in events if e["ph"] == "X"]
+        assert [e["name"] for e in complete] == ["GET /x", "inner", "work"]
+        root = complete[0]
+        for e in complete[1:]:
+            assert root["ts"] <= e["ts"] and e["ts"] + e["dur"] <= root["ts"] + root["dur"] + 1e-3